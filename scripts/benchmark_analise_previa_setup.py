@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Micro-benchmark do custo de preparação da análise prévia de mensagem.
+
+Mede, por mensagem, o tempo gasto antes da chamada ao LLM em
+``AnalisePreviaMensagemLangchainDatasource``:
+
+- antes: gera o modelo Pydantic dinâmico, o ``ChatPromptTemplate`` e o
+  ``with_structured_output`` a cada mensagem (comportamento anterior);
+- depois: obtém a chain memoizada por configuração.
+
+Nenhuma chamada de rede é feita: o LLM é apenas instanciado para que
+``with_structured_output`` gere o schema da ferramenta.
+
+Uso:
+    python scripts/benchmark_analise_previa_setup.py --iteracoes 500
+"""
+
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Callable
+
+from rich.console import Console
+from rich.table import Table
+
+from smart_core_assistant_painel.modules.ai_engine import (
+    AnalisePreviaMensagemParameters,
+    LlmError,
+    LlmParameters,
+)
+from smart_core_assistant_painel.modules.ai_engine.features.analise_previa_mensagem.datasource.langchain_pydantic.analise_previa_mensagem_langchain_datasource import (
+    AnalisePreviaMensagemLangchainDatasource,
+)
+from smart_core_assistant_painel.modules.ai_engine.features.analise_previa_mensagem.datasource.langchain_pydantic.pydantic_model_factory import (
+    PydanticModelFactory,
+)
+
+console = Console()
+
+INTENT_TYPES = json.dumps(
+    {
+        "intent_types": {
+            f"categoria_{c}": {
+                f"intent_{c}_{i}": f"Descrição da intenção {i}"
+                for i in range(8)
+            }
+            for c in range(6)
+        }
+    }
+)
+ENTITY_TYPES = json.dumps(
+    {
+        "entity_types": {
+            f"grupo_{g}": {
+                f"entidade_{g}_{i}": f"Descrição da entidade {i}"
+                for i in range(8)
+            }
+            for g in range(6)
+        }
+    }
+)
+
+
+def criar_parametros() -> AnalisePreviaMensagemParameters:
+    """Cria parâmetros equivalentes aos usados por FeaturesCompose."""
+    from langchain_ollama import ChatOllama
+
+    llm_parameters = LlmParameters(
+        llm_class=ChatOllama,
+        model="llama3.1",
+        extra_params={"temperature": 0},
+        prompt_system="Você é um analista de mensagens. {json} " * 20,
+        prompt_human="Analise a mensagem",
+        context="Olá, gostaria de saber o preço",
+        error=LlmError,
+    )
+    return AnalisePreviaMensagemParameters(
+        historico_atendimento={},
+        valid_intent_types=INTENT_TYPES,
+        valid_entity_types=ENTITY_TYPES,
+        llm_parameters=llm_parameters,
+        error=LlmError("Erro no benchmark"),
+    )
+
+
+def preparar_sem_cache(parameters: AnalisePreviaMensagemParameters) -> Any:
+    """Reproduz a preparação anterior, refeita a cada mensagem."""
+    from langchain_core.prompts import ChatPromptTemplate
+
+    modelo = PydanticModelFactory.create_pydantic_model(
+        parameters.valid_intent_types, parameters.valid_entity_types
+    )
+    prompt_system = parameters.llm_parameters.prompt_system.replace(
+        "{", "{{"
+    ).replace("}", "}}")
+    messages = ChatPromptTemplate.from_messages(
+        [
+            ("system", prompt_system),
+            ("user", "{historico_context}\n\n{prompt_human}: {context}"),
+        ]
+    )
+    llm = parameters.llm_parameters.create_llm
+    return messages | llm.with_structured_output(modelo)
+
+
+def medir(funcao: Callable[[], Any], iteracoes: int) -> list[float]:
+    """Executa a função e retorna os tempos em microssegundos."""
+    funcao()
+    tempos: list[float] = []
+    for _ in range(iteracoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1_000_000)
+    return sorted(tempos)
+
+
+def main() -> None:
+    """Executa o benchmark e exibe a tabela de resultados."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iteracoes", type=int, default=500)
+    args = parser.parse_args()
+
+    parameters = criar_parametros()
+    datasource = AnalisePreviaMensagemLangchainDatasource()
+
+    resultados = {
+        "antes (sem cache)": medir(
+            lambda: preparar_sem_cache(parameters), args.iteracoes
+        ),
+        "depois (chain memoizada)": medir(
+            lambda: datasource._obter_chain(parameters), args.iteracoes
+        ),
+    }
+
+    tabela = Table(title="Preparação por mensagem (µs)")
+    tabela.add_column("Cenário")
+    tabela.add_column("Mediana", justify="right")
+    tabela.add_column("p95", justify="right")
+    for nome, tempos in resultados.items():
+        p95 = tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))]
+        tabela.add_row(nome, f"{statistics.median(tempos):.1f}", f"{p95:.1f}")
+    console.print(tabela)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,9 +11,16 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from smart_core_assistant_painel.app.ui.oraculo.apps import (
+    aquecer_embeddings,
+)
+
 os.environ.setdefault(
     "DJANGO_SETTINGS_MODULE",
     "smart_core_assistant_painel.app.ui.core.settings",
 )
 
 application = get_asgi_application()
+
+# Apenas os processos que atendem requisições aquecem os embeddings
+aquecer_embeddings()
@@ -17,8 +17,12 @@ from .models import (
     Contato,
     Mensagem,
 )
+from .models_cache_embeddings import CacheEmbedding
+from .models_cache_semantico import CacheAnaliseSemantica
 from .models_departamento import Departamento
 from .models_documento import Documento
+from .models_reprocessamento_embeddings import ReprocessamentoEmbeddings
+from .models_telemetria import MetricaLlm
 from .models_treinamento import Treinamento
 
 
@@ -873,7 +877,8 @@ class DocumentoAdmin(admin.ModelAdmin[Documento]):
     search_fields = ["treinamento__tag", "conteudo"]
     list_filter = ["treinamento__tag", "treinamento__grupo", "data_criacao"]
     ordering = ["treinamento__tag", "ordem"]
-    exclude = ["embedding"]  # Exclui o campo embedding do formulário
+    # Exclui os campos vetoriais do formulário
+    exclude = ["embedding", "embedding_prefixo", "embedding_sombra"]
     readonly_fields = [
         "treinamento",
         "conteudo",
@@ -1015,6 +1020,140 @@ class DocumentoAdmin(admin.ModelAdmin[Documento]):
             return f"Erro: {type(e).__name__}"
 
 
+@admin.register(CacheAnaliseSemantica)
+class CacheAnaliseSemanticaAdmin(admin.ModelAdmin[CacheAnaliseSemantica]):
+    """Admin para o cache semântico da análise prévia."""
+
+    list_display = [
+        "id",
+        "mensagem",
+        "versao",
+        "acertos",
+        "data_criacao",
+        "ultimo_acerto",
+    ]
+    search_fields = ["mensagem"]
+    list_filter = ["versao", "data_criacao"]
+    ordering = ["-acertos", "-data_criacao"]
+    exclude = ["embedding"]
+    readonly_fields = [
+        "mensagem",
+        "versao",
+        "intent_detectado",
+        "acertos",
+        "data_criacao",
+        "ultimo_acerto",
+    ]
+    list_per_page = 50
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        """Impede a criação manual de entradas do cache."""
+        return False
+
+
+
+@admin.register(MetricaLlm)
+class MetricaLlmAdmin(admin.ModelAdmin[MetricaLlm]):
+    """Admin para as métricas das chamadas ao LLM e aos embeddings.
+
+    Os agregados (p50/p95 por funcionalidade e dia) são exibidos pelo
+    comando ``relatorio_telemetria_llm``.
+    """
+
+    list_display = [
+        "data",
+        "funcionalidade",
+        "tipo",
+        "modelo",
+        "latencia",
+        "tempo_primeiro_token",
+        "tokens_prompt",
+        "tokens_resposta",
+        "sucesso",
+    ]
+    list_filter = ["funcionalidade", "tipo", "modelo", "sucesso", "data"]
+    date_hierarchy = "data"
+    ordering = ["-data"]
+    list_per_page = 100
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        """Impede a criação manual de métricas."""
+        return False
+
+    def has_change_permission(
+        self, request: HttpRequest, obj: MetricaLlm | None = None
+    ) -> bool:
+        """Métricas são somente leitura."""
+        return False
+
+
+@admin.register(CacheEmbedding)
+class CacheEmbeddingAdmin(admin.ModelAdmin[CacheEmbedding]):
+    """Admin para o cache de embeddings.
+
+    A taxa de acerto e a ocupação por modelo são exibidas pelo comando
+    ``relatorio_cache_embeddings``.
+    """
+
+    list_display = [
+        "id",
+        "embeddings_class",
+        "modelo",
+        "hash_conteudo",
+        "dimensoes",
+        "acertos",
+        "data_criacao",
+        "ultimo_acesso",
+    ]
+    search_fields = ["hash_conteudo"]
+    list_filter = ["embeddings_class", "modelo"]
+    ordering = ["-ultimo_acesso"]
+    exclude = ["vetor"]
+    list_per_page = 100
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        """Impede a criação manual de entradas do cache."""
+        return False
+
+    def has_change_permission(
+        self, request: HttpRequest, obj: CacheEmbedding | None = None
+    ) -> bool:
+        """Entradas do cache são somente leitura."""
+        return False
+
+
+@admin.register(ReprocessamentoEmbeddings)
+class ReprocessamentoEmbeddingsAdmin(
+    admin.ModelAdmin[ReprocessamentoEmbeddings]
+):
+    """Admin para o progresso do comando ``reprocessar_embeddings``."""
+
+    list_display = [
+        "id",
+        "embeddings_class",
+        "modelo",
+        "ultimo_id",
+        "processados",
+        "data_inicio",
+        "data_atualizacao",
+        "data_troca",
+    ]
+    list_filter = ["embeddings_class", "modelo"]
+    ordering = ["-data_inicio"]
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        """Reprocessamentos são criados apenas pelo comando."""
+        return False
+
+    def has_change_permission(
+        self,
+        request: HttpRequest,
+        obj: ReprocessamentoEmbeddings | None = None,
+    ) -> bool:
+        """O progresso é somente leitura."""
+        return False
+
+
 admin.site.site_header = "Smart Core Assistant - Painel de Administração"
 admin.site.site_title = "Smart Core Assistant"
 admin.site.index_title = "Painel de Controle do Chatbot"
@@ -15,6 +15,28 @@ from django.dispatch import Signal
 from loguru import logger
 
 
+def aquecer_embeddings() -> None:
+    """Cria o cliente de embeddings em segundo plano.
+
+    Evita que a primeira mensagem do processo pague a criação do cliente
+    (ou o carregamento do modelo local do HuggingFace). Chamado apenas
+    pelos processos que atendem mensagens: o servidor web (``wsgi``/
+    ``asgi``) e cada worker do Django-Q (``post_spawn``), e não em
+    comandos como ``migrate`` ou ``shell``.
+    """
+    import threading
+
+    from smart_core_assistant_painel.modules.ai_engine import (
+        EMBEDDINGS_CLIENT_REGISTRY,
+    )
+
+    threading.Thread(
+        target=EMBEDDINGS_CLIENT_REGISTRY.aquecer,
+        name="aquecimento-embeddings",
+        daemon=True,
+    ).start()
+
+
 class OraculoConfig(AppConfig):
     """Configuração para o aplicativo Oraculo."""
 
@@ -42,6 +64,44 @@ class OraculoConfig(AppConfig):
             logger.error(f"Erro ao inicializar serviços para Django-Q: {e}")
 
         self._configure_signals_as_robust()
+        self._configurar_telemetria()
+        self._configurar_cache_embeddings()
+
+    @staticmethod
+    def _configurar_telemetria() -> None:
+        """Grava a telemetria do motor de IA na tabela de métricas."""
+        try:
+            from django.db import close_old_connections
+
+            from smart_core_assistant_painel.modules.ai_engine import (
+                TELEMETRIA,
+                RegistroTelemetria,
+            )
+
+            from .models_telemetria import MetricaLlm
+
+            def gravar(lote: list[RegistroTelemetria]) -> None:
+                # A gravação roda na thread da telemetria, com conexão própria
+                close_old_connections()
+                MetricaLlm.registrar_lote(lote)
+
+            TELEMETRIA.configurar_destino(gravar)
+        except Exception as e:
+            logger.error(f"Erro ao configurar a telemetria do LLM: {e}")
+
+    @staticmethod
+    def _configurar_cache_embeddings() -> None:
+        """Armazena o cache de embeddings na tabela ``CacheEmbedding``."""
+        try:
+            from smart_core_assistant_painel.modules.ai_engine import (
+                EMBEDDINGS_CACHE,
+            )
+
+            from .models_cache_embeddings import CacheEmbedding
+
+            EMBEDDINGS_CACHE.configurar_armazenamento(CacheEmbedding)
+        except Exception as e:
+            logger.error(f"Erro ao configurar o cache de embeddings: {e}")
 
     def _configure_signals_as_robust(self) -> None:
         """Configura os signals do modelo para usar send_robust."""
@@ -0,0 +1,247 @@
+"""Cache semântico da análise prévia de mensagens.
+
+Reutiliza o embedding já calculado para cada mensagem recebida para buscar,
+na tabela ``CacheAnaliseSemantica`` (pgvector), uma análise anterior de uma
+mensagem parecida. Apenas mensagens curtas e sem histórico no atendimento
+são elegíveis, pois nelas o resultado depende só do texto. Somente as
+intenções são reaproveitadas: as entidades pertencem à mensagem original e
+vêm sempre do extrator por regras, e a busca é desativada enquanto houver
+tipos de entidade de texto livre configurados (que só o LLM extrai).
+
+As entradas excedentes são podadas a cada ``_INTERVALO_PODA`` registros.
+
+Uma fração dos acertos (``SERVICEHUB.SEMANTIC_CACHE_SAMPLE_RATE``) é
+reanalisada pelo LLM em segundo plano para estimar a taxa de falsos
+acertos e calibrar ``SERVICEHUB.SEMANTIC_CACHE_MAX_DISTANCE``.
+
+O cache é habilitado incluindo ``analise_previa_semantica`` em
+``SERVICEHUB.LLM_CACHE_FEATURES``.
+"""
+
+import itertools
+import random
+from collections.abc import Mapping
+from typing import Any, Optional
+
+from django.core.cache import cache
+from django_q.tasks import async_task  # type: ignore
+from loguru import logger
+
+from smart_core_assistant_painel.app.ui.oraculo.models_cache_semantico import (
+    CacheAnaliseSemantica,
+)
+from smart_core_assistant_painel.modules.ai_engine import (
+    APMTuple,
+    FeaturesCompose,
+    tipos_entidade_livres,
+)
+from smart_core_assistant_painel.modules.ai_engine.utils.response_cache import (
+    normalizar_mensagem,
+)
+from smart_core_assistant_painel.modules.services import SERVICEHUB
+
+FEATURE_CACHE_SEMANTICO = "analise_previa_semantica"
+
+_PREFIXO_METRICAS = "cache_semantico"
+_METRICAS = ("hits", "misses", "amostras", "falsos_acertos")
+
+# Registros entre duas podas das entradas excedentes
+_INTERVALO_PODA = 100
+_registros = itertools.count(1)
+
+
+def cache_semantico_habilitado() -> bool:
+    """Indica se o cache semântico está habilitado."""
+    return FEATURE_CACHE_SEMANTICO in SERVICEHUB.LLM_CACHE_FEATURES
+
+
+def mensagem_elegivel(
+    texto: str, historico_atendimento: Mapping[str, Any]
+) -> bool:
+    """Verifica se a mensagem pode usar o cache semântico.
+
+    Usada na busca, no registro e na decisão de aguardar o embedding da
+    mensagem antes da análise prévia.
+
+    Args:
+        texto: Conteúdo da mensagem
+        historico_atendimento: Histórico carregado do atendimento
+
+    Returns:
+        True se a mensagem é curta, o atendimento não tem histórico e não
+        há tipos de entidade de texto livre configurados
+    """
+    normalizado = normalizar_mensagem(texto)
+    return (
+        bool(normalizado)
+        and len(normalizado) <= SERVICEHUB.SEMANTIC_CACHE_MAX_CHARS
+        and not historico_atendimento.get("conteudo_mensagens")
+        and not tipos_entidade_livres(SERVICEHUB.VALID_ENTITY_TYPES)
+    )
+
+
+def buscar_analise_semantica(
+    texto: str,
+    query_vec: Optional[list[float]],
+    historico_atendimento: Mapping[str, Any],
+) -> Optional[APMTuple]:
+    """Busca uma análise reutilizável para a mensagem.
+
+    Args:
+        texto: Conteúdo da mensagem
+        query_vec: Embedding da mensagem (None desabilita a busca)
+        historico_atendimento: Histórico carregado do atendimento
+
+    Returns:
+        APMTuple com os intents em cache (sem entidades) ou None
+    """
+    if (
+        query_vec is None
+        or not cache_semantico_habilitado()
+        or not mensagem_elegivel(texto, historico_atendimento)
+    ):
+        return None
+
+    try:
+        encontrado = CacheAnaliseSemantica.buscar_similar(
+            query_vec=query_vec,
+            versao=FeaturesCompose.versao_analise_previa(),
+            distancia_maxima=SERVICEHUB.SEMANTIC_CACHE_MAX_DISTANCE,
+        )
+    except Exception as e:
+        logger.warning(f"Cache semântico indisponível: {e}")
+        return None
+
+    if encontrado is None:
+        _incrementar_metrica("misses")
+        return None
+
+    entrada, distancia = encontrado
+    _incrementar_metrica("hits")
+    entrada.registrar_acerto()
+    logger.debug(
+        f"Cache semântico: acerto {entrada.id} (distância {distancia:.4f})"
+    )
+
+    if random.random() < SERVICEHUB.SEMANTIC_CACHE_SAMPLE_RATE:
+        _incrementar_metrica("amostras")
+        async_task(
+            "smart_core_assistant_painel.app.ui.oraculo.cache_semantico."
+            "verificar_falso_acerto",
+            entrada.id,
+            texto,
+            distancia,
+        )
+
+    return APMTuple(
+        intent_types=list(entrada.intent_detectado), entity_types=[]
+    )
+
+
+def registrar_analise_semantica(
+    texto: str,
+    query_vec: Optional[list[float]],
+    historico_atendimento: Mapping[str, Any],
+    resultado: APMTuple,
+) -> None:
+    """Armazena o resultado de uma análise feita pelo LLM.
+
+    Args:
+        texto: Conteúdo da mensagem
+        query_vec: Embedding da mensagem
+        historico_atendimento: Histórico carregado do atendimento
+        resultado: Intents e entidades retornados pelo LLM (apenas os
+            intents são armazenados)
+    """
+    if (
+        query_vec is None
+        or not cache_semantico_habilitado()
+        or not mensagem_elegivel(texto, historico_atendimento)
+    ):
+        return
+
+    versao = FeaturesCompose.versao_analise_previa()
+    try:
+        CacheAnaliseSemantica.registrar(
+            mensagem=normalizar_mensagem(texto),
+            query_vec=query_vec,
+            versao=versao,
+            intent_detectado=resultado.intent_types,
+        )
+        if next(_registros) % _INTERVALO_PODA == 0:
+            CacheAnaliseSemantica.podar(
+                versao=versao, max_entradas=SERVICEHUB.LLM_CACHE_MAX_ENTRIES
+            )
+    except Exception as e:
+        logger.warning(f"Falha ao registrar no cache semântico: {e}")
+
+
+def verificar_falso_acerto(
+    entrada_id: int, texto: str, distancia: float
+) -> None:
+    """Compara um acerto do cache com uma nova análise do LLM.
+
+    Executada em segundo plano (Django-Q) para uma amostra dos acertos,
+    sempre com uma nova chamada ao LLM. Um acerto é considerado falso
+    quando os tipos de intenção divergem.
+
+    Args:
+        entrada_id: ID da entrada do cache reutilizada
+        texto: Conteúdo da mensagem que usou a entrada
+        distancia: Distância de cosseno entre a mensagem e a entrada
+    """
+    try:
+        entrada = CacheAnaliseSemantica.objects.get(id=entrada_id)
+        # Sem cache de respostas nem single-flight: um veredito novo do LLM
+        resultado = FeaturesCompose.analise_previa_mensagem(
+            historico_atendimento={}, context=texto, usar_cache=False
+        )
+        tipos_cache = _tipos(entrada.intent_detectado)
+        tipos_llm = _tipos(resultado.intent_types)
+        if tipos_cache != tipos_llm:
+            _incrementar_metrica("falsos_acertos")
+            logger.warning(
+                f"Cache semântico: falso acerto (distância {distancia:.4f}) "
+                f"'{texto}' ~ '{entrada.mensagem}': "
+                f"{sorted(tipos_cache)} != {sorted(tipos_llm)}"
+            )
+    except CacheAnaliseSemantica.DoesNotExist:
+        logger.debug(f"Entrada {entrada_id} do cache semântico removida")
+    except Exception as e:
+        logger.error(f"Erro ao verificar acerto do cache semântico: {e}")
+
+
+def estatisticas_cache_semantico() -> dict[str, Any]:
+    """Retorna as métricas do cache semântico.
+
+    Returns:
+        Dicionário com contadores, ``hit_rate`` e ``false_hit_rate``
+        (falsos acertos sobre acertos amostrados)
+    """
+    valores = cache.get_many([f"{_PREFIXO_METRICAS}:{m}" for m in _METRICAS])
+    stats: dict[str, Any] = {
+        m: int(valores.get(f"{_PREFIXO_METRICAS}:{m}", 0)) for m in _METRICAS
+    }
+    consultas = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / consultas if consultas else 0.0
+    stats["false_hit_rate"] = (
+        stats["falsos_acertos"] / stats["amostras"]
+        if stats["amostras"]
+        else 0.0
+    )
+    return stats
+
+
+def _tipos(itens: list[dict[str, Any]]) -> set[str]:
+    """Extrai os tipos de uma lista de dicionários ``{tipo: valor}``."""
+    return {str(tipo) for item in itens for tipo in item}
+
+
+def _incrementar_metrica(nome: str) -> None:
+    """Incrementa um contador de métrica no cache do Django."""
+    chave = f"{_PREFIXO_METRICAS}:{nome}"
+    try:
+        if not cache.add(chave, 1, timeout=None):
+            cache.incr(chave)
+    except Exception as e:
+        logger.debug(f"Falha ao registrar métrica {nome}: {e}")
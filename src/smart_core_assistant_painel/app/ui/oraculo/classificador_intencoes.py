@@ -0,0 +1,272 @@
+"""Pré-classificação de intenções antes da análise prévia pelo LLM.
+
+Os centroides de cada intenção de ``VALID_INTENT_TYPES`` são construídos a
+partir das descrições da configuração e de mensagens já rotuladas pelo LLM
+(``Mensagem.intent_detectado`` com uma única intenção). A mensagem recebida
+é comparada aos centroides pelo embedding já calculado para a busca de
+documentos; classificações confiáveis dispensam o LLM e as demais seguem o
+fluxo normal. Como o classificador não extrai entidades, só são elegíveis
+mensagens de atendimentos sem histórico e apenas quando todos os tipos de
+entidade configurados são cobertos pela extração por regras.
+
+A construção roda em segundo plano na primeira consulta e é refeita quando
+a configuração de intenções ou de embeddings muda, ou a cada
+``_VALIDADE_SEGUNDOS``, para incorporar novos exemplos. Enquanto isso, as
+mensagens seguem para o LLM.
+
+A pré-classificação é habilitada com
+``SERVICEHUB.INTENT_CLASSIFIER_MIN_SIMILARITY`` maior que 0.
+"""
+
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from typing import Any, Optional
+
+from django.db import connections
+from loguru import logger
+
+from smart_core_assistant_painel.app.ui.oraculo.models import (
+    Mensagem,
+    TipoRemetente,
+)
+from smart_core_assistant_painel.modules.ai_engine import (
+    APMTuple,
+    ClassificadorCentroides,
+    FeaturesCompose,
+    descricoes_intencoes,
+    tipos_entidade_livres,
+)
+from smart_core_assistant_painel.modules.ai_engine.utils.response_cache import (
+    normalizar_mensagem,
+)
+from smart_core_assistant_painel.modules.services import SERVICEHUB
+
+_VALIDADE_SEGUNDOS: float = 3600.0
+
+
+def classificador_habilitado() -> bool:
+    """Indica se a pré-classificação de intenções está habilitada."""
+    return SERVICEHUB.INTENT_CLASSIFIER_MIN_SIMILARITY > 0
+
+
+def mensagem_classificavel(
+    texto: str, historico_atendimento: Mapping[str, Any]
+) -> bool:
+    """Verifica se a mensagem pode ser pré-classificada.
+
+    Mensagens com histórico dependem do contexto da conversa, e tipos de
+    entidade de texto livre só são extraídos pelo LLM; nesses casos a
+    mensagem segue para a análise prévia.
+
+    Args:
+        texto: Conteúdo da mensagem
+        historico_atendimento: Histórico carregado do atendimento
+
+    Returns:
+        True se a mensagem é curta, o atendimento não tem histórico e as
+        entidades configuradas são cobertas pela extração por regras
+    """
+    normalizado = normalizar_mensagem(texto)
+    return (
+        bool(normalizado)
+        and len(normalizado) <= SERVICEHUB.INTENT_CLASSIFIER_MAX_CHARS
+        and not historico_atendimento.get("conteudo_mensagens")
+        and not tipos_entidade_livres(SERVICEHUB.VALID_ENTITY_TYPES)
+    )
+
+
+def mensagens_rotuladas(
+    intencoes: set[str], limite: Optional[int] = None
+) -> Iterator[tuple[int, str, str]]:
+    """Percorre as mensagens de contatos rotuladas com uma única intenção.
+
+    As mais recentes vêm primeiro. Mensagens com várias intenções são
+    ignoradas, pois o rótulo não se aplica ao texto inteiro.
+
+    Args:
+        intencoes: Intenções válidas (as demais são ignoradas)
+        limite: Quantidade máxima de mensagens consultadas
+
+    Yields:
+        Tuplas ``(id, conteúdo, intenção)``
+    """
+    consulta = (
+        Mensagem.objects.filter(remetente=TipoRemetente.CONTATO)
+        .exclude(intent_detectado=[])
+        .order_by("-timestamp", "-id")
+        .values_list("id", "conteudo", "intent_detectado")
+    )
+    if limite is not None:
+        consulta = consulta[:limite]
+    for mensagem_id, conteudo, intent_detectado in consulta.iterator(
+        chunk_size=2000
+    ):
+        tipos = {str(tipo) for item in intent_detectado for tipo in item}
+        if len(tipos) == 1 and conteudo and conteudo.strip():
+            intencao = tipos.pop()
+            if intencao in intencoes:
+                yield mensagem_id, conteudo, intencao
+
+
+def construir_classificador(
+    exemplos_por_intencao: Optional[int] = None,
+) -> Optional[ClassificadorCentroides]:
+    """Constrói o classificador com a configuração e o histórico atuais.
+
+    Args:
+        exemplos_por_intencao: Exemplos do histórico por intenção. Se
+            omitido, usa ``SERVICEHUB.INTENT_CLASSIFIER_EXAMPLES``
+
+    Returns:
+        O classificador ou None se não houver intenções configuradas
+    """
+    descricoes = descricoes_intencoes(SERVICEHUB.VALID_INTENT_TYPES)
+    if not descricoes:
+        return None
+    limite = (
+        SERVICEHUB.INTENT_CLASSIFIER_EXAMPLES
+        if exemplos_por_intencao is None
+        else exemplos_por_intencao
+    )
+    exemplos: dict[str, list[str]] = {}
+    if limite > 0:
+        # Consulta limitada para não percorrer todo o histórico
+        for _, conteudo, intencao in mensagens_rotuladas(
+            set(descricoes), limite=limite * len(descricoes) * 10
+        ):
+            lista = exemplos.setdefault(intencao, [])
+            if len(lista) < limite:
+                lista.append(conteudo)
+    return ClassificadorCentroides.construir(
+        descricoes, FeaturesCompose.generate_embeddings_lote, exemplos
+    )
+
+
+class _ClassificadorCompartilhado:
+    """Classificador do processo, reconstruído em segundo plano."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._classificador: Optional[ClassificadorCentroides] = None
+        self._assinatura: tuple[object, ...] = ()
+        self._construido_em = 0.0
+        self._construindo = False
+
+    @staticmethod
+    def _assinatura_atual() -> tuple[object, ...]:
+        return (
+            SERVICEHUB.VALID_INTENT_TYPES,
+            SERVICEHUB.EMBEDDINGS_CLASS,
+            SERVICEHUB.EMBEDDINGS_MODEL,
+            SERVICEHUB.INTENT_CLASSIFIER_EXAMPLES,
+        )
+
+    def obter(self) -> Optional[ClassificadorCentroides]:
+        """Retorna o classificador da configuração atual, se já construído.
+
+        Agenda a reconstrução quando a configuração muda ou o classificador
+        expira. Um classificador expirado continua sendo usado até lá.
+        """
+        assinatura = self._assinatura_atual()
+        with self._lock:
+            atual = assinatura == self._assinatura
+            expirado = (
+                time.monotonic() - self._construido_em > _VALIDADE_SEGUNDOS
+            )
+            if (not atual or expirado) and not self._construindo:
+                self._construindo = True
+                threading.Thread(
+                    target=self._construir_em_segundo_plano,
+                    args=(assinatura,),
+                    name="classificador-intencoes",
+                    daemon=True,
+                ).start()
+            return self._classificador if atual else None
+
+    def atualizar(self) -> Optional[ClassificadorCentroides]:
+        """Reconstrói o classificador na thread atual."""
+        assinatura = self._assinatura_atual()
+        classificador = construir_classificador()
+        with self._lock:
+            self._classificador = classificador
+            self._assinatura = assinatura
+            self._construido_em = time.monotonic()
+        return classificador
+
+    def limpar(self) -> None:
+        """Descarta o classificador construído."""
+        with self._lock:
+            self._classificador = None
+            self._assinatura = ()
+            self._construido_em = 0.0
+
+    def _construir_em_segundo_plano(
+        self, assinatura: tuple[object, ...]
+    ) -> None:
+        try:
+            inicio = time.perf_counter()
+            classificador = self.atualizar()
+            if classificador is not None:
+                logger.info(
+                    f"Classificador de intenções construído: "
+                    f"{len(classificador)} intenções em "
+                    f"{time.perf_counter() - inicio:.2f}s"
+                )
+        except Exception as e:
+            logger.warning(f"Falha ao construir classificador: {e}")
+            with self._lock:
+                # Evita nova tentativa a cada mensagem
+                self._classificador = None
+                self._assinatura = assinatura
+                self._construido_em = time.monotonic()
+        finally:
+            with self._lock:
+                self._construindo = False
+            connections.close_all()
+
+
+CLASSIFICADOR_INTENCOES = _ClassificadorCompartilhado()
+
+
+def classificar_intencao(
+    texto: str,
+    query_vec: Optional[list[float]],
+    historico_atendimento: Mapping[str, Any],
+) -> Optional[APMTuple]:
+    """Classifica a mensagem pelo centroide mais próximo, se confiável.
+
+    Args:
+        texto: Conteúdo da mensagem
+        query_vec: Embedding da mensagem (None desabilita a classificação)
+        historico_atendimento: Histórico carregado do atendimento
+
+    Returns:
+        APMTuple com a intenção (sem entidades) ou None quando a
+        classificação não é confiável
+    """
+    if (
+        query_vec is None
+        or not classificador_habilitado()
+        or not mensagem_classificavel(texto, historico_atendimento)
+    ):
+        return None
+    classificador = CLASSIFICADOR_INTENCOES.obter()
+    if classificador is None:
+        return None
+
+    classificacao = classificador.classificar(query_vec)
+    if (
+        classificacao.similaridade
+        < SERVICEHUB.INTENT_CLASSIFIER_MIN_SIMILARITY
+        or classificacao.margem < SERVICEHUB.INTENT_CLASSIFIER_MIN_MARGIN
+    ):
+        return None
+    logger.debug(
+        f"Intenção pré-classificada: {classificacao.intencao} "
+        f"(similaridade {classificacao.similaridade:.3f}, "
+        f"margem {classificacao.margem:.3f})"
+    )
+    return APMTuple(
+        intent_types=[{classificacao.intencao: texto}], entity_types=[]
+    )
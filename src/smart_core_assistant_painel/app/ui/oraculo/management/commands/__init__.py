@@ -0,0 +1 @@
+"""Comandos de gerenciamento do app Oráculo."""
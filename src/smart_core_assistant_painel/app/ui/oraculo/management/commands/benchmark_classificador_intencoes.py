@@ -0,0 +1,172 @@
+"""Benchmark offline da pré-classificação de intenções por centroides.
+
+Usa as mensagens já rotuladas pelo LLM (``Mensagem.intent_detectado`` com
+uma única intenção) como referência: uma fração fixa delas (escolhida pelo
+ID) é separada para teste e o restante fornece os exemplos dos centroides,
+junto com as descrições de ``VALID_INTENT_TYPES``. Para cada limiar de
+similaridade são exibidas a cobertura (mensagens que dispensariam o LLM)
+e a acurácia entre elas, além da latência da classificação.
+
+Com ``EMBEDDINGS_CLASS=HashEmbeddings`` o benchmark roda sem rede.
+
+Uso:
+    python manage.py benchmark_classificador_intencoes
+    python manage.py benchmark_classificador_intencoes --limiares 0.6 0.8
+"""
+
+import statistics
+import time
+from typing import Any
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandParser
+
+from smart_core_assistant_painel.app.ui.oraculo.classificador_intencoes import (
+    mensagens_rotuladas,
+)
+from smart_core_assistant_painel.modules.ai_engine import (
+    ClassificadorCentroides,
+    FeaturesCompose,
+    descricoes_intencoes,
+)
+from smart_core_assistant_painel.modules.services import SERVICEHUB
+
+
+class Command(BaseCommand):
+    """Mede acurácia, cobertura e latência da pré-classificação."""
+
+    help = (
+        "Avalia a pré-classificação de intenções por centroides com as "
+        "mensagens já rotuladas pelo LLM."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--limiares",
+            nargs="+",
+            type=float,
+            default=[0.5, 0.6, 0.7, 0.8, 0.9],
+            help="Similaridades mínimas avaliadas (padrão: 0.5 a 0.9)",
+        )
+        parser.add_argument(
+            "--margem",
+            type=float,
+            default=None,
+            help="Margem mínima (padrão: INTENT_CLASSIFIER_MIN_MARGIN)",
+        )
+        parser.add_argument(
+            "--exemplos",
+            type=int,
+            default=None,
+            help=(
+                "Exemplos por intenção nos centroides "
+                "(padrão: INTENT_CLASSIFIER_EXAMPLES; 0 usa só descrições)"
+            ),
+        )
+        parser.add_argument(
+            "--mensagens",
+            type=int,
+            default=5000,
+            help="Máximo de mensagens rotuladas lidas (padrão: 5000)",
+        )
+        parser.add_argument(
+            "--teste",
+            type=int,
+            default=5,
+            help="Uma a cada N mensagens vai para o teste (padrão: 5)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        descricoes = descricoes_intencoes(SERVICEHUB.VALID_INTENT_TYPES)
+        if not descricoes:
+            self.stdout.write("VALID_INTENT_TYPES sem intenções.")
+            return
+        limite_exemplos: int = (
+            SERVICEHUB.INTENT_CLASSIFIER_EXAMPLES
+            if options["exemplos"] is None
+            else options["exemplos"]
+        )
+        margem: float = (
+            SERVICEHUB.INTENT_CLASSIFIER_MIN_MARGIN
+            if options["margem"] is None
+            else options["margem"]
+        )
+        divisor = max(2, options["teste"])
+
+        treino: dict[str, list[str]] = {}
+        teste: list[tuple[str, str]] = []
+        for mensagem_id, conteudo, intencao in mensagens_rotuladas(
+            set(descricoes), limite=options["mensagens"]
+        ):
+            if mensagem_id % divisor == 0:
+                teste.append((conteudo, intencao))
+            else:
+                lista = treino.setdefault(intencao, [])
+                if len(lista) < limite_exemplos:
+                    lista.append(conteudo)
+        if not teste:
+            self.stdout.write("Nenhuma mensagem rotulada para teste.")
+            return
+
+        inicio = time.perf_counter()
+        classificador = ClassificadorCentroides.construir(
+            descricoes, FeaturesCompose.generate_embeddings_lote, treino
+        )
+        construcao = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        vetores = np.asarray(
+            FeaturesCompose.generate_embeddings_lote(
+                [conteudo for conteudo, _ in teste]
+            ),
+            dtype=np.float32,
+        )
+        embeddings = time.perf_counter() - inicio
+
+        tempos: list[float] = []
+        for vetor in vetores:
+            inicio = time.perf_counter()
+            classificador.classificar(vetor)
+            tempos.append((time.perf_counter() - inicio) * 1_000_000)
+        inicio = time.perf_counter()
+        classificacoes = classificador.classificar_lote(vetores)
+        lote = (time.perf_counter() - inicio) * 1_000_000 / len(teste)
+
+        exemplos = sum(len(lista) for lista in treino.values())
+        self.stdout.write(
+            f"{len(descricoes)} intenções, {exemplos} exemplos, "
+            f"{len(teste)} mensagens de teste"
+        )
+        self.stdout.write(
+            f"Construção: {construcao:.2f}s; embeddings do teste: "
+            f"{embeddings * 1000 / len(teste):.1f} ms/mensagem"
+        )
+        tempos.sort()
+        self.stdout.write(
+            f"Classificação: mediana {statistics.median(tempos):.1f} µs, "
+            f"p95 {tempos[int(len(tempos) * 0.95)]:.1f} µs; "
+            f"em lote {lote:.2f} µs/mensagem"
+        )
+        acertos = [
+            c.intencao == intencao
+            for c, (_, intencao) in zip(classificacoes, teste)
+        ]
+        self.stdout.write(
+            f"Acurácia sem limiar: {sum(acertos) / len(acertos):.1%}"
+        )
+
+        self.stdout.write(
+            f"{'similaridade':>12} {'cobertura':>10} {'acurácia':>9}"
+        )
+        for limiar in sorted(options["limiares"]):
+            cobertos = [
+                acerto
+                for c, acerto in zip(classificacoes, acertos)
+                if c.similaridade >= limiar and c.margem >= margem
+            ]
+            acuracia = (
+                f"{sum(cobertos) / len(cobertos):.1%}" if cobertos else "-"
+            )
+            self.stdout.write(
+                f"{limiar:>12.2f} {len(cobertos) / len(teste):>10.1%} "
+                f"{acuracia:>9}"
+            )
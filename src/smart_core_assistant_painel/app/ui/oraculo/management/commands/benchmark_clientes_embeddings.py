@@ -0,0 +1,102 @@
+"""Benchmark da reutilização do cliente de embeddings.
+
+Compara o custo por chamada de ``generate_embeddings`` criando um novo
+cliente de embeddings a cada chamada (comportamento anterior) com o cliente
+compartilhado de ``EMBEDDINGS_CLIENT_REGISTRY``. A obtenção do cliente e a
+requisição de embeddings são medidas separadamente.
+
+Usa a configuração atual (``EMBEDDINGS_CLASS``/``EMBEDDINGS_MODEL``); com
+``EMBEDDINGS_CLASS=HashEmbeddings`` o benchmark roda sem rede.
+
+Uso:
+    python manage.py benchmark_clientes_embeddings --chamadas 50
+    python manage.py benchmark_clientes_embeddings --sem-requisicao
+"""
+
+import statistics
+import time
+from typing import Any, Callable
+
+from django.core.management.base import BaseCommand, CommandParser
+from langchain_core.embeddings.embeddings import Embeddings
+
+from smart_core_assistant_painel.modules.ai_engine import (
+    EMBEDDINGS_CLIENT_REGISTRY,
+)
+from smart_core_assistant_painel.modules.ai_engine.features.generate_embeddings.datasource.generate_embeddings_langchain_datasource import (
+    GenerateEmbeddingsLangchainDatasource,
+)
+from smart_core_assistant_painel.modules.services import SERVICEHUB
+
+
+class Command(BaseCommand):
+    """Mede o custo por chamada com e sem reutilização do cliente."""
+
+    help = (
+        "Compara o custo por chamada de embeddings criando um cliente a "
+        "cada chamada e reutilizando o cliente compartilhado."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--chamadas",
+            type=int,
+            default=20,
+            help="Chamadas medidas em cada modo (padrão: 20)",
+        )
+        parser.add_argument(
+            "--texto",
+            default="Qual o horário de atendimento da loja?",
+            help="Texto enviado para gerar embeddings",
+        )
+        parser.add_argument(
+            "--sem-requisicao",
+            action="store_true",
+            help="Mede apenas a obtenção do cliente, sem gerar embeddings",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        classe = SERVICEHUB.EMBEDDINGS_CLASS
+        modelo = SERVICEHUB.EMBEDDINGS_MODEL
+        chamadas = max(1, options["chamadas"])
+        datasource = GenerateEmbeddingsLangchainDatasource()
+        self.stdout.write(
+            f"{classe} ({modelo or 'modelo padrão'}), {chamadas} chamadas"
+        )
+
+        EMBEDDINGS_CLIENT_REGISTRY.clear()
+        inicio = time.perf_counter()
+        datasource._create_embeddings_instance()
+        self.stdout.write(
+            f"Aquecimento: {(time.perf_counter() - inicio) * 1000:.1f} ms"
+        )
+
+        modos: list[tuple[str, Callable[[], Embeddings]]] = [
+            (
+                "novo cliente",
+                lambda: EMBEDDINGS_CLIENT_REGISTRY.criar(classe, modelo),
+            ),
+            ("compartilhado", datasource._create_embeddings_instance),
+        ]
+        self.stdout.write(
+            f"{'modo':>14} {'cliente (ms)':>13} {'requisição (ms)':>16} "
+            f"{'total (ms)':>11}"
+        )
+        for nome, obter in modos:
+            clientes: list[float] = []
+            requisicoes: list[float] = []
+            for _ in range(chamadas):
+                inicio = time.perf_counter()
+                cliente = obter()
+                meio = time.perf_counter()
+                if not options["sem_requisicao"]:
+                    cliente.embed_query(options["texto"])
+                fim = time.perf_counter()
+                clientes.append((meio - inicio) * 1000)
+                requisicoes.append((fim - meio) * 1000)
+            cliente_ms = statistics.median(clientes)
+            requisicao_ms = statistics.median(requisicoes)
+            self.stdout.write(
+                f"{nome:>14} {cliente_ms:>13.3f} {requisicao_ms:>16.3f} "
+                f"{cliente_ms + requisicao_ms:>11.3f}"
+            )
@@ -0,0 +1,184 @@
+"""Benchmark do carregamento do histórico de mensagens do atendimento.
+
+Compara o carregador legado (objetos completos do ORM, uma consulta para
+mensagens e outra para atendimentos anteriores) com o carregador colunar
+de ``Atendimento.carregar_historico_mensagens`` (consulta única com
+``values_list``). Os dados são criados dentro de uma transação que é
+desfeita ao final, sem deixar registros no banco.
+
+Uso:
+    python manage.py benchmark_historico_mensagens --tamanhos 10 100 1000
+"""
+
+import statistics
+import time
+from datetime import timedelta
+from typing import Any, Callable
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from smart_core_assistant_painel.app.ui.oraculo.models import (
+    Atendimento,
+    Contato,
+    Mensagem,
+    StatusAtendimento,
+)
+
+
+class _Rollback(Exception):
+    """Sinaliza o descarte da transação de benchmark."""
+
+
+def _carregar_historico_legado(
+    atendimento: Atendimento, excluir_mensagem_id: int | None = None
+) -> dict[str, Any]:
+    """Reproduz o carregador baseado em objetos completos do ORM.
+
+    A deduplicação usa tuplas ``(tipo, valor)`` para que a linha de base
+    seja executável (a versão original adicionava dicts a um ``set``).
+    """
+    mensagens_query = atendimento.mensagens.all().order_by(  # type: ignore[attr-defined]
+        "timestamp"
+    )
+    if excluir_mensagem_id:
+        mensagens_query = mensagens_query.exclude(id=excluir_mensagem_id)
+
+    conteudo_mensagens: list[str] = []
+    intents: dict[tuple[str, str], None] = {}
+    entidades: dict[tuple[str, str], None] = {}
+    for mensagem in list(mensagens_query):
+        if mensagem.conteudo:
+            conteudo_mensagens.append(mensagem.conteudo)
+        for intent_dict in mensagem.intent_detectado or []:
+            for tipo, valor in intent_dict.items():
+                intents[(tipo, str(valor))] = None
+        for entidade_dict in mensagem.entidades_extraidas or []:
+            for tipo, valor in entidade_dict.items():
+                entidades[(tipo, str(valor))] = None
+
+    historico_atendimentos: list[str] = []
+    anteriores = (
+        Atendimento.objects.filter(contato=atendimento.contato)
+        .exclude(id=atendimento.id)
+        .filter(data_fim__isnull=False)
+        .order_by("-data_fim")
+    )
+    for anterior in anteriores:
+        if anterior.assunto and anterior.data_fim is not None:
+            historico_atendimentos.append(
+                f"{anterior.data_fim.strftime('%d/%m/%Y')} - "
+                f"assunto tratado: {anterior.assunto}"
+            )
+
+    return {
+        "conteudo_mensagens": conteudo_mensagens,
+        "intents_detectados": [{t: v} for t, v in intents],
+        "entidades_extraidas": [{t: v} for t, v in entidades],
+        "historico_atendimentos": historico_atendimentos,
+    }
+
+
+class Command(BaseCommand):
+    """Mede o tempo de carregamento do histórico de mensagens."""
+
+    help = (
+        "Compara o carregador legado e o carregador colunar do histórico "
+        "de mensagens para diferentes tamanhos de atendimento."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--tamanhos",
+            nargs="+",
+            type=int,
+            default=[10, 100, 1000],
+            help="Mensagens por atendimento (padrão: 10 100 1000)",
+        )
+        parser.add_argument(
+            "--repeticoes",
+            type=int,
+            default=20,
+            help="Número de execuções por medição (padrão: 20)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        tamanhos: list[int] = options["tamanhos"]
+        repeticoes: int = max(1, options["repeticoes"])
+
+        self.stdout.write(
+            f"{'mensagens':>10} {'carregador':>10} {'mediana ms':>11} "
+            f"{'p95 ms':>9} {'consultas':>10}"
+        )
+        try:
+            with transaction.atomic():
+                for tamanho in tamanhos:
+                    atendimento = self._criar_dados(tamanho)
+                    carregadores: dict[str, Callable[[], Any]] = {
+                        "legado": lambda: _carregar_historico_legado(
+                            atendimento
+                        ),
+                        "colunar": atendimento.carregar_historico_mensagens,
+                    }
+                    for nome, carregador in carregadores.items():
+                        self._medir(nome, tamanho, carregador, repeticoes)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        self.stdout.write(self.style.SUCCESS("Benchmark concluído."))
+
+    def _criar_dados(self, tamanho: int) -> Atendimento:
+        """Cria contato, atendimentos anteriores e ``tamanho`` mensagens."""
+        contato = Contato.objects.create(
+            telefone=f"55119{tamanho:08d}", nome_contato="Benchmark"
+        )
+        agora = timezone.now()
+        Atendimento.objects.bulk_create(
+            Atendimento(
+                contato=contato,
+                status=StatusAtendimento.RESOLVIDO,
+                assunto=f"Assunto {i}",
+                data_fim=agora - timedelta(days=i + 1),
+            )
+            for i in range(5)
+        )
+        atendimento = Atendimento.objects.create(
+            contato=contato, status=StatusAtendimento.EM_ANDAMENTO
+        )
+        Mensagem.objects.bulk_create(
+            Mensagem(
+                atendimento=atendimento,
+                conteudo=f"Mensagem de teste número {i}",
+                intent_detectado=[{"pergunta": f"tema {i % 7}"}],
+                entidades_extraidas=[{"produto": f"produto {i % 5}"}],
+            )
+            for i in range(tamanho)
+        )
+        return atendimento
+
+    def _medir(
+        self,
+        nome: str,
+        tamanho: int,
+        carregador: Callable[[], Any],
+        repeticoes: int,
+    ) -> None:
+        """Executa o carregador e imprime mediana, p95 e nº de consultas."""
+        with CaptureQueriesContext(connection) as consultas:
+            carregador()
+
+        tempos: list[float] = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            carregador()
+            tempos.append((time.perf_counter() - inicio) * 1000)
+
+        tempos.sort()
+        p95 = tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))]
+        self.stdout.write(
+            f"{tamanho:>10} {nome:>10} {statistics.median(tempos):>11.3f} "
+            f"{p95:>9.3f} {len(consultas):>10}"
+        )
@@ -0,0 +1,170 @@
+"""Benchmark da busca de documentos com índices quantizados.
+
+Compara a busca exata (float32) com a busca em duas etapas de
+``Documento.consulta_similares``: candidatos no índice HNSW em meia
+precisão (``halfvec``), binário (``binary``) ou do prefixo do embedding
+(``prefix``), reordenados pela distância exata. Para cada quantização e
+número de candidatos são exibidos o recall@k em relação à busca exata e a
+latência; ao final, o tamanho dos índices e da coluna ``embedding``.
+
+As consultas são embeddings de documentos já vetorizados, sorteados a cada
+execução. Requer PostgreSQL com pgvector 0.7 ou superior.
+
+Uso:
+    python manage.py benchmark_quantizacao_embeddings
+    python manage.py benchmark_quantizacao_embeddings --candidatos 10 40
+"""
+
+import statistics
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection
+
+from smart_core_assistant_painel.app.ui.oraculo.models_documento import (
+    DIMENSOES,
+    DIMENSOES_PREFIXO,
+    Documento,
+)
+
+# Índices criados pelas migrações 0009 e 0010
+_INDICES = {
+    "halfvec": "documento_embedding_halfvec_idx",
+    "binary": "documento_embedding_bit_idx",
+    "prefix": "documento_embedding_prefixo_idx",
+}
+
+# Bytes por vetor no armazenamento (cabeçalho de 8 bytes + dimensões)
+_BYTES_POR_VETOR = {
+    "float32": 8 + 4 * DIMENSOES,
+    "halfvec": 8 + 2 * DIMENSOES,
+    "binary": 8 + DIMENSOES // 8,
+    "prefix": 8 + 4 * DIMENSOES_PREFIXO,
+}
+
+
+class Command(BaseCommand):
+    """Mede recall, latência e ocupação da busca quantizada."""
+
+    help = (
+        "Compara a busca exata de documentos com a busca em índices "
+        "halfvec, binário e de prefixo seguida de reordenação exata."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--consultas",
+            type=int,
+            default=50,
+            help="Quantidade de consultas (padrão: 50)",
+        )
+        parser.add_argument(
+            "--top-k",
+            type=int,
+            default=5,
+            help="Documentos retornados por consulta (padrão: 5)",
+        )
+        parser.add_argument(
+            "--candidatos",
+            nargs="+",
+            type=int,
+            default=[20, 40, 80],
+            help="Candidatos reordenados avaliados (padrão: 20 40 80)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if connection.vendor != "postgresql":
+            self.stdout.write("O benchmark requer PostgreSQL com pgvector.")
+            return
+
+        top_k: int = options["top_k"]
+        consultas = [
+            list(vetor)
+            for vetor in Documento.objects.filter(
+                embedding__isnull=False,
+                treinamento__treinamento_finalizado=True,
+            )
+            .order_by("?")
+            .values_list("embedding", flat=True)[: options["consultas"]]
+        ]
+        if not consultas:
+            self.stdout.write("Nenhum documento vetorizado.")
+            return
+
+        exatos, tempos = self._executar(consultas, top_k, "", 0)
+        self.stdout.write(
+            f"{len(consultas)} consultas, top {top_k}; busca exata: "
+            f"mediana {statistics.median(tempos):.1f} ms"
+        )
+        self.stdout.write(
+            f"{'quantização':<12} {'candidatos':>10} {'recall':>7} "
+            f"{'mediana ms':>11} {'p95 ms':>8}"
+        )
+        for quantizacao in _INDICES:
+            for candidatos in sorted(options["candidatos"]):
+                resultados, tempos = self._executar(
+                    consultas, top_k, quantizacao, candidatos
+                )
+                recall = statistics.mean(
+                    len(set(exato) & set(resultado)) / len(exato)
+                    for exato, resultado in zip(exatos, resultados)
+                    if exato
+                )
+                tempos.sort()
+                self.stdout.write(
+                    f"{quantizacao:<12} {candidatos:>10} {recall:>7.1%} "
+                    f"{statistics.median(tempos):>11.1f} "
+                    f"{tempos[int(len(tempos) * 0.95)]:>8.1f}"
+                )
+
+        self._exibir_ocupacao()
+
+    @staticmethod
+    def _executar(
+        consultas: list[list[float]],
+        top_k: int,
+        quantizacao: str,
+        candidatos: int,
+    ) -> tuple[list[list[int]], list[float]]:
+        """Executa as consultas e retorna os IDs e os tempos (ms)."""
+        resultados: list[list[int]] = []
+        tempos: list[float] = []
+        for vetor in consultas:
+            inicio = time.perf_counter()
+            documentos = Documento.buscar_similares(
+                vetor, top_k, quantizacao, candidatos
+            )
+            tempos.append((time.perf_counter() - inicio) * 1000)
+            resultados.append([documento.pk for documento in documentos])
+        return resultados, tempos
+
+    def _exibir_ocupacao(self) -> None:
+        """Exibe o tamanho dos índices e da coluna de embeddings."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(embedding), "
+                "coalesce(sum(pg_column_size(embedding)), 0) "
+                "FROM oraculo_documento"
+            )
+            vetores, bytes_coluna = cursor.fetchone()
+            self.stdout.write(
+                f"Coluna embedding: {vetores} vetores, "
+                f"{bytes_coluna / 1_048_576:.2f} MB"
+            )
+            for formato, tamanho in _BYTES_POR_VETOR.items():
+                self.stdout.write(
+                    f"  {formato:<8} {tamanho:>5} bytes/vetor "
+                    f"({vetores * tamanho / 1_048_576:.2f} MB)"
+                )
+            for quantizacao, indice in _INDICES.items():
+                cursor.execute(
+                    "SELECT pg_relation_size(to_regclass(%s))", [indice]
+                )
+                (tamanho_indice,) = cursor.fetchone()
+                ocupacao = (
+                    "não criado"
+                    if tamanho_indice is None
+                    else f"{tamanho_indice / 1_048_576:.2f} MB"
+                )
+                self.stdout.write(f"Índice {quantizacao}: {ocupacao}")
@@ -0,0 +1,67 @@
+"""Preenche ``Documento.embedding_prefixo`` dos documentos já vetorizados.
+
+Documentos vetorizados antes da coluna existir ficam fora da primeira
+etapa da busca com ``VECTOR_SEARCH_QUANTIZATION=prefix``. O prefixo é
+calculado a partir do embedding salvo, sem chamar o provedor, percorrendo
+os documentos em lotes pela chave primária; o comando pode ser
+interrompido e executado novamente.
+
+Uso:
+    python manage.py preencher_embedding_prefixo
+    python manage.py preencher_embedding_prefixo --lote 500
+"""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from smart_core_assistant_painel.app.ui.oraculo.models_documento import (
+    Documento,
+    truncar_prefixo,
+)
+
+
+class Command(BaseCommand):
+    """Calcula o prefixo do embedding dos documentos sem prefixo."""
+
+    help = (
+        "Preenche o prefixo do embedding dos documentos já vetorizados "
+        "(busca em duas etapas)."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=1000,
+            help="Documentos atualizados por lote (padrão: 1000)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        tamanho_lote = max(1, options["lote"])
+        ultimo_id = 0
+        preenchidos = 0
+        while True:
+            lote = list(
+                Documento.objects.filter(
+                    id__gt=ultimo_id,
+                    embedding__isnull=False,
+                    embedding_prefixo__isnull=True,
+                )
+                .order_by("id")
+                .only("id", "embedding")[:tamanho_lote]
+            )
+            if not lote:
+                break
+            for documento in lote:
+                documento.embedding_prefixo = truncar_prefixo(
+                    list(documento.embedding)
+                )
+            Documento.objects.bulk_update(lote, ["embedding_prefixo"])
+            preenchidos += len(lote)
+            ultimo_id = lote[-1].pk
+            self.stdout.write(
+                f"{preenchidos} documentos preenchidos (até o ID {ultimo_id})"
+            )
+
+        self.stdout.write(f"Prefixo preenchido em {preenchidos} documentos.")
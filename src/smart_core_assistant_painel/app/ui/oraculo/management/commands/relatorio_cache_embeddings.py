@@ -0,0 +1,66 @@
+"""Relatório do cache de embeddings endereçado pelo conteúdo.
+
+Exibe, por classe e modelo de embeddings, a quantidade de entradas, o
+espaço ocupado pelos vetores e a taxa de acerto. Cada entrada corresponde
+a um texto enviado ao provedor (uma falta) e cada reutilização soma um
+acerto, então a taxa é ``acertos / (acertos + entradas)``.
+
+Com ``--remover-sem-acesso DIAS``, remove antes as entradas não
+reutilizadas no período.
+
+Uso:
+    python manage.py relatorio_cache_embeddings
+    python manage.py relatorio_cache_embeddings --remover-sem-acesso 90
+"""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from smart_core_assistant_painel.app.ui.oraculo.models_cache_embeddings import (
+    CacheEmbedding,
+)
+
+
+class Command(BaseCommand):
+    """Exibe entradas, ocupação e taxa de acerto do cache de embeddings."""
+
+    help = (
+        "Resume o cache de embeddings por classe e modelo (entradas, "
+        "ocupação e taxa de acerto)."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--remover-sem-acesso",
+            type=int,
+            default=0,
+            metavar="DIAS",
+            help="Remove entradas sem reutilização há mais de DIAS dias",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["remover_sem_acesso"] > 0:
+            removidas = CacheEmbedding.remover_sem_acesso(
+                options["remover_sem_acesso"]
+            )
+            self.stdout.write(f"{removidas} entradas removidas.")
+
+        CacheEmbedding.gravar_acertos()
+        estatisticas = CacheEmbedding.estatisticas()
+        if not estatisticas:
+            self.stdout.write("Cache de embeddings vazio.")
+            return
+
+        self.stdout.write(
+            f"{'classe':<26} {'modelo':<28} {'entradas':>9} "
+            f"{'MB':>8} {'acertos':>9} {'taxa':>6}"
+        )
+        for item in estatisticas:
+            taxa = item.acertos / (item.acertos + item.entradas)
+            self.stdout.write(
+                f"{item.embeddings_class[:26]:<26} "
+                f"{(item.modelo or '-')[:28]:<28} {item.entradas:>9} "
+                f"{item.bytes / 1_048_576:>8.2f} {item.acertos:>9} "
+                f"{taxa:>6.1%}"
+            )
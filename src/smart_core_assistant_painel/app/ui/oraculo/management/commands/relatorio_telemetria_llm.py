@@ -0,0 +1,90 @@
+"""Relatório da telemetria das chamadas ao LLM e aos embeddings.
+
+Agrega as métricas gravadas pela telemetria do motor de IA por dia e
+funcionalidade: quantidade de chamadas e falhas, p50/p95 da latência,
+mediana do tempo até o primeiro token (streaming) e tokens consumidos.
+Por padrão lê a tabela ``MetricaLlm``; com ``--arquivo``, lê o JSONL
+gravado quando ``LLM_TELEMETRY_FILE`` está configurado.
+
+Uso:
+    python manage.py relatorio_telemetria_llm --dias 7
+    python manage.py relatorio_telemetria_llm --arquivo telemetria.jsonl
+"""
+
+from datetime import timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from smart_core_assistant_painel.app.ui.oraculo.models_telemetria import (
+    MetricaLlm,
+)
+from smart_core_assistant_painel.modules.ai_engine import (
+    TELEMETRIA,
+    resumir,
+)
+from smart_core_assistant_painel.modules.ai_engine.utils.telemetria import (
+    ler_arquivo,
+)
+
+
+class Command(BaseCommand):
+    """Exibe p50/p95 de latência e tokens por funcionalidade e dia."""
+
+    help = (
+        "Agrega a telemetria do LLM por dia e funcionalidade (chamadas, "
+        "falhas, p50/p95 de latência e tokens)."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--dias",
+            type=int,
+            default=7,
+            help="Quantidade de dias considerados (padrão: 7)",
+        )
+        parser.add_argument(
+            "--arquivo",
+            default="",
+            help="Lê os registros de um arquivo JSONL em vez do banco",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        desde = timezone.now() - timedelta(days=max(1, options["dias"]))
+        if options["arquivo"]:
+            registros = (
+                registro
+                for registro in ler_arquivo(options["arquivo"])
+                if registro.data >= desde
+            )
+        else:
+            # Inclui os registros ainda no buffer deste processo
+            TELEMETRIA.descarregar()
+            registros = MetricaLlm.registros(desde)
+
+        resumos = resumir(registros)
+        if not resumos:
+            self.stdout.write("Nenhuma métrica registrada no período.")
+            return
+
+        self.stdout.write(
+            f"{'dia':<10} {'funcionalidade':<28} {'chamadas':>8} "
+            f"{'falhas':>6} {'p50 ms':>8} {'p95 ms':>8} {'1º token':>8} "
+            f"{'tokens in':>10} {'tokens out':>10}"
+        )
+        for resumo in resumos:
+            primeiro_token = (
+                f"{resumo.primeiro_token_p50 * 1000:.0f}"
+                if resumo.primeiro_token_p50 is not None
+                else "-"
+            )
+            self.stdout.write(
+                f"{resumo.dia.isoformat():<10} "
+                f"{resumo.funcionalidade[:28]:<28} "
+                f"{resumo.chamadas:>8} {resumo.falhas:>6} "
+                f"{resumo.latencia_p50 * 1000:>8.0f} "
+                f"{resumo.latencia_p95 * 1000:>8.0f} "
+                f"{primeiro_token:>8} "
+                f"{resumo.tokens_prompt:>10} {resumo.tokens_resposta:>10}"
+            )
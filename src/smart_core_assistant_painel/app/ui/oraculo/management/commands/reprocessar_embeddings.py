@@ -0,0 +1,206 @@
+"""Reprocessa os embeddings dos documentos com um novo modelo.
+
+Os documentos são percorridos em lotes pela chave primária e os vetores do
+novo modelo são gravados em ``Documento.embedding_sombra``, enquanto a
+busca continua usando ``embedding``. Cada lote é gravado na mesma
+transação que o ponto de retomada (``ReprocessamentoEmbeddings``): após uma
+falha, basta executar o comando novamente. Ao final, documentos
+vetorizados depois do início (ou atrás do ponto de retomada) são
+completados.
+
+Com ``--trocar`` e cobertura de 100%, o reprocessamento é concluído e os
+embeddings do novo modelo substituem os anteriores em lotes
+(``ReprocessamentoEmbeddings.trocar``), sem interromper a busca. A partir
+da conclusão, os embeddings de consulta também passam a usar o novo
+modelo (``ReprocessamentoEmbeddings.aplicar_destino_busca``), sem
+depender de ``EMBEDDINGS_CLASS``/``EMBEDDINGS_MODEL``. Uma promoção
+interrompida é completada na próxima execução.
+
+Uso:
+    python manage.py reprocessar_embeddings --modelo bge-m3
+    python manage.py reprocessar_embeddings --modelo bge-m3 --trocar
+    python manage.py reprocessar_embeddings --reiniciar --modelo bge-m3
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.db import transaction
+
+from smart_core_assistant_painel.app.ui.oraculo.models_documento import (
+    DIMENSOES,
+    Documento,
+)
+from smart_core_assistant_painel.app.ui.oraculo.models_reprocessamento_embeddings import (
+    ReprocessamentoEmbeddings,
+)
+from smart_core_assistant_painel.modules.ai_engine import (
+    EMBEDDINGS_CLIENT_REGISTRY,
+)
+from smart_core_assistant_painel.modules.services import SERVICEHUB
+
+# Tentativas de troca enquanto novos documentos são vetorizados
+_TENTATIVAS_TROCA = 3
+
+
+class Command(BaseCommand):
+    """Gera os embeddings do novo modelo e troca a coluna da busca."""
+
+    help = (
+        "Reprocessa os embeddings dos documentos com um novo modelo em uma "
+        "coluna sombra, com retomada, e troca a coluna da busca."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--classe",
+            default=None,
+            help="Classe de embeddings de destino (padrão: EMBEDDINGS_CLASS)",
+        )
+        parser.add_argument(
+            "--modelo",
+            default=None,
+            help="Modelo de embeddings de destino (padrão: EMBEDDINGS_MODEL)",
+        )
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=None,
+            help="Documentos por lote (padrão: EMBEDDINGS_BATCH_SIZE)",
+        )
+        parser.add_argument(
+            "--trocar",
+            action="store_true",
+            help="Troca para os novos embeddings com cobertura de 100%%",
+        )
+        parser.add_argument(
+            "--reiniciar",
+            action="store_true",
+            help="Descarta o reprocessamento em andamento antes de iniciar",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        classe: str = options["classe"] or SERVICEHUB.EMBEDDINGS_CLASS
+        modelo: str = (
+            SERVICEHUB.EMBEDDINGS_MODEL
+            if options["modelo"] is None
+            else options["modelo"]
+        )
+        tamanho_lote = max(
+            1, options["lote"] or SERVICEHUB.EMBEDDINGS_BATCH_SIZE
+        )
+
+        restantes = ReprocessamentoEmbeddings.concluir_troca(tamanho_lote)
+        if restantes:
+            self.stdout.write(
+                f"Troca anterior concluída em {restantes} documentos."
+            )
+        if options["reiniciar"]:
+            descartados = ReprocessamentoEmbeddings.descartar()
+            self.stdout.write(
+                f"Reprocessamento anterior descartado ({descartados} "
+                "embeddings)."
+            )
+        try:
+            progresso = ReprocessamentoEmbeddings.retomar(classe, modelo)
+        except ValueError as e:
+            raise CommandError(f"{e}; use --reiniciar para descartá-lo.")
+        if progresso.ultimo_id:
+            self.stdout.write(
+                f"Retomando após o documento {progresso.ultimo_id} "
+                f"({progresso.processados} processados)."
+            )
+
+        embeddings = EMBEDDINGS_CLIENT_REGISTRY.criar(classe, modelo)
+
+        self._processar(
+            progresso, embeddings.embed_documents, tamanho_lote, retomar=True
+        )
+        self._processar(
+            progresso, embeddings.embed_documents, tamanho_lote, retomar=False
+        )
+
+        vetorizados = Documento.objects.filter(embedding__isnull=False)
+        total = vetorizados.count()
+        pendentes = Documento.sem_embedding_sombra().count()
+        cobertura = (total - pendentes) / total if total else 1.0
+        self.stdout.write(
+            f"Cobertura do novo modelo: {cobertura:.1%} "
+            f"({total - pendentes} de {total} documentos)"
+        )
+        if not options["trocar"]:
+            return
+
+        for _ in range(_TENTATIVAS_TROCA):
+            try:
+                promovidos = progresso.trocar(tamanho_lote)
+                break
+            except ValueError:
+                self._processar(
+                    progresso,
+                    embeddings.embed_documents,
+                    tamanho_lote,
+                    retomar=False,
+                )
+        else:
+            raise CommandError(
+                "Novos documentos continuam sem o embedding do novo modelo; "
+                "execute novamente."
+            )
+        self.stdout.write(
+            f"Busca trocada para {classe} ({modelo}) em {promovidos} "
+            "documentos."
+        )
+
+    def _processar(
+        self,
+        progresso: ReprocessamentoEmbeddings,
+        gerar: Callable[[list[str]], list[list[float]]],
+        tamanho_lote: int,
+        retomar: bool,
+    ) -> None:
+        """Gera os embeddings sombra dos documentos pendentes.
+
+        Args:
+            progresso: Reprocessamento ativo
+            gerar: ``embed_documents`` do modelo de destino
+            tamanho_lote: Documentos por lote
+            retomar: Parte do ponto de retomada (senão, do início)
+        """
+        ultimo_id = progresso.ultimo_id if retomar else 0
+        while True:
+            lote = list(
+                Documento.sem_embedding_sombra()
+                .filter(id__gt=ultimo_id)
+                .order_by("id")
+                .only("id", "conteudo")[:tamanho_lote]
+            )
+            if not lote:
+                return
+            try:
+                vetores = gerar([str(doc.conteudo) for doc in lote])
+            except Exception as e:
+                raise CommandError(
+                    f"Falha nos documentos {lote[0].pk} a {lote[-1].pk}: "
+                    f"{e}. Execute novamente para retomar."
+                ) from e
+            if any(len(vetor) != DIMENSOES for vetor in vetores):
+                raise CommandError(
+                    f"O modelo de destino deve gerar {DIMENSOES} dimensões."
+                )
+
+            for documento, vetor in zip(lote, vetores):
+                documento.embedding_sombra = vetor
+            with transaction.atomic():
+                Documento.objects.bulk_update(lote, ["embedding_sombra"])
+                progresso.avancar(lote[-1].pk, len(lote))
+            ultimo_id = lote[-1].pk
+            self.stdout.write(
+                f"{progresso.processados} documentos processados "
+                f"(até o ID {ultimo_id})"
+            )
@@ -0,0 +1,111 @@
+"""Inicia o serviço local usado por ``EMBEDDINGS_CLASS=LocalEmbeddings``.
+
+Carrega uma única vez o modelo de ``EMBEDDINGS_LOCAL_BACKEND`` (com
+``EMBEDDINGS_MODEL``) e atende os workers pelo socket Unix
+``EMBEDDINGS_LOCAL_SOCKET``, reunindo os pedidos simultâneos em lotes (ver
+``ai_engine.utils.embeddings_locais``). Ao ser interrompido, exibe quantos
+pedidos foram atendidos e o tamanho médio dos lotes.
+
+Uso:
+    python manage.py servico_embeddings
+    python manage.py servico_embeddings --max-lote 64 --espera-ms 10
+"""
+
+from typing import Any
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from smart_core_assistant_painel.modules.ai_engine import (
+    EMBEDDINGS_CLIENT_REGISTRY,
+    AgrupadorEmbeddings,
+    ServidorEmbeddingsLocal,
+)
+from smart_core_assistant_painel.modules.services import SERVICEHUB
+
+
+class Command(BaseCommand):
+    """Atende pedidos de embeddings dos workers por um socket Unix."""
+
+    help = (
+        "Inicia o serviço local de embeddings, que carrega o modelo uma "
+        "vez e agrupa os pedidos simultâneos."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--socket",
+            default=None,
+            help="Caminho do socket (padrão: EMBEDDINGS_LOCAL_SOCKET)",
+        )
+        parser.add_argument(
+            "--backend",
+            default=None,
+            help="Classe de embeddings (padrão: EMBEDDINGS_LOCAL_BACKEND)",
+        )
+        parser.add_argument(
+            "--max-lote",
+            type=int,
+            default=None,
+            help="Textos por lote (padrão: EMBEDDINGS_LOCAL_MAX_BATCH)",
+        )
+        parser.add_argument(
+            "--espera-ms",
+            type=float,
+            default=None,
+            help=(
+                "Espera máxima por lote em ms "
+                "(padrão: EMBEDDINGS_LOCAL_MAX_WAIT_MS)"
+            ),
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        backend: str = (
+            options["backend"] or SERVICEHUB.EMBEDDINGS_LOCAL_BACKEND
+        )
+        if backend == "LocalEmbeddings":
+            raise CommandError(
+                "EMBEDDINGS_LOCAL_BACKEND deve ser a classe que gera os "
+                "embeddings, não LocalEmbeddings."
+            )
+        caminho: str = (
+            options["socket"] or SERVICEHUB.EMBEDDINGS_LOCAL_SOCKET
+        )
+        max_lote: int = (
+            SERVICEHUB.EMBEDDINGS_LOCAL_MAX_BATCH
+            if options["max_lote"] is None
+            else options["max_lote"]
+        )
+        espera_ms: float = (
+            SERVICEHUB.EMBEDDINGS_LOCAL_MAX_WAIT_MS
+            if options["espera_ms"] is None
+            else options["espera_ms"]
+        )
+
+        embeddings = EMBEDDINGS_CLIENT_REGISTRY.criar(
+            backend, SERVICEHUB.EMBEDDINGS_MODEL
+        )
+        # Carrega o modelo antes de aceitar conexões
+        embeddings.embed_documents(["aquecimento"])
+        agrupador = AgrupadorEmbeddings(
+            embeddings.embed_documents, max_lote, espera_ms
+        )
+
+        with ServidorEmbeddingsLocal(caminho, agrupador) as servidor:
+            self.stdout.write(
+                f"Serviço de embeddings ({backend}) em {caminho}: lotes de "
+                f"até {max_lote} textos, espera máxima de {espera_ms:g} ms"
+            )
+            try:
+                servidor.serve_forever()
+            except KeyboardInterrupt:
+                pass
+
+        estatisticas = agrupador.estatisticas()
+        self.stdout.write(
+            f"{estatisticas.pedidos} pedidos em {estatisticas.lotes} lotes "
+            f"({estatisticas.textos_por_lote:.1f} textos por lote)"
+        )
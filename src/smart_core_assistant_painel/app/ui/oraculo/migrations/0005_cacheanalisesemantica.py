@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-19 07:28
+
+import pgvector.django.vector
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('oraculo', '0004_alter_atendimento_avaliacao'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheAnaliseSemantica',
+            fields=[
+                ('id', models.AutoField(help_text='Chave primária do registro', primary_key=True, serialize=False)),
+                ('mensagem', models.TextField(help_text='Texto normalizado da mensagem analisada')),
+                ('embedding', pgvector.django.vector.VectorField(dimensions=1024, help_text='Vetor de embeddings da mensagem')),
+                ('versao', models.CharField(help_text='Hash da versão do prompt, tipos válidos e modelo', max_length=64)),
+                ('intent_detectado', models.JSONField(blank=True, default=list, help_text='Intents retornados pela análise')),
+                ('entidades_extraidas', models.JSONField(blank=True, default=list, help_text='Entidades retornadas pela análise')),
+                ('acertos', models.PositiveIntegerField(default=0, help_text='Quantidade de reutilizações da entrada')),
+                ('data_criacao', models.DateTimeField(auto_now_add=True, help_text='Data de criação da entrada')),
+                ('ultimo_acerto', models.DateTimeField(blank=True, help_text='Data da última reutilização da entrada', null=True)),
+            ],
+            options={
+                'verbose_name': 'Cache de Análise Semântica',
+                'verbose_name_plural': 'Cache de Análises Semânticas',
+                'ordering': ['-data_criacao'],
+                'indexes': [models.Index(fields=['versao', 'data_criacao'], name='oraculo_cac_versao_2c2cef_idx')],
+            },
+        ),
+    ]
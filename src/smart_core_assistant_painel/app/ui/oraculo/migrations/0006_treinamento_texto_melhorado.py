@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 07:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('oraculo', '0005_cacheanalisesemantica'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='treinamento',
+            name='hash_melhoria',
+            field=models.CharField(blank=True, default='', help_text='Hash do conteúdo, prompt e modelo da sugestão de melhoria', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='treinamento',
+            name='texto_melhorado',
+            field=models.TextField(blank=True, help_text='Última sugestão de melhoria do conteúdo gerada pela IA', null=True),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-19 07:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('oraculo', '0006_treinamento_texto_melhorado'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MetricaLlm',
+            fields=[
+                ('id', models.BigAutoField(help_text='Chave primária do registro', primary_key=True, serialize=False)),
+                ('funcionalidade', models.CharField(help_text='Funcionalidade que fez a chamada', max_length=64)),
+                ('tipo', models.CharField(help_text="Tipo da chamada ('llm' ou 'embedding')", max_length=16)),
+                ('modelo', models.CharField(blank=True, default='', help_text='Nome do modelo', max_length=128)),
+                ('data', models.DateTimeField(help_text='Início da chamada')),
+                ('latencia', models.FloatField(help_text='Duração total da chamada em segundos')),
+                ('tempo_primeiro_token', models.FloatField(blank=True, help_text='Segundos até o primeiro token (apenas streaming)', null=True)),
+                ('tokens_prompt', models.PositiveIntegerField(blank=True, help_text='Tokens de entrada informados pelo provedor', null=True)),
+                ('tokens_resposta', models.PositiveIntegerField(blank=True, help_text='Tokens de saída informados pelo provedor', null=True)),
+                ('sucesso', models.BooleanField(default=True, help_text='Se a chamada terminou sem erro')),
+                ('erro', models.CharField(blank=True, default='', help_text='Descrição do erro, se houver', max_length=255)),
+            ],
+            options={
+                'verbose_name': 'Métrica de LLM',
+                'verbose_name_plural': 'Métricas de LLM',
+                'ordering': ['-data'],
+                'indexes': [models.Index(fields=['data', 'funcionalidade'], name='oraculo_met_data_3b67c2_idx')],
+            },
+        ),
+    ]
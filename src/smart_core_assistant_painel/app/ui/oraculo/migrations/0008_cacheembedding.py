@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-19 08:18
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('oraculo', '0007_metricallm'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheEmbedding',
+            fields=[
+                ('id', models.BigAutoField(help_text='Chave primária do registro', primary_key=True, serialize=False)),
+                ('embeddings_class', models.CharField(help_text='Classe de embeddings que gerou o vetor', max_length=128)),
+                ('modelo', models.CharField(blank=True, default='', help_text='Modelo de embeddings que gerou o vetor', max_length=128)),
+                ('hash_conteudo', models.CharField(help_text='SHA-256 do texto normalizado', max_length=64)),
+                ('vetor', models.BinaryField(help_text='Vetor de embeddings em bytes float32')),
+                ('dimensoes', models.PositiveIntegerField(help_text='Quantidade de dimensões do vetor')),
+                ('acertos', models.PositiveIntegerField(default=0, help_text='Quantidade de reutilizações da entrada')),
+                ('data_criacao', models.DateTimeField(auto_now_add=True, help_text='Data de criação da entrada')),
+                ('ultimo_acesso', models.DateTimeField(default=django.utils.timezone.now, help_text='Data da criação ou da última reutilização da entrada')),
+            ],
+            options={
+                'verbose_name': 'Cache de Embedding',
+                'verbose_name_plural': 'Cache de Embeddings',
+                'ordering': ['-ultimo_acesso'],
+                'indexes': [models.Index(fields=['ultimo_acesso'], name='oraculo_cac_ultimo__b31b72_idx')],
+                'constraints': [models.UniqueConstraint(fields=('embeddings_class', 'modelo', 'hash_conteudo'), name='oraculo_cache_embedding_unico')],
+            },
+        ),
+    ]
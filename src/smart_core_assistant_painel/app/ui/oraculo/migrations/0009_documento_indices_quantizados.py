@@ -0,0 +1,36 @@
+# Índices HNSW quantizados para a primeira etapa da busca de documentos
+# (VECTOR_SEARCH_QUANTIZATION). São índices de expressão sobre a coluna
+# float32, que continua sendo usada na reordenação exata: meia precisão
+# ocupa metade do índice float32 e a binária, 1/32.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('oraculo', '0008_cacheembedding'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX IF NOT EXISTS documento_embedding_halfvec_idx '
+                'ON oraculo_documento USING hnsw '
+                '((embedding::halfvec(1024)) halfvec_cosine_ops) '
+                'WITH (m = 16, ef_construction = 64);'
+            ),
+            reverse_sql=(
+                'DROP INDEX IF EXISTS documento_embedding_halfvec_idx;'
+            ),
+        ),
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX IF NOT EXISTS documento_embedding_bit_idx '
+                'ON oraculo_documento USING hnsw '
+                '((binary_quantize(embedding)::bit(1024)) bit_hamming_ops) '
+                'WITH (m = 16, ef_construction = 64);'
+            ),
+            reverse_sql='DROP INDEX IF EXISTS documento_embedding_bit_idx;',
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-19 08:26
+
+import pgvector.django.vector
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('oraculo', '0009_documento_indices_quantizados'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documento',
+            name='embedding_prefixo',
+            field=pgvector.django.vector.VectorField(blank=True, dimensions=256, help_text='Primeiras dimensões do embedding (busca em duas etapas)', null=True),
+        ),
+        # Primeira etapa da busca com VECTOR_SEARCH_QUANTIZATION=prefix;
+        # as linhas existentes são preenchidas por preencher_embedding_prefixo
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX IF NOT EXISTS documento_embedding_prefixo_idx '
+                'ON oraculo_documento USING hnsw '
+                '(embedding_prefixo vector_cosine_ops) '
+                'WITH (m = 16, ef_construction = 64);'
+            ),
+            reverse_sql=(
+                'DROP INDEX IF EXISTS documento_embedding_prefixo_idx;'
+            ),
+        ),
+    ]
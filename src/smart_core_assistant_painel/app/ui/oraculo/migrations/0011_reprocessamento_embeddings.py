@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-19 08:33
+
+import pgvector.django.vector
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('oraculo', '0010_documento_embedding_prefixo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReprocessamentoEmbeddings',
+            fields=[
+                ('id', models.AutoField(help_text='Chave primária do registro', primary_key=True, serialize=False)),
+                ('embeddings_class', models.CharField(help_text='Classe de embeddings de destino', max_length=128)),
+                ('modelo', models.CharField(blank=True, default='', help_text='Modelo de embeddings de destino', max_length=128)),
+                ('ultimo_id', models.PositiveBigIntegerField(default=0, help_text='Maior ID de documento já processado')),
+                ('processados', models.PositiveIntegerField(default=0, help_text='Quantidade de documentos processados')),
+                ('data_inicio', models.DateTimeField(auto_now_add=True, help_text='Data de início do reprocessamento')),
+                ('data_atualizacao', models.DateTimeField(auto_now=True, help_text='Data do último lote gravado')),
+                ('data_troca', models.DateTimeField(blank=True, help_text='Data da troca para os embeddings do novo modelo', null=True)),
+            ],
+            options={
+                'verbose_name': 'Reprocessamento de Embeddings',
+                'verbose_name_plural': 'Reprocessamentos de Embeddings',
+                'ordering': ['-data_inicio'],
+            },
+        ),
+        migrations.AddField(
+            model_name='documento',
+            name='embedding_sombra',
+            field=pgvector.django.vector.VectorField(blank=True, dimensions=1024, help_text='Embedding do novo modelo durante o reprocessamento', null=True),
+        ),
+    ]
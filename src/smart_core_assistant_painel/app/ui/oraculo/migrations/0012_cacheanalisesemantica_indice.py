@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-19 08:56
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('oraculo', '0011_reprocessamento_embeddings'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='cacheanalisesemantica',
+            name='entidades_extraidas',
+        ),
+        # Busca da entrada mais próxima sem varredura sequencial
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX IF NOT EXISTS '
+                'cache_analise_semantica_embedding_idx '
+                'ON oraculo_cacheanalisesemantica USING hnsw '
+                '(embedding vector_cosine_ops) '
+                'WITH (m = 16, ef_construction = 64);'
+            ),
+            reverse_sql=(
+                'DROP INDEX IF EXISTS cache_analise_semantica_embedding_idx;'
+            ),
+        ),
+    ]
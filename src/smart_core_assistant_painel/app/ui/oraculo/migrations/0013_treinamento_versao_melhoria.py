@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('oraculo', '0012_cacheanalisesemantica_indice'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='treinamento',
+            name='versao_melhoria',
+            field=models.CharField(blank=True, default='', help_text='Hash do prompt e do modelo da sugestão de melhoria', max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='treinamento',
+            name='hash_melhoria',
+            field=models.CharField(blank=True, default='', help_text='Hash do conteúdo da sugestão de melhoria', max_length=64),
+        ),
+    ]
@@ -1,10 +1,11 @@
 import re
+from collections.abc import Iterator, Mapping
 from datetime import datetime
 from typing import Any, Optional, cast, override
 
 from django.core.exceptions import ValidationError
 from django.db import models
-from django.db.models.query import QuerySet
+from django.db.models import F, Value
 from django.utils import timezone
 from loguru import logger
 
@@ -1021,19 +1022,27 @@ class Atendimento(models.Model):
 
     def carregar_historico_mensagens(
         self, excluir_mensagem_id: Optional[int] = None
-    ) -> dict[str, Any]:
+    ) -> "HistoricoMensagens":
         """
-        Carrega o histórico completo de todas as mensagens do atendimento.
+        Carrega o histórico compacto de mensagens do atendimento.
+
+        Busca, em uma única consulta (UNION ALL), apenas as colunas
+        ``conteudo``, ``intent_detectado`` e ``entidades_extraidas`` das
+        mensagens do atendimento e os assuntos dos atendimentos anteriores
+        já finalizados do mesmo contato. Intents e entidades são
+        deduplicados por tuplas imutáveis ``(tipo, valor)``, preservando a
+        ordem da primeira ocorrência.
 
         Args:
             excluir_mensagem_id (Optional[int]): ID da mensagem a ser excluída do histórico
                 (útil para excluir a mensagem atual ao analisar contexto)
 
         Returns:
-            dict: Dicionário contendo:
+            HistoricoMensagens: Objeto somente leitura, compatível com
+                ``Mapping``, contendo:
                 - 'conteudo_mensagens': Lista de strings com o conteúdo das mensagens
-                - 'intents_detectados': Set com todos os intents únicos detectados
-                - 'entidades_extraidas': Set com todas as entidades únicas extraídas
+                - 'intents_detectados': Lista de dicionários únicos ``{tipo: valor}``
+                - 'entidades_extraidas': Lista de dicionários únicos ``{tipo: valor}``
                 - 'historico_atendimentos': Lista de strings com histórico de atendimentos anteriores no formato "DD/MM/YYYY - assunto tratado: {assunto}"
 
         Example:
@@ -1047,76 +1056,213 @@ class Atendimento(models.Model):
             >>> print(f"Entidades únicas: {historico['entidades_extraidas']}")
         """
         try:
-            # Busca todas as mensagens do atendimento ordenadas por timestamp
-            # (mais antigas primeiro)
-            mensagens_query:QuerySet[Mensagem] = cast(QuerySet[Mensagem], self.mensagens.all().order_by("timestamp"))# type: ignore
-
-            # Exclui mensagem específica se solicitado
+            # Mensagens do atendimento atual (origem 0)
+            mensagens_query = (
+                Mensagem.objects.filter(atendimento_id=self.id)
+                .annotate(
+                    origem=Value(_ORIGEM_MENSAGEM),
+                    momento=F("timestamp"),
+                )
+                .order_by()
+            )
             if excluir_mensagem_id:
-                mensagens_query = mensagens_query.exclude(  # type: ignore
+                mensagens_query = mensagens_query.exclude(
                     id=excluir_mensagem_id
                 )
 
-            mensagens:list[Mensagem] = list(mensagens_query)
-
-            # Inicializa as estruturas de dados
-            conteudo_mensagens:list[str] = []
-            intents_detectados:set[dict[str, str]] = set[dict[str, str]]() 
-            entidades_extraidas:set[dict[str, str]] = set[dict[str, str]]()
-
-            # Processa cada mensagem
-            for mensagem in mensagens:
-                # Adiciona conteúdo da mensagem
-                if mensagem.conteudo:
-                    conteudo_mensagens.append(mensagem.conteudo)
-
-                # Processa intents detectados
-                if mensagem.intent_detectado:
-                    for intent_dict in mensagem.intent_detectado:
-                        for tipo_intent, valor_intent in intent_dict.items():
-                            intents_detectados.add({tipo_intent: valor_intent})
-
-                # Processa entidades extraídas
-                if mensagem.entidades_extraidas:
-                    for entidade_dict in mensagem.entidades_extraidas:
-                        for tipo_entidade, valor_entidade in entidade_dict.items():
-                            entidades_extraidas.add({tipo_entidade: valor_entidade})
-
-            # Busca histórico de atendimentos anteriores do contato
-            historico_atendimentos:list[str] = []
-            atendimentos_anteriores = (
-                Atendimento.objects.filter(contato=self.contato)
+            # Atendimentos anteriores finalizados do contato (origem 1),
+            # alinhados às mesmas colunas para permitir o UNION ALL
+            atendimentos_query = (
+                Atendimento.objects.filter(
+                    contato_id=self.contato_id,  # type: ignore[attr-defined]
+                    data_fim__isnull=False,
+                    assunto__isnull=False,
+                )
                 .exclude(id=self.id)
-                .filter(data_fim__isnull=False)
-                .order_by("-data_fim")
+                .exclude(assunto="")
+                .annotate(
+                    origem=Value(_ORIGEM_ATENDIMENTO),
+                    momento=F("data_fim"),
+                    intents=Value(None, output_field=models.JSONField()),
+                    entidades=Value(None, output_field=models.JSONField()),
+                )
+                .order_by()
+            )
+
+            historico_query = (
+                mensagens_query.values_list(
+                    "origem",
+                    "momento",
+                    "id",
+                    "conteudo",
+                    "intent_detectado",
+                    "entidades_extraidas",
+                )
+                .union(
+                    atendimentos_query.values_list(
+                        "origem",
+                        "momento",
+                        "id",
+                        "assunto",
+                        "intents",
+                        "entidades",
+                    ),
+                    all=True,
+                )
+                .order_by("origem", "momento", "id")
             )
 
-            for atendimento_anterior in atendimentos_anteriores:
-                if atendimento_anterior.assunto and atendimento_anterior.data_fim is not None:
-                    data_formatada = atendimento_anterior.data_fim.strftime("%d/%m/%Y")
-                    historico_atendimentos.append(
-                        f"{data_formatada} - assunto tratado: {atendimento_anterior.assunto}"
+            conteudo_mensagens: list[str] = []
+            intents_vistos: dict[tuple[str, Any], dict[str, Any]] = {}
+            entidades_vistas: dict[tuple[str, Any], dict[str, Any]] = {}
+            atendimentos_anteriores: list[str] = []
+
+            for (
+                origem,
+                momento,
+                _,
+                texto,
+                intents,
+                entidades,
+            ) in historico_query.iterator():
+                if origem == _ORIGEM_ATENDIMENTO:
+                    atendimentos_anteriores.append(
+                        f"{momento.strftime('%d/%m/%Y')} - assunto tratado: {texto}"
                     )
+                    continue
 
-            resultado = {
-                "conteudo_mensagens": conteudo_mensagens,
-                "intents_detectados": intents_detectados,
-                "entidades_extraidas": entidades_extraidas,
-                "historico_atendimentos": historico_atendimentos,
-            }
+                if texto:
+                    conteudo_mensagens.append(texto)
+                _acumular_pares_unicos(intents, intents_vistos)
+                _acumular_pares_unicos(entidades, entidades_vistas)
 
-            return resultado
+            # Atendimentos anteriores do mais recente para o mais antigo
+            atendimentos_anteriores.reverse()
+
+            return HistoricoMensagens(
+                conteudo_mensagens=conteudo_mensagens,
+                intents_detectados=list(intents_vistos.values()),
+                entidades_extraidas=list(entidades_vistas.values()),
+                historico_atendimentos=atendimentos_anteriores,
+            )
 
         except Exception as e:
             logger.error(
                 f"Erro ao carregar histórico de mensagens do atendimento {self.id}: {e}"
             )
-            return {
-                "conteudo_mensagens": [],
-                "intents_detectados": set(),
-                "entidades_extraidas": set(),
-                "historico_atendimentos": [],
-            }
+            return HistoricoMensagens()
+
+
+_ORIGEM_MENSAGEM: int = 0
+_ORIGEM_ATENDIMENTO: int = 1
+
+
+def _congelar_valor(valor: Any) -> Any:
+    """
+    Converte um valor JSON em uma estrutura imutável e hashable.
+
+    Args:
+        valor: Valor extraído de um campo JSON (str, número, lista ou dict)
+
+    Returns:
+        Representação hashable do valor (tuplas no lugar de listas/dicts)
+    """
+    if isinstance(valor, dict):
+        valor_dict = cast(dict[Any, Any], valor)
+        return tuple(
+            sorted(
+                ((str(k), _congelar_valor(v)) for k, v in valor_dict.items()),
+                key=lambda par: par[0],
+            )
+        )
+    if isinstance(valor, list):
+        return tuple(_congelar_valor(v) for v in cast(list[Any], valor))
+    return valor
+
+
+def _acumular_pares_unicos(
+    registros: Any, vistos: dict[tuple[str, Any], dict[str, Any]]
+) -> None:
+    """
+    Acumula pares ``{tipo: valor}`` únicos preservando a primeira ocorrência.
+
+    Args:
+        registros: Conteúdo de ``intent_detectado`` ou ``entidades_extraidas``
+            (lista de dicionários ou None)
+        vistos: Dicionário ordenado indexado por ``(tipo, valor congelado)``
+    """
+    if not registros or not isinstance(registros, list):
+        return
+    for item in cast(list[Any], registros):
+        if not isinstance(item, dict):
+            continue
+        for tipo, valor in cast(dict[str, Any], item).items():
+            chave = (str(tipo), _congelar_valor(valor))
+            if chave not in vistos:
+                vistos[chave] = {tipo: valor}
+
+
+class HistoricoMensagens(Mapping[str, Any]):
+    """
+    Histórico compacto de um atendimento para análise de contexto.
+
+    Objeto leve (``__slots__``) retornado por
+    ``Atendimento.carregar_historico_mensagens``. Implementa ``Mapping`` para
+    manter compatibilidade com consumidores que acessam o histórico como
+    dicionário (``historico.get("conteudo_mensagens")``).
+
+    Attributes:
+        conteudo_mensagens: Conteúdo das mensagens em ordem cronológica
+        intents_detectados: Intents únicos no formato ``{tipo: valor}``
+        entidades_extraidas: Entidades únicas no formato ``{tipo: valor}``
+        historico_atendimentos: Assuntos dos atendimentos anteriores
+    """
+
+    __slots__ = (
+        "conteudo_mensagens",
+        "intents_detectados",
+        "entidades_extraidas",
+        "historico_atendimentos",
+    )
+
+    def __init__(
+        self,
+        conteudo_mensagens: Optional[list[str]] = None,
+        intents_detectados: Optional[list[dict[str, Any]]] = None,
+        entidades_extraidas: Optional[list[dict[str, Any]]] = None,
+        historico_atendimentos: Optional[list[str]] = None,
+    ) -> None:
+        self.conteudo_mensagens: list[str] = conteudo_mensagens or []
+        self.intents_detectados: list[dict[str, Any]] = (
+            intents_detectados or []
+        )
+        self.entidades_extraidas: list[dict[str, Any]] = (
+            entidades_extraidas or []
+        )
+        self.historico_atendimentos: list[str] = historico_atendimentos or []
+
+    @override
+    def __getitem__(self, chave: str) -> Any:
+        if chave not in self.__slots__:
+            raise KeyError(chave)
+        return getattr(self, chave)
+
+    @override
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    @override
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    @override
+    def __repr__(self) -> str:
+        return (
+            f"HistoricoMensagens(mensagens={len(self.conteudo_mensagens)}, "
+            f"intents={len(self.intents_detectados)}, "
+            f"entidades={len(self.entidades_extraidas)}, "
+            f"atendimentos={len(self.historico_atendimentos)})"
+        )
 
 
 class Mensagem(models.Model):
@@ -0,0 +1,312 @@
+import atexit
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional, override
+
+from django.db import close_old_connections, models
+from django.db.models import F, Sum
+from django.db.models.indexes import Index
+from django.utils import timezone
+from loguru import logger
+
+# Limite de hashes por consulta (parâmetros do ``IN``)
+_HASHES_POR_CONSULTA = 500
+# Entradas com acertos pendentes que antecipam a gravação
+_ACERTOS_POR_GRAVACAO = 500
+# Intervalo (s) máximo entre gravações dos acertos
+_INTERVALO_GRAVACAO_ACERTOS = 60.0
+
+
+class EstatisticaCacheEmbedding(NamedTuple):
+    """Ocupação do cache de embeddings por classe e modelo."""
+
+    embeddings_class: str
+    modelo: str
+    entradas: int
+    bytes: int
+    acertos: int
+
+
+class _AcertosPendentes:
+    """Acumula os acertos do cache em memória e os grava em lote.
+
+    Evita um ``UPDATE`` por consulta ao cache: os acertos são somados por
+    entrada e gravados por uma thread em segundo plano a cada
+    ``_INTERVALO_GRAVACAO_ACERTOS`` ou quando ``_ACERTOS_POR_GRAVACAO``
+    entradas acumulam acertos, como a telemetria do motor de IA.
+    """
+
+    def __init__(self) -> None:
+        self._acertos: Counter[int] = Counter()
+        self._lock = threading.Lock()
+        self._sinal = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def registrar(self, ids: list[int]) -> None:
+        """Soma um acerto a cada entrada informada.
+
+        Args:
+            ids: IDs das entradas reutilizadas
+        """
+        with self._lock:
+            self._acertos.update(ids)
+            cheio = len(self._acertos) >= _ACERTOS_POR_GRAVACAO
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._gravar_periodicamente,
+                    name="acertos-cache-embeddings",
+                    daemon=True,
+                )
+                self._thread.start()
+        if cheio:
+            self._sinal.set()
+
+    def descarregar(self) -> int:
+        """Grava os acertos acumulados.
+
+        Entradas com a mesma quantidade de acertos são atualizadas em um
+        único ``UPDATE``. Falhas são registradas no log e os acertos são
+        descartados: são apenas estatísticas.
+
+        Returns:
+            Quantidade de entradas atualizadas
+        """
+        with self._lock:
+            acertos, self._acertos = self._acertos, Counter()
+        if not acertos:
+            return 0
+        por_quantidade: dict[int, list[int]] = defaultdict(list)
+        for entrada_id, quantidade in acertos.items():
+            por_quantidade[quantidade].append(entrada_id)
+        agora = timezone.now()
+        atualizadas = 0
+        try:
+            for quantidade, ids in por_quantidade.items():
+                for inicio in range(0, len(ids), _HASHES_POR_CONSULTA):
+                    atualizadas += CacheEmbedding.objects.filter(
+                        id__in=ids[inicio : inicio + _HASHES_POR_CONSULTA]
+                    ).update(
+                        acertos=F("acertos") + quantidade,
+                        ultimo_acesso=agora,
+                    )
+        except Exception as e:
+            logger.warning(
+                f"Falha ao gravar os acertos de {len(acertos)} entradas do "
+                f"cache de embeddings: {e}"
+            )
+            return 0
+        return atualizadas
+
+    def _gravar_periodicamente(self) -> None:
+        """Grava os acertos a cada intervalo ou quando o lote enche."""
+        while True:
+            self._sinal.wait(_INTERVALO_GRAVACAO_ACERTOS)
+            self._sinal.clear()
+            # A gravação roda nesta thread, com conexão própria
+            close_old_connections()
+            self.descarregar()
+
+
+_ACERTOS_PENDENTES = _AcertosPendentes()
+atexit.register(_ACERTOS_PENDENTES.descarregar)
+
+
+class CacheEmbedding(models.Model):
+    """
+    Vetor de embeddings indexado pelo hash do texto que o originou.
+
+    Armazenamento do cache de embeddings do motor de IA
+    (``EMBEDDINGS_CACHE``): antes de chamar o provedor, os trechos são
+    procurados por ``(embeddings_class, modelo, hash_conteudo)``, evitando
+    gerar novamente trechos repetidos entre treinamentos ou mantidos na
+    edição de um treinamento.
+
+    Attributes:
+        embeddings_class: Classe de embeddings que gerou o vetor
+        modelo: Modelo de embeddings que gerou o vetor
+        hash_conteudo: SHA-256 do texto normalizado
+        vetor: Vetor em bytes float32
+        dimensoes: Quantidade de dimensões do vetor
+        acertos: Quantidade de reutilizações da entrada (gravada em lote)
+        data_criacao: Timestamp de criação
+        ultimo_acesso: Timestamp da criação ou da última reutilização
+            (gravado em lote)
+    """
+
+    id: models.BigAutoField = models.BigAutoField(
+        primary_key=True, help_text="Chave primária do registro"
+    )
+
+    embeddings_class: models.CharField[str] = models.CharField(
+        max_length=128,
+        help_text="Classe de embeddings que gerou o vetor",
+    )
+
+    modelo: models.CharField[str] = models.CharField(
+        max_length=128,
+        blank=True,
+        default="",
+        help_text="Modelo de embeddings que gerou o vetor",
+    )
+
+    hash_conteudo: models.CharField[str] = models.CharField(
+        max_length=64,
+        help_text="SHA-256 do texto normalizado",
+    )
+
+    vetor: models.BinaryField = models.BinaryField(
+        help_text="Vetor de embeddings em bytes float32",
+    )
+
+    dimensoes: models.PositiveIntegerField[int] = (
+        models.PositiveIntegerField(
+            help_text="Quantidade de dimensões do vetor",
+        )
+    )
+
+    acertos: models.PositiveIntegerField[int] = models.PositiveIntegerField(
+        default=0,
+        help_text="Quantidade de reutilizações da entrada",
+    )
+
+    data_criacao: models.DateTimeField[datetime] = models.DateTimeField(
+        auto_now_add=True,
+        help_text="Data de criação da entrada",
+    )
+
+    ultimo_acesso: models.DateTimeField[datetime] = models.DateTimeField(
+        default=timezone.now,
+        help_text="Data da criação ou da última reutilização da entrada",
+    )
+
+    class Meta:
+        verbose_name: str = "Cache de Embedding"
+        verbose_name_plural: str = "Cache de Embeddings"
+        ordering: list[str] = ["-ultimo_acesso"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["embeddings_class", "modelo", "hash_conteudo"],
+                name="oraculo_cache_embedding_unico",
+            ),
+        ]
+        indexes: list[Index] = [
+            models.Index(fields=["ultimo_acesso"]),
+        ]
+
+    @override
+    def __str__(self) -> str:
+        return (
+            f"{self.embeddings_class} ({self.modelo}): "
+            f"{self.hash_conteudo[:12]}"
+        )
+
+    @classmethod
+    def buscar(
+        cls, embeddings_class: str, model: str, hashes: list[str]
+    ) -> dict[str, bytes]:
+        """Retorna os vetores armazenados e registra a reutilização.
+
+        Os acertos são acumulados em memória e gravados em lote (ver
+        ``gravar_acertos``).
+
+        Args:
+            embeddings_class: Classe de embeddings configurada
+            model: Modelo de embeddings configurado
+            hashes: Hashes dos textos procurados
+
+        Returns:
+            Vetores encontrados (bytes float32), por hash
+        """
+        encontrados: dict[str, bytes] = {}
+        ids: list[int] = []
+        for inicio in range(0, len(hashes), _HASHES_POR_CONSULTA):
+            for entrada_id, chave, vetor in cls.objects.filter(
+                embeddings_class=embeddings_class,
+                modelo=model,
+                hash_conteudo__in=hashes[
+                    inicio : inicio + _HASHES_POR_CONSULTA
+                ],
+            ).values_list("id", "hash_conteudo", "vetor"):
+                encontrados[chave] = bytes(vetor)
+                ids.append(entrada_id)
+        if ids:
+            _ACERTOS_PENDENTES.registrar(ids)
+        return encontrados
+
+    @classmethod
+    def gravar_acertos(cls) -> int:
+        """Grava imediatamente os acertos acumulados neste processo.
+
+        Returns:
+            Quantidade de entradas atualizadas
+        """
+        return _ACERTOS_PENDENTES.descarregar()
+
+    @classmethod
+    def gravar(
+        cls, embeddings_class: str, model: str, vetores: dict[str, bytes]
+    ) -> None:
+        """Grava os vetores gerados, ignorando hashes já armazenados.
+
+        Args:
+            embeddings_class: Classe de embeddings configurada
+            model: Modelo de embeddings configurado
+            vetores: Vetores (bytes float32) por hash do texto
+        """
+        cls.objects.bulk_create(
+            [
+                cls(
+                    embeddings_class=embeddings_class,
+                    modelo=model,
+                    hash_conteudo=chave,
+                    vetor=vetor,
+                    dimensoes=len(vetor) // 4,
+                )
+                for chave, vetor in vetores.items()
+            ],
+            ignore_conflicts=True,
+        )
+
+    @classmethod
+    def estatisticas(cls) -> list[EstatisticaCacheEmbedding]:
+        """Resume a ocupação do cache por classe e modelo.
+
+        Returns:
+            Entradas, bytes dos vetores e acertos por classe e modelo
+        """
+        return [
+            EstatisticaCacheEmbedding(
+                classe, modelo, entradas, (dimensoes or 0) * 4, acertos or 0
+            )
+            for classe, modelo, entradas, dimensoes, acertos in (
+                cls.objects.order_by("embeddings_class", "modelo")
+                .values("embeddings_class", "modelo")
+                .annotate(
+                    entradas=models.Count("id"),
+                    dimensoes_total=Sum("dimensoes"),
+                    acertos_total=Sum("acertos"),
+                )
+                .values_list(
+                    "embeddings_class",
+                    "modelo",
+                    "entradas",
+                    "dimensoes_total",
+                    "acertos_total",
+                )
+            )
+        ]
+
+    @classmethod
+    def remover_sem_acesso(cls, dias: int) -> int:
+        """Remove as entradas sem reutilização há mais de ``dias`` dias.
+
+        Args:
+            dias: Dias sem acesso para a remoção
+
+        Returns:
+            Quantidade de entradas removidas
+        """
+        limite = timezone.now() - timedelta(days=dias)
+        removidas, _ = cls.objects.filter(ultimo_acesso__lt=limite).delete()
+        return removidas
@@ -0,0 +1,183 @@
+from datetime import datetime
+from typing import Any, Optional, Self, override
+
+from django.db import models
+from django.db.models import F
+from django.db.models.indexes import Index
+from django.utils import timezone
+from loguru import logger
+from pgvector.django import CosineDistance, VectorField
+
+
+class CacheAnaliseSemantica(models.Model):
+    """
+    Resultado de análise prévia indexado pelo embedding da mensagem.
+
+    Permite reutilizar os intents de mensagens curtas e sem histórico que
+    sejam paráfrases de mensagens já analisadas, buscando a entrada mais
+    próxima por distância de cosseno (índice HNSW do pgvector). As
+    entidades não são armazenadas, pois pertencem à mensagem original.
+
+    Attributes:
+        mensagem: Texto normalizado da mensagem analisada
+        embedding: Vetor de embeddings da mensagem (1024 dimensões)
+        versao: Hash da versão do prompt, tipos válidos e modelo
+        intent_detectado: Intents retornados pela análise
+        acertos: Quantidade de reutilizações da entrada
+        data_criacao: Timestamp de criação
+        ultimo_acerto: Timestamp da última reutilização
+    """
+
+    id: models.AutoField = models.AutoField(
+        primary_key=True, help_text="Chave primária do registro"
+    )
+
+    mensagem: models.TextField[str] = models.TextField(
+        help_text="Texto normalizado da mensagem analisada",
+    )
+
+    embedding: VectorField = VectorField(
+        dimensions=1024,
+        help_text="Vetor de embeddings da mensagem",
+    )
+
+    versao: models.CharField[str] = models.CharField(
+        max_length=64,
+        help_text="Hash da versão do prompt, tipos válidos e modelo",
+    )
+
+    intent_detectado: models.JSONField[list[dict[str, Any]]] = (
+        models.JSONField(
+            default=list,
+            blank=True,
+            help_text="Intents retornados pela análise",
+        )
+    )
+
+    acertos: models.PositiveIntegerField[int] = models.PositiveIntegerField(
+        default=0,
+        help_text="Quantidade de reutilizações da entrada",
+    )
+
+    data_criacao: models.DateTimeField[datetime] = models.DateTimeField(
+        auto_now_add=True,
+        help_text="Data de criação da entrada",
+    )
+
+    ultimo_acerto: models.DateTimeField[datetime | None] = (
+        models.DateTimeField(
+            null=True,
+            blank=True,
+            help_text="Data da última reutilização da entrada",
+        )
+    )
+
+    class Meta:
+        verbose_name: str = "Cache de Análise Semântica"
+        verbose_name_plural: str = "Cache de Análises Semânticas"
+        ordering: list[str] = ["-data_criacao"]
+        indexes: list[Index] = [
+            models.Index(fields=["versao", "data_criacao"]),
+        ]
+
+    @override
+    def __str__(self) -> str:
+        return f"Cache {self.id}: {self.mensagem[:50]}"
+
+    @classmethod
+    def buscar_similar(
+        cls,
+        query_vec: list[float],
+        versao: str,
+        distancia_maxima: float,
+    ) -> Optional[tuple[Self, float]]:
+        """Busca a entrada mais próxima dentro da distância máxima.
+
+        Args:
+            query_vec: Embedding da mensagem recebida
+            versao: Versão do prompt/modelo que a entrada deve ter
+            distancia_maxima: Maior distância de cosseno aceita
+
+        Returns:
+            Tupla (entrada, distância) ou None se nada estiver próximo
+        """
+        entrada = (
+            cls.objects.filter(versao=versao)
+            .annotate(distancia=CosineDistance("embedding", query_vec))
+            .order_by("distancia")
+            .first()
+        )
+        if entrada is None:
+            return None
+
+        distancia = float(getattr(entrada, "distancia"))
+        if distancia > distancia_maxima:
+            return None
+        return entrada, distancia
+
+    @classmethod
+    def registrar(
+        cls,
+        mensagem: str,
+        query_vec: list[float],
+        versao: str,
+        intent_detectado: list[dict[str, Any]],
+    ) -> Self:
+        """Registra o resultado de uma análise.
+
+        Args:
+            mensagem: Texto normalizado da mensagem
+            query_vec: Embedding da mensagem
+            versao: Versão do prompt/modelo usada na análise
+            intent_detectado: Intents retornados pela análise
+
+        Returns:
+            A entrada criada
+        """
+        return cls.objects.create(
+            mensagem=mensagem,
+            embedding=query_vec,
+            versao=versao,
+            intent_detectado=intent_detectado,
+        )
+
+    @classmethod
+    def podar(cls, versao: str, max_entradas: int) -> int:
+        """Remove as entradas de outras versões e as excedentes da atual.
+
+        Args:
+            versao: Versão atual do prompt/modelo
+            max_entradas: Número máximo de entradas mantidas
+
+        Returns:
+            Quantidade de entradas removidas
+        """
+        removidas, _ = cls.objects.exclude(versao=versao).delete()
+        manter = max(1, max_entradas)
+        limite = list(
+            cls.objects.filter(versao=versao)
+            .order_by("-data_criacao", "-id")
+            .values_list("data_criacao", "id")[manter : manter + 1]
+        )
+        if limite:
+            data_limite, id_limite = limite[0]
+            excedentes, _ = (
+                cls.objects.filter(versao=versao)
+                .filter(
+                    models.Q(data_criacao__lt=data_limite)
+                    | models.Q(data_criacao=data_limite, id__lte=id_limite)
+                )
+                .delete()
+            )
+            removidas += excedentes
+        if removidas:
+            logger.debug(
+                f"Removidas {removidas} entradas antigas do cache semântico"
+            )
+        return removidas
+
+    def registrar_acerto(self) -> None:
+        """Incrementa o contador de reutilizações da entrada."""
+        type(self).objects.filter(id=self.id).update(
+            acertos=F("acertos") + 1, ultimo_acerto=timezone.now()
+        )
@@ -1,15 +1,82 @@
+from collections import defaultdict, deque
 from datetime import datetime
-from typing import Any, Self, cast, override
+from typing import Any, NamedTuple, Self, cast, override
 
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import F, Func, Value
+from django.db.models.functions import Cast
 from django.db.models.indexes import Index
 from django.db.models.query import QuerySet
 from langchain_core.documents.base import Document
 from loguru import logger
-from pgvector.django import CosineDistance, VectorField
+from pgvector import HalfVector
+from pgvector.django import (
+    BitField,
+    CosineDistance,
+    HalfVectorField,
+    HammingDistance,
+    VectorField,
+)
+
+from smart_core_assistant_painel.modules.ai_engine.utils.cache_embeddings import (
+    hash_conteudo,
+)
+from smart_core_assistant_painel.modules.services import SERVICEHUB
 
 from .models_treinamento import Treinamento
 
+# Dimensões do embedding dos documentos (e dos índices quantizados)
+DIMENSOES = 1024
+
+# Dimensões do prefixo do embedding (modelos treinados como Matryoshka)
+DIMENSOES_PREFIXO = 256
+
+# Documentos por transação na promoção dos embeddings sombra
+LOTE_PROMOCAO = 500
+
+
+def truncar_prefixo(vetor: list[float]) -> list[float]:
+    """Retorna as primeiras ``DIMENSOES_PREFIXO`` dimensões do vetor.
+
+    A distância de cosseno não depende da norma, então o prefixo não
+    precisa ser normalizado novamente.
+
+    Args:
+        vetor: Vetor de embeddings completo
+
+    Returns:
+        Prefixo do vetor
+    """
+    return list(vetor[:DIMENSOES_PREFIXO])
+
+
+def quantizar_binario(vetor: list[float]) -> str:
+    """Quantiza o vetor em um bit por dimensão, como ``binary_quantize``.
+
+    Args:
+        vetor: Vetor de embeddings
+
+    Returns:
+        Bits (``"1"`` para valores positivos) no formato do tipo ``bit``
+    """
+    return "".join("1" if valor > 0 else "0" for valor in vetor)
+
+
+class SincronizacaoDocumentos(NamedTuple):
+    """Resultado da sincronização dos chunks com os documentos existentes.
+
+    Attributes:
+        pendentes: Documentos sem embedding (novos ou ainda não vetorizados)
+        inseridos: Quantidade de documentos criados
+        mantidos: Quantidade de documentos reaproveitados
+        removidos: Quantidade de documentos excluídos
+    """
+
+    pendentes: list["Documento"]
+    inseridos: int
+    mantidos: int
+    removidos: int
+
 
 class Documento(models.Model):
     """
@@ -23,6 +90,8 @@ class Documento(models.Model):
         conteudo: Conteúdo do chunk de treinamento
         metadata: Metadados do documento (tag, grupo, source, etc.)
         embedding: Vetor de embeddings do conteúdo (1024 dimensões)
+        embedding_prefixo: Primeiras 256 dimensões do embedding
+        embedding_sombra: Embedding do novo modelo durante o reprocessamento
         ordem: Ordem do documento no treinamento
         data_criacao: Timestamp de criação
     """
@@ -51,12 +120,26 @@ class Documento(models.Model):
     )
 
     embedding: VectorField = VectorField(
-        dimensions=1024,
+        dimensions=DIMENSOES,
         null=True,
         blank=True,
         help_text="Vetor de embeddings do conteúdo do documento",
     )
 
+    embedding_prefixo: VectorField = VectorField(
+        dimensions=DIMENSOES_PREFIXO,
+        null=True,
+        blank=True,
+        help_text="Primeiras dimensões do embedding (busca em duas etapas)",
+    )
+
+    embedding_sombra: VectorField = VectorField(
+        dimensions=DIMENSOES,
+        null=True,
+        blank=True,
+        help_text="Embedding do novo modelo durante o reprocessamento",
+    )
+
     ordem: models.PositiveIntegerField[int] = models.PositiveIntegerField(
         default=1,
         help_text="Ordem do documento no treinamento",
@@ -79,6 +162,114 @@ class Documento(models.Model):
     def __str__(self) -> str:
         return f"Documento {self.id}"
 
+    @classmethod
+    def consulta_similares(
+        cls,
+        query_vec: list[float],
+        top_k: int = 5,
+        quantizacao: str = "",
+        candidatos: int = 40,
+    ) -> QuerySet[Self]:
+        """Monta a consulta dos documentos mais próximos da query.
+
+        Sem quantização, ordena todos os documentos pela distância de
+        cosseno exata. Com ``"halfvec"`` ou ``"binary"``, a subconsulta
+        percorre o índice HNSW compacto (ver migração
+        ``0009_documento_indices_quantizados``); com ``"prefix"``, o
+        índice de ``embedding_prefixo``. Apenas os ``candidatos``
+        retornados são reordenados pela distância exata em float32.
+
+        Args:
+            query_vec: Embedding da mensagem
+            top_k: Número de documentos a retornar
+            quantizacao: ``""``, ``"halfvec"``, ``"binary"`` ou
+                ``"prefix"``
+            candidatos: Candidatos da primeira etapa (ao menos ``top_k``)
+
+        Returns:
+            Consulta com a distância exata anotada em ``distance``
+        """
+        documentos = cls.objects.filter(
+            treinamento__treinamento_finalizado=True,
+            embedding__isnull=False,
+        )
+        aproximada: Func | None = None
+        if quantizacao == "halfvec":
+            aproximada = CosineDistance(
+                Cast("embedding", HalfVectorField(dimensions=DIMENSOES)),
+                HalfVector(query_vec),
+            )
+        elif quantizacao == "binary":
+            aproximada = HammingDistance(
+                Cast(
+                    Func("embedding", function="binary_quantize"),
+                    BitField(length=DIMENSOES),
+                ),
+                quantizar_binario(query_vec),
+            )
+        elif quantizacao == "prefix":
+            aproximada = CosineDistance(
+                "embedding_prefixo", truncar_prefixo(query_vec)
+            )
+        elif quantizacao:
+            logger.warning(
+                f"Quantização '{quantizacao}' desconhecida; usando a busca "
+                "exata"
+            )
+
+        if aproximada is not None:
+            ids = (
+                documentos.annotate(distancia_aproximada=aproximada)
+                .order_by("distancia_aproximada")
+                .values("id")[: max(candidatos, top_k)]
+            )
+            documentos = cls.objects.filter(id__in=ids)
+
+        return (
+            documentos.select_related("treinamento")
+            .annotate(distance=CosineDistance("embedding", query_vec))
+            .order_by("distance")[:top_k]
+        )
+
+    @classmethod
+    def buscar_similares(
+        cls,
+        query_vec: list[float],
+        top_k: int = 5,
+        quantizacao: str | None = None,
+        candidatos: int | None = None,
+    ) -> list[Self]:
+        """Executa ``consulta_similares`` com a configuração do ServiceHub.
+
+        No PostgreSQL, ``hnsw.ef_search`` é elevado na transação para que o
+        índice retorne todos os candidatos pedidos (o padrão é 40).
+
+        Args:
+            query_vec: Embedding da mensagem
+            top_k: Número de documentos a retornar
+            quantizacao: Padrão ``SERVICEHUB.VECTOR_SEARCH_QUANTIZATION``
+            candidatos: Padrão ``SERVICEHUB.VECTOR_SEARCH_RERANK_CANDIDATES``
+
+        Returns:
+            Documentos em ordem crescente de distância
+        """
+        if quantizacao is None:
+            quantizacao = SERVICEHUB.VECTOR_SEARCH_QUANTIZATION
+        if candidatos is None:
+            candidatos = SERVICEHUB.VECTOR_SEARCH_RERANK_CANDIDATES
+        consulta = cls.consulta_similares(
+            query_vec, top_k, quantizacao, candidatos
+        )
+        if not quantizacao or connection.vendor != "postgresql":
+            return list(consulta)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                "SET LOCAL hnsw.ef_search = %s",
+                [max(candidatos, top_k, 40)],
+            )
+            return list(consulta)
+
     @classmethod
     def buscar_documentos_similares(
         cls,
@@ -88,7 +279,7 @@ class Documento(models.Model):
         """Busca documentos relacionados à mensagem recebida pelo webhook.
 
         Args:
-            mensagem: Texto da mensagem recebida
+            query_vec: Embedding da mensagem recebida
             top_k: Número de documentos a retornar
 
         Returns:
@@ -96,14 +287,7 @@ class Documento(models.Model):
         """
         try:
             # Busca documentos similares
-            documentos: QuerySet[Self] = (
-                cls.objects.filter(
-                    treinamento__treinamento_finalizado=True,
-                    embedding__isnull=False,
-                )
-                .annotate(distance=CosineDistance("embedding", query_vec))
-                .order_by("distance")[:top_k]
-            )
+            documentos = cls.buscar_similares(query_vec, top_k)
 
             # Formata contexto
             if not documentos:
@@ -127,39 +311,144 @@ class Documento(models.Model):
             return ""
 
     @classmethod
-    def limpar_documentos_por_treinamento(cls, treinamento_id: int) -> None:
-        """Remove todos os documentos de um treinamento."""
-        docs = cls.objects.filter(treinamento_id=treinamento_id).delete()
-        logger.info(
-            f"Removidos {docs} documentos do treinamento {treinamento_id}"
+    def sem_embedding_sombra(cls) -> QuerySet[Self]:
+        """Documentos vetorizados ainda sem o embedding do novo modelo."""
+        return (
+            cls.objects.filter(
+                embedding__isnull=False, embedding_sombra__isnull=True
+            )
+            .exclude(conteudo__isnull=True)
+            .exclude(conteudo="")
         )
 
     @classmethod
-    def criar_documentos_de_chunks(
-        cls,
-        chunks: list[Document],
-        treinamento_id: int
-    ) -> list['Documento']:
-        """Cria documentos a partir de uma lista de chunks e o ID do treinamento.
-        
+    def promover_embeddings_sombra(
+        cls, tamanho_lote: int = LOTE_PROMOCAO
+    ) -> int:
+        """Copia os embeddings sombra para a coluna da busca, em lotes.
+
+        Cada lote copia ``embedding_sombra`` para ``embedding`` (e o
+        prefixo) e limpa a coluna sombra com um ``UPDATE`` na sua própria
+        transação, sem trazer os vetores ao Python. Assim, nenhuma
+        transação reescreve a tabela inteira nem mantém todas as linhas
+        bloqueadas; em contrapartida, até o último lote, parte dos
+        documentos ainda tem o embedding do modelo anterior e fica mal
+        posicionada na busca. Fora do PostgreSQL, o prefixo fica vazio e é
+        recalculado por ``preencher_embedding_prefixo``.
+
         Args:
-            chunks: lista de objetos Document (chunks) do LangChain
-            treinamento_id: ID do treinamento ao qual os documentos pertencem
-            
+            tamanho_lote: Documentos por ``UPDATE``
+
         Returns:
-            lista de objetos Documento criados
+            Quantidade de documentos promovidos
         """
-        documentos_criados: list[Documento] = []
-        
-        for ordem, chunk in enumerate(chunks, start=1):
-            metadata_dict: dict[str, Any] = cast(dict[str, Any], chunk.metadata or {})
-            documento = cls.objects.create(
-                treinamento_id=treinamento_id,
-                conteudo=chunk.page_content,
-                metadata=metadata_dict,
-                ordem=ordem
+        prefixo: Func | None = None
+        if connection.vendor == "postgresql":
+            prefixo = Func(
+                F("embedding_sombra"),
+                Value(1),
+                Value(DIMENSOES_PREFIXO),
+                function="subvector",
+                output_field=VectorField(dimensions=DIMENSOES_PREFIXO),
             )
-            documentos_criados.append(documento)
-            
-        logger.info(f"Criados {len(documentos_criados)} documentos para o treinamento {treinamento_id}")
-        return documentos_criados
+        promovidos = 0
+        while True:
+            with transaction.atomic():
+                ids = list(
+                    cls.objects.filter(embedding_sombra__isnull=False)
+                    .order_by("id")
+                    .values_list("id", flat=True)[:tamanho_lote]
+                )
+                if not ids:
+                    break
+                promovidos += cls.objects.filter(id__in=ids).update(
+                    embedding=F("embedding_sombra"),
+                    embedding_prefixo=prefixo,
+                    embedding_sombra=None,
+                )
+
+        logger.info(f"Embeddings do novo modelo em {promovidos} documentos")
+        return promovidos
+
+    @classmethod
+    def sincronizar_chunks(
+        cls, chunks: list[Document], treinamento_id: int
+    ) -> SincronizacaoDocumentos:
+        """Atualiza os documentos do treinamento a partir dos novos chunks.
+
+        Cada chunk é associado a um documento existente com o mesmo
+        conteúdo (pelo hash do texto normalizado). Documentos associados
+        são mantidos com o embedding atual, atualizando apenas ``ordem`` e
+        ``metadata``; chunks sem correspondente são inseridos e documentos
+        sem chunk correspondente são excluídos. Assim, editar um trecho do
+        treinamento só gera embeddings para os chunks alterados.
+
+        Args:
+            chunks: Chunks do conteúdo atual do treinamento
+            treinamento_id: ID do treinamento
+
+        Returns:
+            Os documentos que precisam de embedding e as quantidades de
+            documentos inseridos, mantidos e removidos
+        """
+        with transaction.atomic():
+            consulta = cls.objects.filter(treinamento_id=treinamento_id)
+            sem_embedding = set(
+                consulta.filter(embedding__isnull=True).values_list(
+                    "id", flat=True
+                )
+            )
+            existentes: dict[str, deque[Documento]] = defaultdict(deque)
+            for documento in consulta.only(
+                "id", "conteudo", "metadata", "ordem"
+            ).order_by("ordem", "id"):
+                existentes[hash_conteudo(documento.conteudo or "")].append(
+                    documento
+                )
+
+            novos: list[Documento] = []
+            alterados: list[Documento] = []
+            mantidos: list[Documento] = []
+            for ordem, chunk in enumerate(chunks, start=1):
+                metadata = cast(dict[str, Any], chunk.metadata or {})
+                candidatos = existentes.get(hash_conteudo(chunk.page_content))
+                if not candidatos:
+                    novos.append(
+                        cls(
+                            treinamento_id=treinamento_id,
+                            conteudo=chunk.page_content,
+                            metadata=metadata,
+                            ordem=ordem,
+                        )
+                    )
+                    continue
+                documento = candidatos.popleft()
+                mantidos.append(documento)
+                if documento.ordem != ordem or documento.metadata != metadata:
+                    documento.ordem = ordem
+                    documento.metadata = metadata
+                    alterados.append(documento)
+
+            removidos = [
+                documento.pk
+                for restantes in existentes.values()
+                for documento in restantes
+            ]
+            if removidos:
+                cls.objects.filter(pk__in=removidos).delete()
+            if alterados:
+                cls.objects.bulk_update(alterados, ["ordem", "metadata"])
+            inseridos = cls.objects.bulk_create(novos)
+
+        pendentes = [
+            documento
+            for documento in mantidos
+            if documento.pk in sem_embedding
+        ] + inseridos
+        logger.info(
+            f"Treinamento {treinamento_id}: {len(inseridos)} documentos "
+            f"inseridos, {len(mantidos)} mantidos e {len(removidos)} removidos"
+        )
+        return SincronizacaoDocumentos(
+            pendentes, len(inseridos), len(mantidos), len(removidos)
+        )
@@ -0,0 +1,252 @@
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Self, override
+
+from django.db import models, transaction
+from django.utils import timezone
+from loguru import logger
+
+from smart_core_assistant_painel.modules.services import SERVICEHUB
+
+from .models_documento import LOTE_PROMOCAO, Documento
+
+_VALIDADE_DESTINO_SEGUNDOS: float = 60.0
+_destino_lock = threading.Lock()
+_destino_consultado_em: Optional[float] = None
+
+
+class ReprocessamentoEmbeddings(models.Model):
+    """
+    Progresso do reprocessamento dos embeddings dos documentos.
+
+    Registra o ponto de retomada do comando ``reprocessar_embeddings``, que
+    gera em ``Documento.embedding_sombra`` os embeddings do novo modelo.
+    Apenas um reprocessamento fica ativo (sem ``data_troca``) por vez.
+
+    O último reprocessamento concluído define a classe e o modelo dos
+    embeddings da busca: ``data_troca`` é registrada antes da promoção dos
+    embeddings sombra, feita em lotes, e ``aplicar_destino_busca`` faz os
+    embeddings de consulta seguirem esse registro, com precedência sobre
+    ``EMBEDDINGS_CLASS``/``EMBEDDINGS_MODEL``. Cada processo consulta o
+    registro no máximo a cada ``_VALIDADE_DESTINO_SEGUNDOS``; o processo
+    que faz a troca aplica o novo destino logo após o ``commit``.
+
+    Attributes:
+        embeddings_class: Classe de embeddings de destino
+        modelo: Modelo de embeddings de destino
+        ultimo_id: Maior ID de documento já processado
+        processados: Quantidade de documentos processados
+        data_inicio: Timestamp de início
+        data_atualizacao: Timestamp do último lote gravado
+        data_troca: Timestamp da troca para a coluna nova
+    """
+
+    id: models.AutoField = models.AutoField(
+        primary_key=True, help_text="Chave primária do registro"
+    )
+
+    embeddings_class: models.CharField[str] = models.CharField(
+        max_length=128,
+        help_text="Classe de embeddings de destino",
+    )
+
+    modelo: models.CharField[str] = models.CharField(
+        max_length=128,
+        blank=True,
+        default="",
+        help_text="Modelo de embeddings de destino",
+    )
+
+    ultimo_id: models.PositiveBigIntegerField[int] = (
+        models.PositiveBigIntegerField(
+            default=0,
+            help_text="Maior ID de documento já processado",
+        )
+    )
+
+    processados: models.PositiveIntegerField[int] = (
+        models.PositiveIntegerField(
+            default=0,
+            help_text="Quantidade de documentos processados",
+        )
+    )
+
+    data_inicio: models.DateTimeField[datetime] = models.DateTimeField(
+        auto_now_add=True,
+        help_text="Data de início do reprocessamento",
+    )
+
+    data_atualizacao: models.DateTimeField[datetime] = models.DateTimeField(
+        auto_now=True,
+        help_text="Data do último lote gravado",
+    )
+
+    data_troca: models.DateTimeField[datetime | None] = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Data da troca para os embeddings do novo modelo",
+    )
+
+    class Meta:
+        verbose_name: str = "Reprocessamento de Embeddings"
+        verbose_name_plural: str = "Reprocessamentos de Embeddings"
+        ordering: list[str] = ["-data_inicio"]
+
+    @override
+    def __str__(self) -> str:
+        return f"{self.embeddings_class} ({self.modelo}): {self.processados}"
+
+    @classmethod
+    def ativo(cls) -> Optional[Self]:
+        """Retorna o reprocessamento ainda não concluído, se houver."""
+        return cls.objects.filter(data_troca__isnull=True).first()
+
+    @classmethod
+    def retomar(cls, embeddings_class: str, modelo: str) -> Self:
+        """Retoma o reprocessamento ativo ou inicia um novo.
+
+        Args:
+            embeddings_class: Classe de embeddings de destino
+            modelo: Modelo de embeddings de destino
+
+        Returns:
+            O reprocessamento ativo
+
+        Raises:
+            ValueError: Se o reprocessamento ativo tem outro destino
+        """
+        progresso = cls.ativo()
+        if progresso is None:
+            return cls.objects.create(
+                embeddings_class=embeddings_class, modelo=modelo
+            )
+        if (progresso.embeddings_class, progresso.modelo) != (
+            embeddings_class,
+            modelo,
+        ):
+            raise ValueError(
+                "Reprocessamento em andamento para "
+                f"{progresso.embeddings_class} ({progresso.modelo})"
+            )
+        return progresso
+
+    @classmethod
+    def descartar(cls) -> int:
+        """Descarta o reprocessamento ativo e os embeddings já gerados.
+
+        Returns:
+            Quantidade de documentos cujo embedding sombra foi descartado
+        """
+        with transaction.atomic():
+            cls.objects.filter(data_troca__isnull=True).delete()
+            return Documento.objects.filter(
+                embedding_sombra__isnull=False
+            ).update(embedding_sombra=None)
+
+    def avancar(self, ultimo_id: int, quantidade: int) -> None:
+        """Registra um lote processado.
+
+        Args:
+            ultimo_id: Maior ID de documento do lote
+            quantidade: Documentos do lote
+        """
+        self.ultimo_id = max(self.ultimo_id, ultimo_id)
+        self.processados += quantidade
+        self.save(
+            update_fields=["ultimo_id", "processados", "data_atualizacao"]
+        )
+
+    def trocar(self, tamanho_lote: int = LOTE_PROMOCAO) -> int:
+        """Conclui o reprocessamento e promove os embeddings sombra.
+
+        A conclusão muda o destino da busca em um ``commit`` rápido, e este
+        processo passa a gerar as consultas com o novo modelo em seguida.
+        Os documentos são promovidos depois, em lotes
+        (``Documento.promover_embeddings_sombra``); se a promoção for
+        interrompida, ``concluir_troca`` a retoma.
+
+        Args:
+            tamanho_lote: Documentos por lote da promoção
+
+        Returns:
+            Quantidade de documentos trocados
+
+        Raises:
+            ValueError: Se algum documento vetorizado não tem embedding
+                sombra
+        """
+        with transaction.atomic():
+            pendentes = Documento.sem_embedding_sombra().count()
+            if pendentes:
+                raise ValueError(
+                    f"{pendentes} documentos sem embedding do novo modelo"
+                )
+            self.data_troca = timezone.now()
+            self.save(update_fields=["data_troca", "data_atualizacao"])
+            transaction.on_commit(
+                lambda: type(self).aplicar_destino_busca(forcar=True)
+            )
+        return Documento.promover_embeddings_sombra(tamanho_lote)
+
+    @classmethod
+    def concluir_troca(cls, tamanho_lote: int = LOTE_PROMOCAO) -> int:
+        """Promove os embeddings sombra de uma troca interrompida.
+
+        Sem reprocessamento ativo, embeddings sombra só restam de uma
+        promoção que não chegou ao último lote.
+
+        Args:
+            tamanho_lote: Documentos por lote da promoção
+
+        Returns:
+            Quantidade de documentos promovidos
+        """
+        if cls.ativo() is not None:
+            return 0
+        return Documento.promover_embeddings_sombra(tamanho_lote)
+
+    @classmethod
+    def destino_busca(cls) -> Optional[tuple[str, str]]:
+        """Retorna a classe e o modelo da última troca concluída, se houver."""
+        return (
+            cls.objects.filter(data_troca__isnull=False)
+            .order_by("-data_troca")
+            .values_list("embeddings_class", "modelo")
+            .first()
+        )
+
+    @classmethod
+    def aplicar_destino_busca(cls, forcar: bool = False) -> None:
+        """Gera os embeddings de consulta com o modelo dos documentos.
+
+        Chamado antes de vetorizar mensagens e documentos. O destino é
+        consultado no banco no máximo a cada
+        ``_VALIDADE_DESTINO_SEGUNDOS``; nas demais chamadas vale o último
+        destino aplicado. Sem troca registrada, valem
+        ``EMBEDDINGS_CLASS``/``EMBEDDINGS_MODEL``; se o banco estiver
+        indisponível, o destino atual é mantido.
+
+        Args:
+            forcar: Consulta o banco mesmo dentro da validade
+        """
+        global _destino_consultado_em
+        with _destino_lock:
+            agora = time.monotonic()
+            if (
+                not forcar
+                and _destino_consultado_em is not None
+                and agora - _destino_consultado_em
+                < _VALIDADE_DESTINO_SEGUNDOS
+            ):
+                return
+            try:
+                destino = cls.destino_busca()
+            except Exception as e:
+                logger.warning(f"Destino dos embeddings indisponível: {e}")
+                return
+            _destino_consultado_em = agora
+            if destino is None:
+                SERVICEHUB.set_embeddings_target(None)
+            else:
+                SERVICEHUB.set_embeddings_target(*destino)
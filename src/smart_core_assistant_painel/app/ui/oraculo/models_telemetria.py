@@ -0,0 +1,156 @@
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Optional, override
+
+from django.db import models
+from django.db.models.indexes import Index
+
+from smart_core_assistant_painel.modules.ai_engine import RegistroTelemetria
+
+
+class MetricaLlm(models.Model):
+    """
+    Medição de uma chamada ao LLM ou ao modelo de embeddings.
+
+    Os registros são gravados em lote pela telemetria do motor de IA e
+    agregados por funcionalidade e dia (p50/p95 de latência, tokens) pelo
+    comando ``relatorio_telemetria_llm``.
+
+    Attributes:
+        funcionalidade: Funcionalidade que fez a chamada
+        tipo: 'llm' ou 'embedding'
+        modelo: Nome do modelo
+        data: Início da chamada
+        latencia: Duração total em segundos
+        tempo_primeiro_token: Segundos até o primeiro token (streaming)
+        tokens_prompt: Tokens de entrada informados pelo provedor
+        tokens_resposta: Tokens de saída informados pelo provedor
+        sucesso: Se a chamada terminou sem erro
+        erro: Descrição do erro, se houver
+    """
+
+    id: models.BigAutoField = models.BigAutoField(
+        primary_key=True, help_text="Chave primária do registro"
+    )
+
+    funcionalidade: models.CharField[str] = models.CharField(
+        max_length=64,
+        help_text="Funcionalidade que fez a chamada",
+    )
+
+    tipo: models.CharField[str] = models.CharField(
+        max_length=16,
+        help_text="Tipo da chamada ('llm' ou 'embedding')",
+    )
+
+    modelo: models.CharField[str] = models.CharField(
+        max_length=128,
+        blank=True,
+        default="",
+        help_text="Nome do modelo",
+    )
+
+    data: models.DateTimeField[datetime] = models.DateTimeField(
+        help_text="Início da chamada",
+    )
+
+    latencia: models.FloatField[float] = models.FloatField(
+        help_text="Duração total da chamada em segundos",
+    )
+
+    tempo_primeiro_token: models.FloatField[Optional[float]] = (
+        models.FloatField(
+            null=True,
+            blank=True,
+            help_text="Segundos até o primeiro token (apenas streaming)",
+        )
+    )
+
+    tokens_prompt: models.PositiveIntegerField[Optional[int]] = (
+        models.PositiveIntegerField(
+            null=True,
+            blank=True,
+            help_text="Tokens de entrada informados pelo provedor",
+        )
+    )
+
+    tokens_resposta: models.PositiveIntegerField[Optional[int]] = (
+        models.PositiveIntegerField(
+            null=True,
+            blank=True,
+            help_text="Tokens de saída informados pelo provedor",
+        )
+    )
+
+    sucesso: models.BooleanField[bool] = models.BooleanField(
+        default=True,
+        help_text="Se a chamada terminou sem erro",
+    )
+
+    erro: models.CharField[str] = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        help_text="Descrição do erro, se houver",
+    )
+
+    class Meta:
+        verbose_name: str = "Métrica de LLM"
+        verbose_name_plural: str = "Métricas de LLM"
+        ordering: list[str] = ["-data"]
+        indexes: list[Index] = [
+            models.Index(fields=["data", "funcionalidade"]),
+        ]
+
+    @override
+    def __str__(self) -> str:
+        return (
+            f"{self.funcionalidade} ({self.modelo}): "
+            f"{self.latencia * 1000:.0f}ms"
+        )
+
+    @classmethod
+    def registrar_lote(cls, registros: list[RegistroTelemetria]) -> None:
+        """Grava um lote de registros da telemetria com uma única consulta.
+
+        Args:
+            registros: Registros acumulados pela telemetria
+        """
+        cls.objects.bulk_create(
+            [
+                cls(
+                    funcionalidade=registro.funcionalidade[:64],
+                    tipo=registro.tipo,
+                    modelo=registro.modelo[:128],
+                    data=registro.data,
+                    latencia=registro.latencia,
+                    tempo_primeiro_token=registro.tempo_primeiro_token,
+                    tokens_prompt=registro.tokens_prompt,
+                    tokens_resposta=registro.tokens_resposta,
+                    sucesso=registro.sucesso,
+                    erro=registro.erro,
+                )
+                for registro in registros
+            ]
+        )
+
+    @classmethod
+    def registros(
+        cls, desde: Optional[datetime] = None
+    ) -> Iterator[RegistroTelemetria]:
+        """Percorre os registros gravados, opcionalmente a partir de uma data.
+
+        Args:
+            desde: Data inicial (inclusiva)
+
+        Yields:
+            Os registros no formato da telemetria
+        """
+        consulta = cls.objects.all()
+        if desde is not None:
+            consulta = consulta.filter(data__gte=desde)
+        campos = RegistroTelemetria._fields
+        for valores in (
+            consulta.order_by().values_list(*campos).iterator(chunk_size=2000)
+        ):
+            yield RegistroTelemetria(*valores)
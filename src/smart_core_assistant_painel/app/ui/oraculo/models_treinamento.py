@@ -1,6 +1,6 @@
 import re
 from datetime import datetime
-from typing import override
+from typing import Optional, override
 
 from django.core.exceptions import ValidationError
 from django.db import models
@@ -58,6 +58,10 @@ class Treinamento(models.Model):
         conteudo: Conteúdo completo do treinamento (antes da divisão em chunks)
         treinamento_finalizado: Status de finalização do treinamento
         treinamento_vetorizado: Status de vetorização do treinamento
+        texto_melhorado: Última sugestão de melhoria gerada pela IA
+        hash_melhoria: Chave do conteúdo que gerou a sugestão de melhoria
+        versao_melhoria: Versão da configuração do LLM que gerou a sugestão
+            de melhoria (vazia se desconhecida)
         data_criacao: Data de criação automática do treinamento
         data_atualizacao: Data da última atualização
     """
@@ -92,6 +96,23 @@ class Treinamento(models.Model):
         default=False,
         help_text="Indica se o treinamento foi vetorizado com sucesso",
     )
+    texto_melhorado: models.TextField[str | None] = models.TextField(
+        blank=True,
+        null=True,
+        help_text="Última sugestão de melhoria do conteúdo gerada pela IA",
+    )
+    hash_melhoria: models.CharField[str] = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="Hash do conteúdo da sugestão de melhoria",
+    )
+    versao_melhoria: models.CharField[str] = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="Hash do prompt e do modelo da sugestão de melhoria",
+    )
     data_criacao: models.DateTimeField[datetime] = models.DateTimeField(
         auto_now_add=True,
         help_text="Data de criação do treinamento",
@@ -131,6 +152,48 @@ class Treinamento(models.Model):
                 message={"grupo": "O grupo não pode ser igual à tag."}
             )
 
+    def melhoria_armazenada(
+        self, chave: str, versao: Optional[str] = None
+    ) -> Optional[str]:
+        """Retorna a sugestão de melhoria armazenada, se ainda for válida.
+
+        Args:
+            chave (str): Chave do conteúdo atual.
+            versao (Optional[str]): Versão da configuração atual. Se
+                omitida, qualquer sugestão para o conteúdo é válida.
+
+        Returns:
+            Optional[str]: O texto melhorado ou None se ausente ou gerado
+                para outro conteúdo (ou outra versão, se informada).
+        """
+        if not self.texto_melhorado or self.hash_melhoria != chave:
+            return None
+        if versao is not None and self.versao_melhoria != versao:
+            return None
+        return self.texto_melhorado
+
+    def armazenar_melhoria(
+        self, chave: str, versao: str, texto_melhorado: str
+    ) -> None:
+        """Persiste a sugestão de melhoria gerada para o conteúdo atual.
+
+        Args:
+            chave (str): Chave do conteúdo atual.
+            versao (str): Versão da configuração que gerou o texto (vazia
+                se desconhecida).
+            texto_melhorado (str): O texto melhorado.
+        """
+        self.texto_melhorado = texto_melhorado
+        self.hash_melhoria = chave
+        self.versao_melhoria = versao
+        self.save(
+            update_fields=[
+                "texto_melhorado",
+                "hash_melhoria",
+                "versao_melhoria",
+            ]
+        )
+
     @override
     def __str__(self) -> str:
         """Retorna representação string do objeto.
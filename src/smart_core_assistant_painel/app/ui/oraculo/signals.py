@@ -12,12 +12,20 @@ from django.db.models.signals import post_save, pre_delete
 from django.dispatch import Signal, receiver
 from django.utils import timezone
 from django_q.models import Schedule
+from django_q.signals import post_spawn
 from django_q.tasks import async_task  # type: ignore
 from langchain_core.documents.base import Document
 from loguru import logger
 
+from smart_core_assistant_painel.app.ui.oraculo.apps import (
+    aquecer_embeddings,
+)
 from smart_core_assistant_painel.app.ui.oraculo.models_documento import (
     Documento,
+    truncar_prefixo,
+)
+from smart_core_assistant_painel.app.ui.oraculo.models_reprocessamento_embeddings import (
+    ReprocessamentoEmbeddings,
 )
 from smart_core_assistant_painel.app.ui.oraculo.models_treinamento import (
     Treinamento,
@@ -27,6 +35,17 @@ from smart_core_assistant_painel.modules.services import SERVICEHUB
 mensagem_bufferizada = Signal()
 
 
+@receiver(post_spawn)
+def signal_aquecer_embeddings_worker(sender: Any, **kwargs: Any) -> None:
+    """Aquece o cliente de embeddings em cada worker do Django-Q.
+
+    Args:
+        sender (Any): O remetente do signal.
+        **kwargs (Any): Argumentos de palavra-chave adicionais.
+    """
+    aquecer_embeddings()
+
+
 @receiver(post_save, sender=Treinamento)
 def signals_gerar_documentos_treinamento(
     sender: Any, instance: Treinamento, created: bool, **kwargs: Any
@@ -161,6 +180,7 @@ def __gerar_embedding_documento(documento_id: int) -> None:
             logger.warning(f"Documento {documento_id} sem conteúdo válido")
             return
 
+        ReprocessamentoEmbeddings.aplicar_destino_busca()
         embedding_vector: list[float] = FeaturesCompose.generate_embeddings(
             text=documento.conteudo
         )
@@ -168,7 +188,8 @@ def __gerar_embedding_documento(documento_id: int) -> None:
         if embedding_vector:
             # Salva o embedding no documento
             Documento.objects.filter(id=documento_id).update(
-                embedding=embedding_vector
+                embedding=embedding_vector,
+                embedding_prefixo=truncar_prefixo(embedding_vector),
             )
             logger.info(
                 f"Embedding gerado e salvo para documento {documento_id}"
@@ -186,6 +207,60 @@ def __gerar_embedding_documento(documento_id: int) -> None:
         )
 
 
+def __vetorizar_documentos(documentos: list[Documento]) -> list[Documento]:
+    """Gera e salva os embeddings dos documentos em lotes.
+
+    Cada lote de ``SERVICEHUB.EMBEDDINGS_BATCH_SIZE`` documentos usa uma
+    única chamada a ``embed_documents`` e um único ``bulk_update``, que não
+    dispara ``signals_embeddings_documento``. Um lote com falha é registrado
+    e os seus documentos ficam sem embedding; os demais lotes seguem.
+
+    Args:
+        documentos: Documentos sem embedding
+
+    Returns:
+        Documentos com conteúdo que ficaram sem embedding
+    """
+    from smart_core_assistant_painel.modules.ai_engine.features.features_compose import (
+        FeaturesCompose,
+    )
+
+    pendentes = [
+        documento
+        for documento in documentos
+        if documento.conteudo and documento.conteudo.strip()
+    ]
+    if len(pendentes) < len(documentos):
+        logger.warning(
+            f"{len(documentos) - len(pendentes)} documentos sem conteúdo "
+            "para embedding"
+        )
+
+    ReprocessamentoEmbeddings.aplicar_destino_busca()
+    tamanho_lote = max(1, SERVICEHUB.EMBEDDINGS_BATCH_SIZE)
+    falhas: list[Documento] = []
+    for inicio in range(0, len(pendentes), tamanho_lote):
+        lote = pendentes[inicio : inicio + tamanho_lote]
+        try:
+            vetores = FeaturesCompose.generate_embeddings_lote(
+                [cast(str, documento.conteudo) for documento in lote],
+                tamanho_lote=len(lote),
+            )
+            for documento, vetor in zip(lote, vetores):
+                documento.embedding = vetor
+                documento.embedding_prefixo = truncar_prefixo(vetor)
+            Documento.objects.bulk_update(
+                lote, ["embedding", "embedding_prefixo"]
+            )
+        except Exception as e:
+            falhas.extend(lote)
+            logger.error(
+                f"Erro ao gerar embeddings dos documentos "
+                f"{lote[0].pk} a {lote[-1].pk}: {e}"
+            )
+    return falhas
+
+
 def __gerar_documentos(instance_id: int) -> None:
     try:
         instance: Treinamento = Treinamento.objects.get(id=instance_id)
@@ -206,9 +281,24 @@ def __gerar_documentos(instance_id: int) -> None:
         )
         from .models_documento import Documento
 
-        Documento.criar_documentos_de_chunks(
+        # Reaproveita os documentos cujo conteúdo não mudou
+        sincronizacao = Documento.sincronizar_chunks(
             chunks=chunks, treinamento_id=instance_id
         )
+        falhas = __vetorizar_documentos(sincronizacao.pendentes)
+        if falhas:
+            # Permanece não vetorizado para ser reprocessado; os documentos
+            # já vetorizados são mantidos pela sincronização
+            logger.error(
+                f"{len(falhas)} documentos do treinamento {instance_id} "
+                "ficaram sem embedding; o treinamento não foi marcado como "
+                "vetorizado"
+            )
+            return
+        logger.info(
+            "Embeddings gerados para os documentos pendentes do "
+            f"treinamento {instance_id}"
+        )
         instance.treinamento_vetorizado = True
         instance.save()
         logger.info("Documentos gerados: %s", instance_id)
@@ -0,0 +1,141 @@
+"""Testes para a busca de documentos em índices quantizados."""
+
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..models_documento import (
+    Documento,
+    quantizar_binario,
+    truncar_prefixo,
+)
+from ..models_treinamento import Treinamento
+
+_MODELS = "smart_core_assistant_painel.app.ui.oraculo.models_documento"
+
+_QUERY = [0.5, -1.0, 0.0, 0.25]
+
+
+class TestConsultaSimilares(TestCase):
+    """Testes da consulta em duas etapas."""
+
+    def _sql(
+        self, quantizacao: str, top_k: int = 5, candidatos: int = 40
+    ) -> str:
+        return str(
+            Documento.consulta_similares(
+                _QUERY, top_k, quantizacao, candidatos
+            ).query
+        )
+
+    def test_quantizacao_binaria_da_query(self) -> None:
+        self.assertEqual(quantizar_binario(_QUERY), "1001")
+
+    def test_busca_exata_sem_subconsulta(self) -> None:
+        sql = self._sql("")
+
+        self.assertNotIn("IN (SELECT", sql)
+        self.assertIn('"embedding" <=>', sql)
+
+    def test_halfvec_reordena_candidatos(self) -> None:
+        sql = self._sql("halfvec")
+
+        self.assertIn("halfvec(1024)", sql)
+        self.assertIn("LIMIT 40)", sql)
+        # A ordenação final usa a distância exata em float32
+        self.assertIn('("oraculo_documento"."embedding" <=>', sql)
+        self.assertTrue(sql.endswith("LIMIT 5"))
+
+    def test_binario_usa_distancia_de_hamming(self) -> None:
+        sql = self._sql("binary", top_k=10, candidatos=3)
+
+        self.assertIn("binary_quantize", sql)
+        self.assertIn("bit(1024)) <~>", sql)
+        # Nunca menos candidatos que documentos pedidos
+        self.assertIn("LIMIT 10)", sql)
+
+    def test_prefixo_reordena_candidatos(self) -> None:
+        sql = self._sql("prefix", candidatos=30)
+
+        self.assertIn('U0."embedding_prefixo" <=>', sql)
+        self.assertIn("LIMIT 30)", sql)
+        self.assertTrue(sql.endswith("LIMIT 5"))
+
+    def test_quantizacao_desconhecida_usa_busca_exata(self) -> None:
+        with patch(f"{_MODELS}.logger") as mock_logger:
+            sql = self._sql("int8")
+
+        self.assertNotIn("IN (SELECT", sql)
+        mock_logger.warning.assert_called_once()
+
+
+class TestBuscarSimilares(TestCase):
+    """Testes da execução da busca com a configuração do ServiceHub."""
+
+    def test_usa_configuracao_do_service_hub(self) -> None:
+        with (
+            patch(f"{_MODELS}.SERVICEHUB") as mock_hub,
+            patch.object(
+                Documento, "consulta_similares", return_value=[]
+            ) as mock_consulta,
+        ):
+            mock_hub.VECTOR_SEARCH_QUANTIZATION = "binary"
+            mock_hub.VECTOR_SEARCH_RERANK_CANDIDATES = 10
+
+            self.assertEqual(Documento.buscar_similares(_QUERY), [])
+
+        mock_consulta.assert_called_once_with(_QUERY, 5, "binary", 10)
+
+    def test_benchmark_requer_postgresql(self) -> None:
+        saida = StringIO()
+
+        call_command("benchmark_quantizacao_embeddings", stdout=saida)
+
+        self.assertIn("PostgreSQL", saida.getvalue())
+
+
+class TestPrefixoEmbedding(TestCase):
+    """Testes do prefixo do embedding e do seu preenchimento."""
+
+    def test_truncar_prefixo(self) -> None:
+        vetor = [float(i) for i in range(1024)]
+
+        self.assertEqual(truncar_prefixo(vetor), vetor[:256])
+        self.assertEqual(truncar_prefixo(_QUERY), _QUERY)
+
+    def test_preenche_documentos_sem_prefixo(self) -> None:
+        treinamento = Treinamento.objects.create(
+            tag="faq", grupo="geral", conteudo="Conteúdo"
+        )
+        vetores = [[float(i + j) for j in range(1024)] for i in range(3)]
+        Documento.objects.bulk_create(
+            [
+                Documento(
+                    treinamento=treinamento,
+                    conteudo=f"trecho {i}",
+                    embedding=vetor,
+                    ordem=i,
+                )
+                for i, vetor in enumerate(vetores)
+            ]
+            + [Documento(treinamento=treinamento, conteudo="sem embedding")]
+        )
+        saida = StringIO()
+
+        call_command("preencher_embedding_prefixo", lote=2, stdout=saida)
+
+        self.assertIn("Prefixo preenchido em 3 documentos.", saida.getvalue())
+        prefixos = [
+            list(documento.embedding_prefixo)
+            for documento in Documento.objects.filter(
+                embedding__isnull=False
+            ).order_by("id")
+        ]
+        self.assertEqual(prefixos, [vetor[:256] for vetor in vetores])
+        self.assertTrue(
+            Documento.objects.filter(
+                embedding__isnull=True, embedding_prefixo__isnull=True
+            ).exists()
+        )
@@ -0,0 +1,167 @@
+"""Testes para o cache de embeddings persistido em banco."""
+
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+import numpy as np
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from smart_core_assistant_painel.modules.ai_engine import (
+    EMBEDDINGS_CACHE,
+    FeaturesCompose,
+    HashEmbeddings,
+)
+from smart_core_assistant_painel.modules.ai_engine.utils.cache_embeddings import (
+    codificar_vetor,
+    hash_conteudo,
+)
+
+from ..models_cache_embeddings import CacheEmbedding
+
+_CACHE = "smart_core_assistant_painel.modules.ai_engine.utils.cache_embeddings"
+_EMBEDDINGS = HashEmbeddings(latencia_ms=0)
+
+
+class TestCacheEmbedding(TestCase):
+    """Testes do armazenamento dos vetores."""
+
+    def setUp(self) -> None:
+        # Descarta acertos pendentes de outros testes
+        CacheEmbedding.gravar_acertos()
+
+    def test_gravar_e_buscar(self) -> None:
+        CacheEmbedding.gravar(
+            "HashEmbeddings", "m", {"a" * 64: codificar_vetor([1.0, 2.0])}
+        )
+        # Hash repetido é ignorado
+        CacheEmbedding.gravar(
+            "HashEmbeddings", "m", {"a" * 64: codificar_vetor([9.0, 9.0])}
+        )
+
+        encontrados = CacheEmbedding.buscar(
+            "HashEmbeddings", "m", ["a" * 64, "b" * 64]
+        )
+
+        self.assertEqual(encontrados, {"a" * 64: codificar_vetor([1.0, 2.0])})
+        self.assertEqual(CacheEmbedding.buscar("Outra", "m", ["a" * 64]), {})
+        self.assertEqual(CacheEmbedding.gravar_acertos(), 1)
+        entrada = CacheEmbedding.objects.get()
+        self.assertEqual((entrada.dimensoes, entrada.acertos), (2, 1))
+
+    def test_acertos_acumulados_e_gravados_em_lote(self) -> None:
+        CacheEmbedding.gravar(
+            "HashEmbeddings",
+            "m",
+            {
+                "a" * 64: codificar_vetor([1.0]),
+                "b" * 64: codificar_vetor([2.0]),
+            },
+        )
+        CacheEmbedding.objects.update(
+            ultimo_acesso=timezone.now() - timedelta(days=1)
+        )
+
+        with self.assertNumQueries(3):
+            CacheEmbedding.buscar("HashEmbeddings", "m", ["a" * 64])
+            CacheEmbedding.buscar("HashEmbeddings", "m", ["a" * 64, "b" * 64])
+            CacheEmbedding.buscar("HashEmbeddings", "m", ["a" * 64])
+        self.assertEqual(
+            sorted(CacheEmbedding.objects.values_list("acertos", flat=True)),
+            [0, 0],
+        )
+
+        # Um UPDATE por quantidade distinta de acertos
+        with self.assertNumQueries(2):
+            self.assertEqual(CacheEmbedding.gravar_acertos(), 2)
+        acertos = dict(
+            CacheEmbedding.objects.values_list("hash_conteudo", "acertos")
+        )
+        self.assertEqual(acertos, {"a" * 64: 3, "b" * 64: 1})
+        self.assertFalse(
+            CacheEmbedding.objects.filter(
+                ultimo_acesso__lt=timezone.now() - timedelta(hours=1)
+            ).exists()
+        )
+        self.assertEqual(CacheEmbedding.gravar_acertos(), 0)
+
+    def test_estatisticas_e_remocao(self) -> None:
+        CacheEmbedding.gravar(
+            "HashEmbeddings",
+            "m",
+            {
+                "a" * 64: codificar_vetor([0.0] * 1024),
+                "b" * 64: codificar_vetor([0.0] * 1024),
+            },
+        )
+        CacheEmbedding.buscar("HashEmbeddings", "m", ["a" * 64])
+        CacheEmbedding.gravar_acertos()
+        CacheEmbedding.objects.filter(hash_conteudo="b" * 64).update(
+            ultimo_acesso=timezone.now() - timedelta(days=40)
+        )
+
+        [estatistica] = CacheEmbedding.estatisticas()
+        self.assertEqual(estatistica[2:], (2, 2 * 1024 * 4, 1))
+
+        self.assertEqual(CacheEmbedding.remover_sem_acesso(30), 1)
+        self.assertEqual(CacheEmbedding.objects.count(), 1)
+
+    def test_relatorio(self) -> None:
+        CacheEmbedding.gravar(
+            "HashEmbeddings", "m", {"a" * 64: codificar_vetor([0.0] * 8)}
+        )
+        CacheEmbedding.buscar("HashEmbeddings", "m", ["a" * 64])
+        saida = StringIO()
+
+        call_command("relatorio_cache_embeddings", stdout=saida)
+
+        self.assertIn("HashEmbeddings", saida.getvalue())
+        self.assertIn("50.0%", saida.getvalue())
+
+
+class TestGeracaoComCache(TestCase):
+    """Testes da geração de embeddings consultando o banco."""
+
+    def setUp(self) -> None:
+        patcher = patch(f"{_CACHE}.SERVICEHUB")
+        mock_hub = patcher.start()
+        self.addCleanup(patcher.stop)
+        mock_hub.EMBEDDINGS_CLASS = "HashEmbeddings"
+        mock_hub.EMBEDDINGS_MODEL = ""
+        mock_hub.EMBEDDINGS_CACHE_FEATURES = frozenset(
+            {"generate_embeddings", "generate_embeddings_lote"}
+        )
+        EMBEDDINGS_CACHE.configurar_armazenamento(CacheEmbedding)
+
+        patcher_lotes = patch.object(
+            FeaturesCompose,
+            "_gerar_embeddings_em_lotes",
+            side_effect=lambda textos, tamanho: _EMBEDDINGS.embed_documents(
+                textos
+            ),
+        )
+        self.mock_lotes = patcher_lotes.start()
+        self.addCleanup(patcher_lotes.stop)
+
+    def test_trechos_repetidos_nao_sao_gerados_novamente(self) -> None:
+        primeiro = FeaturesCompose.generate_embeddings_lote(
+            ["boas-vindas", "horário"]
+        )
+        segundo = FeaturesCompose.generate_embeddings_lote(
+            ["horário", "boas-vindas", "endereço"]
+        )
+
+        self.assertEqual(
+            [c.args[0] for c in self.mock_lotes.call_args_list],
+            [["boas-vindas", "horário"], ["endereço"]],
+        )
+        # Vetores do cache voltam em float32
+        np.testing.assert_allclose(segundo[:2], primeiro[::-1], rtol=1e-6)
+        self.assertEqual(CacheEmbedding.objects.count(), 3)
+        self.assertTrue(
+            CacheEmbedding.objects.filter(
+                hash_conteudo=hash_conteudo("endereço")
+            ).exists()
+        )
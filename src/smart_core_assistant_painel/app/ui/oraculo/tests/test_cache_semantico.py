@@ -0,0 +1,249 @@
+"""Testes para o cache semântico da análise prévia."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from smart_core_assistant_painel.modules.ai_engine import APMTuple
+
+from .. import cache_semantico, utils
+from ..models_cache_semantico import CacheAnaliseSemantica
+
+_MODULO = "smart_core_assistant_painel.app.ui.oraculo.cache_semantico"
+_VETOR = [0.1] * 1024
+
+
+class TestCacheSemantico(TestCase):
+    """Testes do fluxo de busca e registro do cache semântico."""
+
+    def setUp(self) -> None:
+        """Configuração inicial."""
+        cache.clear()
+        patcher_hub = patch(f"{_MODULO}.SERVICEHUB")
+        self.mock_hub = patcher_hub.start()
+        self.addCleanup(patcher_hub.stop)
+        self.mock_hub.LLM_CACHE_FEATURES = frozenset(
+            {cache_semantico.FEATURE_CACHE_SEMANTICO}
+        )
+        self.mock_hub.SEMANTIC_CACHE_MAX_CHARS = 20
+        self.mock_hub.SEMANTIC_CACHE_MAX_DISTANCE = 0.08
+        self.mock_hub.SEMANTIC_CACHE_SAMPLE_RATE = 0.0
+        self.mock_hub.LLM_CACHE_MAX_ENTRIES = 2
+        self.mock_hub.VALID_ENTITY_TYPES = json.dumps(
+            {"entity_types": {"contato": {"email_contato": "E-mail"}}}
+        )
+
+        patcher_versao = patch(
+            f"{_MODULO}.FeaturesCompose.versao_analise_previa",
+            return_value="v1",
+        )
+        patcher_versao.start()
+        self.addCleanup(patcher_versao.stop)
+
+    def test_mensagem_elegivel(self) -> None:
+        self.assertTrue(cache_semantico.mensagem_elegivel("Bom dia!", {}))
+        self.assertFalse(
+            cache_semantico.mensagem_elegivel("x" * 21, {}),
+        )
+        self.assertFalse(
+            cache_semantico.mensagem_elegivel(
+                "Bom dia!", {"conteudo_mensagens": ["oi"]}
+            )
+        )
+        self.assertFalse(cache_semantico.mensagem_elegivel("!!", {}))
+
+    def test_busca_desabilitada_sem_feature(self) -> None:
+        self.mock_hub.LLM_CACHE_FEATURES = frozenset()
+        with patch.object(CacheAnaliseSemantica, "buscar_similar") as busca:
+            resultado = cache_semantico.buscar_analise_semantica(
+                "oi", _VETOR, {}
+            )
+
+        self.assertIsNone(resultado)
+        busca.assert_not_called()
+
+    def test_busca_sem_embedding(self) -> None:
+        with patch.object(CacheAnaliseSemantica, "buscar_similar") as busca:
+            self.assertIsNone(
+                cache_semantico.buscar_analise_semantica("oi", None, {})
+            )
+        busca.assert_not_called()
+
+    def test_acerto_retorna_analise_e_registra_metricas(self) -> None:
+        entrada = CacheAnaliseSemantica.objects.create(
+            mensagem="bom dia",
+            embedding=_VETOR,
+            versao="v1",
+            intent_detectado=[{"saudacao": "bom dia"}],
+        )
+        with patch.object(
+            CacheAnaliseSemantica,
+            "buscar_similar",
+            side_effect=[(entrada, 0.01), None],
+        ) as busca:
+            acerto = cache_semantico.buscar_analise_semantica(
+                "Bom dia!!", _VETOR, {}
+            )
+            falha = cache_semantico.buscar_analise_semantica(
+                "tchau", _VETOR, {}
+            )
+
+        self.assertEqual(
+            acerto,
+            APMTuple(intent_types=[{"saudacao": "bom dia"}], entity_types=[]),
+        )
+        self.assertIsNone(falha)
+        busca.assert_called_with(
+            query_vec=_VETOR, versao="v1", distancia_maxima=0.08
+        )
+        entrada.refresh_from_db()
+        self.assertEqual(entrada.acertos, 1)
+        self.assertIsNotNone(entrada.ultimo_acerto)
+
+        stats = cache_semantico.estatisticas_cache_semantico()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    @patch(f"{_MODULO}.async_task")
+    def test_acerto_amostrado_agenda_verificacao(
+        self, mock_async_task: MagicMock
+    ) -> None:
+        self.mock_hub.SEMANTIC_CACHE_SAMPLE_RATE = 1.0
+        entrada = MagicMock(id=7, intent_detectado=[])
+        with patch.object(
+            CacheAnaliseSemantica,
+            "buscar_similar",
+            return_value=(entrada, 0.02),
+        ):
+            cache_semantico.buscar_analise_semantica("oi", _VETOR, {})
+
+        mock_async_task.assert_called_once_with(
+            f"{_MODULO}.verificar_falso_acerto", 7, "oi", 0.02
+        )
+        self.assertEqual(
+            cache_semantico.estatisticas_cache_semantico()["amostras"], 1
+        )
+
+    def test_busca_desabilitada_com_entidades_de_texto_livre(self) -> None:
+        self.mock_hub.VALID_ENTITY_TYPES = json.dumps(
+            {"entity_types": {"cliente": {"nome_cliente": "Nome"}}}
+        )
+        with patch.object(CacheAnaliseSemantica, "buscar_similar") as busca:
+            resultado = cache_semantico.buscar_analise_semantica(
+                "oi", _VETOR, {}
+            )
+
+        self.assertIsNone(resultado)
+        busca.assert_not_called()
+        self.assertFalse(cache_semantico.mensagem_elegivel("oi", {}))
+
+        # O registro também é ignorado: a entrada nunca seria lida
+        cache_semantico.registrar_analise_semantica(
+            "oi", _VETOR, {}, APMTuple(intent_types=[], entity_types=[])
+        )
+        self.assertFalse(CacheAnaliseSemantica.objects.exists())
+
+    @patch(f"{_MODULO}.FeaturesCompose.analise_previa_mensagem")
+    @patch(
+        "smart_core_assistant_painel.app.ui.oraculo.utils."
+        "classificador_habilitado",
+        return_value=False,
+    )
+    @patch("smart_core_assistant_painel.app.ui.oraculo.utils.SERVICEHUB")
+    def test_analise_previa_nao_aguarda_embedding_sem_elegibilidade(
+        self,
+        mock_hub_utils: MagicMock,
+        mock_classificador: MagicMock,
+        mock_analise: MagicMock,
+    ) -> None:
+        mock_hub_utils.RULE_FAST_PATH_MIN_CONFIDENCE = 2.0
+        self.mock_hub.VALID_ENTITY_TYPES = json.dumps(
+            {"entity_types": {"cliente": {"nome_cliente": "Nome"}}}
+        )
+        mock_analise.return_value = APMTuple(intent_types=[], entity_types=[])
+        obter_query_vec = MagicMock(return_value=_VETOR)
+
+        utils._analise_previa("oi", None, {}, obter_query_vec)
+
+        obter_query_vec.assert_not_called()
+        mock_analise.assert_called_once()
+
+    @patch(f"{_MODULO}._INTERVALO_PODA", 1)
+    def test_registrar_respeita_limite_por_versao(self) -> None:
+        for texto in ("oi", "ola", "bom dia"):
+            cache_semantico.registrar_analise_semantica(
+                texto,
+                _VETOR,
+                {},
+                APMTuple(intent_types=[{"saudacao": texto}], entity_types=[]),
+            )
+
+        mensagens = set(
+            CacheAnaliseSemantica.objects.values_list("mensagem", flat=True)
+        )
+        self.assertEqual(mensagens, {"ola", "bom dia"})
+
+    def test_registrar_poda_apenas_periodicamente(self) -> None:
+        with patch.object(CacheAnaliseSemantica, "podar") as podar:
+            for texto in ("oi", "ola", "bom dia"):
+                cache_semantico.registrar_analise_semantica(
+                    texto,
+                    _VETOR,
+                    {},
+                    APMTuple(intent_types=[], entity_types=[]),
+                )
+
+        podar.assert_not_called()
+        self.assertEqual(CacheAnaliseSemantica.objects.count(), 3)
+
+    def test_podar_remove_outras_versoes(self) -> None:
+        for versao, texto in (("v0", "oi"), ("v1", "ola"), ("v1", "bom dia")):
+            CacheAnaliseSemantica.objects.create(
+                mensagem=texto, embedding=_VETOR, versao=versao
+            )
+
+        removidas = CacheAnaliseSemantica.podar(versao="v1", max_entradas=1)
+
+        self.assertEqual(removidas, 2)
+        self.assertEqual(
+            list(
+                CacheAnaliseSemantica.objects.values_list(
+                    "mensagem", flat=True
+                )
+            ),
+            ["bom dia"],
+        )
+
+    def test_registrar_ignora_mensagem_com_historico(self) -> None:
+        cache_semantico.registrar_analise_semantica(
+            "oi",
+            _VETOR,
+            {"conteudo_mensagens": ["mensagem anterior"]},
+            APMTuple(intent_types=[], entity_types=[]),
+        )
+        self.assertFalse(CacheAnaliseSemantica.objects.exists())
+
+    @patch(f"{_MODULO}.FeaturesCompose.analise_previa_mensagem")
+    def test_verificar_falso_acerto(self, mock_analise: MagicMock) -> None:
+        entrada = CacheAnaliseSemantica.objects.create(
+            mensagem="bom dia",
+            embedding=_VETOR,
+            versao="v1",
+            intent_detectado=[{"saudacao": "bom dia"}],
+        )
+        mock_analise.return_value = APMTuple(
+            intent_types=[{"despedida": "boa noite"}], entity_types=[]
+        )
+
+        cache_semantico.verificar_falso_acerto(entrada.id, "boa noite", 0.05)
+
+        mock_analise.assert_called_once_with(
+            historico_atendimento={}, context="boa noite", usar_cache=False
+        )
+        self.assertEqual(
+            cache_semantico.estatisticas_cache_semantico()["falsos_acertos"],
+            1,
+        )
@@ -0,0 +1,255 @@
+"""Testes para a pré-classificação de intenções por centroides."""
+
+import json
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from smart_core_assistant_painel.modules.ai_engine import (
+    APMTuple,
+    FeaturesCompose,
+    HashEmbeddings,
+)
+
+from .. import classificador_intencoes, utils
+from ..models import Atendimento, Contato, Mensagem, TipoRemetente
+
+_MODULO = "smart_core_assistant_painel.app.ui.oraculo.classificador_intencoes"
+_COMANDO = (
+    "smart_core_assistant_painel.app.ui.oraculo.management.commands."
+    "benchmark_classificador_intencoes"
+)
+
+_INTENCOES = json.dumps(
+    {
+        "intent_types": {
+            "comunicacao": {"saudacao": "Cumprimentos como bom dia"},
+            "comercial": {"orcamento": "Pedido de orçamento ou preço"},
+        }
+    }
+)
+
+_ENTIDADES = json.dumps(
+    {"entity_types": {"contato": {"email_contato": "E-mail do contato"}}}
+)
+
+_EMBEDDINGS = HashEmbeddings(latencia_ms=0)
+
+
+def _configurar_hub(mock_hub: MagicMock) -> None:
+    mock_hub.VALID_INTENT_TYPES = _INTENCOES
+    mock_hub.VALID_ENTITY_TYPES = _ENTIDADES
+    mock_hub.EMBEDDINGS_CLASS = "HashEmbeddings"
+    mock_hub.EMBEDDINGS_MODEL = ""
+    mock_hub.INTENT_CLASSIFIER_EXAMPLES = 10
+    mock_hub.INTENT_CLASSIFIER_MIN_SIMILARITY = 0.6
+    mock_hub.INTENT_CLASSIFIER_MIN_MARGIN = 0.05
+    mock_hub.INTENT_CLASSIFIER_MAX_CHARS = 200
+
+
+class _ComHistorico(TestCase):
+    """Cria mensagens rotuladas e usa embeddings simulados."""
+
+    def setUp(self) -> None:
+        atendimento = Atendimento.objects.create(
+            contato=Contato.objects.create(telefone="5511999990000")
+        )
+        rotuladas = [
+            ("bom dia", [{"saudacao": "bom dia"}]),
+            ("bom dia pessoal", [{"saudacao": "bom dia"}]),
+            ("bom dia tudo bem", [{"saudacao": "bom dia"}]),
+            ("quero um orçamento", [{"orcamento": "orçamento"}]),
+            ("qual o preço do orçamento", [{"orcamento": "preço"}]),
+            ("orçamento de site", [{"orcamento": "orçamento"}]),
+            (
+                "bom dia, quero um orçamento",
+                [{"saudacao": "bom dia"}, {"orcamento": "orçamento"}],
+            ),
+            ("cancelar pedido", [{"cancelamento": "cancelar"}]),
+        ]
+        Mensagem.objects.bulk_create(
+            Mensagem(
+                atendimento=atendimento,
+                conteudo=conteudo,
+                intent_detectado=intent,
+            )
+            for conteudo, intent in rotuladas
+        )
+        Mensagem.objects.bulk_create(
+            [
+                Mensagem(
+                    atendimento=atendimento,
+                    conteudo="bom dia, em que posso ajudar?",
+                    remetente=TipoRemetente.BOT,
+                    intent_detectado=[{"saudacao": "bom dia"}],
+                )
+            ]
+        )
+
+        patcher_hub = patch(f"{_MODULO}.SERVICEHUB")
+        self.mock_hub = patcher_hub.start()
+        self.addCleanup(patcher_hub.stop)
+        _configurar_hub(self.mock_hub)
+
+        patcher_lote = patch.object(
+            FeaturesCompose,
+            "generate_embeddings_lote",
+            side_effect=_EMBEDDINGS.embed_documents,
+        )
+        self.mock_lote = patcher_lote.start()
+        self.addCleanup(patcher_lote.stop)
+
+        classificador_intencoes.CLASSIFICADOR_INTENCOES.limpar()
+        self.addCleanup(classificador_intencoes.CLASSIFICADOR_INTENCOES.limpar)
+
+
+class TestClassificadorIntencoes(_ComHistorico):
+    """Testes da construção e do uso do classificador."""
+
+    def test_mensagens_rotuladas_com_intencao_unica_do_contato(self) -> None:
+        rotuladas = list(
+            classificador_intencoes.mensagens_rotuladas(
+                {"saudacao", "orcamento"}
+            )
+        )
+
+        conteudos = {conteudo for _, conteudo, _ in rotuladas}
+        self.assertEqual(len(rotuladas), 6)
+        self.assertNotIn("bom dia, quero um orçamento", conteudos)
+        self.assertNotIn("cancelar pedido", conteudos)
+        self.assertNotIn("bom dia, em que posso ajudar?", conteudos)
+
+    def test_construcao_usa_uma_chamada_em_lote(self) -> None:
+        classificador = classificador_intencoes.construir_classificador()
+
+        assert classificador is not None
+        self.assertEqual(classificador.rotulos, ("saudacao", "orcamento"))
+        self.mock_lote.assert_called_once()
+        # Duas descrições e seis exemplos
+        self.assertEqual(len(self.mock_lote.call_args.args[0]), 8)
+
+    def test_classificacao_confiavel_dispensa_llm(self) -> None:
+        classificador_intencoes.CLASSIFICADOR_INTENCOES.atualizar()
+
+        resultado = classificador_intencoes.classificar_intencao(
+            "Bom dia!", _EMBEDDINGS.embed_query("Bom dia!"), {}
+        )
+
+        self.assertEqual(
+            resultado,
+            APMTuple(intent_types=[{"saudacao": "Bom dia!"}], entity_types=[]),
+        )
+
+    def test_classificacao_pouco_confiavel_segue_para_llm(self) -> None:
+        classificador_intencoes.CLASSIFICADOR_INTENCOES.atualizar()
+        texto = "onde fica a loja de vocês"
+
+        self.assertIsNone(
+            classificador_intencoes.classificar_intencao(
+                texto, _EMBEDDINGS.embed_query(texto), {}
+            )
+        )
+
+    def test_desabilitado_ou_mensagem_longa(self) -> None:
+        classificador_intencoes.CLASSIFICADOR_INTENCOES.atualizar()
+        vetor = _EMBEDDINGS.embed_query("bom dia")
+
+        self.mock_hub.INTENT_CLASSIFIER_MAX_CHARS = 3
+        self.assertIsNone(
+            classificador_intencoes.classificar_intencao("bom dia", vetor, {})
+        )
+        self.mock_hub.INTENT_CLASSIFIER_MAX_CHARS = 200
+        self.mock_hub.INTENT_CLASSIFIER_MIN_SIMILARITY = 0
+        self.assertIsNone(
+            classificador_intencoes.classificar_intencao("bom dia", vetor, {})
+        )
+
+    def test_historico_ou_entidades_de_texto_livre_seguem_para_llm(
+        self,
+    ) -> None:
+        classificador_intencoes.CLASSIFICADOR_INTENCOES.atualizar()
+        vetor = _EMBEDDINGS.embed_query("Bom dia!")
+
+        self.assertIsNone(
+            classificador_intencoes.classificar_intencao(
+                "Bom dia!", vetor, {"conteudo_mensagens": ["Olá"]}
+            )
+        )
+        self.mock_hub.VALID_ENTITY_TYPES = json.dumps(
+            {"entity_types": {"pedido": {"produto": "Produto citado"}}}
+        )
+        self.assertIsNone(
+            classificador_intencoes.classificar_intencao("Bom dia!", vetor, {})
+        )
+
+    def test_construcao_em_segundo_plano_sob_demanda(self) -> None:
+        compartilhado = classificador_intencoes._ClassificadorCompartilhado()
+        with patch.object(
+            compartilhado, "_construir_em_segundo_plano"
+        ) as construir:
+            self.assertIsNone(compartilhado.obter())
+            self.assertIsNone(compartilhado.obter())
+
+        construir.assert_called_once()
+
+    def test_mudanca_de_configuracao_descarta_classificador(self) -> None:
+        compartilhado = classificador_intencoes._ClassificadorCompartilhado()
+        self.assertIsNotNone(compartilhado.atualizar())
+        self.assertIsNotNone(compartilhado.obter())
+
+        self.mock_hub.INTENT_CLASSIFIER_EXAMPLES = 0
+        with patch.object(compartilhado, "_construir_em_segundo_plano"):
+            self.assertIsNone(compartilhado.obter())
+
+
+class TestAnalisePreviaComClassificador(TestCase):
+    """Testes da pré-classificação no fluxo da análise prévia."""
+
+    @patch.object(FeaturesCompose, "analise_previa_mensagem")
+    @patch(
+        "smart_core_assistant_painel.app.ui.oraculo.utils."
+        "classificar_intencao"
+    )
+    @patch("smart_core_assistant_painel.app.ui.oraculo.utils.SERVICEHUB")
+    def test_classificacao_confiavel_nao_chama_llm(
+        self, mock_hub, mock_classificar, mock_analise
+    ) -> None:
+        mock_hub.RULE_FAST_PATH_MIN_CONFIDENCE = 2.0
+        mock_classificar.return_value = APMTuple(
+            intent_types=[{"saudacao": "Bom dia"}], entity_types=[]
+        )
+
+        resultado = utils._analise_previa("Bom dia", [0.1] * 1024, {})
+
+        self.assertEqual(resultado.intent_types, [{"saudacao": "Bom dia"}])
+        mock_analise.assert_not_called()
+
+
+class TestBenchmarkClassificadorIntencoes(_ComHistorico):
+    """Testes do comando de benchmark."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        patcher_hub = patch(f"{_COMANDO}.SERVICEHUB")
+        _configurar_hub(patcher_hub.start())
+        self.addCleanup(patcher_hub.stop)
+
+    def test_exibe_acuracia_e_cobertura(self) -> None:
+        saida = StringIO()
+
+        call_command(
+            "benchmark_classificador_intencoes",
+            "--teste",
+            "2",
+            "--limiares",
+            "0.5",
+            "0.9",
+            stdout=saida,
+        )
+
+        texto = saida.getvalue()
+        self.assertIn("2 intenções", texto)
+        self.assertIn("Acurácia sem limiar", texto)
+        self.assertIn("0.90", texto)
@@ -0,0 +1,131 @@
+"""Testes para o carregamento do histórico de mensagens do atendimento."""
+
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ..models import (
+    Atendimento,
+    Contato,
+    HistoricoMensagens,
+    Mensagem,
+    StatusAtendimento,
+    TipoRemetente,
+)
+
+
+class TestCarregarHistoricoMensagens(TestCase):
+    """Testes para Atendimento.carregar_historico_mensagens."""
+
+    def setUp(self) -> None:
+        """Configuração inicial."""
+        self.contato = Contato.objects.create(
+            telefone="5511999999999", nome_contato="Teste Histórico"
+        )
+        self.atendimento = Atendimento.objects.create(
+            contato=self.contato, status=StatusAtendimento.EM_ANDAMENTO
+        )
+
+    def _criar_mensagem(
+        self,
+        conteudo: str,
+        intents: list[dict[str, str]] | None = None,
+        entidades: list[dict[str, str]] | None = None,
+    ) -> Mensagem:
+        return Mensagem.objects.create(
+            atendimento=self.atendimento,
+            conteudo=conteudo,
+            remetente=TipoRemetente.CONTATO,
+            intent_detectado=intents or [],
+            entidades_extraidas=entidades or [],
+        )
+
+    def test_historico_vazio(self) -> None:
+        """Testa o retorno para atendimento sem mensagens."""
+        historico = self.atendimento.carregar_historico_mensagens()
+
+        self.assertIsInstance(historico, HistoricoMensagens)
+        self.assertEqual(historico.get("conteudo_mensagens"), [])
+        self.assertEqual(
+            dict(historico),
+            {
+                "conteudo_mensagens": [],
+                "intents_detectados": [],
+                "entidades_extraidas": [],
+                "historico_atendimentos": [],
+            },
+        )
+
+    def test_deduplica_intents_e_entidades(self) -> None:
+        """Testa a deduplicação preservando a ordem de ocorrência."""
+        self._criar_mensagem(
+            "Olá",
+            intents=[{"saudacao": "Olá"}],
+            entidades=[{"nome_contato": "Ana"}],
+        )
+        self._criar_mensagem(
+            "Olá de novo",
+            intents=[{"saudacao": "Olá"}, {"pergunta": "preço"}],
+            entidades=[{"nome_contato": "Ana"}, {"cpf_cliente": "123"}],
+        )
+
+        historico = self.atendimento.carregar_historico_mensagens()
+
+        self.assertEqual(
+            historico["conteudo_mensagens"], ["Olá", "Olá de novo"]
+        )
+        self.assertEqual(
+            historico["intents_detectados"],
+            [{"saudacao": "Olá"}, {"pergunta": "preço"}],
+        )
+        self.assertEqual(
+            historico["entidades_extraidas"],
+            [{"nome_contato": "Ana"}, {"cpf_cliente": "123"}],
+        )
+
+    def test_exclui_mensagem_informada(self) -> None:
+        """Testa a exclusão da mensagem atual do histórico."""
+        self._criar_mensagem("Primeira")
+        atual = self._criar_mensagem(
+            "Atual", intents=[{"despedida": "tchau"}]
+        )
+
+        historico = self.atendimento.carregar_historico_mensagens(
+            excluir_mensagem_id=atual.id
+        )
+
+        self.assertEqual(historico.conteudo_mensagens, ["Primeira"])
+        self.assertEqual(historico.intents_detectados, [])
+
+    def test_inclui_assuntos_de_atendimentos_anteriores(self) -> None:
+        """Testa a inclusão dos atendimentos finalizados do contato."""
+        agora = timezone.now()
+        for dias, assunto in ((10, "Orçamento"), (2, "Suporte"), (1, "")):
+            Atendimento.objects.create(
+                contato=self.contato,
+                status=StatusAtendimento.RESOLVIDO,
+                assunto=assunto,
+                data_fim=agora - timedelta(days=dias),
+            )
+        self._criar_mensagem("Oi")
+
+        historico = self.atendimento.carregar_historico_mensagens()
+
+        self.assertEqual(historico.conteudo_mensagens, ["Oi"])
+        self.assertEqual(len(historico.historico_atendimentos), 2)
+        self.assertIn("Suporte", historico.historico_atendimentos[0])
+        self.assertIn("Orçamento", historico.historico_atendimentos[1])
+
+    def test_executa_uma_unica_consulta(self) -> None:
+        """Testa que o histórico é carregado com uma única consulta."""
+        for i in range(5):
+            self._criar_mensagem(f"Mensagem {i}", intents=[{"i": str(i)}])
+
+        with CaptureQueriesContext(connection) as queries:
+            historico = self.atendimento.carregar_historico_mensagens()
+
+        self.assertEqual(len(historico.conteudo_mensagens), 5)
+        self.assertEqual(len(queries), 1)
@@ -0,0 +1,188 @@
+"""Testes para o reprocessamento dos embeddings em uma coluna sombra."""
+
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from smart_core_assistant_painel.modules.ai_engine import HashEmbeddings
+from smart_core_assistant_painel.modules.services import SERVICEHUB
+
+from ..models_documento import Documento
+from ..models_reprocessamento_embeddings import ReprocessamentoEmbeddings
+from ..models_treinamento import Treinamento
+
+_REGISTRO = (
+    "smart_core_assistant_painel.app.ui.oraculo.management.commands."
+    "reprocessar_embeddings.EMBEDDINGS_CLIENT_REGISTRY"
+)
+
+_NOVO = HashEmbeddings(dimensoes=1024, latencia_ms=0)
+
+
+class _FalhaNoSegundoLote(HashEmbeddings):
+    """Modelo que falha no segundo lote recebido."""
+
+    chamadas: int = 0
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.chamadas += 1
+        if self.chamadas == 2:
+            raise RuntimeError("tempo esgotado")
+        return super().embed_documents(texts)
+
+
+class TestReprocessarEmbeddings(TestCase):
+    """Testes do comando ``reprocessar_embeddings``."""
+
+    def setUp(self) -> None:
+        treinamento = Treinamento.objects.create(
+            tag="faq", grupo="geral", conteudo="Conteúdo"
+        )
+        self.antigo = [1.0] + [0.0] * 1023
+        Documento.objects.bulk_create(
+            [
+                Documento(
+                    treinamento=treinamento,
+                    conteudo=f"trecho {i}",
+                    embedding=self.antigo,
+                    embedding_prefixo=self.antigo[:256],
+                    ordem=i,
+                )
+                for i in range(5)
+            ]
+        )
+
+    def _executar(self, modelo: HashEmbeddings, **opcoes: object) -> str:
+        saida = StringIO()
+        with patch(_REGISTRO) as mock_registro:
+            mock_registro.criar.return_value = modelo
+            call_command(
+                "reprocessar_embeddings",
+                classe="HashEmbeddings",
+                modelo="novo",
+                lote=2,
+                stdout=saida,
+                **opcoes,
+            )
+        return saida.getvalue()
+
+    def test_retoma_do_ponto_apos_falha(self) -> None:
+        modelo = _FalhaNoSegundoLote(dimensoes=1024, latencia_ms=0)
+
+        with self.assertRaisesRegex(CommandError, "retomar"):
+            self._executar(modelo)
+
+        progresso = ReprocessamentoEmbeddings.ativo()
+        assert progresso is not None
+        self.assertEqual(progresso.processados, 2)
+        self.assertEqual(Documento.sem_embedding_sombra().count(), 3)
+
+        saida = self._executar(modelo)
+
+        self.assertIn("Retomando após o documento", saida)
+        self.assertIn("Cobertura do novo modelo: 100.0%", saida)
+        progresso.refresh_from_db()
+        self.assertEqual(progresso.processados, 5)
+        # A busca continua com os embeddings anteriores até a troca
+        self.assertTrue(
+            all(
+                list(documento.embedding) == self.antigo
+                for documento in Documento.objects.all()
+            )
+        )
+
+    def test_troca_recalcula_o_prefixo(self) -> None:
+        saida = self._executar(_NOVO, trocar=True)
+        # Fora do PostgreSQL o prefixo é recalculado pelo comando
+        call_command("preencher_embedding_prefixo", stdout=StringIO())
+
+        self.assertIn("Busca trocada para HashEmbeddings (novo)", saida)
+        for documento in Documento.objects.all():
+            esperado = _NOVO.embed_query(str(documento.conteudo))
+            self.assertEqual(len(documento.embedding), 1024)
+            self.assertAlmostEqual(
+                float(documento.embedding[0]), esperado[0], places=5
+            )
+            self.assertEqual(
+                list(documento.embedding_prefixo),
+                list(documento.embedding)[:256],
+            )
+            self.assertIsNone(documento.embedding_sombra)
+        self.assertIsNone(ReprocessamentoEmbeddings.ativo())
+
+    def test_troca_define_o_modelo_da_consulta(self) -> None:
+        self.addCleanup(SERVICEHUB.set_embeddings_target, None)
+        ReprocessamentoEmbeddings.aplicar_destino_busca(forcar=True)
+        classe_anterior = SERVICEHUB.EMBEDDINGS_CLASS
+
+        self._executar(_NOVO)
+        ReprocessamentoEmbeddings.aplicar_destino_busca(forcar=True)
+        self.assertEqual(SERVICEHUB.EMBEDDINGS_CLASS, classe_anterior)
+
+        # O processo da troca aplica o novo destino após o commit
+        with self.captureOnCommitCallbacks(execute=True):
+            self._executar(_NOVO, trocar=True)
+        self.assertEqual(
+            ReprocessamentoEmbeddings.destino_busca(),
+            ("HashEmbeddings", "novo"),
+        )
+        self.assertEqual(SERVICEHUB.EMBEDDINGS_CLASS, "HashEmbeddings")
+        self.assertEqual(SERVICEHUB.EMBEDDINGS_MODEL, "novo")
+
+    def test_destino_consultado_uma_vez_na_validade(self) -> None:
+        ReprocessamentoEmbeddings.aplicar_destino_busca(forcar=True)
+
+        with self.assertNumQueries(0):
+            ReprocessamentoEmbeddings.aplicar_destino_busca()
+            ReprocessamentoEmbeddings.aplicar_destino_busca()
+
+    def test_troca_recusada_com_documentos_pendentes(self) -> None:
+        progresso = ReprocessamentoEmbeddings.retomar(
+            "HashEmbeddings", "novo"
+        )
+
+        with self.assertRaisesRegex(ValueError, "5 documentos"):
+            progresso.trocar()
+
+        self.assertEqual(ReprocessamentoEmbeddings.ativo(), progresso)
+
+    def test_promocao_interrompida_e_concluida(self) -> None:
+        novo = [0.0, 1.0] + [0.0] * 1022
+        Documento.objects.update(embedding_sombra=novo)
+        progresso = ReprocessamentoEmbeddings.retomar(
+            "HashEmbeddings", "novo"
+        )
+        self.assertEqual(ReprocessamentoEmbeddings.concluir_troca(), 0)
+
+        # Conclusão registrada, promoção interrompida antes dos lotes
+        with patch.object(
+            Documento, "promover_embeddings_sombra", return_value=0
+        ):
+            progresso.trocar()
+
+        self.assertEqual(
+            ReprocessamentoEmbeddings.concluir_troca(tamanho_lote=2), 5
+        )
+        self.assertTrue(
+            all(
+                list(documento.embedding) == novo
+                and documento.embedding_sombra is None
+                for documento in Documento.objects.all()
+            )
+        )
+
+    def test_destino_diferente_exige_reiniciar(self) -> None:
+        ReprocessamentoEmbeddings.retomar("HashEmbeddings", "outro")
+        Documento.objects.update(embedding_sombra=self.antigo)
+
+        with self.assertRaisesRegex(CommandError, "--reiniciar"):
+            self._executar(_NOVO)
+
+        saida = self._executar(_NOVO, reiniciar=True)
+
+        self.assertIn("descartado (5 embeddings)", saida)
+        self.assertEqual(ReprocessamentoEmbeddings.objects.count(), 1)
+        self.assertEqual(Documento.sem_embedding_sombra().count(), 0)
@@ -1,10 +1,12 @@
 """Testes para sinais (signals) do app Oraculo."""
 
 from typing import Any
+from unittest.mock import patch
 
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.test import TestCase, TransactionTestCase
+from django_q.signals import post_spawn
 
 from ..models import (
     Atendimento,
@@ -344,3 +346,17 @@ class TestSignalPerformance(TestCase):
             # Desconecta todos os handlers
             for handler in handlers:
                 post_save.disconnect(handler, sender=Contato)
+
+
+class TestAquecimentoEmbeddings(TestCase):
+    """Testes do aquecimento do cliente de embeddings."""
+
+    def test_worker_do_django_q_aquece_embeddings(self) -> None:
+        """Testa que cada worker criado aquece o cliente de embeddings."""
+        with patch(
+            "smart_core_assistant_painel.app.ui.oraculo.signals."
+            "aquecer_embeddings"
+        ) as aquecer:
+            post_spawn.send(sender="django_q", proc_name="Worker-1")
+
+        aquecer.assert_called_once_with()
@@ -0,0 +1,77 @@
+"""Testes para a gravação e o relatório da telemetria do LLM."""
+
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from smart_core_assistant_painel.modules.ai_engine import RegistroTelemetria
+
+from ..models_telemetria import MetricaLlm
+
+
+def _registro(
+    funcionalidade: str, latencia: float, dias_atras: int = 0
+) -> RegistroTelemetria:
+    return RegistroTelemetria(
+        funcionalidade=funcionalidade,
+        tipo="llm",
+        modelo="llama3.1",
+        data=timezone.now() - timedelta(days=dias_atras),
+        latencia=latencia,
+        sucesso=True,
+        tokens_prompt=10,
+        tokens_resposta=5,
+    )
+
+
+class TestMetricaLlm(TestCase):
+    """Testes da tabela de métricas."""
+
+    def test_registrar_lote_e_ler_registros(self) -> None:
+        registros = [
+            _registro("analise_previa_mensagem", 0.2),
+            _registro("melhoria_ia_treinamento", 1.5),
+            _registro("analise_previa_mensagem", 0.4, dias_atras=30),
+        ]
+
+        MetricaLlm.registrar_lote(registros)
+
+        self.assertEqual(MetricaLlm.objects.count(), 3)
+        recentes = list(
+            MetricaLlm.registros(timezone.now() - timedelta(days=7))
+        )
+        self.assertEqual(len(recentes), 2)
+        self.assertIn(registros[0], recentes)
+
+
+class TestRelatorioTelemetriaLlm(TestCase):
+    """Testes do comando de relatório."""
+
+    def test_agrega_por_funcionalidade(self) -> None:
+        MetricaLlm.registrar_lote(
+            [_registro("analise_previa_mensagem", 0.1 * i) for i in (1, 2, 3)]
+            + [_registro("melhoria_ia_treinamento", 2.0)]
+        )
+        saida = StringIO()
+
+        call_command("relatorio_telemetria_llm", "--dias", "1", stdout=saida)
+
+        linhas = saida.getvalue().splitlines()
+        self.assertEqual(len(linhas), 3)
+        analise = next(
+            linha for linha in linhas if "analise_previa_mensagem" in linha
+        )
+        # chamadas, falhas, p50 e p95 (ms), primeiro token, tokens
+        self.assertEqual(
+            analise.split()[2:], ["3", "0", "200", "300", "-", "30", "15"]
+        )
+
+    def test_sem_metricas(self) -> None:
+        saida = StringIO()
+
+        call_command("relatorio_telemetria_llm", stdout=saida)
+
+        self.assertIn("Nenhuma métrica", saida.getvalue())
@@ -1,7 +1,8 @@
 """Testes para as funções utilitárias do Oráculo."""
 
+import asyncio
 import json
-from unittest.mock import MagicMock, call, patch
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import pytest
 
@@ -11,7 +12,11 @@ from smart_core_assistant_painel.app.ui.oraculo.models import (
     Contato,
     Mensagem,
 )
-from smart_core_assistant_painel.modules.ai_engine import MessageData
+from smart_core_assistant_painel.modules.ai_engine import (
+    APMTuple,
+    ExtracaoRegras,
+    MessageData,
+)
 from smart_core_assistant_painel.modules.ai_engine.features.analise_previa_mensagem.domain.interface.analise_previa_mensagem import (
     AnalisePreviaMensagem,
 )
@@ -196,6 +201,183 @@ class TestSendMessageResponse:
         utils.send_message_response(phone)
         mock_analisar.assert_not_called()
 
+    @patch(
+        "smart_core_assistant_painel.app.ui.oraculo.models.Mensagem.objects.get"
+    )
+    @patch(
+        "smart_core_assistant_painel.app.ui.oraculo.utils._executar_estagios_resposta"
+    )
+    @patch("smart_core_assistant_painel.app.ui.oraculo.utils.ASYNC_WORKER")
+    def test_send_message_entrega_ao_worker_assincrono(
+        self,
+        mock_worker,
+        mock_executar,
+        mock_msg_get,
+        mock_cache,
+        mock_compile,
+        mock_processar,
+        mock_analisar,
+        mock_clear,
+    ):
+        phone = "12345"
+        message_data = create_message_data(numero_telefone=phone)
+        mock_cache.get.return_value = [message_data]
+        mock_compile.return_value = message_data
+        mock_processar.return_value = 1
+        mock_worker.habilitado = True
+
+        utils.send_message_response(phone)
+
+        mock_executar.assert_not_called()
+        mock_worker.submeter.assert_called_once()
+        corrotina = mock_worker.submeter.call_args.args[0]()
+        assert asyncio.iscoroutine(corrotina)
+        corrotina.close()
+        mock_clear.assert_called_once_with(phone)
+
+
+@patch("smart_core_assistant_painel.app.ui.oraculo.utils.SERVICEHUB")
+@patch(
+    "smart_core_assistant_painel.app.ui.oraculo.utils._pode_bot_responder_atendimento",
+    return_value=True,
+)
+@patch(
+    "smart_core_assistant_painel.app.ui.oraculo.utils._analisar_conteudo_mensagem"
+)
+@patch("smart_core_assistant_painel.app.ui.oraculo.utils.Documento")
+@patch("smart_core_assistant_painel.app.ui.oraculo.utils.FeaturesCompose")
+class TestExecutarEstagiosResposta:
+    """Testes para o grafo de estágios da resposta."""
+
+    def test_busca_usa_embedding_e_envia_resposta(
+        self,
+        mock_features_compose,
+        mock_documento,
+        mock_analisar,
+        mock_pode_responder,
+        mock_service_hub,
+    ):
+        mock_features_compose.generate_embeddings.return_value = [0.1, 0.2]
+        mock_documento.buscar_documentos_similares.return_value = "contexto"
+        mensagem = MagicMock(spec=Mensagem, id=7, conteudo="Preciso de ajuda")
+
+        utils._executar_estagios_resposta(
+            create_message_data(), mensagem, MagicMock(spec=Atendimento)
+        )
+
+        mock_documento.buscar_documentos_similares.assert_called_once_with(
+            query_vec=[0.1, 0.2]
+        )
+        mock_analisar.assert_called_once()
+        obter_query_vec = mock_analisar.call_args.kwargs["obter_query_vec"]
+        assert obter_query_vec() == [0.1, 0.2]
+        mock_service_hub.whatsapp_service.send_message.assert_called_once()
+
+    def test_falha_no_embedding_nao_impede_analise(
+        self,
+        mock_features_compose,
+        mock_documento,
+        mock_analisar,
+        mock_pode_responder,
+        mock_service_hub,
+    ):
+        mock_features_compose.generate_embeddings.side_effect = RuntimeError(
+            "provedor indisponível"
+        )
+        mock_analisar.side_effect = lambda _id, obter_query_vec: (
+            obter_query_vec()
+        )
+        mensagem = MagicMock(spec=Mensagem, id=7, conteudo="Preciso de ajuda")
+
+        utils._executar_estagios_resposta(
+            create_message_data(), mensagem, MagicMock(spec=Atendimento)
+        )
+
+        mock_analisar.assert_called_once()
+        mock_documento.buscar_documentos_similares.assert_not_called()
+        mock_service_hub.whatsapp_service.send_message.assert_not_called()
+
+
+@patch("smart_core_assistant_painel.app.ui.oraculo.utils.SERVICEHUB")
+@patch(
+    "smart_core_assistant_painel.app.ui.oraculo.utils._pode_bot_responder_atendimento",
+    return_value=True,
+)
+@patch(
+    "smart_core_assistant_painel.app.ui.oraculo.utils._analisar_conteudo_mensagem_async"
+)
+@patch("smart_core_assistant_painel.app.ui.oraculo.utils.Documento")
+@patch("smart_core_assistant_painel.app.ui.oraculo.utils.FeaturesCompose")
+@patch(
+    "smart_core_assistant_painel.app.ui.oraculo.utils.ReprocessamentoEmbeddings"
+)
+class TestExecutarEstagiosRespostaAsync:
+    """Testes para os estágios da resposta no worker assíncrono."""
+
+    def test_busca_usa_embedding_e_envia_resposta(
+        self,
+        mock_reprocessamento,
+        mock_features_compose,
+        mock_documento,
+        mock_analisar,
+        mock_pode_responder,
+        mock_service_hub,
+    ):
+        mock_features_compose.generate_embeddings_async = AsyncMock(
+            return_value=[0.1, 0.2]
+        )
+        mock_documento.buscar_documentos_similares.return_value = "contexto"
+        vetores = []
+
+        async def analisar(mensagem_id, obter_query_vec):
+            vetores.append(await obter_query_vec())
+
+        mock_analisar.side_effect = analisar
+        mensagem = MagicMock(spec=Mensagem, id=7, conteudo="Preciso de ajuda")
+
+        asyncio.run(
+            utils._executar_estagios_resposta_async(
+                create_message_data(), mensagem, MagicMock(spec=Atendimento)
+            )
+        )
+
+        mock_features_compose.generate_embeddings.assert_not_called()
+        mock_documento.buscar_documentos_similares.assert_called_once_with(
+            query_vec=[0.1, 0.2]
+        )
+        assert vetores == [[0.1, 0.2]]
+        mock_service_hub.whatsapp_service.send_message.assert_called_once()
+
+    def test_falha_no_embedding_nao_impede_analise(
+        self,
+        mock_reprocessamento,
+        mock_features_compose,
+        mock_documento,
+        mock_analisar,
+        mock_pode_responder,
+        mock_service_hub,
+    ):
+        mock_features_compose.generate_embeddings_async = AsyncMock(
+            side_effect=RuntimeError("provedor indisponível")
+        )
+        vetores = []
+
+        async def analisar(mensagem_id, obter_query_vec):
+            vetores.append(await obter_query_vec())
+
+        mock_analisar.side_effect = analisar
+        mensagem = MagicMock(spec=Mensagem, id=7, conteudo="Preciso de ajuda")
+
+        asyncio.run(
+            utils._executar_estagios_resposta_async(
+                create_message_data(), mensagem, MagicMock(spec=Atendimento)
+            )
+        )
+
+        assert vetores == [None]
+        mock_documento.buscar_documentos_similares.assert_not_called()
+        mock_service_hub.whatsapp_service.send_message.assert_not_called()
+
 
 @patch(
     "smart_core_assistant_painel.app.ui.oraculo.utils.mensagem_bufferizada.send"
@@ -279,6 +461,9 @@ class TestAnalisarConteudoMensagem:
         mock_atendimento.carregar_historico_mensagens.return_value = {
             "conteudo_mensagens": ["oi"]
         }
+        mock_features_compose.extracao_por_regras.return_value = (
+            ExtracaoRegras([], [], 0.0)
+        )
         mock_features_compose.analise_previa_mensagem.return_value = (
             AnalisePreviaMensagem(intent=[{"saudacao": "oi"}], entities=[])
         )
@@ -295,6 +480,28 @@ class TestAnalisarConteudoMensagem:
             mock_mensagem.save.assert_called_once()
             mock_proc_entidades.assert_called_once()
 
+    def test_extracao_por_regras_dispensa_llm(
+        self, mock_filter, mock_msg_get, mock_features_compose
+    ):
+        mock_atendimento = MagicMock(spec=Atendimento, id=1)
+        mock_mensagem = MagicMock(
+            spec=Mensagem, atendimento=mock_atendimento, conteudo="Bom dia!"
+        )
+        mock_msg_get.return_value = mock_mensagem
+        mock_atendimento.carregar_historico_mensagens.return_value = {}
+        mock_features_compose.extracao_por_regras.return_value = (
+            ExtracaoRegras([{"saudacao": "bom dia"}], [], 1.0)
+        )
+
+        with patch(
+            "smart_core_assistant_painel.app.ui.oraculo.utils._processar_entidades_contato"
+        ):
+            utils._analisar_conteudo_mensagem(1)
+
+        mock_features_compose.analise_previa_mensagem.assert_not_called()
+        assert mock_mensagem.intent_detectado == [{"saudacao": "bom dia"}]
+        mock_mensagem.save.assert_called_once()
+
     def test_chama_apresentacao_se_novo_atendimento(
         self, mock_filter, mock_msg_get, mock_features_compose
     ):
@@ -324,6 +531,70 @@ class TestAnalisarConteudoMensagem:
         mock_features_compose.mensagem_apresentacao.assert_not_called()
 
 
+@patch(
+    "smart_core_assistant_painel.app.ui.oraculo.utils._processar_entidades_contato"
+)
+@patch(
+    "smart_core_assistant_painel.app.ui.oraculo.utils.registrar_analise_semantica"
+)
+@patch(
+    "smart_core_assistant_painel.app.ui.oraculo.utils.buscar_analise_semantica",
+    return_value=None,
+)
+@patch(
+    "smart_core_assistant_painel.app.ui.oraculo.utils.classificar_intencao",
+    return_value=None,
+)
+@patch("smart_core_assistant_painel.app.ui.oraculo.utils.FeaturesCompose")
+@patch("smart_core_assistant_painel.app.ui.oraculo.utils.Mensagem.objects.get")
+@patch(
+    "smart_core_assistant_painel.app.ui.oraculo.models.Atendimento.objects.filter"
+)
+class TestAnalisarConteudoMensagemAsync:
+    """Testes para a função _analisar_conteudo_mensagem_async."""
+
+    def test_analise_usa_llm_assincrono(
+        self,
+        mock_filter,
+        mock_msg_get,
+        mock_features_compose,
+        mock_classificar,
+        mock_buscar,
+        mock_registrar,
+        mock_proc_entidades,
+    ):
+        mock_atendimento = MagicMock(spec=Atendimento, id=1)
+        mock_mensagem = MagicMock(
+            spec=Mensagem, atendimento=mock_atendimento, conteudo="Oi"
+        )
+        mock_msg_get.return_value = mock_mensagem
+        mock_atendimento.carregar_historico_mensagens.return_value = {
+            "conteudo_mensagens": ["oi"]
+        }
+        mock_features_compose.extracao_por_regras.return_value = (
+            ExtracaoRegras([], [], 0.0)
+        )
+        analise_async = AsyncMock(
+            return_value=APMTuple(
+                intent_types=[{"saudacao": "oi"}], entity_types=[]
+            )
+        )
+        mock_features_compose.analise_previa_mensagem_async = analise_async
+
+        asyncio.run(
+            utils._analisar_conteudo_mensagem_async(
+                1, AsyncMock(return_value=None)
+            )
+        )
+
+        mock_features_compose.analise_previa_mensagem.assert_not_called()
+        analise_async.assert_awaited_once()
+        assert mock_mensagem.intent_detectado == [{"saudacao": "oi"}]
+        mock_mensagem.save.assert_called_once()
+        mock_registrar.assert_called_once()
+        mock_proc_entidades.assert_called_once_with(mock_mensagem, [])
+
+
 @patch("smart_core_assistant_painel.app.ui.oraculo.utils.SERVICEHUB")
 class TestObterEntidadesMetadadosValidas:
     """Testes para a função _obter_entidades_metadados_validas."""
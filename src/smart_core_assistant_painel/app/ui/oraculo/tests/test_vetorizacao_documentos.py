@@ -0,0 +1,224 @@
+"""Testes para a vetorização em lote dos documentos de treinamento."""
+
+from unittest.mock import patch
+
+from django.test import TestCase
+from langchain_core.documents.base import Document
+
+from smart_core_assistant_painel.modules.ai_engine import (
+    FeaturesCompose,
+    HashEmbeddings,
+)
+from smart_core_assistant_painel.modules.ai_engine.utils.erros import (
+    EmbeddingError,
+)
+
+from ..models_documento import Documento
+from ..models_treinamento import Treinamento
+
+_SIGNALS = "smart_core_assistant_painel.app.ui.oraculo.signals"
+
+_EMBEDDINGS = HashEmbeddings(latencia_ms=0)
+
+
+class _ComChunks(TestCase):
+    """Simula os chunks do treinamento e o tamanho do lote."""
+
+    def setUp(self) -> None:
+        patcher_hub = patch(f"{_SIGNALS}.SERVICEHUB")
+        self.mock_hub = patcher_hub.start()
+        self.addCleanup(patcher_hub.stop)
+        self.mock_hub.EMBEDDINGS_BATCH_SIZE = 2
+
+        self.chunks = [
+            Document(page_content=f"trecho {i}", metadata={"tag": "faq"})
+            for i in range(5)
+        ]
+        self.chunks.append(Document(page_content="   "))
+        patcher_chunks = patch.object(
+            FeaturesCompose, "generate_chunks", return_value=self.chunks
+        )
+        patcher_chunks.start()
+        self.addCleanup(patcher_chunks.stop)
+
+    def _treinar(self) -> Treinamento:
+        return Treinamento.objects.create(
+            tag="faq",
+            grupo="geral",
+            conteudo="Conteúdo do treinamento",
+            treinamento_finalizado=True,
+        )
+
+
+class TestVetorizacaoDocumentos(_ComChunks):
+    """Testes do fluxo de geração de documentos de um treinamento."""
+
+    def test_embeddings_em_lote_sem_tarefa_por_documento(self) -> None:
+        with (
+            patch.object(
+                FeaturesCompose,
+                "generate_embeddings_lote",
+                side_effect=lambda textos, tamanho_lote=None: (
+                    _EMBEDDINGS.embed_documents(textos)
+                ),
+            ) as mock_lote,
+            patch.object(FeaturesCompose, "generate_embeddings") as unitario,
+        ):
+            treinamento = self._treinar()
+
+        # Cinco documentos com conteúdo em lotes de dois
+        self.assertEqual(
+            [len(c.args[0]) for c in mock_lote.call_args_list], [2, 2, 1]
+        )
+        unitario.assert_not_called()
+
+        documentos = list(treinamento.documentos.all())
+        self.assertEqual([d.ordem for d in documentos], list(range(1, 7)))
+        self.assertEqual(documentos[0].metadata, {"tag": "faq"})
+        for documento in documentos[:5]:
+            vetor = _EMBEDDINGS.embed_query(documento.conteudo)
+            self.assertEqual(list(documento.embedding), vetor)
+            self.assertEqual(list(documento.embedding_prefixo), vetor[:256])
+        self.assertIsNone(documentos[5].embedding)
+        treinamento.refresh_from_db()
+        self.assertTrue(treinamento.treinamento_vetorizado)
+
+    def test_lote_com_falha_nao_interrompe_os_demais(self) -> None:
+        chamadas: list[int] = []
+
+        def gerar(
+            textos: list[str], tamanho_lote: int | None = None
+        ) -> list[list[float]]:
+            chamadas.append(len(textos))
+            if len(chamadas) == 2:
+                raise EmbeddingError("indisponível")
+            return _EMBEDDINGS.embed_documents(textos)
+
+        with patch.object(
+            FeaturesCompose, "generate_embeddings_lote", side_effect=gerar
+        ):
+            treinamento = self._treinar()
+
+        self.assertEqual(len(chamadas), 3)
+        sem_embedding = Documento.objects.filter(
+            treinamento=treinamento, embedding__isnull=True
+        ).values_list("ordem", flat=True)
+        self.assertEqual(sorted(sem_embedding), [3, 4, 6])
+        treinamento.refresh_from_db()
+        self.assertFalse(treinamento.treinamento_vetorizado)
+
+    def test_reprocessamento_vetoriza_apenas_os_que_falharam(self) -> None:
+        with patch.object(
+            FeaturesCompose,
+            "generate_embeddings_lote",
+            side_effect=EmbeddingError("indisponível"),
+        ):
+            treinamento = self._treinar()
+        treinamento.refresh_from_db()
+        self.assertFalse(treinamento.treinamento_vetorizado)
+        Documento.objects.filter(
+            treinamento=treinamento, ordem__lte=4
+        ).update(embedding=_EMBEDDINGS.embed_query("trecho"))
+
+        with patch.object(
+            FeaturesCompose,
+            "generate_embeddings_lote",
+            side_effect=lambda textos, tamanho_lote=None: (
+                _EMBEDDINGS.embed_documents(textos)
+            ),
+        ) as mock_lote:
+            # Salvar o treinamento ainda não vetorizado o reprocessa
+            treinamento.save()
+
+        self.assertEqual(
+            [c.args[0] for c in mock_lote.call_args_list], [["trecho 4"]]
+        )
+        treinamento.refresh_from_db()
+        self.assertTrue(treinamento.treinamento_vetorizado)
+
+
+class TestSincronizacaoDocumentos(_ComChunks):
+    """Testes da revetorização incremental após a edição do treinamento."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        patcher_lote = patch.object(
+            FeaturesCompose,
+            "generate_embeddings_lote",
+            side_effect=lambda textos, tamanho_lote=None: (
+                _EMBEDDINGS.embed_documents(textos)
+            ),
+        )
+        self.mock_lote = patcher_lote.start()
+        self.addCleanup(patcher_lote.stop)
+
+    def _editar(self, treinamento: Treinamento) -> None:
+        # Mesmo fluxo da view: volta ao pré-processamento e é finalizado
+        treinamento.treinamento_finalizado = False
+        treinamento.treinamento_vetorizado = False
+        treinamento.save()
+        treinamento.treinamento_finalizado = True
+        treinamento.save()
+
+    def test_edicao_gera_embeddings_apenas_dos_trechos_alterados(
+        self,
+    ) -> None:
+        treinamento = self._treinar()
+        antes = {d.conteudo: d.pk for d in treinamento.documentos.all()}
+        self.mock_lote.reset_mock()
+
+        # Remove "trecho 1", inclui um trecho novo e reordena o restante
+        self.chunks[:] = [
+            Document(page_content="trecho 4", metadata={"tag": "nova"}),
+            Document(page_content="trecho novo", metadata={"tag": "nova"}),
+            Document(page_content="trecho  0", metadata={"tag": "nova"}),
+            Document(page_content="trecho 2", metadata={"tag": "nova"}),
+            Document(page_content="trecho 3", metadata={"tag": "nova"}),
+        ]
+        self._editar(treinamento)
+
+        self.assertEqual(
+            [c.args[0] for c in self.mock_lote.call_args_list],
+            [["trecho novo"]],
+        )
+        documentos = list(treinamento.documentos.all())
+        self.assertEqual(
+            [d.conteudo for d in documentos],
+            ["trecho 4", "trecho novo", "trecho 0", "trecho 2", "trecho 3"],
+        )
+        self.assertEqual(documentos[0].pk, antes["trecho 4"])
+        self.assertEqual(documentos[2].pk, antes["trecho 0"])
+        self.assertNotIn(antes["trecho 1"], [d.pk for d in documentos])
+        self.assertTrue(all(d.metadata == {"tag": "nova"} for d in documentos))
+        self.assertTrue(all(d.embedding is not None for d in documentos))
+
+    def test_documento_mantido_sem_embedding_e_vetorizado(self) -> None:
+        treinamento = self._treinar()
+        Documento.objects.filter(
+            treinamento=treinamento, conteudo="trecho 2"
+        ).update(embedding=None)
+        self.mock_lote.reset_mock()
+
+        sincronizacao = Documento.sincronizar_chunks(
+            self.chunks, treinamento.pk
+        )
+
+        # O chunk em branco continua pendente e é ignorado na vetorização
+        self.assertEqual(
+            [d.conteudo for d in sincronizacao.pendentes], ["trecho 2", "   "]
+        )
+        self.assertEqual(sincronizacao[1:], (0, 6, 0))
+
+    def test_chunks_repetidos_associados_um_a_um(self) -> None:
+        treinamento = self._treinar()
+        self.chunks[:] = [Document(page_content="trecho 0")] * 3
+
+        sincronizacao = Documento.sincronizar_chunks(
+            self.chunks, treinamento.pk
+        )
+
+        self.assertEqual(sincronizacao[1:], (2, 1, 5))
+        self.assertEqual(
+            list(treinamento.documentos.values_list("conteudo", "ordem")),
+            [("trecho 0", 1), ("trecho 0", 2), ("trecho 0", 3)],
+        )
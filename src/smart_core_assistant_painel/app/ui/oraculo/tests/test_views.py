@@ -7,6 +7,8 @@ from django.test import Client, TestCase
 from django.urls import reverse
 
 from ..models_departamento import Departamento
+from ..models_treinamento import Treinamento
+from ..views import _aceitar_treinamento, _obter_melhoria
 
 
 class TestWebhookWhatsApp(TestCase):
@@ -296,3 +298,195 @@ class TestViewsIntegration(TestCase):
         self.assertTrue(hasattr(webhook_whatsapp, "csrf_exempt"))
         # ou verifica se está no decorator
         self.assertTrue(getattr(webhook_whatsapp, "csrf_exempt", False))
+
+
+@patch(
+    "smart_core_assistant_painel.app.ui.oraculo.views.FeaturesCompose.versao_melhoria_ia_treinamento",
+    return_value="versao-atual",
+)
+@patch(
+    "smart_core_assistant_painel.app.ui.oraculo.views.FeaturesCompose.chave_melhoria_ia_treinamento",
+    return_value="chave-atual",
+)
+@patch(
+    "smart_core_assistant_painel.app.ui.oraculo.views.has_permission",
+    return_value=True,
+)
+class TestPreProcessamentoStream(TestCase):
+    """Testes para a view pre_processamento_stream (SSE)."""
+
+    def setUp(self) -> None:
+        """Configuração inicial para os testes."""
+        self.client = Client()
+        self.treinamento = Treinamento.objects.create(
+            tag="faq", grupo="suporte", conteudo="conteúdo original"
+        )
+        self.url = reverse(
+            "oraculo:pre_processamento_stream", args=[self.treinamento.id]
+        )
+
+    def _eventos(self) -> list[str]:
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        corpo = b"".join(response.streaming_content).decode()
+        return [evento for evento in corpo.split("\n\n") if evento]
+
+    @patch(
+        "smart_core_assistant_painel.app.ui.oraculo.views.FeaturesCompose.melhoria_ia_treinamento_stream"
+    )
+    def test_transmite_trechos_e_armazena_melhoria(
+        self,
+        mock_stream: Mock,
+        mock_permissao: Mock,
+        mock_chave: Mock,
+        mock_versao: Mock,
+    ) -> None:
+        """Testa os eventos de trecho, o HTML final e o armazenamento."""
+        mock_stream.return_value = iter(["# Títu", "lo\n", "texto"])
+
+        eventos = self._eventos()
+
+        mock_stream.assert_called_once_with("conteúdo original")
+        self.assertEqual(len(eventos), 4)
+        self.assertEqual(
+            eventos[0], 'event: trecho\ndata: {"texto": "# Títu"}'
+        )
+        self.assertTrue(eventos[-1].startswith("event: fim\n"))
+        self.assertIn("<h1>Título</h1>", eventos[-1])
+        self.treinamento.refresh_from_db()
+        self.assertEqual(self.treinamento.texto_melhorado, "# Título\ntexto")
+        self.assertEqual(self.treinamento.hash_melhoria, "chave-atual")
+        self.assertEqual(self.treinamento.versao_melhoria, "versao-atual")
+
+    @patch(
+        "smart_core_assistant_painel.app.ui.oraculo.views.FeaturesCompose.melhoria_ia_treinamento_stream"
+    )
+    def test_reutiliza_melhoria_armazenada(
+        self,
+        mock_stream: Mock,
+        mock_permissao: Mock,
+        mock_chave: Mock,
+        mock_versao: Mock,
+    ) -> None:
+        """Testa que a melhoria armazenada dispensa o LLM."""
+        self.treinamento.armazenar_melhoria(
+            "chave-atual", "versao-atual", "Texto revisado"
+        )
+
+        eventos = self._eventos()
+
+        mock_stream.assert_not_called()
+        self.assertEqual(
+            eventos[0], 'event: trecho\ndata: {"texto": "Texto revisado"}'
+        )
+        self.assertTrue(eventos[-1].startswith("event: fim\n"))
+
+    @patch(
+        "smart_core_assistant_painel.app.ui.oraculo.views.FeaturesCompose.melhoria_ia_treinamento_stream"
+    )
+    def test_configuracao_alterada_gera_nova_melhoria(
+        self,
+        mock_stream: Mock,
+        mock_permissao: Mock,
+        mock_chave: Mock,
+        mock_versao: Mock,
+    ) -> None:
+        """Testa que a exibição regenera a melhoria de outra versão."""
+        self.treinamento.armazenar_melhoria("chave-atual", "", "Texto antigo")
+        mock_stream.return_value = iter(["Texto novo"])
+
+        self._eventos()
+
+        mock_stream.assert_called_once_with("conteúdo original")
+        self.treinamento.refresh_from_db()
+        self.assertEqual(self.treinamento.texto_melhorado, "Texto novo")
+
+    @patch(
+        "smart_core_assistant_painel.app.ui.oraculo.views.FeaturesCompose.melhoria_ia_treinamento_stream"
+    )
+    def test_erro_no_llm_gera_evento_de_erro(
+        self,
+        mock_stream: Mock,
+        mock_permissao: Mock,
+        mock_chave: Mock,
+        mock_versao: Mock,
+    ) -> None:
+        """Testa que uma falha no LLM encerra o fluxo com evento de erro."""
+
+        def falhar():
+            yield "parcial"
+            raise RuntimeError("LLM indisponível")
+
+        mock_stream.return_value = falhar()
+
+        eventos = self._eventos()
+
+        self.assertTrue(eventos[0].startswith("event: trecho"))
+        self.assertTrue(eventos[-1].startswith("event: erro"))
+        self.treinamento.refresh_from_db()
+        self.assertIsNone(self.treinamento.texto_melhorado)
+
+    def test_sem_permissao(
+        self, mock_permissao: Mock, mock_chave: Mock, mock_versao: Mock
+    ) -> None:
+        """Testa que usuários sem permissão recebem 404."""
+        mock_permissao.return_value = False
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 404)
+
+
+@patch(
+    "smart_core_assistant_painel.app.ui.oraculo.views.FeaturesCompose.melhoria_ia_treinamento"
+)
+@patch(
+    "smart_core_assistant_painel.app.ui.oraculo.views.FeaturesCompose.chave_melhoria_ia_treinamento"
+)
+class TestMelhoriaArmazenada(TestCase):
+    """Testes da reutilização da melhoria entre exibição e aceite."""
+
+    def setUp(self) -> None:
+        """Configuração inicial para os testes."""
+        self.treinamento = Treinamento.objects.create(
+            tag="faq", grupo="suporte", conteudo="conteúdo original"
+        )
+
+    def test_aceitar_reutiliza_melhoria_revisada(
+        self, mock_chave: Mock, mock_melhoria: Mock
+    ) -> None:
+        """Testa que o aceite aplica o texto exibido sem chamar o LLM.
+
+        A versão armazenada é ignorada: uma alteração da configuração entre
+        a exibição e o aceite não substitui o texto revisado.
+        """
+        mock_chave.return_value = "chave-atual"
+        self.treinamento.armazenar_melhoria(
+            "chave-atual", "versao-antiga", "Texto revisado"
+        )
+
+        _aceitar_treinamento(self.treinamento.id)
+
+        mock_melhoria.assert_not_called()
+        self.treinamento.refresh_from_db()
+        self.assertEqual(self.treinamento.conteudo, "Texto revisado")
+        self.assertTrue(self.treinamento.treinamento_finalizado)
+
+    def test_conteudo_alterado_invalida_melhoria(
+        self, mock_chave: Mock, mock_melhoria: Mock
+    ) -> None:
+        """Testa que uma chave diferente gera uma nova melhoria."""
+        self.treinamento.armazenar_melhoria(
+            "chave-antiga", "versao-atual", "Texto antigo"
+        )
+        mock_chave.return_value = "chave-nova"
+        mock_melhoria.return_value = "Texto novo"
+
+        texto = _obter_melhoria(self.treinamento)
+
+        self.assertEqual(texto, "Texto novo")
+        mock_melhoria.assert_called_once_with("conteúdo original")
+        self.treinamento.refresh_from_db()
+        self.assertEqual(self.treinamento.hash_melhoria, "chave-nova")
+        self.assertEqual(self.treinamento.versao_melhoria, "")
@@ -15,17 +15,21 @@ from smart_core_assistant_painel.app.ui.oraculo.views import (
     TreinamentoService,
     _processar_treinamento,
 )
+from smart_core_assistant_painel.modules.ai_engine import LlmError
 
 
 class TestTreinamentoService(TestCase):
     """Testes para a classe TreinamentoService."""
 
     @patch(
-        "smart_core_assistant_painel.app.ui.oraculo.views.FeaturesCompose.pre_analise_ia_treinamento"
+        "smart_core_assistant_painel.app.ui.oraculo.views.FeaturesCompose.pre_analise_ia_treinamento_lote"
     )
     def test_aplicar_pre_analise_documentos(self, mock_pre_analise):
         """Testa a aplicação da pré-análise em documentos."""
-        mock_pre_analise.return_value = "Conteúdo pré-analisado"
+        mock_pre_analise.return_value = [
+            "Conteúdo pré-analisado 1",
+            "Conteúdo pré-analisado 2",
+        ]
         documentos = [
             Document(page_content="Conteúdo 1"),
             Document(page_content="Conteúdo 2"),
@@ -37,9 +41,37 @@ class TestTreinamentoService(TestCase):
 
         self.assertEqual(len(documentos_processados), 2)
         self.assertEqual(
-            documentos_processados[0].page_content, "Conteúdo pré-analisado"
+            documentos_processados[0].page_content, "Conteúdo pré-analisado 1"
+        )
+        self.assertEqual(
+            documentos_processados[1].page_content, "Conteúdo pré-analisado 2"
+        )
+        mock_pre_analise.assert_called_once()
+        self.assertEqual(
+            mock_pre_analise.call_args.args[0], ["Conteúdo 1", "Conteúdo 2"]
+        )
+
+    @patch(
+        "smart_core_assistant_painel.app.ui.oraculo.views.FeaturesCompose.pre_analise_ia_treinamento_lote"
+    )
+    def test_aplicar_pre_analise_mantem_pagina_com_falha(
+        self, mock_pre_analise
+    ):
+        """Testa que a página com falha mantém o conteúdo original."""
+        mock_pre_analise.return_value = [LlmError("falhou"), "Analisado 2"]
+        documentos = [
+            Document(page_content="Conteúdo 1"),
+            Document(page_content="Conteúdo 2"),
+        ]
+
+        documentos_processados = (
+            TreinamentoService.aplicar_pre_analise_documentos(documentos)
+        )
+
+        self.assertEqual(
+            [d.page_content for d in documentos_processados],
+            ["Conteúdo 1", "Analisado 2"],
         )
-        self.assertEqual(mock_pre_analise.call_count, 2)
 
     def test_processar_arquivo_upload_com_caminho_temporario(self):
         """Testa o processamento de um arquivo com temporary_file_path."""
@@ -17,6 +17,11 @@ urlpatterns = [
         views.pre_processamento,
         name="pre_processamento",
     ),
+    path(
+        "pre-processamento/<int:id>/stream/",
+        views.pre_processamento_stream,
+        name="pre_processamento_stream",
+    ),
     path("webhook_whatsapp/", views.webhook_whatsapp, name="webhook_whatsapp"),
     path(
         "verificar_treinamentos/",
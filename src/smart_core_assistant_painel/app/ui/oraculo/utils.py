@@ -4,19 +4,42 @@ Este módulo fornece funções para gerenciar o buffer de mensagens do WhatsApp,
 agendar respostas, processar entidades e analisar o conteúdo das mensagens.
 """
 
+import asyncio
 import json
-from typing import Any, Optional, cast
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any, Optional, TypeVar, cast
 
 from django.core.cache import cache
+from django.db import connections
 from django.utils import timezone
 from loguru import logger
 
+from smart_core_assistant_painel.app.ui.oraculo.cache_semantico import (
+    buscar_analise_semantica,
+    cache_semantico_habilitado,
+    mensagem_elegivel,
+    registrar_analise_semantica,
+)
+from smart_core_assistant_painel.app.ui.oraculo.classificador_intencoes import (
+    classificador_habilitado,
+    classificar_intencao,
+    mensagem_classificavel,
+)
 from smart_core_assistant_painel.app.ui.oraculo.models_documento import (
     Documento,
 )
+from smart_core_assistant_painel.app.ui.oraculo.models_reprocessamento_embeddings import (
+    ReprocessamentoEmbeddings,
+)
 from smart_core_assistant_painel.modules.ai_engine import (
+    ASYNC_WORKER,
+    APMTuple,
+    Estagio,
     FeaturesCompose,
+    GrafoEstagios,
     MessageData,
+    mesclar_entidades,
 )
 from smart_core_assistant_painel.modules.services import SERVICEHUB
 
@@ -29,6 +52,12 @@ from .models import (
 )
 from .signals import mensagem_bufferizada
 
+T = TypeVar("T")
+
+_MENSAGEM_AGUARDE_ATENDENTE = (
+    "Obrigado pela sua mensagem, em breve um atendente entrará em contato."
+)
+
 
 def set_wa_buffer(message: MessageData) -> None:
     """Adiciona uma mensagem ao buffer do WhatsApp no cache.
@@ -58,6 +87,11 @@ def clear_wa_buffer(phone: str) -> None:
 def send_message_response(phone: str) -> None:
     """Envia uma resposta para uma mensagem do WhatsApp.
 
+    Com ``ASYNC_WORKER_CONCURRENCY`` maior que zero, os estágios da
+    resposta são entregues ao ``ASYNC_WORKER`` e a tarefa termina assim que
+    a mensagem é persistida; o worker aplica o limite de conversas em
+    andamento no processo.
+
     Args:
         phone (str): O número de telefone para o qual enviar a resposta.
     """
@@ -79,24 +113,18 @@ def send_message_response(phone: str) -> None:
         )
         try:
             mensagem = Mensagem.objects.get(id=mensagem_id)
-            _analisar_conteudo_mensagem(mensagem_id)
-            query_vec = FeaturesCompose.generate_embeddings(
-                text=mensagem.conteudo
-            )
-            teste_similaridade = Documento.buscar_documentos_similares(
-                query_vec=query_vec
-            )
-            logger.info(f"Teste similaridade: {teste_similaridade}")
-
             atendimento_obj: Atendimento = cast(
                 Atendimento, mensagem.atendimento
             )
-            if _pode_bot_responder_atendimento(atendimento_obj):
-                SERVICEHUB.whatsapp_service.send_message(
-                    instance=message_data.instance,
-                    api_key=message_data.api_key,
-                    number=message_data.numero_telefone,
-                    text="Obrigado pela sua mensagem, em breve um atendente entrará em contato.",
+            if ASYNC_WORKER.habilitado:
+                ASYNC_WORKER.submeter(
+                    lambda: _executar_estagios_resposta_async(
+                        message_data, mensagem, atendimento_obj
+                    )
+                )
+            else:
+                _executar_estagios_resposta(
+                    message_data, mensagem, atendimento_obj
                 )
         except Mensagem.DoesNotExist:
             logger.error(
@@ -110,6 +138,145 @@ def send_message_response(phone: str) -> None:
         clear_wa_buffer(phone)
 
 
+def _executar_estagios_resposta(
+    message_data: MessageData,
+    mensagem: Mensagem,
+    atendimento: Atendimento,
+) -> None:
+    """Executa os estágios da resposta como um grafo de dependências.
+
+    A análise da mensagem não depende do embedding (ele só é aguardado se
+    o cache semântico for consultado), então executa em paralelo com o
+    embedding e a busca de documentos. O envio inicia assim que a busca
+    termina, e a duração de cada estágio é registrada no log.
+
+    Args:
+        message_data (MessageData): Os dados compilados da mensagem.
+        mensagem (Mensagem): A mensagem persistida.
+        atendimento (Atendimento): O atendimento da mensagem.
+    """
+    mensagem_id = cast(int, mensagem.id)
+
+    def embedding() -> list[float]:
+        return FeaturesCompose.generate_embeddings(text=mensagem.conteudo)
+
+    def obter_query_vec() -> Optional[list[float]]:
+        try:
+            return cast(list[float], grafo.aguardar("embedding"))
+        except Exception:
+            return None
+
+    def analise() -> None:
+        _analisar_conteudo_mensagem(
+            mensagem_id, obter_query_vec=obter_query_vec
+        )
+
+    def busca(embedding: list[float]) -> str:
+        return Documento.buscar_documentos_similares(query_vec=embedding)
+
+    def resposta(busca: str) -> None:
+        logger.info(f"Teste similaridade: {busca}")
+        if _pode_bot_responder_atendimento(atendimento):
+            SERVICEHUB.whatsapp_service.send_message(
+                instance=message_data.instance,
+                api_key=message_data.api_key,
+                number=message_data.numero_telefone,
+                text=_MENSAGEM_AGUARDE_ATENDENTE,
+            )
+
+    # A consulta usa o mesmo modelo dos embeddings dos documentos
+    ReprocessamentoEmbeddings.aplicar_destino_busca()
+    grafo = GrafoEstagios(
+        [
+            Estagio("embedding", embedding),
+            Estagio("analise", analise),
+            Estagio("busca", busca, ("embedding",)),
+            Estagio("resposta", resposta, ("busca",)),
+        ],
+        finalizar_thread=connections.close_all,
+    )
+    grafo.executar(descricao=f"resposta da mensagem {mensagem_id}")
+
+
+async def _executar_estagios_resposta_async(
+    message_data: MessageData,
+    mensagem: Mensagem,
+    atendimento: Atendimento,
+) -> None:
+    """Variante assíncrona de ``_executar_estagios_resposta``.
+
+    Os estágios são corrotinas no event loop do ``ASYNC_WORKER``: o LLM e
+    os embeddings são chamados com as APIs assíncronas dos provedores, e
+    apenas o acesso ao banco e o envio pelo WhatsApp ocupam uma thread.
+
+    Args:
+        message_data (MessageData): Os dados compilados da mensagem.
+        mensagem (Mensagem): A mensagem persistida.
+        atendimento (Atendimento): O atendimento da mensagem.
+    """
+    mensagem_id = cast(int, mensagem.id)
+    descricao = f"resposta da mensagem {mensagem_id}"
+    inicio = time.perf_counter()
+
+    # A consulta usa o mesmo modelo dos embeddings dos documentos
+    await _em_thread_banco(ReprocessamentoEmbeddings.aplicar_destino_busca)
+    embedding = asyncio.ensure_future(
+        FeaturesCompose.generate_embeddings_async(text=mensagem.conteudo)
+    )
+
+    async def obter_query_vec() -> Optional[list[float]]:
+        try:
+            return await asyncio.shield(embedding)
+        except Exception:
+            return None
+
+    async def resposta() -> None:
+        vetor = await asyncio.shield(embedding)
+        busca = await _em_thread_banco(
+            lambda: Documento.buscar_documentos_similares(query_vec=vetor)
+        )
+        logger.info(f"Teste similaridade: {busca}")
+        if await _em_thread_banco(
+            _pode_bot_responder_atendimento, atendimento
+        ):
+            await asyncio.to_thread(
+                SERVICEHUB.whatsapp_service.send_message,
+                instance=message_data.instance,
+                api_key=message_data.api_key,
+                number=message_data.numero_telefone,
+                text=_MENSAGEM_AGUARDE_ATENDENTE,
+            )
+
+    resultados = await asyncio.gather(
+        _analisar_conteudo_mensagem_async(mensagem_id, obter_query_vec),
+        resposta(),
+        return_exceptions=True,
+    )
+    for nome, resultado in zip(("analise", "resposta"), resultados):
+        if isinstance(resultado, BaseException):
+            logger.error(
+                f"Estágio '{nome}' de {descricao} falhou: {resultado}"
+            )
+    total = time.perf_counter() - inicio
+    logger.info(f"{descricao}: total={total * 1000:.0f}ms")
+
+
+async def _em_thread_banco(funcao: Callable[..., T], *args: Any) -> T:
+    """Executa um acesso ao banco em uma thread, fora do event loop.
+
+    As conexões abertas pela thread são fechadas ao final, como nos
+    estágios do ``GrafoEstagios``.
+    """
+
+    def executar() -> T:
+        try:
+            return funcao(*args)
+        finally:
+            connections.close_all()
+
+    return await asyncio.to_thread(executar)
+
+
 def sched_message_response(phone: str) -> None:
     """Agenda o processamento da resposta via signal.
 
@@ -205,43 +372,236 @@ def _processar_entidades_contato(
         logger.error(f"Erro ao processar entidades do contato: {e}")
 
 
-def _analisar_conteudo_mensagem(mensagem_id: int) -> None:
+def _analisar_conteudo_mensagem(
+    mensagem_id: int,
+    query_vec: Optional[list[float]] = None,
+    obter_query_vec: Optional[Callable[[], Optional[list[float]]]] = None,
+) -> None:
     """Analisa o conteúdo da mensagem para detectar intenção e entidades.
 
+    Quando o embedding da mensagem é informado, o cache semântico é
+    consultado antes do LLM e alimentado com o resultado da análise.
+
     Args:
         mensagem_id (int): O ID da mensagem a ser analisada.
+        query_vec (Optional[list[float]]): O embedding da mensagem.
+        obter_query_vec (Optional[Callable[[], Optional[list[float]]]]):
+            Fornece o embedding sob demanda, quando ele ainda está sendo
+            calculado em paralelo.
     """
     try:
-        mensagem: Mensagem = Mensagem.objects.get(id=mensagem_id)
-        atendimento: Atendimento = cast(Atendimento, mensagem.atendimento)
-        exists_atendimento_anterior = (
-            Atendimento.objects.filter(contato=atendimento.contato)
-            .exclude(id=atendimento.id)
-            .exists()
+        mensagem, historico_atendimento = _carregar_analise(mensagem_id)
+        resultado_analise = _analise_previa(
+            mensagem.conteudo,
+            query_vec,
+            historico_atendimento,
+            obter_query_vec=obter_query_vec,
         )
-        historico_atendimento = atendimento.carregar_historico_mensagens(
-            excluir_mensagem_id=mensagem_id
+        _salvar_analise(mensagem, resultado_analise)
+    except Exception as e:
+        logger.error(
+            f"Erro ao analisar conteúdo da mensagem {mensagem_id}: {e}"
         )
-        if not exists_atendimento_anterior and not historico_atendimento.get(
-            "conteudo_mensagens"
-        ):
-            FeaturesCompose.mensagem_apresentacao()
-        resultado_analise = FeaturesCompose.analise_previa_mensagem(
-            historico_atendimento=historico_atendimento,
-            context=mensagem.conteudo,
+
+
+async def _analisar_conteudo_mensagem_async(
+    mensagem_id: int,
+    obter_query_vec: Callable[[], Awaitable[Optional[list[float]]]],
+) -> None:
+    """Variante assíncrona de ``_analisar_conteudo_mensagem``.
+
+    Args:
+        mensagem_id (int): O ID da mensagem a ser analisada.
+        obter_query_vec (Callable[[], Awaitable[Optional[list[float]]]]):
+            Aguarda o embedding da mensagem, calculado em paralelo.
+    """
+    try:
+        mensagem, historico_atendimento = await _em_thread_banco(
+            _carregar_analise, mensagem_id
         )
-        mensagem.intent_detectado = resultado_analise.intent_types
-        mensagem.entidades_extraidas = resultado_analise.entity_types
-        mensagem.save(
-            update_fields=["intent_detectado", "entidades_extraidas"]
+        resultado_analise = await _analise_previa_async(
+            mensagem.conteudo, historico_atendimento, obter_query_vec
         )
-        _processar_entidades_contato(mensagem, resultado_analise.entity_types)
+        await _em_thread_banco(_salvar_analise, mensagem, resultado_analise)
     except Exception as e:
         logger.error(
             f"Erro ao analisar conteúdo da mensagem {mensagem_id}: {e}"
         )
 
 
+def _carregar_analise(
+    mensagem_id: int,
+) -> tuple[Mensagem, dict[str, Any]]:
+    """Carrega a mensagem e o histórico do atendimento para a análise.
+
+    Na primeira mensagem do primeiro atendimento do contato, prepara a
+    mensagem de apresentação.
+
+    Args:
+        mensagem_id (int): O ID da mensagem a ser analisada.
+
+    Returns:
+        tuple[Mensagem, dict[str, Any]]: A mensagem e o histórico.
+    """
+    mensagem: Mensagem = Mensagem.objects.get(id=mensagem_id)
+    atendimento: Atendimento = cast(Atendimento, mensagem.atendimento)
+    exists_atendimento_anterior = (
+        Atendimento.objects.filter(contato=atendimento.contato)
+        .exclude(id=atendimento.id)
+        .exists()
+    )
+    historico_atendimento = atendimento.carregar_historico_mensagens(
+        excluir_mensagem_id=mensagem_id
+    )
+    if not exists_atendimento_anterior and not historico_atendimento.get(
+        "conteudo_mensagens"
+    ):
+        FeaturesCompose.mensagem_apresentacao()
+    return mensagem, historico_atendimento
+
+
+def _salvar_analise(mensagem: Mensagem, resultado_analise: APMTuple) -> None:
+    """Grava a análise na mensagem e atualiza os dados do contato.
+
+    Args:
+        mensagem (Mensagem): A mensagem analisada.
+        resultado_analise (APMTuple): As intenções e entidades detectadas.
+    """
+    mensagem.intent_detectado = resultado_analise.intent_types
+    mensagem.entidades_extraidas = resultado_analise.entity_types
+    mensagem.save(update_fields=["intent_detectado", "entidades_extraidas"])
+    _processar_entidades_contato(mensagem, resultado_analise.entity_types)
+
+
+def _analise_previa(
+    conteudo: str,
+    query_vec: Optional[list[float]],
+    historico_atendimento: Mapping[str, Any],
+    obter_query_vec: Optional[Callable[[], Optional[list[float]]]] = None,
+) -> APMTuple:
+    """Obtém intenções e entidades da mensagem pelo caminho mais barato.
+
+    A extração por regras dispensa o LLM quando cobre toda a mensagem.
+    Caso contrário, tenta a pré-classificação de intenções por centroides,
+    o cache semântico e, por fim, o LLM; as entidades encontradas pelas
+    regras complementam o resultado.
+
+    Args:
+        conteudo (str): O texto da mensagem.
+        query_vec (Optional[list[float]]): O embedding da mensagem.
+        historico_atendimento (Mapping[str, Any]): Histórico do atendimento.
+        obter_query_vec (Optional[Callable[[], Optional[list[float]]]]):
+            Fornece o embedding sob demanda. Só é chamado se a
+            pré-classificação ou o cache semântico puderem ser usados para
+            a mensagem.
+
+    Returns:
+        APMTuple: As intenções e entidades da mensagem.
+    """
+    extracao = FeaturesCompose.extracao_por_regras(conteudo)
+    if extracao.confianca >= SERVICEHUB.RULE_FAST_PATH_MIN_CONFIDENCE:
+        logger.debug("Análise prévia resolvida pela extração por regras")
+        return extracao.como_apm()
+
+    if (
+        query_vec is None
+        and obter_query_vec is not None
+        and _precisa_query_vec(conteudo, historico_atendimento)
+    ):
+        query_vec = obter_query_vec()
+    classificado = classificar_intencao(
+        conteudo, query_vec, historico_atendimento
+    )
+    if classificado is not None:
+        return mesclar_entidades(classificado, extracao)
+
+    resultado = buscar_analise_semantica(
+        conteudo, query_vec, historico_atendimento
+    )
+    if resultado is None:
+        resultado = FeaturesCompose.analise_previa_mensagem(
+            historico_atendimento=historico_atendimento,
+            context=conteudo,
+        )
+        registrar_analise_semantica(
+            conteudo, query_vec, historico_atendimento, resultado
+        )
+    return mesclar_entidades(resultado, extracao)
+
+
+async def _analise_previa_async(
+    conteudo: str,
+    historico_atendimento: Mapping[str, Any],
+    obter_query_vec: Callable[[], Awaitable[Optional[list[float]]]],
+) -> APMTuple:
+    """Variante assíncrona de ``_analise_previa``.
+
+    A pré-classificação e o cache semântico consultam o banco em uma
+    thread; o LLM é chamado com ``analise_previa_mensagem_async``.
+
+    Args:
+        conteudo (str): O texto da mensagem.
+        historico_atendimento (Mapping[str, Any]): Histórico do atendimento.
+        obter_query_vec (Callable[[], Awaitable[Optional[list[float]]]]):
+            Aguarda o embedding. Só é chamado se a pré-classificação ou o
+            cache semântico puderem ser usados para a mensagem.
+
+    Returns:
+        APMTuple: As intenções e entidades da mensagem.
+    """
+    extracao = FeaturesCompose.extracao_por_regras(conteudo)
+    if extracao.confianca >= SERVICEHUB.RULE_FAST_PATH_MIN_CONFIDENCE:
+        logger.debug("Análise prévia resolvida pela extração por regras")
+        return extracao.como_apm()
+
+    query_vec = None
+    if _precisa_query_vec(conteudo, historico_atendimento):
+        query_vec = await obter_query_vec()
+    classificado = await _em_thread_banco(
+        classificar_intencao, conteudo, query_vec, historico_atendimento
+    )
+    if classificado is not None:
+        return mesclar_entidades(classificado, extracao)
+
+    resultado = await _em_thread_banco(
+        buscar_analise_semantica, conteudo, query_vec, historico_atendimento
+    )
+    if resultado is None:
+        resultado = await FeaturesCompose.analise_previa_mensagem_async(
+            historico_atendimento=historico_atendimento,
+            context=conteudo,
+        )
+        await _em_thread_banco(
+            registrar_analise_semantica,
+            conteudo,
+            query_vec,
+            historico_atendimento,
+            resultado,
+        )
+    return mesclar_entidades(resultado, extracao)
+
+
+def _precisa_query_vec(
+    conteudo: str, historico_atendimento: Mapping[str, Any]
+) -> bool:
+    """Indica se a pré-classificação ou o cache semântico usarão o embedding.
+
+    Args:
+        conteudo (str): O texto da mensagem.
+        historico_atendimento (Mapping[str, Any]): Histórico do atendimento.
+
+    Returns:
+        bool: True se o embedding da mensagem deve ser aguardado.
+    """
+    return (
+        classificador_habilitado()
+        and mensagem_classificavel(conteudo, historico_atendimento)
+    ) or (
+        cache_semantico_habilitado()
+        and mensagem_elegivel(conteudo, historico_atendimento)
+    )
+
+
 def _pode_bot_responder_atendimento(
     atendimento: Optional["Atendimento"],
 ) -> bool:
@@ -7,26 +7,31 @@ dados e o webhook para receber mensagens do WhatsApp.
 import json
 import os
 import tempfile
-from typing import Any
+from collections.abc import Callable, Iterator
+from typing import Any, Optional
 
 from django.contrib import messages
 from django.db import transaction
-from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import redirect, render
 from django.views.decorators.csrf import csrf_exempt
 from langchain.docstore.document import Document
 from loguru import logger
 from rolepermissions.checkers import has_permission
 
-from smart_core_assistant_painel.app.ui.oraculo.models_documento import (
-    Documento,
-)
 from smart_core_assistant_painel.modules.ai_engine import FeaturesCompose
 
 from .models_departamento import Departamento
 
 # Atualizando a importação do modelo Treinamento
 from .models_treinamento import Treinamento
+from .templatetags.markdown_extras import markdown_format
 from .utils import sched_message_response, set_wa_buffer
 
 
@@ -36,29 +41,39 @@ class TreinamentoService:
     @staticmethod
     def aplicar_pre_analise_documentos(
         documentos: list[Document],
+        progresso: Optional[Callable[[int, int], None]] = None,
     ) -> list[Document]:
         """Aplica pré-análise de IA ao conteúdo de uma lista de documentos.
 
+        As páginas são analisadas em lote, em paralelo, mantendo a ordem
+        original. Uma página cuja análise falhe mantém o conteúdo original.
+
         Args:
             documentos (list[Document]): Lista de documentos a serem processados.
+            progresso (Optional[Callable[[int, int], None]]): Chamado a cada
+                página concluída com a quantidade concluída e o total. Se
+                omitido, o progresso é registrado no log.
 
         Returns:
             list[Document]: Lista de documentos com o conteúdo atualizado.
         """
-        documentos_processados = []
-        for documento in documentos:
-            try:
-                pre_analise_content = (
-                    FeaturesCompose.pre_analise_ia_treinamento(
-                        documento.page_content
-                    )
+        resultados = FeaturesCompose.pre_analise_ia_treinamento_lote(
+            [documento.page_content for documento in documentos],
+            progresso=progresso or TreinamentoService._registrar_progresso,
+        )
+        for documento, resultado in zip(documentos, resultados):
+            if isinstance(resultado, str):
+                documento.page_content = resultado
+            else:
+                logger.error(
+                    f"Erro ao aplicar pré-análise no documento: {resultado}"
                 )
-                documento.page_content = pre_analise_content
-                documentos_processados.append(documento)
-            except Exception as e:
-                logger.error(f"Erro ao aplicar pré-análise no documento: {e}")
-                documentos_processados.append(documento)
-        return documentos_processados
+        return documentos
+
+    @staticmethod
+    def _registrar_progresso(concluidos: int, total: int) -> None:
+        """Registra no log o progresso da pré-análise dos documentos."""
+        logger.info(f"Pré-análise de documentos: {concluidos}/{total}")
 
     @staticmethod
     def processar_arquivo_upload(arquivo: Any) -> str | None:
@@ -240,8 +255,10 @@ def _processar_treinamento(request: HttpRequest) -> HttpResponse:
                     # Atualiza os campos básicos
                     treinamento.tag = tag
                     treinamento.grupo = grupo
-                    # LIMPA COMPLETAMENTE TODOS OS DADOS EXISTENTES
-                    Documento.limpar_documentos_por_treinamento(treinamento.id)
+                    # Volta ao pré-processamento; os documentos existentes
+                    # são sincronizados com os novos chunks ao finalizar
+                    treinamento.treinamento_finalizado = False
+                    treinamento.treinamento_vetorizado = False
                     messages.success(
                         request,
                         f"Treinamento ID {treinamento_id} editado com sucesso!",
@@ -384,10 +401,8 @@ def _aceitar_treinamento(id: int) -> None:
             )
             return
 
-        # Aplica melhoria de IA ao conteúdo unificado
-        conteudo_melhorado = FeaturesCompose.melhoria_ia_treinamento(
-            conteudo_atual
-        )
+        # Aplica a melhoria revisada pelo usuário (gera se não houver)
+        conteudo_melhorado = _obter_melhoria(treinamento)
 
         # Atualiza o conteúdo do treinamento
         treinamento.conteudo = conteudo_melhorado
@@ -432,8 +447,10 @@ def _exibir_pre_processamento(request: HttpRequest, id: int) -> HttpResponse:
             # Retorna para edição
             return redirect("oraculo:treinar_ia")
 
-        texto_melhorado = FeaturesCompose.melhoria_ia_treinamento(
-            conteudo_unificado
+        # Sem melhoria armazenada, a página a carrega via SSE
+        texto_melhorado = treinamento.melhoria_armazenada(
+            FeaturesCompose.chave_melhoria_ia_treinamento(conteudo_unificado),
+            FeaturesCompose.versao_melhoria_ia_treinamento(),
         )
         return render(
             request,
@@ -453,6 +470,110 @@ def _exibir_pre_processamento(request: HttpRequest, id: int) -> HttpResponse:
         return redirect("oraculo:treinar_ia")
 
 
+def pre_processamento_stream(
+    request: HttpRequest, id: int
+) -> StreamingHttpResponse:
+    """Transmite a sugestão de melhoria via server-sent events (SSE).
+
+    Envia um evento ``trecho`` para cada parte do texto gerado, um evento
+    ``fim`` com o texto completo renderizado em HTML ou um evento ``erro``.
+
+    Args:
+        request (HttpRequest): O objeto de requisição.
+        id (int): O ID do treinamento.
+
+    Returns:
+        StreamingHttpResponse: O fluxo de eventos.
+
+    Raises:
+        Http404: Se o usuário não tiver permissão ou o treinamento não
+            existir.
+    """
+    if not has_permission(request.user, "treinar_ia"):
+        raise Http404()
+    try:
+        treinamento = Treinamento.objects.get(id=id)
+    except Treinamento.DoesNotExist:
+        raise Http404()
+
+    response = StreamingHttpResponse(
+        _eventos_melhoria(treinamento),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def _eventos_melhoria(treinamento: Treinamento) -> Iterator[str]:
+    """Gera os eventos SSE da melhoria do conteúdo de um treinamento.
+
+    Reutiliza a melhoria armazenada para o conteúdo e a configuração
+    atuais; caso não exista, transmite a gerada pelo LLM e a armazena ao
+    final.
+
+    Args:
+        treinamento (Treinamento): O treinamento.
+
+    Yields:
+        str: Os eventos no formato SSE.
+    """
+    conteudo = treinamento.conteudo or ""
+    chave = FeaturesCompose.chave_melhoria_ia_treinamento(conteudo)
+    versao = FeaturesCompose.versao_melhoria_ia_treinamento()
+    texto_melhorado = treinamento.melhoria_armazenada(chave, versao)
+    try:
+        if texto_melhorado is None:
+            partes: list[str] = []
+            for trecho in FeaturesCompose.melhoria_ia_treinamento_stream(
+                conteudo
+            ):
+                partes.append(trecho)
+                yield _evento_sse("trecho", {"texto": trecho})
+            texto_melhorado = "".join(partes).strip()
+            treinamento.armazenar_melhoria(chave, versao, texto_melhorado)
+        else:
+            yield _evento_sse("trecho", {"texto": texto_melhorado})
+        yield _evento_sse(
+            "fim", {"html": str(markdown_format(texto_melhorado))}
+        )
+    except Exception as e:
+        logger.error(f"Erro no streaming da melhoria: {e}")
+        yield _evento_sse(
+            "erro", {"mensagem": "Erro ao gerar a sugestão de melhoria."}
+        )
+
+
+def _obter_melhoria(treinamento: Treinamento) -> str:
+    """Retorna a melhoria do conteúdo, gerando-a apenas se necessário.
+
+    A melhoria exibida é aplicada enquanto o conteúdo não mudar, mesmo após
+    uma alteração da configuração do LLM. A gerada aqui pode vir de um
+    provedor alternativo, e é armazenada sem versão para não ser exibida
+    como se fosse do modelo configurado.
+
+    Args:
+        treinamento (Treinamento): O treinamento.
+
+    Returns:
+        str: O texto melhorado para o conteúdo atual.
+    """
+    conteudo = treinamento.conteudo or ""
+    chave = FeaturesCompose.chave_melhoria_ia_treinamento(conteudo)
+    texto_melhorado = treinamento.melhoria_armazenada(chave)
+    if texto_melhorado is None:
+        texto_melhorado = FeaturesCompose.melhoria_ia_treinamento(conteudo)
+        treinamento.armazenar_melhoria(chave, "", texto_melhorado)
+    return texto_melhorado
+
+
+def _evento_sse(evento: str, dados: dict[str, Any]) -> str:
+    """Formata um evento SSE com dados em JSON."""
+    return (
+        f"event: {evento}\ndata: {json.dumps(dados, ensure_ascii=False)}\n\n"
+    )
+
+
 @csrf_exempt
 def webhook_whatsapp(request: HttpRequest) -> JsonResponse:
     """Endpoint para receber notificações de mensagens do WhatsApp.
@@ -12,12 +12,63 @@ from .features.features_compose import FeaturesCompose
 from .features.load_mensage_data.domain.model.message_data import (
     MessageData,
 )
+from .utils.async_runtime import (
+    ASYNC_RUNTIME,
+    ASYNC_WORKER,
+    AsyncRuntime,
+    WorkerAssincrono,
+)
+from .utils.cache_consultas_embeddings import (
+    EMBEDDINGS_QUERY_CACHE,
+    CacheConsultasEmbeddings,
+    EstatisticasCacheConsultas,
+)
+from .utils.cache_embeddings import (
+    EMBEDDINGS_CACHE,
+    CacheEmbeddings,
+    EstatisticasCacheEmbeddings,
+)
+from .utils.classificador_intencoes import (
+    ClassificacaoIntencao,
+    ClassificadorCentroides,
+    descricoes_intencoes,
+)
+from .utils.embeddings_client_registry import (
+    EMBEDDINGS_CLIENT_REGISTRY,
+    EmbeddingsClientRegistry,
+)
+from .utils.embeddings_locais import (
+    AgrupadorEmbeddings,
+    LocalEmbeddings,
+    ServidorEmbeddingsLocal,
+)
 from .utils.erros import (
     DataMessageError,
     DocumentError,
     HtmlStrError,
     LlmError,
 )
+from .utils.extrator_regras import (
+    TIPOS_ENTIDADE_REGRAS,
+    ExtracaoRegras,
+    mesclar_entidades,
+    tipos_entidade_livres,
+)
+from .utils.fake_providers import FakeChat, HashEmbeddings
+from .utils.grafo_estagios import (
+    Estagio,
+    GrafoEstagios,
+    ResultadoGrafo,
+)
+from .utils.llm_client_registry import (
+    LLM_CLIENT_REGISTRY,
+    LlmClientRegistry,
+)
+from .utils.llm_router import (
+    LLM_ROUTER,
+    LlmRouter,
+    ProvedorLlm,
+)
 from .utils.parameters import (
     AnalisePreviaMensagemParameters,
     DataMensageParameters,
@@ -25,6 +76,18 @@ from .utils.parameters import (
     LoadDocumentConteudoParameters,
     LoadDocumentFileParameters,
 )
+from .utils.response_cache import (
+    LlmResponseCache,
+    get_response_cache,
+)
+from .utils.single_flight import SingleFlight, get_single_flight
+from .utils.telemetria import (
+    TELEMETRIA,
+    RegistroTelemetria,
+    ResumoTelemetria,
+    TelemetriaLlm,
+    resumir,
+)
 from .utils.types import (
     ACData,
     ACUsecase,
@@ -52,6 +115,57 @@ __all__ = [
     "LoadDocumentConteudoParameters",
     "LoadDocumentFileParameters",
     "MessageData",
+    # Extração por regras
+    "ExtracaoRegras",
+    "TIPOS_ENTIDADE_REGRAS",
+    "mesclar_entidades",
+    "tipos_entidade_livres",
+    # Execução de estágios
+    "Estagio",
+    "GrafoEstagios",
+    "ResultadoGrafo",
+    # Registros
+    "ASYNC_RUNTIME",
+    "AsyncRuntime",
+    "ASYNC_WORKER",
+    "WorkerAssincrono",
+    "EMBEDDINGS_CLIENT_REGISTRY",
+    "EmbeddingsClientRegistry",
+    "LLM_CLIENT_REGISTRY",
+    "LlmClientRegistry",
+    # Pré-classificação de intenções
+    "ClassificacaoIntencao",
+    "ClassificadorCentroides",
+    "descricoes_intencoes",
+    # Provedores simulados
+    "FakeChat",
+    "HashEmbeddings",
+    # Serviço local de embeddings
+    "AgrupadorEmbeddings",
+    "LocalEmbeddings",
+    "ServidorEmbeddingsLocal",
+    # Roteamento entre provedores
+    "LLM_ROUTER",
+    "LlmRouter",
+    "ProvedorLlm",
+    # Telemetria
+    "TELEMETRIA",
+    "RegistroTelemetria",
+    "ResumoTelemetria",
+    "TelemetriaLlm",
+    "resumir",
+    # Caches
+    "EMBEDDINGS_CACHE",
+    "CacheEmbeddings",
+    "EstatisticasCacheEmbeddings",
+    "EMBEDDINGS_QUERY_CACHE",
+    "CacheConsultasEmbeddings",
+    "EstatisticasCacheConsultas",
+    "LlmResponseCache",
+    "get_response_cache",
+    # Coalescência de chamadas idênticas
+    "SingleFlight",
+    "get_single_flight",
     # Types
     "ACData",
     "ACUsecase",
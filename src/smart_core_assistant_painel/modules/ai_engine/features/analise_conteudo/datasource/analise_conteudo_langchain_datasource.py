@@ -1,7 +1,18 @@
 import re
+from collections.abc import Iterator
+from typing import Any
 
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
 
+from smart_core_assistant_painel.modules.ai_engine.utils.async_runtime import (
+    em_thread,
+    possui_async_nativo,
+)
+from smart_core_assistant_painel.modules.ai_engine.utils.filtro_pensamento import (
+    FiltroPensamento,
+)
 from smart_core_assistant_painel.modules.ai_engine.utils.parameters import (
     LlmParameters,
 )
@@ -28,6 +39,115 @@ class AnaliseConteudoLangchainDatasource(ACData):
         Raises:
             TypeError: Se a resposta do LLM não for uma string.
         """
+        chain = self._criar_chain(parameters)
+        response = chain.invoke(self._entrada(parameters)).content
+        return self._limpar_resposta(response)
+
+    async def executar_async(self, parameters: LlmParameters) -> str:
+        """Variante assíncrona de ``__call__``, com ``ainvoke``.
+
+        LLMs sem implementação assíncrona própria são chamados em uma
+        thread (``em_thread``).
+
+        Args:
+            parameters (LlmParameters): Parâmetros contendo o modelo, prompts
+                e contexto para a chamada.
+
+        Returns:
+            str: A resposta do LLM como uma string limpa.
+
+        Raises:
+            TypeError: Se a resposta do LLM não for uma string.
+        """
+        chain = self._criar_chain(parameters)
+        entrada = self._entrada(parameters)
+        if possui_async_nativo(
+            parameters.create_llm, BaseChatModel, "_agenerate"
+        ):
+            resposta = await chain.ainvoke(entrada)
+        else:
+            resposta = await em_thread(chain.invoke, entrada)
+        return self._limpar_resposta(resposta.content)
+
+    def stream(self, parameters: LlmParameters) -> Iterator[str]:
+        """Executa a chamada retornando a resposta em trechos (``stream``).
+
+        As tags de pensamento são removidas incrementalmente, mesmo quando
+        chegam divididas entre trechos.
+
+        Args:
+            parameters (LlmParameters): Parâmetros contendo o modelo, prompts
+                e contexto para a chamada.
+
+        Yields:
+            str: Os trechos da resposta já filtrados.
+
+        Raises:
+            TypeError: Se um trecho da resposta não for uma string.
+        """
+        chain = self._criar_chain(parameters)
+        filtro = FiltroPensamento()
+        for chunk in chain.stream(self._entrada(parameters)):
+            conteudo = chunk.content
+            if not isinstance(conteudo, str):
+                raise TypeError(
+                    f"Trecho da resposta do LLM deve ser uma string, mas "
+                    f"recebeu: {type(conteudo)}"
+                )
+            texto = filtro.processar(conteudo)
+            if texto:
+                yield texto
+        restante = filtro.finalizar()
+        if restante:
+            yield restante
+
+    def lote(
+        self,
+        parameters: LlmParameters,
+        contextos: list[str],
+        max_concurrency: int,
+    ) -> Iterator[tuple[int, str | Exception]]:
+        """Executa a mesma chamada para vários contextos com ``batch``.
+
+        Usa ``batch_as_completed`` da chain, limitado a ``max_concurrency``
+        chamadas simultâneas. A falha de um contexto não interrompe os
+        demais: a exceção é devolvida no lugar da resposta.
+
+        Args:
+            parameters (LlmParameters): Parâmetros comuns da chamada. O
+                ``context`` é substituído por cada item de ``contextos``.
+            contextos (list[str]): Os contextos a processar.
+            max_concurrency (int): Máximo de chamadas simultâneas.
+
+        Yields:
+            tuple[int, str | Exception]: O índice do contexto e a resposta
+                limpa ou a exceção, na ordem em que forem concluídos.
+        """
+        if not contextos:
+            return
+        chain = self._criar_chain(parameters)
+        entradas = [
+            {"prompt_human": parameters.prompt_human, "context": contexto}
+            for contexto in contextos
+        ]
+        for indice, resposta in chain.batch_as_completed(
+            entradas,
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=True,
+        ):
+            if isinstance(resposta, Exception):
+                yield indice, resposta
+                continue
+            try:
+                yield indice, self._limpar_resposta(resposta.content)
+            except TypeError as e:
+                yield indice, e
+
+    @staticmethod
+    def _criar_chain(
+        parameters: LlmParameters,
+    ) -> Runnable[dict[str, Any], Any]:
+        """Monta a chain ``prompt | llm`` para os parâmetros."""
         llm = parameters.create_llm
 
         messages = ChatPromptTemplate.from_messages(
@@ -37,15 +157,19 @@ class AnaliseConteudoLangchainDatasource(ACData):
             ]
         )
 
-        chain = messages | llm
+        return messages | llm
 
-        response = chain.invoke(
-            {
-                "prompt_human": parameters.prompt_human,
-                "context": parameters.context,
-            }
-        ).content
+    @staticmethod
+    def _entrada(parameters: LlmParameters) -> dict[str, Any]:
+        """Retorna as variáveis do prompt."""
+        return {
+            "prompt_human": parameters.prompt_human,
+            "context": parameters.context,
+        }
 
+    @staticmethod
+    def _limpar_resposta(response: Any) -> str:
+        """Valida a resposta do LLM e remove as tags de pensamento."""
         if isinstance(response, str):
             # ✅ Filtrar tags <think> e </think>
             cleaned_response = re.sub(
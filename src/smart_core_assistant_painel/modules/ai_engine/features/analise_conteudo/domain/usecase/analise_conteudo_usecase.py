@@ -1,11 +1,18 @@
+from typing import cast
+
 from py_return_success_or_error import (
+    ErrorReturn,
     ReturnSuccessOrError,
+    SuccessReturn,
 )
 
 from smart_core_assistant_painel.modules.ai_engine.utils.parameters import (
     LlmParameters,
 )
-from smart_core_assistant_painel.modules.ai_engine.utils.types import ACUsecase
+from smart_core_assistant_painel.modules.ai_engine.utils.types import (
+    ACAsyncData,
+    ACUsecase,
+)
 
 
 class AnaliseConteudoUseCase(ACUsecase):
@@ -32,3 +39,21 @@ class AnaliseConteudoUseCase(ACUsecase):
         return self._resultDatasource(
             parameters=parameters, datasource=self._datasource
         )
+
+    async def executar_async(
+        self, parameters: LlmParameters
+    ) -> ReturnSuccessOrError[str]:
+        """Variante assíncrona de ``__call__``.
+
+        Args:
+            parameters (LlmParameters): Os parâmetros da interação com o LLM.
+
+        Returns:
+            ReturnSuccessOrError[str]: O resultado da análise
+                (SuccessReturn) ou o erro dos parâmetros (ErrorReturn).
+        """
+        datasource = cast(ACAsyncData, self._datasource)
+        try:
+            return SuccessReturn(await datasource.executar_async(parameters))
+        except Exception:
+            return ErrorReturn(parameters.error)
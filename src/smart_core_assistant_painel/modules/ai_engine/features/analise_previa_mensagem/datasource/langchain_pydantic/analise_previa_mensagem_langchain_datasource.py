@@ -1,6 +1,11 @@
+import hashlib
+import threading
+from collections.abc import Mapping
 from typing import Any
 
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
 from loguru import logger
 
 from smart_core_assistant_painel.modules.ai_engine.features.analise_previa_mensagem.datasource.langchain_pydantic.analise_previa_mensagem_langchain import (
@@ -9,11 +14,17 @@ from smart_core_assistant_painel.modules.ai_engine.features.analise_previa_mensa
 from smart_core_assistant_painel.modules.ai_engine.features.analise_previa_mensagem.datasource.langchain_pydantic.pydantic_model_factory import (
     create_dynamic_pydantic_model,
 )
+from smart_core_assistant_painel.modules.ai_engine.utils.async_runtime import (
+    em_thread,
+    possui_async_nativo,
+)
 from smart_core_assistant_painel.modules.ai_engine.utils.parameters import (
     AnalisePreviaMensagemParameters,
 )
 from smart_core_assistant_painel.modules.ai_engine.utils.types import APMData
 
+_CHAIN_CACHE_MAXSIZE: int = 32
+
 
 class AnalisePreviaMensagemLangchainDatasource(APMData):
     """Datasource para extrair intenções e entidades usando LLM com Langchain.
@@ -23,6 +34,11 @@ class AnalisePreviaMensagemLangchainDatasource(APMData):
     específico, garantindo a extração confiável de dados.
     """
 
+    _chain_cache: dict[
+        str, tuple[BaseChatModel, Runnable[dict[str, Any], Any]]
+    ] = {}
+    _chain_cache_lock = threading.Lock()
+
     def __call__(
         self, parameters: AnalisePreviaMensagemParameters
     ) -> AnalisePreviaMensagemLangchain:
@@ -47,83 +63,179 @@ class AnalisePreviaMensagemLangchainDatasource(APMData):
                 interação com o LLM ou na criação do modelo dinâmico.
         """
         try:
-            # Criar modelo PydanticModel dinâmico baseado nos parâmetros
-            PydanticModel = create_dynamic_pydantic_model(
-                intent_types_json=parameters.valid_intent_types,
-                entity_types_json=parameters.valid_entity_types,
-            )
-
-            # Processar histórico do atendimento
-            historico_formatado = self._formatar_historico_atendimento(
-                parameters.historico_atendimento
-            )
-            # Escapar chaves JSON no prompt system para evitar conflito com
-            # variáveis do template
-            prompt_system_escaped = (
-                parameters.llm_parameters.prompt_system.replace(
-                    "{", "{{"
-                ).replace("}", "}}")
-            )
-
-            messages = ChatPromptTemplate.from_messages(
-                [
-                    ("system", prompt_system_escaped),
-                    (
-                        "user",
-                        "{historico_context}\n\n{prompt_human}: {context}",
-                    ),
-                ]
-            )
-
-            llm = parameters.llm_parameters.create_llm
-
-            # Aplicar structured output
-            structured_llm = llm.with_structured_output(PydanticModel)
-
-            # Chain com LLM estruturado
-            chain = messages | structured_llm
-
-            # Preparar dados para invocação com validação
-            invoke_data = {
-                "prompt_human": parameters.llm_parameters.prompt_human,
-                "context": parameters.llm_parameters.context,
-                "historico_context": historico_formatado,
-            }
+            # Chain com LLM estruturado (reutilizada enquanto a configuração
+            # de intents, entidades, prompt e modelo não mudar)
+            chain = self._obter_chain(parameters)
 
             # Invocar a chain
-            response = chain.invoke(invoke_data)
+            response = chain.invoke(self._entrada(parameters))
 
-            # Converter PydanticModel para AnalisePreviaMensagem
-            # Extrair dados de intent e entities do response
-            intent_data = getattr(response, "intent", [])
-            entities_data = getattr(response, "entities", [])
+            return self._converter_resposta(response)
 
-            intent_dicts = [
-                {str(item.type): item.value} for item in intent_data
-            ]
+        except Exception as e:
+            logger.error(f"Erro ao processar análise prévia: {e}")
+            raise
 
-            entity_dicts = [
-                {str(item.type): item.value} for item in entities_data
-            ]
+    async def executar_async(
+        self, parameters: AnalisePreviaMensagemParameters
+    ) -> AnalisePreviaMensagemLangchain:
+        """Variante assíncrona de ``__call__``, com ``ainvoke``.
 
-            # Criar instância de AnalisePreviaMensagem
-            resultado = AnalisePreviaMensagemLangchain(
-                intent=intent_dicts, entities=entity_dicts
-            )
+        LLMs sem implementação assíncrona própria são chamados em uma
+        thread (``em_thread``).
 
-            return resultado
+        Args:
+            parameters (AnalisePreviaMensagemParameters): Os parâmetros
+                necessários, incluindo o histórico, texto, e configurações
+                do LLM.
+
+        Returns:
+            AnalisePreviaMensagemLangchain: Um objeto contendo as listas de
+                intenções e entidades extraídas.
+
+        Raises:
+            Exception: Propaga exceções que podem ocorrer durante a
+                interação com o LLM ou na criação do modelo dinâmico.
+        """
+        try:
+            chain = self._obter_chain(parameters)
+            entrada = self._entrada(parameters)
+            if possui_async_nativo(
+                parameters.llm_parameters.create_llm,
+                BaseChatModel,
+                "_agenerate",
+            ):
+                response = await chain.ainvoke(entrada)
+            else:
+                response = await em_thread(chain.invoke, entrada)
+            return self._converter_resposta(response)
 
         except Exception as e:
             logger.error(f"Erro ao processar análise prévia: {e}")
             raise
 
+    def _entrada(
+        self, parameters: AnalisePreviaMensagemParameters
+    ) -> dict[str, Any]:
+        """Retorna as variáveis do prompt, com o histórico formatado."""
+        return {
+            "prompt_human": parameters.llm_parameters.prompt_human,
+            "context": parameters.llm_parameters.context,
+            "historico_context": self._formatar_historico_atendimento(
+                parameters.historico_atendimento
+            ),
+        }
+
+    @staticmethod
+    def _converter_resposta(response: Any) -> AnalisePreviaMensagemLangchain:
+        """Converte a resposta estruturada do LLM em intenções e entidades.
+
+        Args:
+            response (Any): A instância do modelo Pydantic dinâmico.
+
+        Returns:
+            AnalisePreviaMensagemLangchain: As intenções e entidades.
+        """
+        intent_data = getattr(response, "intent", [])
+        entities_data = getattr(response, "entities", [])
+
+        intent_dicts = [{str(item.type): item.value} for item in intent_data]
+
+        entity_dicts = [
+            {str(item.type): item.value} for item in entities_data
+        ]
+
+        return AnalisePreviaMensagemLangchain(
+            intent=intent_dicts, entities=entity_dicts
+        )
+
+    def _obter_chain(
+        self, parameters: AnalisePreviaMensagemParameters
+    ) -> Runnable[dict[str, Any], Any]:
+        """Retorna a chain ``prompt | structured_llm`` para a configuração.
+
+        A chain é memoizada por um hash de ``VALID_INTENT_TYPES``,
+        ``VALID_ENTITY_TYPES``, prompt de sistema e configuração do modelo.
+        A entrada só é reaproveitada se a instância do LLM for a mesma,
+        o que invalida a chain quando o registro de clientes é renovado.
+
+        Args:
+            parameters (AnalisePreviaMensagemParameters): Os parâmetros da
+                análise.
+
+        Returns:
+            Runnable[dict[str, Any], Any]: A chain pronta para invocação.
+        """
+        llm_parameters = parameters.llm_parameters
+        llm = llm_parameters.create_llm
+        chave = self._chave_chain(parameters)
+
+        with self._chain_cache_lock:
+            entrada = self._chain_cache.get(chave)
+        if entrada is not None and entrada[0] is llm:
+            return entrada[1]
+
+        # Criar modelo PydanticModel dinâmico baseado nos parâmetros
+        PydanticModel = create_dynamic_pydantic_model(
+            intent_types_json=parameters.valid_intent_types,
+            entity_types_json=parameters.valid_entity_types,
+        )
+
+        # Escapar chaves JSON no prompt system para evitar conflito com
+        # variáveis do template
+        prompt_system_escaped = llm_parameters.prompt_system.replace(
+            "{", "{{"
+        ).replace("}", "}}")
+
+        messages = ChatPromptTemplate.from_messages(
+            [
+                ("system", prompt_system_escaped),
+                (
+                    "user",
+                    "{historico_context}\n\n{prompt_human}: {context}",
+                ),
+            ]
+        )
+
+        # Aplicar structured output
+        structured_llm = llm.with_structured_output(PydanticModel)
+        chain = messages | structured_llm
+
+        with self._chain_cache_lock:
+            self._chain_cache.pop(chave, None)
+            while len(self._chain_cache) >= _CHAIN_CACHE_MAXSIZE:
+                self._chain_cache.pop(next(iter(self._chain_cache)))
+            self._chain_cache[chave] = (llm, chain)
+        return chain
+
+    @staticmethod
+    def _chave_chain(parameters: AnalisePreviaMensagemParameters) -> str:
+        """Gera a chave da chain a partir da configuração da análise.
+
+        Args:
+            parameters (AnalisePreviaMensagemParameters): Os parâmetros da
+                análise.
+
+        Returns:
+            str: Hash SHA-256 da configuração.
+        """
+        conteudo = "\x1f".join(
+            [
+                parameters.valid_intent_types,
+                parameters.valid_entity_types,
+                parameters.llm_parameters.prompt_system,
+                repr(parameters.llm_parameters.config_key),
+            ]
+        )
+        return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
     def _formatar_historico_atendimento(
-        self, historico_atendimento: dict[str, Any]
+        self, historico_atendimento: Mapping[str, Any]
     ) -> str:
         """Formata o histórico de atendimento para ser usado no prompt da LLM.
 
         Args:
-            historico_atendimento: Histórico de atendimento a ser formatado (dict[str, Any])
+            historico_atendimento: Histórico de atendimento a ser formatado (Mapping[str, Any])
 
         Returns:
             str: Histórico formatado para o prompt
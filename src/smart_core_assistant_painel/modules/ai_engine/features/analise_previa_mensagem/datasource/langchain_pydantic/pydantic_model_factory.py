@@ -12,6 +12,7 @@ Funções:
 """
 
 import json
+from functools import lru_cache
 from typing import Type
 
 from pydantic import BaseModel, Field
@@ -249,11 +250,16 @@ class PydanticModelFactory:
         return PydanticModel
 
 
+@lru_cache(maxsize=32)
 def create_dynamic_pydantic_model(
     intent_types_json: str, entity_types_json: str
 ) -> Type[BaseModel]:
     """Função utilitária para criar uma PydanticModel dinâmica.
 
+    O resultado é memoizado pelo par de configurações JSON: enquanto
+    ``VALID_INTENT_TYPES`` e ``VALID_ENTITY_TYPES`` não mudam, a mesma
+    classe é reutilizada sem reprocessar o JSON e a documentação.
+
     Args:
         intent_types_json (str): JSON com os tipos de intenção.
         entity_types_json (str): JSON com os tipos de entidade.
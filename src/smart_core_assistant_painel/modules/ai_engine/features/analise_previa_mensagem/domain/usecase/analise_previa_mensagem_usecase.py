@@ -1,3 +1,5 @@
+from typing import cast
+
 from py_return_success_or_error import (
     ErrorReturn,
     ReturnSuccessOrError,
@@ -8,6 +10,7 @@ from smart_core_assistant_painel.modules.ai_engine.utils.parameters import (
     AnalisePreviaMensagemParameters,
 )
 from smart_core_assistant_painel.modules.ai_engine.utils.types import (
+    APMAsyncData,
     APMTuple,
     APMUsecase,
 )
@@ -58,3 +61,33 @@ class AnalisePreviaMensagemUsecase(APMUsecase):
             error = parameters.error
             error.message = f"{error.message} - Exception: {str(e)}"
             return ErrorReturn(error)
+
+    async def executar_async(
+        self, parameters: AnalisePreviaMensagemParameters
+    ) -> ReturnSuccessOrError[APMTuple]:
+        """Variante assíncrona de ``__call__``.
+
+        Args:
+            parameters (AnalisePreviaMensagemParameters): Parâmetros que
+                incluem o texto a ser analisado, histórico e configurações
+                do LLM.
+
+        Returns:
+            ReturnSuccessOrError[APMTuple]: As intenções e entidades
+                extraídas (SuccessReturn) ou um AppError (ErrorReturn).
+        """
+        datasource = cast(APMAsyncData, self._datasource)
+        try:
+            result = await datasource.executar_async(parameters)
+        except Exception:
+            return ErrorReturn(parameters.error)
+        try:
+            return SuccessReturn(
+                success=APMTuple(
+                    intent_types=result.intent, entity_types=result.entities
+                )
+            )
+        except Exception as e:
+            error = parameters.error
+            error.message = f"{error.message} - Exception: {str(e)}"
+            return ErrorReturn(error)
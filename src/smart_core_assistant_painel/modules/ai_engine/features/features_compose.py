@@ -5,7 +5,9 @@ de IA do sistema, como processamento de documentos, análise de mensagens e
 interação com modelos de linguagem.
 """
 
-from typing import Any, cast
+import time
+from collections.abc import Awaitable, Callable, Iterator, Mapping
+from typing import Any, Optional, TypeVar, cast
 
 from langchain_core.documents.base import Document
 from loguru import logger
@@ -26,11 +28,20 @@ from smart_core_assistant_painel.modules.ai_engine.utils.parameters import (
 )
 from smart_core_assistant_painel.modules.services import SERVICEHUB
 
+from ..utils.async_runtime import ASYNC_RUNTIME
+from ..utils.cache_consultas_embeddings import EMBEDDINGS_QUERY_CACHE
+from ..utils.cache_embeddings import EMBEDDINGS_CACHE
 from ..utils.erros import (
     DataMessageError,
     DocumentError,
     LlmError,
 )
+from ..utils.extrator_regras import (
+    ExtracaoRegras,
+    extrair_por_regras,
+    tipos_configurados,
+)
+from ..utils.llm_router import LLM_ROUTER, ProvedorLlm
 from ..utils.parameters import (
     AnalisePreviaMensagemParameters,
     DataMensageParameters,
@@ -39,6 +50,14 @@ from ..utils.parameters import (
     LoadDocumentConteudoParameters,
     LoadDocumentFileParameters,
 )
+from ..utils.response_cache import (
+    LlmResponseCache,
+    fingerprint_historico,
+    get_response_cache,
+    normalizar_mensagem,
+)
+from ..utils.single_flight import get_single_flight
+from ..utils.telemetria import TELEMETRIA, TIPO_EMBEDDING
 from ..utils.types import (
     ACData,
     ACUsecase,
@@ -85,6 +104,8 @@ from .load_mensage_data.domain.usecase.load_mensage_data_usecase import (
     LoadMensageDataUseCase,
 )
 
+T = TypeVar("T")
+
 
 class FeaturesCompose:
     """Facade para os casos de uso do módulo AI Engine."""
@@ -173,18 +194,21 @@ class FeaturesCompose:
             LlmError: Se ocorrer um erro durante a comunicação com o LLM.
             ValueError: Se o tipo de retorno do caso de uso for inesperado.
         """
-        parameters = LlmParameters(
-            llm_class=SERVICEHUB.LLM_CLASS,
-            model=SERVICEHUB.MODEL,
-            extra_params={"temperature": SERVICEHUB.LLM_TEMPERATURE},
-            prompt_system=SERVICEHUB.PROMPT_SYSTEM_ANALISE_CONTEUDO,
-            prompt_human=SERVICEHUB.PROMPT_HUMAN_ANALISE_CONTEUDO,
-            context=context,
-            error=LlmError,
-        )
         datasource: ACData = AnaliseConteudoLangchainDatasource()
         usecase: ACUsecase = AnaliseConteudoUseCase(datasource)
-        data = usecase(parameters)
+        with TELEMETRIA.funcionalidade("pre_analise_ia_treinamento"):
+            data = LLM_ROUTER.executar(
+                FeaturesCompose._provedores_llm(),
+                lambda provedor: usecase(
+                    FeaturesCompose._parametros_llm(
+                        prompt_system=SERVICEHUB.PROMPT_SYSTEM_ANALISE_CONTEUDO,
+                        prompt_human=SERVICEHUB.PROMPT_HUMAN_ANALISE_CONTEUDO,
+                        context=context,
+                        provedor=provedor,
+                    )
+                ),
+                "análise de conteúdo",
+            )
 
         if isinstance(data, SuccessReturn):
             return cast(str, data.result)
@@ -207,18 +231,21 @@ class FeaturesCompose:
             LlmError: Se ocorrer um erro durante a comunicação com o LLM.
             ValueError: Se o tipo de retorno do caso de uso for inesperado.
         """
-        parameters = LlmParameters(
-            llm_class=SERVICEHUB.LLM_CLASS,
-            model=SERVICEHUB.MODEL,
-            extra_params={"temperature": SERVICEHUB.LLM_TEMPERATURE},
-            prompt_system=SERVICEHUB.PROMPT_SYSTEM_MELHORIA_CONTEUDO,
-            prompt_human=SERVICEHUB.PROMPT_HUMAN_MELHORIA_CONTEUDO,
-            context=context,
-            error=LlmError,
-        )
         datasource: ACData = AnaliseConteudoLangchainDatasource()
         usecase: ACUsecase = AnaliseConteudoUseCase(datasource)
-        data = usecase(parameters)
+        with TELEMETRIA.funcionalidade("melhoria_ia_treinamento"):
+            data = LLM_ROUTER.executar(
+                FeaturesCompose._provedores_llm(),
+                lambda provedor: usecase(
+                    FeaturesCompose._parametros_llm(
+                        prompt_system=SERVICEHUB.PROMPT_SYSTEM_MELHORIA_CONTEUDO,
+                        prompt_human=SERVICEHUB.PROMPT_HUMAN_MELHORIA_CONTEUDO,
+                        context=context,
+                        provedor=provedor,
+                    )
+                ),
+                "melhoria de conteúdo",
+            )
 
         if isinstance(data, SuccessReturn):
             return cast(str, data.result)
@@ -227,15 +254,112 @@ class FeaturesCompose:
         else:
             raise ValueError("Unexpected return type from usecase")
 
+    @staticmethod
+    def melhoria_ia_treinamento_stream(context: str) -> Iterator[str]:
+        """Variante de ``melhoria_ia_treinamento`` que retorna em trechos.
+
+        Permite exibir a versão melhorada enquanto ela é gerada. O
+        provedor é escolhido pelo ``LLM_ROUTER``; se o stream falhar antes
+        do primeiro trecho, o próximo provedor é tentado.
+
+        Args:
+            context (str): O conteúdo a ser melhorado.
+
+        Yields:
+            str: Os trechos da versão melhorada, sem tags de pensamento.
+
+        Raises:
+            LlmError: Se ocorrer um erro durante a comunicação com o LLM.
+        """
+        datasource = AnaliseConteudoLangchainDatasource()
+        try:
+            with TELEMETRIA.funcionalidade("melhoria_ia_treinamento"):
+                yield from LLM_ROUTER.executar_stream(
+                    FeaturesCompose._provedores_llm(),
+                    lambda provedor: datasource.stream(
+                        FeaturesCompose._parametros_llm(
+                            prompt_system=SERVICEHUB.PROMPT_SYSTEM_MELHORIA_CONTEUDO,
+                            prompt_human=SERVICEHUB.PROMPT_HUMAN_MELHORIA_CONTEUDO,
+                            context=context,
+                            provedor=provedor,
+                        )
+                    ),
+                    "melhoria de conteúdo",
+                )
+        except LlmError:
+            raise
+        except Exception as e:
+            raise LlmError(f"Erro no streaming da melhoria: {e}") from e
+
+    @staticmethod
+    def pre_analise_ia_treinamento_lote(
+        contextos: list[str],
+        max_concurrency: Optional[int] = None,
+        progresso: Optional[Callable[[int, int], None]] = None,
+    ) -> list[str | LlmError]:
+        """Executa a pré-análise de vários conteúdos em lote.
+
+        As chamadas são feitas em paralelo, limitadas a ``max_concurrency``
+        simultâneas, e o resultado preserva a ordem de ``contextos``. A
+        falha de um conteúdo não interrompe os demais.
+
+        Args:
+            contextos (list[str]): Os conteúdos a serem analisados.
+            max_concurrency (Optional[int]): Máximo de chamadas simultâneas.
+                Se omitido, usa ``SERVICEHUB.LLM_BATCH_MAX_CONCURRENCY``.
+            progresso (Optional[Callable[[int, int], None]]): Chamado a cada
+                conteúdo concluído com a quantidade concluída e o total.
+
+        Returns:
+            list[str | LlmError]: Para cada conteúdo, o resultado da análise
+                ou o erro ocorrido.
+        """
+        parameters = FeaturesCompose._parametros_llm(
+            prompt_system=SERVICEHUB.PROMPT_SYSTEM_ANALISE_CONTEUDO,
+            prompt_human=SERVICEHUB.PROMPT_HUMAN_ANALISE_CONTEUDO,
+            context="",
+        )
+        limite = max_concurrency or SERVICEHUB.LLM_BATCH_MAX_CONCURRENCY
+        total = len(contextos)
+        resultados: list[str | LlmError] = [
+            LlmError("Conteúdo não processado")
+        ] * total
+        datasource = AnaliseConteudoLangchainDatasource()
+        try:
+            with TELEMETRIA.funcionalidade("pre_analise_ia_treinamento"):
+                for concluidos, (indice, resposta) in enumerate(
+                    datasource.lote(parameters, contextos, limite), start=1
+                ):
+                    if isinstance(resposta, Exception):
+                        logger.error(
+                            f"Erro na pré-análise do conteúdo {indice}: "
+                            f"{resposta}"
+                        )
+                        resposta = LlmError(str(resposta))
+                    resultados[indice] = resposta
+                    if progresso is not None:
+                        progresso(concluidos, total)
+        except Exception as e:
+            logger.error(f"Erro na pré-análise em lote: {e}")
+            erro = LlmError(str(e))
+            resultados = [
+                r if isinstance(r, str) else erro for r in resultados
+            ]
+        return resultados
+
     @staticmethod
     def analise_previa_mensagem(
-        historico_atendimento: dict[str, Any], context: str
+        historico_atendimento: Mapping[str, Any],
+        context: str,
+        usar_cache: bool = True,
     ) -> APMTuple:
         """Realiza análise prévia de mensagem para extrair intenção e entidades.
 
         Args:
-            historico_atendimento (dict[str, Any]): Histórico da conversa.
+            historico_atendimento (Mapping[str, Any]): Histórico da conversa.
             context (str): O texto da mensagem a ser analisada.
+            usar_cache (bool): Com False, ignora o cache de respostas e o
+                single-flight, garantindo uma nova chamada ao LLM.
 
         Returns:
             APMTuple: Uma tupla contendo as intenções e entidades detectadas.
@@ -244,33 +368,560 @@ class FeaturesCompose:
             LlmError: Se ocorrer um erro durante a comunicação com o LLM.
             ValueError: Se o tipo de retorno do caso de uso for inesperado.
         """
-        llm_parameters = LlmParameters(
-            llm_class=SERVICEHUB.LLM_CLASS,
-            model=SERVICEHUB.MODEL,
+        cache = get_response_cache("analise_previa_mensagem")
+        cache_key = None
+        if usar_cache and cache.enabled:
+            cache_key = FeaturesCompose._chave_cache_analise_previa(
+                historico_atendimento, context
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return APMTuple(
+                    intent_types=cached["intent_types"],
+                    entity_types=cached["entity_types"],
+                )
+
+        def analisar() -> APMTuple:
+            datasource: APMData = AnalisePreviaMensagemLangchainDatasource()
+            usecase: APMUsecase = AnalisePreviaMensagemUsecase(datasource)
+            provedores = FeaturesCompose._provedores_llm()
+            respostas: list[
+                tuple[ProvedorLlm, ReturnSuccessOrError[APMTuple]]
+            ] = []
+
+            def chamar(
+                provedor: ProvedorLlm,
+            ) -> ReturnSuccessOrError[APMTuple]:
+                resposta = usecase(
+                    FeaturesCompose._parametros_analise_previa(
+                        historico_atendimento, context, provedor
+                    )
+                )
+                respostas.append((provedor, resposta))
+                return resposta
+
+            with TELEMETRIA.funcionalidade("analise_previa_mensagem"):
+                data = LLM_ROUTER.executar_com_hedge(
+                    provedores, chamar, "análise prévia de mensagem"
+                )
+
+            resultado, armazenar = FeaturesCompose._concluir_analise_previa(
+                data, respostas, provedores
+            )
+            if cache_key is not None and armazenar:
+                cache.set(cache_key, resultado._asdict())
+            return resultado
+
+        if not usar_cache:
+            return analisar()
+        # Mensagens idênticas simultâneas (ex.: respostas a um disparo em
+        # massa) com o mesmo histórico aguardam a mesma chamada ao LLM
+        return get_single_flight("analise_previa_mensagem").executar(
+            FeaturesCompose._chave_single_flight_analise_previa(
+                historico_atendimento, context
+            ),
+            analisar,
+            serializar=APMTuple._asdict,
+            desserializar=lambda valor: APMTuple(**valor),
+        )
+
+    @staticmethod
+    async def pre_analise_ia_treinamento_async(context: str) -> str:
+        """Variante assíncrona de ``pre_analise_ia_treinamento``.
+
+        Chama o LLM com ``ainvoke``, com o mesmo roteamento entre provedores
+        e a mesma telemetria. Cada chamada respeita o limite de concorrência
+        e o tempo limite do provedor no ``ASYNC_RUNTIME``; ao expirar, o
+        próximo provedor é tentado.
+
+        Args:
+            context (str): O conteúdo a ser analisado.
+
+        Returns:
+            str: O resultado da análise.
+
+        Raises:
+            LlmError: Se ocorrer um erro ou o tempo limite for excedido.
+        """
+        return await FeaturesCompose._executar_async(
+            FeaturesCompose._analise_conteudo_async(
+                "pre_analise_ia_treinamento",
+                SERVICEHUB.PROMPT_SYSTEM_ANALISE_CONTEUDO,
+                SERVICEHUB.PROMPT_HUMAN_ANALISE_CONTEUDO,
+                context,
+                "análise de conteúdo",
+            ),
+            LlmError("Tempo limite excedido na análise de conteúdo"),
+        )
+
+    @staticmethod
+    async def melhoria_ia_treinamento_async(context: str) -> str:
+        """Variante assíncrona de ``melhoria_ia_treinamento``.
+
+        Args:
+            context (str): O conteúdo a ser melhorado.
+
+        Returns:
+            str: A versão melhorada do conteúdo.
+
+        Raises:
+            LlmError: Se ocorrer um erro ou o tempo limite for excedido.
+        """
+        return await FeaturesCompose._executar_async(
+            FeaturesCompose._analise_conteudo_async(
+                "melhoria_ia_treinamento",
+                SERVICEHUB.PROMPT_SYSTEM_MELHORIA_CONTEUDO,
+                SERVICEHUB.PROMPT_HUMAN_MELHORIA_CONTEUDO,
+                context,
+                "melhoria de conteúdo",
+            ),
+            LlmError("Tempo limite excedido na melhoria de conteúdo"),
+        )
+
+    @staticmethod
+    async def analise_previa_mensagem_async(
+        historico_atendimento: Mapping[str, Any],
+        context: str,
+        usar_cache: bool = True,
+    ) -> APMTuple:
+        """Variante assíncrona de ``analise_previa_mensagem``.
+
+        Usa o mesmo cache de respostas, a mesma coalescência de chamadas
+        idênticas (compartilhada com a variante síncrona) e o mesmo
+        roteamento com hedging, chamando o LLM com ``ainvoke``.
+
+        Args:
+            historico_atendimento (Mapping[str, Any]): Histórico da conversa.
+            context (str): O texto da mensagem a ser analisada.
+            usar_cache (bool): Com False, ignora o cache de respostas e o
+                single-flight, garantindo uma nova chamada ao LLM.
+
+        Returns:
+            APMTuple: Uma tupla contendo as intenções e entidades detectadas.
+
+        Raises:
+            LlmError: Se ocorrer um erro ou o tempo limite for excedido.
+        """
+        cache = get_response_cache("analise_previa_mensagem")
+        cache_key = None
+        if usar_cache and cache.enabled:
+            cache_key = FeaturesCompose._chave_cache_analise_previa(
+                historico_atendimento, context
+            )
+            cached = await cache.aget(cache_key)
+            if cached is not None:
+                return APMTuple(
+                    intent_types=cached["intent_types"],
+                    entity_types=cached["entity_types"],
+                )
+
+        async def analisar() -> APMTuple:
+            datasource: APMData = AnalisePreviaMensagemLangchainDatasource()
+            usecase = AnalisePreviaMensagemUsecase(datasource)
+            provedores = FeaturesCompose._provedores_llm()
+            respostas: list[
+                tuple[ProvedorLlm, ReturnSuccessOrError[APMTuple]]
+            ] = []
+
+            async def chamar(
+                provedor: ProvedorLlm,
+            ) -> ReturnSuccessOrError[APMTuple]:
+                parametros = FeaturesCompose._parametros_analise_previa(
+                    historico_atendimento, context, provedor
+                )
+                resposta = await ASYNC_RUNTIME.executar(
+                    provedor.classe,
+                    lambda: usecase.executar_async(parametros),
+                )
+                respostas.append((provedor, resposta))
+                return resposta
+
+            with TELEMETRIA.funcionalidade("analise_previa_mensagem"):
+                data = await LLM_ROUTER.aexecutar_com_hedge(
+                    provedores, chamar, "análise prévia de mensagem"
+                )
+
+            resultado, armazenar = FeaturesCompose._concluir_analise_previa(
+                data, respostas, provedores
+            )
+            if cache_key is not None and armazenar:
+                await cache.aset(cache_key, resultado._asdict())
+            return resultado
+
+        erro_timeout = LlmError(
+            "Tempo limite excedido na análise prévia da mensagem"
+        )
+        if not usar_cache:
+            return await FeaturesCompose._executar_async(
+                analisar(), erro_timeout
+            )
+        return await FeaturesCompose._executar_async(
+            get_single_flight("analise_previa_mensagem").aexecutar(
+                FeaturesCompose._chave_single_flight_analise_previa(
+                    historico_atendimento, context
+                ),
+                analisar,
+                serializar=APMTuple._asdict,
+                desserializar=lambda valor: APMTuple(**valor),
+            ),
+            erro_timeout,
+        )
+
+    @staticmethod
+    async def generate_embeddings_async(text: str) -> list[float]:
+        """Variante assíncrona de ``generate_embeddings``.
+
+        Usa os mesmos caches de embeddings, a mesma coalescência de
+        chamadas idênticas (compartilhada com a variante síncrona) e a
+        mesma telemetria, chamando o provedor com ``aembed_query``.
+
+        Args:
+            text (str): Texto para gerar embeddings.
+
+        Returns:
+            list[float]: Vetor de embeddings gerado.
+
+        Raises:
+            EmbeddingError: Se ocorrer um erro ou o tempo limite for
+                excedido.
+        """
+
+        async def gerar() -> list[float]:
+            parameters = GenerateEmbeddingsParameters(
+                text=text, error=EmbeddingError("Erro ao gerar embeddings!")
+            )
+            datasource: GEData = GenerateEmbeddingsLangchainDatasource()
+            usecase = GenerateEmbeddingsUseCase(datasource)
+            inicio = time.perf_counter()
+            try:
+                data = await ASYNC_RUNTIME.executar(
+                    SERVICEHUB.EMBEDDINGS_CLASS,
+                    lambda: usecase.executar_async(parameters),
+                )
+            except TimeoutError:
+                data = ErrorReturn(
+                    EmbeddingError(
+                        "Tempo limite excedido na geração de embeddings"
+                    )
+                )
+            FeaturesCompose._registrar_embedding(inicio, data)
+
+            if isinstance(data, SuccessReturn):
+                return cast(list[float], data.result)
+            elif isinstance(data, ErrorReturn):
+                raise data.result
+            else:
+                raise ValueError("Unexpected return type from usecase")
+
+        async def gerar_lote(_: list[str]) -> list[list[float]]:
+            return [await gerar()]
+
+        async def consultar_cache() -> list[float]:
+            vetores = await EMBEDDINGS_CACHE.aobter_lote(
+                "generate_embeddings", [text], gerar_lote
+            )
+            return vetores[0]
+
+        return await EMBEDDINGS_QUERY_CACHE.aobter(
+            text,
+            lambda: get_single_flight("generate_embeddings").aexecutar(
+                FeaturesCompose._chave_single_flight_embeddings(text),
+                consultar_cache,
+            ),
+        )
+
+    @staticmethod
+    def extracao_por_regras(context: str) -> ExtracaoRegras:
+        """Extrai entidades fixas e intenções triviais sem usar o LLM.
+
+        Reconhece e-mail, CPF, CNPJ (com dígitos verificadores), CEP,
+        telefone e saudações/confirmações cujo tipo esteja configurado em
+        ``VALID_INTENT_TYPES``.
+
+        Args:
+            context (str): O texto da mensagem a ser analisada.
+
+        Returns:
+            ExtracaoRegras: Intenções, entidades e a confiança da extração.
+        """
+        return extrair_por_regras(
+            context, tipos_configurados(SERVICEHUB.VALID_INTENT_TYPES)
+        )
+
+    @staticmethod
+    def chave_melhoria_ia_treinamento(context: str) -> str:
+        """Retorna a chave que identifica o conteúdo de uma melhoria.
+
+        A melhoria exibida ao usuário é aplicada no aceite enquanto o
+        conteúdo não mudar, mesmo que a configuração do LLM tenha mudado.
+
+        Args:
+            context (str): O conteúdo a ser melhorado.
+
+        Returns:
+            str: Hash SHA-256 (hex) do conteúdo.
+        """
+        return LlmResponseCache.make_key(context)
+
+    @staticmethod
+    def versao_melhoria_ia_treinamento() -> str:
+        """Retorna a versão da configuração da melhoria em streaming.
+
+        Hash dos prompts de melhoria e do modelo (classe, nome e
+        temperatura) usado por ``melhoria_ia_treinamento_stream``. Uma
+        melhoria só é exibida novamente enquanto nenhum desses valores
+        mudar.
+
+        Returns:
+            str: Hash SHA-256 (hex) da configuração.
+        """
+        return LlmResponseCache.make_key(
+            SERVICEHUB.PROMPT_SYSTEM_MELHORIA_CONTEUDO,
+            SERVICEHUB.PROMPT_HUMAN_MELHORIA_CONTEUDO,
+            FeaturesCompose._provider_llm(),
+            SERVICEHUB.MODEL,
+            SERVICEHUB.LLM_TEMPERATURE,
+        )
+
+    @staticmethod
+    def versao_analise_previa() -> str:
+        """Retorna a versão da configuração da análise prévia.
+
+        Hash dos prompts, dos tipos válidos de intenção/entidade, do
+        provedor principal do roteamento (classe e modelo) e da temperatura.
+        Muda sempre que qualquer um deles é alterado, invalidando resultados
+        em cache.
+
+        Returns:
+            str: Hash SHA-256 (hex) da configuração.
+        """
+        principal = FeaturesCompose._provedores_llm()[0]
+        return LlmResponseCache.make_key(
+            SERVICEHUB.PROMPT_SYSTEM_ANALISE_PREVIA_MENSAGEM,
+            SERVICEHUB.PROMPT_HUMAN_ANALISE_PREVIA_MENSAGEM,
+            SERVICEHUB.VALID_INTENT_TYPES,
+            SERVICEHUB.VALID_ENTITY_TYPES,
+            principal.classe,
+            principal.modelo,
+            SERVICEHUB.LLM_TEMPERATURE,
+        )
+
+    @staticmethod
+    def _chave_cache_analise_previa(
+        historico_atendimento: Mapping[str, Any], context: str
+    ) -> str:
+        """Gera a chave do cache de respostas da análise prévia.
+
+        Combina a mensagem normalizada, a impressão digital do histórico
+        recente e a versão da configuração (prompts, tipos válidos e modelo).
+
+        Args:
+            historico_atendimento (Mapping[str, Any]): Histórico da conversa.
+            context (str): O texto da mensagem a ser analisada.
+
+        Returns:
+            str: A chave do cache.
+        """
+        return LlmResponseCache.make_key(
+            normalizar_mensagem(context),
+            fingerprint_historico(
+                historico_atendimento, SERVICEHUB.LLM_CACHE_HISTORY_WINDOW
+            ),
+            FeaturesCompose.versao_analise_previa(),
+        )
+
+    @staticmethod
+    def _chave_single_flight_analise_previa(
+        historico_atendimento: Mapping[str, Any], context: str
+    ) -> str:
+        """Gera a chave que coalesce análises prévias simultâneas.
+
+        Usa o conteúdo completo do histórico enviado ao LLM, e não a sua
+        representação (``HistoricoMensagens`` só exibe contagens): a mesma
+        mensagem em conversas diferentes nunca compartilha a chamada.
+
+        Args:
+            historico_atendimento (Mapping[str, Any]): Histórico da conversa.
+            context (str): O texto da mensagem a ser analisada.
+
+        Returns:
+            str: A chave do single-flight.
+        """
+        return LlmResponseCache.make_key(dict(historico_atendimento), context)
+
+    @staticmethod
+    def _concluir_analise_previa(
+        data: ReturnSuccessOrError[APMTuple],
+        respostas: list[tuple[ProvedorLlm, ReturnSuccessOrError[APMTuple]]],
+        provedores: list[ProvedorLlm],
+    ) -> tuple[APMTuple, bool]:
+        """Extrai o resultado da análise prévia roteada.
+
+        A chave do cache identifica o provedor principal: respostas de um
+        provedor alternativo não são armazenadas.
+
+        Returns:
+            tuple[APMTuple, bool]: O resultado e se ele pode ir ao cache.
+
+        Raises:
+            LlmError: Se a análise falhou em todos os provedores.
+            ValueError: Se o tipo de retorno do caso de uso for inesperado.
+        """
+        if isinstance(data, SuccessReturn):
+            atendido_por = next(
+                (p for p, resposta in respostas if resposta is data), None
+            )
+            return cast(APMTuple, data.result), atendido_por == provedores[0]
+        elif isinstance(data, ErrorReturn):
+            raise data.result
+        else:
+            raise ValueError("Unexpected return type from usecase")
+
+    @staticmethod
+    def _chave_single_flight_embeddings(text: str) -> str:
+        """Gera a chave que coalesce gerações de embeddings simultâneas."""
+        return LlmResponseCache.make_key(
+            SERVICEHUB.EMBEDDINGS_CLASS, SERVICEHUB.EMBEDDINGS_MODEL, text
+        )
+
+    @staticmethod
+    def _parametros_llm(
+        prompt_system: str,
+        prompt_human: str,
+        context: str,
+        provedor: Optional[ProvedorLlm] = None,
+    ) -> LlmParameters:
+        """Monta os parâmetros do LLM.
+
+        Usa o provedor escolhido pelo roteador ou, se omitido, o LLM
+        configurado em ``LLM_CLASS``/``MODEL``.
+        """
+        if provedor is None:
+            llm_class, model = SERVICEHUB.LLM_CLASS, SERVICEHUB.MODEL
+        else:
+            llm_class = SERVICEHUB.get_llm_class(provedor.classe)
+            model = provedor.modelo
+        return LlmParameters(
+            llm_class=llm_class,
+            model=model,
             extra_params={"temperature": SERVICEHUB.LLM_TEMPERATURE},
-            prompt_system=SERVICEHUB.PROMPT_SYSTEM_ANALISE_PREVIA_MENSAGEM,
-            prompt_human=SERVICEHUB.PROMPT_HUMAN_ANALISE_PREVIA_MENSAGEM,
+            prompt_system=prompt_system,
+            prompt_human=prompt_human,
             context=context,
             error=LlmError,
         )
-        parameters = AnalisePreviaMensagemParameters(
+
+    @staticmethod
+    def _parametros_analise_previa(
+        historico_atendimento: Mapping[str, Any],
+        context: str,
+        provedor: Optional[ProvedorLlm] = None,
+    ) -> AnalisePreviaMensagemParameters:
+        """Monta os parâmetros da análise prévia de mensagem."""
+        return AnalisePreviaMensagemParameters(
             historico_atendimento=historico_atendimento,
             valid_intent_types=SERVICEHUB.VALID_INTENT_TYPES,
             valid_entity_types=SERVICEHUB.VALID_ENTITY_TYPES,
-            llm_parameters=llm_parameters,
+            llm_parameters=FeaturesCompose._parametros_llm(
+                prompt_system=SERVICEHUB.PROMPT_SYSTEM_ANALISE_PREVIA_MENSAGEM,
+                prompt_human=SERVICEHUB.PROMPT_HUMAN_ANALISE_PREVIA_MENSAGEM,
+                context=context,
+                provedor=provedor,
+            ),
             error=LlmError("Erro ao processar mensagem"),
         )
-        datasource: APMData = AnalisePreviaMensagemLangchainDatasource()
-        usecase: APMUsecase = AnalisePreviaMensagemUsecase(datasource)
-        data = usecase(parameters)
+
+    @staticmethod
+    def _registrar_embedding(
+        inicio: float, data: ReturnSuccessOrError[list[float]]
+    ) -> None:
+        """Registra a geração de embeddings na telemetria."""
+        TELEMETRIA.registrar_chamada(
+            "generate_embeddings",
+            TIPO_EMBEDDING,
+            str(SERVICEHUB.EMBEDDINGS_MODEL or ""),
+            inicio,
+            sucesso=isinstance(data, SuccessReturn),
+            erro=str(data.result) if isinstance(data, ErrorReturn) else "",
+        )
+
+    @staticmethod
+    def _provedores_llm() -> list[ProvedorLlm]:
+        """Retorna os provedores do roteamento na ordem configurada.
+
+        Sem ``LLM_PROVIDERS``, há um único provedor: o de ``LLM_CLASS``.
+        """
+        provedores = [
+            ProvedorLlm(classe, modelo)
+            for classe, modelo in SERVICEHUB.LLM_PROVIDERS
+        ]
+        return provedores or [
+            ProvedorLlm(FeaturesCompose._provider_llm(), SERVICEHUB.MODEL)
+        ]
+
+    @staticmethod
+    def _provider_llm() -> str:
+        """Retorna o nome do provedor do LLM para os limites assíncronos."""
+        llm_class = SERVICEHUB.LLM_CLASS
+        return str(getattr(llm_class, "__name__", llm_class))
+
+    @staticmethod
+    async def _analise_conteudo_async(
+        funcionalidade: str,
+        prompt_system: str,
+        prompt_human: str,
+        context: str,
+        descricao: str,
+    ) -> str:
+        """Executa a análise de conteúdo assíncrona com o roteamento.
+
+        Cada provedor é chamado pelo ``ASYNC_RUNTIME``, com o seu limite
+        de concorrência e tempo limite.
+
+        Raises:
+            LlmError: Se ocorrer um erro durante a comunicação com o LLM.
+            TimeoutError: Se o último provedor exceder o tempo limite.
+        """
+        datasource: ACData = AnaliseConteudoLangchainDatasource()
+        usecase = AnaliseConteudoUseCase(datasource)
+
+        async def chamar(provedor: ProvedorLlm) -> ReturnSuccessOrError[str]:
+            parametros = FeaturesCompose._parametros_llm(
+                prompt_system=prompt_system,
+                prompt_human=prompt_human,
+                context=context,
+                provedor=provedor,
+            )
+            return await ASYNC_RUNTIME.executar(
+                provedor.classe, lambda: usecase.executar_async(parametros)
+            )
+
+        with TELEMETRIA.funcionalidade(funcionalidade):
+            data = await LLM_ROUTER.aexecutar(
+                FeaturesCompose._provedores_llm(), chamar, descricao
+            )
 
         if isinstance(data, SuccessReturn):
-            return cast(APMTuple, data.result)
+            return cast(str, data.result)
         elif isinstance(data, ErrorReturn):
             raise data.result
         else:
             raise ValueError("Unexpected return type from usecase")
 
+    @staticmethod
+    async def _executar_async(
+        chamada: Awaitable[T], erro_timeout: Exception
+    ) -> T:
+        """Aguarda a chamada convertendo o tempo limite em erro da feature.
+
+        Raises:
+            Exception: ``erro_timeout`` se o tempo limite for excedido.
+        """
+        try:
+            return await chamada
+        except TimeoutError as e:
+            raise erro_timeout from e
+
     @staticmethod
     def _converter_contexto(metadados: dict[str, Any]) -> str:
         """Converte metadados de mensagens multimídia para texto.
@@ -339,6 +990,9 @@ class FeaturesCompose:
     def generate_embeddings(text: str) -> list[float]:
         """Gera embeddings para um texto.
 
+        Textos repetidos são atendidos pelo cache de embeddings de consulta
+        (``EMBEDDINGS_QUERY_CACHE``) antes do cache persistente.
+
         Args:
             text (str): Texto para gerar embeddings.
 
@@ -349,20 +1003,105 @@ class FeaturesCompose:
             EmbeddingError: Se ocorrer um erro durante a geração.
             ValueError: Se o tipo de retorno do caso de uso for inesperado.
         """
-        error: EmbeddingError = EmbeddingError("Erro ao gerar embeddings!")
-        parameters: GenerateEmbeddingsParameters = (
-            GenerateEmbeddingsParameters(text=text, error=error)
+
+        def gerar() -> list[float]:
+            error: EmbeddingError = EmbeddingError(
+                "Erro ao gerar embeddings!"
+            )
+            parameters: GenerateEmbeddingsParameters = (
+                GenerateEmbeddingsParameters(text=text, error=error)
+            )
+            datasource: GEData = GenerateEmbeddingsLangchainDatasource()
+            usecase: GEUsecase = GenerateEmbeddingsUseCase(datasource)
+            inicio = time.perf_counter()
+            data: ReturnSuccessOrError[list[float]] = usecase(parameters)
+            FeaturesCompose._registrar_embedding(inicio, data)
+
+            if isinstance(data, SuccessReturn):
+                return cast(list[float], data.result)
+            elif isinstance(data, ErrorReturn):
+                raise data.result
+            else:
+                raise ValueError("Unexpected return type from usecase")
+
+        def consultar_cache() -> list[float]:
+            return EMBEDDINGS_CACHE.obter_lote(
+                "generate_embeddings", [text], lambda _: [gerar()]
+            )[0]
+
+        return EMBEDDINGS_QUERY_CACHE.obter(
+            text,
+            lambda: get_single_flight("generate_embeddings").executar(
+                FeaturesCompose._chave_single_flight_embeddings(text),
+                consultar_cache,
+            ),
         )
-        datasource: GEData = GenerateEmbeddingsLangchainDatasource()
-        usecase: GEUsecase = GenerateEmbeddingsUseCase(datasource)
-        data: ReturnSuccessOrError[list[float]] = usecase(parameters)
 
-        if isinstance(data, SuccessReturn):
-            return cast(list[float], data.result)
-        elif isinstance(data, ErrorReturn):
-            raise data.result
-        else:
-            raise ValueError("Unexpected return type from usecase")
+    @staticmethod
+    def generate_embeddings_lote(
+        textos: list[str], tamanho_lote: Optional[int] = None
+    ) -> list[list[float]]:
+        """Gera embeddings para vários textos com ``embed_documents``.
+
+        Os textos são enviados em lotes de ``tamanho_lote`` por requisição,
+        em vez de uma requisição por texto. Textos já presentes no cache de
+        embeddings não são enviados.
+
+        Args:
+            textos (list[str]): Textos para gerar embeddings.
+            tamanho_lote (Optional[int]): Textos por requisição. Se omitido,
+                usa ``SERVICEHUB.EMBEDDINGS_BATCH_SIZE``.
+
+        Returns:
+            list[list[float]]: Um vetor por texto, na mesma ordem.
+
+        Raises:
+            EmbeddingError: Se ocorrer um erro na geração de algum lote.
+        """
+        tamanho = max(1, tamanho_lote or SERVICEHUB.EMBEDDINGS_BATCH_SIZE)
+        return EMBEDDINGS_CACHE.obter_lote(
+            "generate_embeddings_lote",
+            textos,
+            lambda ausentes: FeaturesCompose._gerar_embeddings_em_lotes(
+                ausentes, tamanho
+            ),
+        )
+
+    @staticmethod
+    def _gerar_embeddings_em_lotes(
+        textos: list[str], tamanho: int
+    ) -> list[list[float]]:
+        """Envia os textos ao provedor em lotes de ``tamanho``."""
+        datasource = GenerateEmbeddingsLangchainDatasource()
+        vetores: list[list[float]] = []
+        for inicio_lote in range(0, len(textos), tamanho):
+            lote = textos[inicio_lote : inicio_lote + tamanho]
+            inicio = time.perf_counter()
+            try:
+                resultado = datasource.lote(lote)
+                if len(resultado) != len(lote):
+                    raise ValueError(
+                        f"{len(resultado)} vetores para {len(lote)} textos"
+                    )
+            except Exception as e:
+                TELEMETRIA.registrar_chamada(
+                    "generate_embeddings_lote",
+                    TIPO_EMBEDDING,
+                    str(SERVICEHUB.EMBEDDINGS_MODEL or ""),
+                    inicio,
+                    sucesso=False,
+                    erro=str(e),
+                )
+                raise EmbeddingError(f"Erro ao gerar embeddings: {e}") from e
+            TELEMETRIA.registrar_chamada(
+                "generate_embeddings_lote",
+                TIPO_EMBEDDING,
+                str(SERVICEHUB.EMBEDDINGS_MODEL or ""),
+                inicio,
+                sucesso=True,
+            )
+            vetores.extend(resultado)
+        return vetores
 
     @staticmethod
     def generate_chunks(
@@ -2,12 +2,20 @@
 
 Este módulo implementa a camada de dados para gerar embeddings de texto,
 encapsulando a lógica de integração com diferentes provedores de embeddings
-como OpenAI, Ollama e HuggingFace através da biblioteca LangChain.
+como OpenAI, Ollama e HuggingFace através da biblioteca LangChain, além do
+serviço local de embeddings (``LocalEmbeddings``).
 As configurações vêm do ServiceHub seguindo o padrão do projeto.
 """
 
 from langchain_core.embeddings.embeddings import Embeddings
 
+from smart_core_assistant_painel.modules.ai_engine.utils.async_runtime import (
+    em_thread,
+    possui_async_nativo,
+)
+from smart_core_assistant_painel.modules.ai_engine.utils.embeddings_client_registry import (
+    EMBEDDINGS_CLIENT_REGISTRY,
+)
 from smart_core_assistant_painel.modules.ai_engine.utils.parameters import (
     GenerateEmbeddingsParameters,
 )
@@ -54,45 +62,63 @@ class GenerateEmbeddingsLangchainDatasource(GEData):
         except Exception as e:
             raise Exception(f"Erro ao gerar embeddings: {str(e)}")
 
-    def _create_embeddings_instance(self) -> Embeddings:
-        """Cria uma instância de embeddings baseada na configuração do ServiceHub.
+    async def executar_async(
+        self, parameters: GenerateEmbeddingsParameters
+    ) -> list[float]:
+        """Variante assíncrona de ``__call__``, com ``aembed_query``.
 
-        Returns:
-            Instância do modelo de embeddings configurado.
-        """
-        embeddings_class: str = SERVICEHUB.EMBEDDINGS_CLASS
-        embeddings_model: str = SERVICEHUB.EMBEDDINGS_MODEL
+        Provedores sem implementação assíncrona própria (como o
+        ``LocalEmbeddings``) são chamados em uma thread (``em_thread``).
 
-        if embeddings_class == "OpenAIEmbeddings":
-            from langchain_openai import OpenAIEmbeddings
+        Args:
+            parameters (GenerateEmbeddingsParameters): Parâmetros contendo o
+                texto para geração de embeddings.
 
-            return OpenAIEmbeddings(model=embeddings_model)
+        Returns:
+            list[float]: Vetor de embeddings gerado.
 
-        elif embeddings_class == "OllamaEmbeddings":
-            from langchain_ollama import OllamaEmbeddings
+        Raises:
+            Exception: Em caso de erro na geração dos embeddings.
+        """
+        try:
+            embeddings_instance = self._create_embeddings_instance()
+            if possui_async_nativo(
+                embeddings_instance, Embeddings, "aembed_query"
+            ):
+                return await embeddings_instance.aembed_query(parameters.text)
+            return await em_thread(
+                embeddings_instance.embed_query, parameters.text
+            )
+        except Exception as e:
+            raise Exception(f"Erro ao gerar embeddings: {str(e)}")
 
-            return OllamaEmbeddings(model=embeddings_model)
+    def lote(self, textos: list[str]) -> list[list[float]]:
+        """Gera os embeddings de vários textos em uma única requisição.
 
-        elif embeddings_class == "HuggingFaceEmbeddings":
-            from langchain_community.embeddings import HuggingFaceEmbeddings
+        Args:
+            textos (list[str]): Os textos, na ordem desejada.
 
-            return HuggingFaceEmbeddings(model_name=embeddings_model)
+        Returns:
+            list[list[float]]: Um vetor por texto, na mesma ordem.
 
-        elif embeddings_class == "HuggingFaceInferenceAPIEmbeddings":
-            from langchain_community.embeddings import (
-                HuggingFaceInferenceAPIEmbeddings,
-            )
-            from pydantic import SecretStr
+        Raises:
+            Exception: Em caso de erro na geração dos embeddings.
+        """
+        try:
+            return self._create_embeddings_instance().embed_documents(textos)
+        except Exception as e:
+            raise Exception(f"Erro ao gerar embeddings: {str(e)}")
 
-            return HuggingFaceInferenceAPIEmbeddings(
-                api_key=SecretStr(secret_value=SERVICEHUB.HUGGINGFACE_API_KEY),
-                model_name=embeddings_model,
-            )
+    def _create_embeddings_instance(self) -> Embeddings:
+        """Retorna a instância de embeddings da configuração do ServiceHub.
 
-        else:
-            # Fallback para OpenAI como padrão
-            from langchain_openai import OpenAIEmbeddings
+        A instância é compartilhada pelo processo através de
+        ``EMBEDDINGS_CLIENT_REGISTRY`` e só é criada na primeira chamada
+        para cada classe e modelo.
 
-            return OpenAIEmbeddings(
-                model=embeddings_model or "text-embedding-ada-002"
-            )
+        Returns:
+            Instância do modelo de embeddings configurado.
+        """
+        return EMBEDDINGS_CLIENT_REGISTRY.get(
+            SERVICEHUB.EMBEDDINGS_CLASS, SERVICEHUB.EMBEDDINGS_MODEL
+        )
@@ -1,11 +1,18 @@
+from typing import cast
+
 from py_return_success_or_error import (
+    ErrorReturn,
     ReturnSuccessOrError,
+    SuccessReturn,
 )
 
 from smart_core_assistant_painel.modules.ai_engine.utils.parameters import (
     GenerateEmbeddingsParameters,
 )
-from smart_core_assistant_painel.modules.ai_engine.utils.types import GEUsecase
+from smart_core_assistant_painel.modules.ai_engine.utils.types import (
+    GEAsyncData,
+    GEUsecase,
+)
 
 
 class GenerateEmbeddingsUseCase(GEUsecase):
@@ -34,3 +41,22 @@ class GenerateEmbeddingsUseCase(GEUsecase):
         return self._resultDatasource(
             parameters=parameters, datasource=self._datasource
         )
+
+    async def executar_async(
+        self, parameters: GenerateEmbeddingsParameters
+    ) -> ReturnSuccessOrError[list[float]]:
+        """Variante assíncrona de ``__call__``.
+
+        Args:
+            parameters (GenerateEmbeddingsParameters): Os parâmetros com o
+                texto de entrada.
+
+        Returns:
+            ReturnSuccessOrError[list[float]]: O vetor de embeddings
+                (SuccessReturn) ou o erro dos parâmetros (ErrorReturn).
+        """
+        datasource = cast(GEAsyncData, self._datasource)
+        try:
+            return SuccessReturn(await datasource.executar_async(parameters))
+        except Exception:
+            return ErrorReturn(parameters.error)
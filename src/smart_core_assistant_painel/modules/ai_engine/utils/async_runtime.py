@@ -0,0 +1,342 @@
+"""Runtime assíncrono do motor de IA.
+
+As variantes ``*_async`` do ``FeaturesCompose`` chamam os provedores com
+``ainvoke``/``aembed_query``. Este módulo limita a concorrência dessas
+chamadas com um semáforo por provedor
+(``SERVICEHUB.ASYNC_PROVIDER_CONCURRENCY``) e aplica um tempo limite por
+chamada (``SERVICEHUB.ASYNC_CALL_TIMEOUT``). A vaga do provedor só é
+liberada quando a chamada de fato termina, mesmo que o chamador tenha
+desistido dela por tempo limite ou cancelamento.
+
+O ``ASYNC_WORKER`` mantém um event loop por processo, onde várias
+conversas são atendidas ao mesmo tempo
+(``SERVICEHUB.ASYNC_WORKER_CONCURRENCY``).
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import multiprocessing.util
+import os
+import threading
+import weakref
+from collections.abc import Awaitable, Callable, Coroutine
+from typing import Any, Optional, TypeVar
+
+from loguru import logger
+
+from smart_core_assistant_painel.modules.services import SERVICEHUB
+
+T = TypeVar("T")
+
+
+def possui_async_nativo(cliente: object, base: type, metodo: str) -> bool:
+    """Indica se o cliente implementa o método assíncrono da classe base.
+
+    As implementações padrão do LangChain (``BaseChatModel._agenerate``,
+    ``Embeddings.aembed_query``) apenas executam a variante síncrona em uma
+    thread, que continua rodando se a chamada for cancelada.
+
+    Args:
+        cliente (object): O cliente do provedor.
+        base (type): A classe base que define o método.
+        metodo (str): O nome do método assíncrono.
+
+    Returns:
+        bool: True se a classe do cliente sobrescreve o método.
+    """
+    return isinstance(cliente, base) and getattr(
+        type(cliente), metodo, None
+    ) is not getattr(base, metodo)
+
+
+async def em_thread(funcao: Callable[..., T], *args: Any) -> T:
+    """Executa uma função síncrona em uma thread sem bloquear o event loop.
+
+    Uma thread não pode ser interrompida: se a espera for cancelada, o
+    cancelamento só é propagado quando a função termina, para que a vaga
+    do provedor continue ocupada enquanto a requisição estiver em curso.
+
+    Args:
+        funcao (Callable[..., T]): A função síncrona.
+        *args (Any): Os argumentos da função.
+
+    Returns:
+        T: O resultado da função.
+    """
+    loop = asyncio.get_running_loop()
+    contexto = contextvars.copy_context()
+    futuro = loop.run_in_executor(
+        None, functools.partial(contexto.run, funcao, *args)
+    )
+    try:
+        return await asyncio.shield(futuro)
+    except asyncio.CancelledError:
+        await asyncio.wait([futuro])
+        raise
+
+
+class AsyncRuntime:
+    """Limites de concorrência e tempo limite por provedor.
+
+    Os semáforos são criados por event loop, pois primitivas do asyncio não
+    podem ser compartilhadas entre loops, e renovados quando a configuração
+    do LLM é recarregada.
+    """
+
+    def __init__(self) -> None:
+        self._semaforos: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]
+        ] = weakref.WeakKeyDictionary()
+        self._em_andamento: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def limite(self, provider: str) -> int:
+        """Retorna o número máximo de chamadas simultâneas do provedor.
+
+        Args:
+            provider (str): Nome do provedor (classe do LLM ou embeddings).
+
+        Returns:
+            int: O limite configurado ou o padrão.
+        """
+        limites = SERVICEHUB.ASYNC_PROVIDER_CONCURRENCY
+        return max(1, limites.get(provider, SERVICEHUB.ASYNC_DEFAULT_CONCURRENCY))
+
+    def em_andamento(self) -> dict[str, int]:
+        """Retorna quantas chamadas estão em execução por provedor."""
+        with self._lock:
+            return {p: n for p, n in self._em_andamento.items() if n}
+
+    def clear(self) -> None:
+        """Descarta os semáforos para que os limites sejam relidos."""
+        with self._lock:
+            self._semaforos = weakref.WeakKeyDictionary()
+
+    async def executar(
+        self,
+        provider: str,
+        chamada: Callable[[], Awaitable[T]],
+        timeout: Optional[float] = None,
+    ) -> T:
+        """Executa uma chamada respeitando o limite e o tempo do provedor.
+
+        A espera pelo semáforo conta para o tempo limite. Ao expirar, ou se
+        o chamador for cancelado, a chamada é cancelada e o chamador é
+        liberado imediatamente; a vaga do provedor só é devolvida quando a
+        chamada termina de fato.
+
+        Args:
+            provider (str): Nome do provedor.
+            chamada (Callable[[], Awaitable[T]]): Fábrica da corrotina.
+            timeout (Optional[float]): Tempo limite em segundos. Se omitido,
+                usa ``SERVICEHUB.ASYNC_CALL_TIMEOUT`` (0 desabilita).
+
+        Returns:
+            T: O resultado da chamada.
+
+        Raises:
+            TimeoutError: Se a chamada exceder o tempo limite.
+        """
+        limite_tempo = (
+            SERVICEHUB.ASYNC_CALL_TIMEOUT if timeout is None else timeout
+        )
+        loop = asyncio.get_running_loop()
+        prazo = loop.time() + limite_tempo if limite_tempo else None
+        semaforo = self._semaforo(provider)
+        try:
+            async with asyncio.timeout_at(prazo):
+                await semaforo.acquire()
+        except TimeoutError:
+            self._avisar_timeout(provider, limite_tempo)
+            raise
+
+        self._registrar(provider, 1)
+        try:
+            tarefa = asyncio.ensure_future(chamada())
+        except BaseException:
+            self._liberar(provider, semaforo)
+            raise
+        tarefa.add_done_callback(
+            lambda concluida: self._finalizar(provider, semaforo, concluida)
+        )
+        try:
+            async with asyncio.timeout_at(prazo):
+                return await asyncio.shield(tarefa)
+        except TimeoutError:
+            tarefa.cancel()
+            self._avisar_timeout(provider, limite_tempo)
+            raise
+        except asyncio.CancelledError:
+            tarefa.cancel()
+            raise
+
+    def _semaforo(self, provider: str) -> asyncio.Semaphore:
+        """Retorna o semáforo do provedor para o event loop atual."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaforos = self._semaforos.setdefault(loop, {})
+            semaforo = semaforos.get(provider)
+            if semaforo is None:
+                semaforo = asyncio.Semaphore(self.limite(provider))
+                semaforos[provider] = semaforo
+            return semaforo
+
+    def _finalizar(
+        self,
+        provider: str,
+        semaforo: asyncio.Semaphore,
+        tarefa: "asyncio.Future[Any]",
+    ) -> None:
+        """Devolve a vaga quando a chamada termina de fato."""
+        self._liberar(provider, semaforo)
+        # Consome a exceção de chamadas que o chamador abandonou
+        if not tarefa.cancelled():
+            tarefa.exception()
+
+    def _liberar(self, provider: str, semaforo: asyncio.Semaphore) -> None:
+        semaforo.release()
+        self._registrar(provider, -1)
+
+    def _registrar(self, provider: str, delta: int) -> None:
+        with self._lock:
+            self._em_andamento[provider] = (
+                self._em_andamento.get(provider, 0) + delta
+            )
+
+    @staticmethod
+    def _avisar_timeout(provider: str, limite_tempo: float) -> None:
+        logger.warning(
+            f"Chamada ao provedor '{provider}' excedeu {limite_tempo}s"
+        )
+
+
+class WorkerAssincrono:
+    """Event loop do processo onde as conversas são atendidas.
+
+    O loop roda em uma thread própria, criada na primeira submissão em cada
+    processo (os workers do Django-Q são criados por ``fork``). No máximo
+    ``SERVICEHUB.ASYNC_WORKER_CONCURRENCY`` conversas ficam em andamento:
+    acima disso, ``submeter`` aguarda uma vaga, aplicando contrapressão à
+    fila. Ao encerrar o processo, as conversas em andamento são aguardadas.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._vagas: Optional[threading.BoundedSemaphore] = None
+        self._pendentes: set[concurrent.futures.Future[Any]] = set()
+        self._pid: Optional[int] = None
+
+    @property
+    def habilitado(self) -> bool:
+        """Indica se as conversas devem ser atendidas pelo worker."""
+        return SERVICEHUB.ASYNC_WORKER_CONCURRENCY > 0
+
+    def submeter(
+        self, fabrica: Callable[[], Coroutine[Any, Any, T]]
+    ) -> "concurrent.futures.Future[T]":
+        """Agenda uma corrotina no event loop do worker.
+
+        Bloqueia enquanto o limite de conversas em andamento estiver
+        atingido. Exceções não tratadas pela corrotina são registradas no
+        log.
+
+        Args:
+            fabrica (Callable[[], Coroutine[Any, Any, T]]): Cria a
+                corrotina a executar.
+
+        Returns:
+            concurrent.futures.Future[T]: O resultado da corrotina.
+        """
+        loop, vagas = self._iniciar()
+        vagas.acquire()
+        try:
+            futuro = asyncio.run_coroutine_threadsafe(fabrica(), loop)
+        except BaseException:
+            vagas.release()
+            raise
+        with self._lock:
+            self._pendentes.add(futuro)
+        futuro.add_done_callback(
+            lambda concluido: self._concluir(concluido, vagas)
+        )
+        return futuro
+
+    def em_andamento(self) -> int:
+        """Retorna quantas conversas estão em andamento neste processo."""
+        with self._lock:
+            return len(self._pendentes) if self._pid == os.getpid() else 0
+
+    def encerrar(self, timeout: Optional[float] = 30.0) -> None:
+        """Aguarda as conversas em andamento e para o event loop.
+
+        Args:
+            timeout (Optional[float]): Tempo máximo de espera, em segundos.
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or thread is None or self._pid != os.getpid():
+                return
+            self._loop = self._thread = None
+            pendentes = set(self._pendentes)
+        if pendentes:
+            logger.info(
+                f"Worker assíncrono: aguardando {len(pendentes)} conversas"
+            )
+            concurrent.futures.wait(pendentes, timeout=timeout)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+
+    def _iniciar(
+        self,
+    ) -> tuple[asyncio.AbstractEventLoop, threading.BoundedSemaphore]:
+        """Cria o event loop do processo atual, se necessário."""
+        with self._lock:
+            if (
+                self._loop is None
+                or self._vagas is None
+                or self._pid != os.getpid()
+            ):
+                self._loop = asyncio.new_event_loop()
+                self._vagas = threading.BoundedSemaphore(
+                    max(1, SERVICEHUB.ASYNC_WORKER_CONCURRENCY)
+                )
+                self._pendentes = set()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="async-worker",
+                    daemon=True,
+                )
+                self._thread.start()
+                if self._pid != os.getpid():
+                    # Executado também na saída de processos filhos do
+                    # multiprocessing, que não executam o atexit
+                    multiprocessing.util.Finalize(
+                        self, self.encerrar, exitpriority=10
+                    )
+                    self._pid = os.getpid()
+            return self._loop, self._vagas
+
+    def _concluir(
+        self,
+        futuro: "concurrent.futures.Future[Any]",
+        vagas: threading.BoundedSemaphore,
+    ) -> None:
+        """Libera a vaga da conversa e registra falhas não tratadas."""
+        vagas.release()
+        with self._lock:
+            self._pendentes.discard(futuro)
+        if not futuro.cancelled() and futuro.exception() is not None:
+            logger.error(
+                f"Worker assíncrono: conversa falhou: {futuro.exception()}"
+            )
+
+
+ASYNC_RUNTIME = AsyncRuntime()
+SERVICEHUB.add_llm_config_listener(ASYNC_RUNTIME.clear)
+ASYNC_WORKER = WorkerAssincrono()
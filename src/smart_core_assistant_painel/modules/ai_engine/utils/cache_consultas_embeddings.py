@@ -0,0 +1,276 @@
+"""Cache dos embeddings de consulta em memória (LRU com expiração).
+
+O embedding de cada mensagem recebida é gerado para a busca de documentos,
+e muitos textos se repetem exatamente entre contatos e ao longo do tempo
+("sim", "obrigado", "qual o horário?"). Este cache guarda os vetores no
+processo, indexados por ``(EMBEDDINGS_CLASS, EMBEDDINGS_MODEL,
+sha256(texto normalizado))``, em bytes ``float32`` (4 bytes por dimensão),
+com limite de entradas (``EMBEDDINGS_QUERY_CACHE_MAX_ENTRIES``) e tempo de
+vida (``EMBEDDINGS_QUERY_CACHE_TTL``).
+
+Com ``EMBEDDINGS_QUERY_CACHE_REDIS_TTL`` maior que 0 e ``REDIS_URL``
+definida, as faltas do processo consultam um segundo nível no Redis,
+compartilhado entre os workers. Falhas do Redis nunca interrompem o fluxo:
+são tratadas como ausência de cache.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any, NamedTuple, Optional
+
+from loguru import logger
+
+from smart_core_assistant_painel.modules.services import SERVICEHUB
+
+from .cache_embeddings import (
+    codificar_vetor,
+    decodificar_vetor,
+    hash_conteudo,
+)
+
+# Intervalo (em consultas) para registrar a taxa de acerto no log
+_INTERVALO_LOG_METRICAS: int = 500
+
+
+class EstatisticasCacheConsultas(NamedTuple):
+    """Uso do cache de embeddings de consulta neste processo.
+
+    Attributes:
+        acertos_memoria (int): Consultas atendidas pela memória do processo.
+        acertos_redis (int): Consultas atendidas pelo Redis.
+        faltas (int): Consultas enviadas ao provedor.
+        entradas (int): Vetores em memória.
+        bytes (int): Bytes ocupados pelos vetores em memória.
+    """
+
+    acertos_memoria: int
+    acertos_redis: int
+    faltas: int
+    entradas: int
+    bytes: int
+
+    @property
+    def taxa_acerto(self) -> float:
+        """Fração das consultas atendidas pelo cache (memória ou Redis)."""
+        acertos = self.acertos_memoria + self.acertos_redis
+        total = acertos + self.faltas
+        return acertos / total if total else 0.0
+
+
+class CacheConsultasEmbeddings:
+    """Consulta a memória do processo e o Redis antes de gerar o vetor."""
+
+    def __init__(self, client: Optional[Any] = None) -> None:
+        """Inicializa o cache vazio.
+
+        Args:
+            client (Optional[Any]): Cliente Redis explícito. Se omitido, é
+                criado a partir de ``SERVICEHUB.REDIS_URL`` quando o nível
+                Redis estiver habilitado.
+        """
+        self._client = client
+        self._dados: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._metricas = {"acertos_memoria": 0, "acertos_redis": 0}
+        self._faltas = 0
+
+    def obter(
+        self, texto: str, gerar: Callable[[], list[float]]
+    ) -> list[float]:
+        """Retorna o embedding do texto, gerando-o apenas na ausência.
+
+        Falhas de ``gerar`` são propagadas e nada é armazenado.
+
+        Args:
+            texto (str): O texto da consulta.
+            gerar (Callable[[], list[float]]): Gera o embedding do texto.
+
+        Returns:
+            list[float]: O vetor de embeddings.
+        """
+        limite = SERVICEHUB.EMBEDDINGS_QUERY_CACHE_MAX_ENTRIES
+        if limite <= 0:
+            return gerar()
+
+        chave = self._chave(texto)
+        dados = self._buscar_memoria(chave)
+        if dados is not None:
+            self._registrar("acertos_memoria")
+            return decodificar_vetor(dados)
+
+        dados = self._buscar_redis(chave)
+        if dados is not None:
+            self._gravar_memoria(chave, dados, limite)
+            self._registrar("acertos_redis")
+            return decodificar_vetor(dados)
+
+        vetor = gerar()
+        dados = codificar_vetor(vetor)
+        self._gravar_memoria(chave, dados, limite)
+        self._gravar_redis(chave, dados)
+        self._registrar(None)
+        return vetor
+
+    async def aobter(
+        self, texto: str, gerar: Callable[[], Awaitable[list[float]]]
+    ) -> list[float]:
+        """Variante assíncrona de ``obter``.
+
+        A memória do processo é consultada diretamente; o nível Redis, se
+        habilitado, em uma thread.
+
+        Args:
+            texto (str): O texto da consulta.
+            gerar (Callable[[], Awaitable[list[float]]]): Gera o embedding
+                do texto.
+
+        Returns:
+            list[float]: O vetor de embeddings.
+        """
+        limite = SERVICEHUB.EMBEDDINGS_QUERY_CACHE_MAX_ENTRIES
+        if limite <= 0:
+            return await gerar()
+
+        chave = self._chave(texto)
+        dados = self._buscar_memoria(chave)
+        if dados is not None:
+            self._registrar("acertos_memoria")
+            return decodificar_vetor(dados)
+
+        redis = self._obter_client() is not None
+        if redis:
+            dados = await asyncio.to_thread(self._buscar_redis, chave)
+            if dados is not None:
+                self._gravar_memoria(chave, dados, limite)
+                self._registrar("acertos_redis")
+                return decodificar_vetor(dados)
+
+        vetor = await gerar()
+        dados = codificar_vetor(vetor)
+        self._gravar_memoria(chave, dados, limite)
+        if redis:
+            await asyncio.to_thread(self._gravar_redis, chave, dados)
+        self._registrar(None)
+        return vetor
+
+    def estatisticas(self) -> EstatisticasCacheConsultas:
+        """Retorna os acertos, as faltas e a ocupação da memória."""
+        with self._lock:
+            return EstatisticasCacheConsultas(
+                acertos_memoria=self._metricas["acertos_memoria"],
+                acertos_redis=self._metricas["acertos_redis"],
+                faltas=self._faltas,
+                entradas=len(self._dados),
+                bytes=self._bytes,
+            )
+
+    def limpar(self) -> None:
+        """Remove os vetores em memória e zera as métricas."""
+        with self._lock:
+            self._dados.clear()
+            self._bytes = 0
+            self._metricas = {"acertos_memoria": 0, "acertos_redis": 0}
+            self._faltas = 0
+
+    @staticmethod
+    def _chave(texto: str) -> str:
+        """Gera a chave do texto para o modelo de embeddings atual."""
+        return (
+            f"{SERVICEHUB.EMBEDDINGS_CLASS}:{SERVICEHUB.EMBEDDINGS_MODEL}:"
+            f"{hash_conteudo(texto)}"
+        )
+
+    def _buscar_memoria(self, chave: str) -> Optional[bytes]:
+        """Retorna o vetor em memória, se presente e não expirado."""
+        with self._lock:
+            entrada = self._dados.get(chave)
+            if entrada is None:
+                return None
+            expira_em, dados = entrada
+            if expira_em <= time.monotonic():
+                del self._dados[chave]
+                self._bytes -= len(dados)
+                return None
+            self._dados.move_to_end(chave)
+            return dados
+
+    def _gravar_memoria(self, chave: str, dados: bytes, limite: int) -> None:
+        """Grava o vetor, descartando os menos usados acima do limite."""
+        expira_em = time.monotonic() + SERVICEHUB.EMBEDDINGS_QUERY_CACHE_TTL
+        with self._lock:
+            anterior = self._dados.pop(chave, None)
+            if anterior is not None:
+                self._bytes -= len(anterior[1])
+            self._dados[chave] = (expira_em, dados)
+            self._bytes += len(dados)
+            while len(self._dados) > limite:
+                _, (_, removidos) = self._dados.popitem(last=False)
+                self._bytes -= len(removidos)
+
+    def _buscar_redis(self, chave: str) -> Optional[bytes]:
+        """Consulta o nível Redis, se habilitado."""
+        client = self._obter_client()
+        if client is None:
+            return None
+        try:
+            dados = client.get(f"embeddings_consulta:{chave}")
+        except Exception as e:
+            logger.warning(f"Cache de embeddings de consulta: Redis: {e}")
+            return None
+        return bytes(dados) if dados is not None else None
+
+    def _gravar_redis(self, chave: str, dados: bytes) -> None:
+        """Publica o vetor no nível Redis, se habilitado."""
+        client = self._obter_client()
+        if client is None:
+            return
+        ttl = SERVICEHUB.EMBEDDINGS_QUERY_CACHE_REDIS_TTL
+        try:
+            client.set(
+                f"embeddings_consulta:{chave}", dados, px=int(ttl * 1000)
+            )
+        except Exception as e:
+            logger.warning(f"Cache de embeddings de consulta: Redis: {e}")
+
+    def _registrar(self, acerto: Optional[str]) -> None:
+        """Conta a consulta e registra periodicamente a taxa de acerto."""
+        with self._lock:
+            if acerto is None:
+                self._faltas += 1
+            else:
+                self._metricas[acerto] += 1
+            consultas = self._faltas + sum(self._metricas.values())
+        if consultas % _INTERVALO_LOG_METRICAS == 0:
+            estatisticas = self.estatisticas()
+            logger.info(
+                "Cache de embeddings de consulta: hit_rate="
+                f"{estatisticas.taxa_acerto:.2%} "
+                f"memoria={estatisticas.acertos_memoria} "
+                f"redis={estatisticas.acertos_redis} "
+                f"faltas={estatisticas.faltas} "
+                f"entradas={estatisticas.entradas} "
+                f"bytes={estatisticas.bytes}"
+            )
+
+    def _obter_client(self) -> Optional[Any]:
+        """Cria o cliente Redis na primeira utilização."""
+        if SERVICEHUB.EMBEDDINGS_QUERY_CACHE_REDIS_TTL <= 0:
+            return None
+        if self._client is None and SERVICEHUB.REDIS_URL:
+            with self._lock:
+                if self._client is None:
+                    import redis
+
+                    self._client = redis.Redis.from_url(
+                        SERVICEHUB.REDIS_URL,
+                        socket_timeout=0.5,
+                        socket_connect_timeout=0.5,
+                    )
+        return self._client
+
+
+EMBEDDINGS_QUERY_CACHE = CacheConsultasEmbeddings()
@@ -0,0 +1,271 @@
+"""Cache persistente de embeddings endereçado pelo conteúdo.
+
+Cada vetor é identificado por ``(embeddings_class, model, sha256(texto
+normalizado))``, então o mesmo trecho só é enviado ao provedor uma vez por
+modelo, mesmo que apareça em treinamentos diferentes ou seja reenviado ao
+editar um treinamento. Os vetores são armazenados como bytes ``float32``
+(4 bytes por dimensão), independentemente da dimensão do modelo.
+
+O armazenamento é definido pela aplicação (``configurar_armazenamento``),
+seguindo o mesmo padrão do destino da telemetria: o motor de IA não depende
+do ORM. Sem armazenamento configurado, ou com a funcionalidade fora de
+``SERVICEHUB.EMBEDDINGS_CACHE_FEATURES``, os embeddings são sempre gerados.
+"""
+
+import asyncio
+import hashlib
+import threading
+import unicodedata
+from collections.abc import Awaitable, Callable, Sequence
+from typing import NamedTuple, Optional, Protocol
+
+import numpy as np
+from loguru import logger
+
+from smart_core_assistant_painel.modules.services import SERVICEHUB
+
+
+class ArmazenamentoEmbeddings(Protocol):
+    """Armazenamento dos vetores do cache, indexado pelo hash do texto."""
+
+    def buscar(
+        self, embeddings_class: str, model: str, hashes: list[str]
+    ) -> dict[str, bytes]:
+        """Retorna os vetores encontrados, por hash."""
+        ...
+
+    def gravar(
+        self, embeddings_class: str, model: str, vetores: dict[str, bytes]
+    ) -> None:
+        """Grava os vetores, ignorando hashes já existentes."""
+        ...
+
+
+class EstatisticasCacheEmbeddings(NamedTuple):
+    """Acertos e faltas do cache neste processo.
+
+    Attributes:
+        acertos (int): Textos encontrados no cache.
+        faltas (int): Textos enviados ao provedor.
+    """
+
+    acertos: int
+    faltas: int
+
+    @property
+    def taxa_acerto(self) -> float:
+        """Fração dos textos atendidos pelo cache."""
+        total = self.acertos + self.faltas
+        return self.acertos / total if total else 0.0
+
+
+def normalizar_texto(texto: str) -> str:
+    """Normaliza o texto para o cálculo do hash.
+
+    Aplica a forma NFC do Unicode e colapsa espaços em branco, para que
+    variações irrelevantes do mesmo trecho compartilhem a entrada.
+
+    Args:
+        texto (str): O texto original.
+
+    Returns:
+        str: O texto normalizado.
+    """
+    return " ".join(unicodedata.normalize("NFC", texto).split())
+
+
+def hash_conteudo(texto: str) -> str:
+    """Calcula o SHA-256 (hexadecimal) do texto normalizado."""
+    return hashlib.sha256(normalizar_texto(texto).encode()).hexdigest()
+
+
+def codificar_vetor(vetor: Sequence[float]) -> bytes:
+    """Converte o vetor em bytes ``float32``."""
+    return np.asarray(vetor, dtype=np.float32).tobytes()
+
+
+def decodificar_vetor(dados: bytes) -> list[float]:
+    """Converte bytes ``float32`` de volta em lista de floats."""
+    return np.frombuffer(dados, dtype=np.float32).tolist()
+
+
+class CacheEmbeddings:
+    """Consulta o armazenamento antes de gerar embeddings."""
+
+    def __init__(self) -> None:
+        """Inicializa o cache sem armazenamento."""
+        self._armazenamento: Optional[ArmazenamentoEmbeddings] = None
+        self._lock = threading.Lock()
+        self._acertos = 0
+        self._faltas = 0
+
+    def configurar_armazenamento(
+        self, armazenamento: Optional[ArmazenamentoEmbeddings]
+    ) -> None:
+        """Define onde os vetores são armazenados (None desabilita).
+
+        Args:
+            armazenamento (Optional[ArmazenamentoEmbeddings]): O
+                armazenamento dos vetores.
+        """
+        self._armazenamento = armazenamento
+
+    def habilitado(self, funcionalidade: str) -> bool:
+        """Indica se a funcionalidade consulta o cache."""
+        return (
+            self._armazenamento is not None
+            and funcionalidade in SERVICEHUB.EMBEDDINGS_CACHE_FEATURES
+        )
+
+    def obter_lote(
+        self,
+        funcionalidade: str,
+        textos: list[str],
+        gerar: Callable[[list[str]], list[list[float]]],
+    ) -> list[list[float]]:
+        """Retorna os embeddings dos textos, gerando apenas os ausentes.
+
+        Textos repetidos no lote são gerados uma única vez. Falhas do
+        armazenamento são registradas e os embeddings são gerados
+        normalmente; falhas de ``gerar`` são propagadas.
+
+        Args:
+            funcionalidade (str): Nome da funcionalidade que pede os
+                embeddings.
+            textos (list[str]): Os textos, na ordem desejada.
+            gerar (Callable[[list[str]], list[list[float]]]): Gera os
+                embeddings dos textos ausentes, na mesma ordem.
+
+        Returns:
+            list[list[float]]: Um vetor por texto, na mesma ordem.
+        """
+        armazenamento = self._armazenamento
+        if armazenamento is None or not self.habilitado(funcionalidade):
+            return gerar(textos)
+
+        classe = SERVICEHUB.EMBEDDINGS_CLASS
+        modelo = SERVICEHUB.EMBEDDINGS_MODEL
+        hashes = [hash_conteudo(texto) for texto in textos]
+        vetores = self._buscar(armazenamento, classe, modelo, hashes)
+        ausentes = self._ausentes(hashes, textos, vetores)
+        if ausentes:
+            novos = dict(zip(ausentes, gerar(list(ausentes.values()))))
+            vetores.update(novos)
+            self._gravar(armazenamento, classe, modelo, novos)
+        self._contabilizar(len(textos), len(ausentes))
+        return [vetores[chave] for chave in hashes]
+
+    async def aobter_lote(
+        self,
+        funcionalidade: str,
+        textos: list[str],
+        gerar: Callable[[list[str]], Awaitable[list[list[float]]]],
+    ) -> list[list[float]]:
+        """Variante assíncrona de ``obter_lote``.
+
+        O armazenamento é consultado e gravado em uma thread, para não
+        bloquear o event loop.
+
+        Args:
+            funcionalidade (str): Nome da funcionalidade que pede os
+                embeddings.
+            textos (list[str]): Os textos, na ordem desejada.
+            gerar (Callable[[list[str]], Awaitable[list[list[float]]]]):
+                Gera os embeddings dos textos ausentes, na mesma ordem.
+
+        Returns:
+            list[list[float]]: Um vetor por texto, na mesma ordem.
+        """
+        armazenamento = self._armazenamento
+        if armazenamento is None or not self.habilitado(funcionalidade):
+            return await gerar(textos)
+
+        classe = SERVICEHUB.EMBEDDINGS_CLASS
+        modelo = SERVICEHUB.EMBEDDINGS_MODEL
+        hashes = [hash_conteudo(texto) for texto in textos]
+        vetores = await asyncio.to_thread(
+            self._buscar, armazenamento, classe, modelo, hashes
+        )
+        ausentes = self._ausentes(hashes, textos, vetores)
+        if ausentes:
+            novos = dict(zip(ausentes, await gerar(list(ausentes.values()))))
+            vetores.update(novos)
+            await asyncio.to_thread(
+                self._gravar, armazenamento, classe, modelo, novos
+            )
+        self._contabilizar(len(textos), len(ausentes))
+        return [vetores[chave] for chave in hashes]
+
+    def estatisticas(self) -> EstatisticasCacheEmbeddings:
+        """Retorna os acertos e as faltas acumulados neste processo."""
+        with self._lock:
+            return EstatisticasCacheEmbeddings(self._acertos, self._faltas)
+
+    def zerar_estatisticas(self) -> None:
+        """Zera os contadores de acertos e faltas."""
+        with self._lock:
+            self._acertos = 0
+            self._faltas = 0
+
+
+    @staticmethod
+    def _buscar(
+        armazenamento: ArmazenamentoEmbeddings,
+        classe: str,
+        modelo: str,
+        hashes: list[str],
+    ) -> dict[str, list[float]]:
+        """Retorna os vetores já armazenados, por hash."""
+        try:
+            encontrados = armazenamento.buscar(
+                classe, modelo, list(dict.fromkeys(hashes))
+            )
+        except Exception as e:
+            logger.warning(f"Falha ao consultar o cache de embeddings: {e}")
+            encontrados = {}
+        return {
+            chave: decodificar_vetor(dados)
+            for chave, dados in encontrados.items()
+        }
+
+    @staticmethod
+    def _ausentes(
+        hashes: list[str],
+        textos: list[str],
+        vetores: dict[str, list[float]],
+    ) -> dict[str, str]:
+        """Retorna os textos sem vetor armazenado, sem repetições."""
+        ausentes: dict[str, str] = {}
+        for chave, texto in zip(hashes, textos):
+            if chave not in vetores:
+                ausentes.setdefault(chave, texto)
+        return ausentes
+
+    @staticmethod
+    def _gravar(
+        armazenamento: ArmazenamentoEmbeddings,
+        classe: str,
+        modelo: str,
+        novos: dict[str, list[float]],
+    ) -> None:
+        """Armazena os vetores gerados."""
+        try:
+            armazenamento.gravar(
+                classe,
+                modelo,
+                {
+                    chave: codificar_vetor(vetor)
+                    for chave, vetor in novos.items()
+                },
+            )
+        except Exception as e:
+            logger.warning(f"Falha ao gravar o cache de embeddings: {e}")
+
+    def _contabilizar(self, total: int, faltas: int) -> None:
+        """Soma os acertos e as faltas de uma consulta."""
+        with self._lock:
+            self._acertos += total - faltas
+            self._faltas += faltas
+
+
+EMBEDDINGS_CACHE = CacheEmbeddings()
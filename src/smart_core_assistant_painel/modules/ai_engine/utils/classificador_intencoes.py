@@ -0,0 +1,194 @@
+"""Pré-classificação de intenções por centroides de embeddings.
+
+Cada intenção de ``VALID_INTENT_TYPES`` é representada por um centroide:
+a média normalizada dos embeddings da sua descrição e, opcionalmente, de
+exemplos rotulados (trechos de ``Mensagem.intent_detectado``). Uma
+mensagem é classificada pela similaridade de cosseno entre o seu embedding,
+já calculado para a busca de documentos, e os centroides.
+
+A pontuação é uma multiplicação de matrizes (NumPy), então classificar uma
+mensagem ou um lote inteiro custa microssegundos, contra centenas de
+milissegundos de uma chamada ao LLM. Apenas classificações com
+similaridade e margem sobre a segunda intenção suficientes devem
+dispensar o LLM.
+"""
+
+import json
+from collections.abc import Callable, Mapping, Sequence
+from typing import NamedTuple, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+Matriz = npt.NDArray[np.float32]
+
+
+class ClassificacaoIntencao(NamedTuple):
+    """Intenção mais provável de uma mensagem.
+
+    Attributes:
+        intencao (str): Tipo da intenção mais próxima.
+        similaridade (float): Cosseno com o centroide da intenção.
+        margem (float): Diferença para a segunda intenção mais próxima.
+    """
+
+    intencao: str
+    similaridade: float
+    margem: float
+
+
+def descricoes_intencoes(valid_intent_types: str) -> dict[str, str]:
+    """Extrai o texto descritivo de cada intenção da configuração.
+
+    Args:
+        valid_intent_types (str): JSON no formato de
+            ``VALID_INTENT_TYPES`` (``{"intent_types": {categoria:
+            {tipo: descrição}}}``).
+
+    Returns:
+        dict[str, str]: O texto a ser embutido para cada tipo. Vazio se o
+            JSON for inválido.
+    """
+    try:
+        dados = json.loads(valid_intent_types or "{}")
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(dados, dict):
+        return {}
+    categorias = dados.get("intent_types", dados)
+    descricoes: dict[str, str] = {}
+    for tipos in categorias.values():
+        if not isinstance(tipos, dict):
+            continue
+        for tipo, descricao in tipos.items():
+            descricoes[str(tipo)] = (
+                f"{str(tipo).replace('_', ' ')}: {descricao}"
+            )
+    return descricoes
+
+
+def _normalizar(vetores: npt.ArrayLike) -> Matriz:
+    """Converte para matriz float32 com linhas de norma 1."""
+    matriz = np.atleast_2d(np.asarray(vetores, dtype=np.float32))
+    normas = np.linalg.norm(matriz, axis=1, keepdims=True)
+    return matriz / np.maximum(normas, np.finfo(np.float32).tiny)
+
+
+class ClassificadorCentroides:
+    """Classificador de intenções pelo centroide mais próximo.
+
+    Attributes:
+        rotulos (tuple[str, ...]): Intenções, na ordem das linhas dos
+            centroides.
+    """
+
+    def __init__(
+        self, rotulos: Sequence[str], centroides: npt.ArrayLike
+    ) -> None:
+        """Inicializa o classificador.
+
+        Args:
+            rotulos (Sequence[str]): Uma intenção por centroide.
+            centroides (npt.ArrayLike): Matriz ``(intenções, dimensões)``.
+
+        Raises:
+            ValueError: Se não houver centroides ou se a quantidade de
+                rótulos divergir da de centroides.
+        """
+        matriz = _normalizar(centroides)
+        if not rotulos or len(rotulos) != matriz.shape[0]:
+            raise ValueError(
+                f"{len(rotulos)} rótulos para {matriz.shape[0]} centroides"
+            )
+        self.rotulos = tuple(rotulos)
+        self._centroides = matriz
+
+    @classmethod
+    def construir(
+        cls,
+        descricoes: Mapping[str, str],
+        gerar_embeddings: Callable[[list[str]], list[list[float]]],
+        exemplos: Optional[Mapping[str, Sequence[str]]] = None,
+    ) -> "ClassificadorCentroides":
+        """Constrói os centroides a partir de descrições e exemplos.
+
+        Todos os textos são embutidos com uma única chamada a
+        ``gerar_embeddings``. Exemplos de intenções ausentes de
+        ``descricoes`` são ignorados.
+
+        Args:
+            descricoes (Mapping[str, str]): Texto descritivo por intenção.
+            gerar_embeddings (Callable[[list[str]], list[list[float]]]):
+                Gera os embeddings de uma lista de textos.
+            exemplos (Optional[Mapping[str, Sequence[str]]]): Mensagens
+                rotuladas por intenção.
+
+        Returns:
+            ClassificadorCentroides: O classificador construído.
+        """
+        rotulos = list(descricoes)
+        textos = [descricoes[rotulo] for rotulo in rotulos]
+        grupos = list(range(len(rotulos)))
+        for indice, rotulo in enumerate(rotulos):
+            for exemplo in (exemplos or {}).get(rotulo, ()):
+                if exemplo.strip():
+                    textos.append(exemplo)
+                    grupos.append(indice)
+
+        vetores = _normalizar(gerar_embeddings(textos))
+        somas = np.zeros((len(rotulos), vetores.shape[1]), dtype=np.float32)
+        np.add.at(somas, np.asarray(grupos), vetores)
+        return cls(rotulos, somas)
+
+    def pontuar(self, vetores: npt.ArrayLike) -> Matriz:
+        """Calcula o cosseno de cada vetor com cada centroide.
+
+        Args:
+            vetores (npt.ArrayLike): Um vetor ou uma matriz
+                ``(mensagens, dimensões)``.
+
+        Returns:
+            Matriz: Matriz ``(mensagens, intenções)`` de similaridades.
+        """
+        return _normalizar(vetores) @ self._centroides.T
+
+    def classificar_lote(
+        self, vetores: npt.ArrayLike
+    ) -> list[ClassificacaoIntencao]:
+        """Classifica vários embeddings de uma vez.
+
+        Args:
+            vetores (npt.ArrayLike): Matriz ``(mensagens, dimensões)``.
+
+        Returns:
+            list[ClassificacaoIntencao]: Uma classificação por mensagem.
+        """
+        pontuacoes = self.pontuar(vetores)
+        melhores = np.argmax(pontuacoes, axis=1)
+        linhas = np.arange(pontuacoes.shape[0])
+        similaridades = pontuacoes[linhas, melhores]
+        if pontuacoes.shape[1] > 1:
+            segundas = np.partition(pontuacoes, -2, axis=1)[:, -2]
+        else:
+            segundas = np.full_like(similaridades, -1.0)
+        margens = similaridades - segundas
+        return [
+            ClassificacaoIntencao(self.rotulos[indice], float(sim), float(m))
+            for indice, sim, m in zip(
+                melhores.tolist(), similaridades, margens
+            )
+        ]
+
+    def classificar(self, vetor: Sequence[float]) -> ClassificacaoIntencao:
+        """Classifica o embedding de uma mensagem.
+
+        Args:
+            vetor (Sequence[float]): O embedding da mensagem.
+
+        Returns:
+            ClassificacaoIntencao: A intenção mais próxima.
+        """
+        return self.classificar_lote([vetor])[0]
+
+    def __len__(self) -> int:
+        return len(self.rotulos)
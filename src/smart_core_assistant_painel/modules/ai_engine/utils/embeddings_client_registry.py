@@ -0,0 +1,177 @@
+"""Registro de clientes de embeddings reutilizáveis por configuração.
+
+Criar ``OpenAIEmbeddings``/``OllamaEmbeddings`` a cada chamada recria o
+cliente HTTP, e ``HuggingFaceEmbeddings`` carrega o modelo inteiro do disco
+a cada instância. Este módulo mantém, por processo, uma única instância por
+combinação ``(embeddings_class, model)``.
+
+O registro é seguro para uso concorrente pelos workers do Django-Q, pode
+ser aquecido na inicialização do processo (``aquecer``) e é invalidado
+automaticamente quando ``ServiceHub.reload_config`` detecta mudança na
+configuração de embeddings.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from langchain_core.embeddings.embeddings import Embeddings
+from loguru import logger
+
+from smart_core_assistant_painel.modules.services import SERVICEHUB
+
+EmbeddingsClientKey = tuple[str, str]
+
+
+class EmbeddingsClientRegistry:
+    """Registro thread-safe de clientes de embeddings por configuração.
+
+    Attributes:
+        hits (int): Número de reutilizações de clientes já criados.
+        misses (int): Número de clientes criados.
+    """
+
+    def __init__(self) -> None:
+        """Inicializa o registro vazio."""
+        self._clients: Dict[EmbeddingsClientKey, Embeddings] = {}
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(
+        self,
+        embeddings_class: str,
+        model: str,
+        fabrica: Optional[Callable[[str, str], Embeddings]] = None,
+    ) -> Embeddings:
+        """Retorna o cliente da configuração, criando-o se necessário.
+
+        A criação ocorre sob o lock, então threads concorrentes nunca
+        carregam o mesmo modelo duas vezes.
+
+        Args:
+            embeddings_class (str): O nome da classe de embeddings.
+            model (str): O nome do modelo.
+            fabrica (Optional[Callable[[str, str], Embeddings]]): Cria o
+                cliente a partir da classe e do modelo (padrão: ``criar``).
+
+        Returns:
+            Embeddings: Instância compartilhada do cliente de embeddings.
+        """
+        key = (embeddings_class, model)
+        client = self._clients.get(key)
+        if client is not None:
+            self.hits += 1
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                inicio = time.perf_counter()
+                client = (fabrica or self.criar)(embeddings_class, model)
+                self._clients[key] = client
+                self.misses += 1
+                logger.debug(
+                    f"Cliente de embeddings criado: {embeddings_class} "
+                    f"({model}) em {time.perf_counter() - inicio:.3f}s"
+                )
+            else:
+                self.hits += 1
+            return client
+
+    @staticmethod
+    def criar(embeddings_class: str, model: str) -> Embeddings:
+        """Cria um novo cliente de embeddings, fora do registro.
+
+        Usado pelo registro na primeira chamada de cada configuração e por
+        quem precisa de um cliente próprio, como o reprocessamento com um
+        modelo diferente do configurado.
+
+        Args:
+            embeddings_class (str): O nome da classe de embeddings.
+            model (str): O nome do modelo.
+
+        Returns:
+            Embeddings: Nova instância do modelo de embeddings solicitado.
+        """
+        if embeddings_class == "OpenAIEmbeddings":
+            from langchain_openai import OpenAIEmbeddings
+
+            return OpenAIEmbeddings(model=model)
+
+        elif embeddings_class == "OllamaEmbeddings":
+            from langchain_ollama import OllamaEmbeddings
+
+            return OllamaEmbeddings(model=model)
+
+        elif embeddings_class == "HuggingFaceEmbeddings":
+            from langchain_community.embeddings import HuggingFaceEmbeddings
+
+            return HuggingFaceEmbeddings(model_name=model)
+
+        elif embeddings_class == "HuggingFaceInferenceAPIEmbeddings":
+            from langchain_community.embeddings import (
+                HuggingFaceInferenceAPIEmbeddings,
+            )
+            from pydantic import SecretStr
+
+            return HuggingFaceInferenceAPIEmbeddings(
+                api_key=SecretStr(secret_value=SERVICEHUB.HUGGINGFACE_API_KEY),
+                model_name=model,
+            )
+
+        elif embeddings_class == "HashEmbeddings":
+            from smart_core_assistant_painel.modules.ai_engine.utils.fake_providers import (
+                HashEmbeddings,
+            )
+
+            return HashEmbeddings(model=model or "hash-embeddings")
+
+        elif embeddings_class == "LocalEmbeddings":
+            from smart_core_assistant_painel.modules.ai_engine.utils.embeddings_locais import (
+                LocalEmbeddings,
+            )
+
+            return LocalEmbeddings(model=model)
+
+        else:
+            # Fallback para OpenAI como padrão
+            from langchain_openai import OpenAIEmbeddings
+
+            return OpenAIEmbeddings(model=model or "text-embedding-ada-002")
+
+    def aquecer(self) -> Optional[Embeddings]:
+        """Cria o cliente da configuração atual antes da primeira chamada.
+
+        Nenhuma requisição de embeddings é feita; apenas o cliente é
+        instanciado (o que carrega o modelo, no caso do HuggingFace local).
+        Erros são registrados e a criação fica para a primeira chamada.
+
+        Returns:
+            Optional[Embeddings]: O cliente criado ou None em caso de erro.
+        """
+        try:
+            return self.get(
+                SERVICEHUB.EMBEDDINGS_CLASS, SERVICEHUB.EMBEDDINGS_MODEL
+            )
+        except Exception as e:
+            logger.warning(f"Falha ao aquecer cliente de embeddings: {e}")
+            return None
+
+    def clear(self) -> None:
+        """Descarta todos os clientes registrados."""
+        with self._lock:
+            total = len(self._clients)
+            self._clients.clear()
+        if total:
+            logger.info(
+                f"Registro de clientes de embeddings invalidado ({total})"
+            )
+
+    def __len__(self) -> int:
+        """Retorna o número de clientes registrados."""
+        return len(self._clients)
+
+
+EMBEDDINGS_CLIENT_REGISTRY = EmbeddingsClientRegistry()
+SERVICEHUB.add_embeddings_config_listener(EMBEDDINGS_CLIENT_REGISTRY.clear)
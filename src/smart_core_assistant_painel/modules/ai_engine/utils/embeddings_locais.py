@@ -0,0 +1,284 @@
+"""Serviço local de embeddings com agrupamento dinâmico de pedidos.
+
+Com ``EMBEDDINGS_CLASS=LocalEmbeddings``, os workers não carregam o modelo:
+enviam os textos por um socket Unix (``EMBEDDINGS_LOCAL_SOCKET``) a um
+processo local iniciado com ``python manage.py servico_embeddings``. O
+serviço carrega o modelo uma única vez (``EMBEDDINGS_LOCAL_BACKEND`` com
+``EMBEDDINGS_MODEL``) e reúne os pedidos simultâneos em um único
+``embed_documents``: o lote fecha ao atingir ``EMBEDDINGS_LOCAL_MAX_BATCH``
+textos ou ``EMBEDDINGS_LOCAL_MAX_WAIT_MS`` após o primeiro pedido.
+
+Protocolo: o cliente envia uma linha JSON ``{"textos": [...]}`` e recebe
+uma linha JSON ``{"quantidade": n, "dimensoes": d}`` seguida de ``n * d``
+valores float32, ou ``{"erro": "..."}``.
+"""
+
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from loguru import logger
+from pydantic import BaseModel, ConfigDict
+
+from smart_core_assistant_painel.modules.ai_engine.utils.erros import (
+    EmbeddingError,
+)
+from smart_core_assistant_painel.modules.services import SERVICEHUB
+
+GeradorEmbeddings = Callable[[list[str]], list[list[float]]]
+
+
+class EstatisticasAgrupador(NamedTuple):
+    """Pedidos e lotes processados pelo agrupador."""
+
+    pedidos: int
+    lotes: int
+    textos: int
+
+    @property
+    def textos_por_lote(self) -> float:
+        """Tamanho médio dos lotes enviados ao modelo."""
+        return self.textos / self.lotes if self.lotes else 0.0
+
+
+class _Pedido(NamedTuple):
+    textos: list[str]
+    futuro: Future[list[list[float]]]
+
+
+class AgrupadorEmbeddings:
+    """Reúne pedidos simultâneos em lotes para o modelo de embeddings.
+
+    Uma thread consome a fila de pedidos: a partir do primeiro pedido,
+    acrescenta os seguintes ao lote até somar ``max_lote`` textos ou
+    passar ``espera_maxima_ms``. Um pedido que ultrapassaria o limite fica
+    para o próximo lote; um pedido maior que o limite segue sozinho. Uma
+    falha do modelo é repassada a todos os pedidos do lote.
+    """
+
+    def __init__(
+        self,
+        gerar: GeradorEmbeddings,
+        max_lote: int,
+        espera_maxima_ms: float,
+    ) -> None:
+        self._gerar = gerar
+        self._max_lote = max(1, max_lote)
+        self._espera = max(0.0, espera_maxima_ms) / 1000
+        self._fila: queue.SimpleQueue[Optional[_Pedido]] = (
+            queue.SimpleQueue()
+        )
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pedidos = 0
+        self._lotes = 0
+        self._textos = 0
+
+    def gerar(self, textos: list[str]) -> list[list[float]]:
+        """Gera os embeddings dos textos no próximo lote.
+
+        Args:
+            textos: Textos do pedido
+
+        Returns:
+            Um vetor por texto, na mesma ordem
+        """
+        if not textos:
+            return []
+        futuro: Future[list[list[float]]] = Future()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._executar,
+                    name="agrupador-embeddings",
+                    daemon=True,
+                )
+                self._thread.start()
+            self._fila.put(_Pedido(list(textos), futuro))
+        return futuro.result()
+
+    def parar(self) -> None:
+        """Processa os pedidos já enfileirados e encerra a thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._fila.put(None)
+            thread.join()
+
+    def estatisticas(self) -> EstatisticasAgrupador:
+        """Retorna os pedidos, lotes e textos processados."""
+        with self._lock:
+            return EstatisticasAgrupador(
+                self._pedidos, self._lotes, self._textos
+            )
+
+    def _executar(self) -> None:
+        adiado: Optional[_Pedido] = None
+        encerrar = False
+        while not encerrar:
+            primeiro = adiado if adiado is not None else self._fila.get()
+            adiado = None
+            if primeiro is None:
+                return
+
+            lote = [primeiro]
+            total = len(primeiro.textos)
+            prazo = time.monotonic() + self._espera
+            while total < self._max_lote:
+                try:
+                    proximo = self._fila.get(
+                        timeout=max(0.0, prazo - time.monotonic())
+                    )
+                except queue.Empty:
+                    break
+                if proximo is None:
+                    encerrar = True
+                    break
+                if total + len(proximo.textos) > self._max_lote:
+                    adiado = proximo
+                    break
+                lote.append(proximo)
+                total += len(proximo.textos)
+
+            self._processar(lote, total)
+
+        if adiado is not None:
+            self._processar([adiado], len(adiado.textos))
+
+    def _processar(self, lote: list[_Pedido], total: int) -> None:
+        with self._lock:
+            self._pedidos += len(lote)
+            self._lotes += 1
+            self._textos += total
+        try:
+            vetores = self._gerar(
+                [texto for pedido in lote for texto in pedido.textos]
+            )
+        except Exception as e:
+            for pedido in lote:
+                pedido.futuro.set_exception(e)
+            return
+
+        inicio = 0
+        for pedido in lote:
+            fim = inicio + len(pedido.textos)
+            pedido.futuro.set_result(vetores[inicio:fim])
+            inicio = fim
+
+
+class _TratadorConexao(socketserver.StreamRequestHandler):
+    """Atende os pedidos de uma conexão, um por linha."""
+
+    server: "ServidorEmbeddingsLocal"
+
+    def handle(self) -> None:
+        for linha in self.rfile:
+            try:
+                textos = [str(texto) for texto in json.loads(linha)["textos"]]
+                vetores = self.server.agrupador.gerar(textos)
+                matriz = np.asarray(vetores, dtype=np.float32)
+                cabecalho: dict[str, Any] = {
+                    "quantidade": len(vetores),
+                    "dimensoes": int(matriz.shape[1]) if vetores else 0,
+                }
+                corpo = matriz.tobytes()
+            except Exception as e:
+                logger.warning(f"Erro no serviço local de embeddings: {e}")
+                cabecalho, corpo = {"erro": str(e)}, b""
+            self.wfile.write(json.dumps(cabecalho).encode() + b"\n" + corpo)
+
+
+class ServidorEmbeddingsLocal(
+    socketserver.ThreadingMixIn, socketserver.UnixStreamServer
+):
+    """Servidor do socket Unix; cada conexão é atendida por uma thread."""
+
+    daemon_threads = True
+
+    def __init__(self, caminho: str, agrupador: AgrupadorEmbeddings) -> None:
+        """Abre o socket, substituindo um arquivo de execução anterior.
+
+        Args:
+            caminho: Caminho do socket Unix
+            agrupador: Agrupador que gera os embeddings
+
+        Raises:
+            OSError: Se outro serviço já atende no caminho
+        """
+        if os.path.exists(caminho):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as teste:
+                try:
+                    teste.connect(caminho)
+                except OSError:
+                    os.unlink(caminho)
+                else:
+                    raise OSError(f"Serviço de embeddings já ativo: {caminho}")
+        self.caminho = caminho
+        self.agrupador = agrupador
+        super().__init__(caminho, _TratadorConexao)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.agrupador.parar()
+        if os.path.exists(self.caminho):
+            os.unlink(self.caminho)
+
+
+class LocalEmbeddings(Embeddings, BaseModel):
+    """Cliente do serviço local de embeddings (``servico_embeddings``).
+
+    Attributes:
+        model (str): Nome informado na configuração (o modelo efetivo é o
+            carregado pelo serviço).
+        socket_path (str): Caminho do socket. Vazio usa
+            ``EMBEDDINGS_LOCAL_SOCKET``.
+        timeout (float): Tempo máximo (s) de espera pela resposta.
+    """
+
+    model: str = ""
+    socket_path: str = ""
+    timeout: float = 60.0
+
+    model_config = ConfigDict(extra="ignore")
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        caminho = self.socket_path or SERVICEHUB.EMBEDDINGS_LOCAL_SOCKET
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conexao:
+                conexao.settimeout(self.timeout)
+                conexao.connect(caminho)
+                conexao.sendall(
+                    json.dumps({"textos": texts}).encode() + b"\n"
+                )
+                with conexao.makefile("rb") as resposta:
+                    cabecalho = json.loads(resposta.readline() or "{}")
+                    if "erro" in cabecalho or "quantidade" not in cabecalho:
+                        raise EmbeddingError(
+                            cabecalho.get("erro", "resposta vazia")
+                        )
+                    quantidade = int(cabecalho["quantidade"])
+                    dimensoes = int(cabecalho["dimensoes"])
+                    corpo = resposta.read(quantidade * dimensoes * 4)
+        except OSError as e:
+            raise EmbeddingError(
+                f"Serviço local de embeddings indisponível em {caminho}: {e}"
+            ) from e
+        if len(corpo) != quantidade * dimensoes * 4:
+            raise EmbeddingError("Resposta incompleta do serviço local")
+
+        vetores = np.frombuffer(corpo, dtype=np.float32)
+        return vetores.reshape(quantidade, dimensoes).tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
@@ -0,0 +1,414 @@
+"""Extração determinística de entidades e intenções triviais.
+
+Etapa executada antes da análise prévia pelo LLM. Identifica, com
+expressões regulares pré-compiladas e validação de dígitos verificadores,
+as entidades fixas de formato rígido (e-mail, CPF, CNPJ, CEP e telefone) e
+reconhece saudações, agradecimentos, confirmações e despedidas.
+
+Quando toda a mensagem é coberta pelas regras (confiança 1.0), o resultado
+pode substituir a chamada ao LLM. Caso contrário, as entidades encontradas
+complementam a resposta do LLM.
+"""
+
+import json
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, NamedTuple, Optional
+
+from smart_core_assistant_painel.modules.ai_engine.utils.types import (
+    APMTuple,
+)
+
+_EMAIL = re.compile(
+    r"\b[\w.+-]+@[a-zA-Z0-9-]+(?:\.[a-zA-Z0-9-]+)*\.[a-zA-Z]{2,}\b"
+)
+_CNPJ = re.compile(r"(?<!\d)\d{2}\.?\d{3}\.?\d{3}/?\d{4}-?\d{2}(?!\d)")
+_CPF = re.compile(r"(?<!\d)\d{3}\.?\d{3}\.?\d{3}-?\d{2}(?!\d)")
+_CEP = re.compile(r"(?<!\d)\d{2}\.?\d{3}-\d{3}(?!\d)|(?<!\d)\d{8}(?!\d)")
+_TELEFONE = re.compile(
+    r"(?<![\d+])(?:\+?55[\s.-]?)?\(?[1-9]\d\)?[\s.-]?(?:9[\s.-]?)?"
+    r"\d{4}[\s.-]?\d{4}(?!\d)"
+)
+_PALAVRAS = re.compile(r"[^\W_]+")
+_MENCIONA_CEP = re.compile(r"\bcep\b", re.IGNORECASE)
+_MENCIONA_TELEFONE = re.compile(
+    r"\b(?:telefone|tel|fone|celular|cel|whats\w*|zap|contato)\b",
+    re.IGNORECASE,
+)
+_MENCIONA_CPF = re.compile(r"\bcpf\b", re.IGNORECASE)
+
+# Tipos de entidade que as regras extraem (os demais dependem do LLM)
+TIPOS_ENTIDADE_REGRAS: frozenset[str] = frozenset(
+    {
+        "email_contato",
+        "cnpj_cliente",
+        "cpf_cliente",
+        "cep_cliente",
+        "telefone_cliente",
+    }
+)
+
+# Frases reconhecidas por tipo de intenção (texto sem acentos)
+_FRASES_INTENCAO: dict[str, tuple[str, ...]] = {
+    "saudacao": (
+        "oi",
+        "oie",
+        "ola",
+        "opa",
+        "eai",
+        "e ai",
+        "bom dia",
+        "boa tarde",
+        "boa noite",
+        "tudo bem",
+        "tudo bom",
+        "como vai",
+        "hello",
+        "hi",
+    ),
+    "agradecimento": (
+        "obrigado",
+        "obrigada",
+        "muito obrigado",
+        "muito obrigada",
+        "obg",
+        "brigado",
+        "brigada",
+        "valeu",
+        "vlw",
+        "grato",
+        "grata",
+        "agradeco",
+    ),
+    "confirmacao": (
+        "ok",
+        "okay",
+        "certo",
+        "beleza",
+        "blz",
+        "sim",
+        "perfeito",
+        "combinado",
+        "entendi",
+        "entendido",
+        "fechado",
+        "show",
+        "pode ser",
+        "ta bom",
+        "ta bem",
+        "esta bem",
+    ),
+    "despedida": (
+        "tchau",
+        "ate mais",
+        "ate logo",
+        "ate breve",
+        "falou",
+        "flw",
+    ),
+}
+
+# Palavras de ligação que acompanham dados sem alterar o sentido
+_PALAVRAS_NEUTRAS: frozenset[str] = frozenset(
+    {
+        "a",
+        "o",
+        "e",
+        "de",
+        "do",
+        "da",
+        "eh",
+        "meu",
+        "minha",
+        "nosso",
+        "nossa",
+        "segue",
+        "seguem",
+        "aqui",
+        "esta",
+        "ta",
+        "eis",
+        "cpf",
+        "cnpj",
+        "cep",
+        "email",
+        "mail",
+        "telefone",
+        "tel",
+        "fone",
+        "celular",
+        "cel",
+        "whatsapp",
+        "whats",
+        "zap",
+        "contato",
+        "numero",
+        "n",
+        "endereco",
+    }
+)
+
+_MAX_PALAVRAS_FRASE = max(
+    len(frase.split())
+    for frases in _FRASES_INTENCAO.values()
+    for frase in frases
+)
+
+
+class ExtracaoRegras(NamedTuple):
+    """Resultado da extração por regras.
+
+    Attributes:
+        intent_types (list[dict[str, Any]]): Intenções reconhecidas.
+        entity_types (list[dict[str, Any]]): Entidades extraídas.
+        confianca (float): Fração das palavras da mensagem cobertas pelas
+            regras (1.0 quando nada resta para o LLM interpretar).
+    """
+
+    intent_types: list[dict[str, Any]]
+    entity_types: list[dict[str, Any]]
+    confianca: float
+
+    def como_apm(self) -> APMTuple:
+        """Converte o resultado para o formato da análise prévia."""
+        return APMTuple(
+            intent_types=list(self.intent_types),
+            entity_types=list(self.entity_types),
+        )
+
+
+def validar_cpf(valor: str) -> bool:
+    """Valida um CPF pelos dígitos verificadores.
+
+    Args:
+        valor (str): CPF com ou sem máscara.
+
+    Returns:
+        bool: True se o CPF for válido.
+    """
+    digitos = [int(d) for d in re.sub(r"\D", "", valor)]
+    if len(digitos) != 11 or len(set(digitos)) == 1:
+        return False
+    for posicao in (9, 10):
+        soma = sum(
+            d * peso
+            for d, peso in zip(digitos[:posicao], range(posicao + 1, 1, -1))
+        )
+        if digitos[posicao] != (soma * 10 % 11) % 10:
+            return False
+    return True
+
+
+def validar_cnpj(valor: str) -> bool:
+    """Valida um CNPJ pelos dígitos verificadores.
+
+    Args:
+        valor (str): CNPJ com ou sem máscara.
+
+    Returns:
+        bool: True se o CNPJ for válido.
+    """
+    digitos = [int(d) for d in re.sub(r"\D", "", valor)]
+    if len(digitos) != 14 or len(set(digitos)) == 1:
+        return False
+    pesos = [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+    for posicao in (12, 13):
+        soma = sum(
+            d * peso
+            for d, peso in zip(digitos[:posicao], pesos[13 - posicao :])
+        )
+        resto = soma % 11
+        if digitos[posicao] != (0 if resto < 2 else 11 - resto):
+            return False
+    return True
+
+
+def extrair_por_regras(
+    texto: str, tipos_intent_validos: frozenset[str]
+) -> ExtracaoRegras:
+    """Extrai entidades fixas e intenções triviais de uma mensagem.
+
+    Args:
+        texto (str): O texto da mensagem.
+        tipos_intent_validos (frozenset[str]): Tipos de intenção configurados.
+            Saudações e confirmações só são reconhecidas se o tipo
+            correspondente estiver configurado.
+
+    Returns:
+        ExtracaoRegras: Intenções, entidades e a confiança da extração.
+    """
+    if not texto or not texto.strip():
+        return ExtracaoRegras([], [], 0.0)
+
+    entidades: list[dict[str, Any]] = []
+    restante = texto
+
+    def consumir(padrao: re.Pattern[str], tipo: Optional[str]) -> None:
+        nonlocal restante
+        for encontrado in padrao.finditer(restante):
+            valor = encontrado.group(0)
+            tipo_entidade = tipo or _classificar_numero(valor, texto)
+            if tipo_entidade is None:
+                continue
+            entidades.append({tipo_entidade: valor.strip()})
+            restante = restante.replace(valor, " ", 1)
+
+    consumir(_EMAIL, "email_contato")
+    consumir(_CNPJ, None)
+    consumir(_CPF, None)
+    consumir(_CEP, None)
+    consumir(_TELEFONE, "telefone_cliente")
+
+    palavras = _PALAVRAS.findall(_sem_acentos(restante).casefold())
+    total = len(palavras) + len(entidades)
+    intencoes, nao_reconhecidas = _reconhecer_intencoes(
+        palavras, tipos_intent_validos
+    )
+    descobertas = sum(
+        1 for p in nao_reconhecidas if p not in _PALAVRAS_NEUTRAS
+    )
+
+    if not intencoes and not entidades:
+        return ExtracaoRegras([], [], 0.0)
+    return ExtracaoRegras(
+        intent_types=intencoes,
+        entity_types=entidades,
+        confianca=(total - descobertas) / total,
+    )
+
+
+def mesclar_entidades(
+    resultado: APMTuple, extracao: ExtracaoRegras
+) -> APMTuple:
+    """Acrescenta ao resultado do LLM as entidades extraídas por regras.
+
+    Args:
+        resultado (APMTuple): Resultado da análise pelo LLM.
+        extracao (ExtracaoRegras): Resultado da extração por regras.
+
+    Returns:
+        APMTuple: O resultado com as entidades que faltavam.
+    """
+    existentes = {
+        (tipo, str(valor))
+        for entidade in resultado.entity_types
+        for tipo, valor in entidade.items()
+    }
+    novas = [
+        entidade
+        for entidade in extracao.entity_types
+        if not any((t, str(v)) in existentes for t, v in entidade.items())
+    ]
+    if not novas:
+        return resultado
+    return APMTuple(
+        intent_types=resultado.intent_types,
+        entity_types=[*resultado.entity_types, *novas],
+    )
+
+
+@lru_cache(maxsize=8)
+def tipos_configurados(types_json: str) -> frozenset[str]:
+    """Lista os tipos de um JSON de configuração de intenções/entidades.
+
+    Args:
+        types_json (str): JSON no formato de ``VALID_INTENT_TYPES`` ou
+            ``VALID_ENTITY_TYPES``.
+
+    Returns:
+        frozenset[str]: Os tipos configurados (vazio se inválido).
+    """
+    try:
+        data = json.loads(types_json)
+        data = data.get("intent_types", data.get("entity_types", data))
+        return frozenset(
+            tipo
+            for categoria in data.values()
+            if isinstance(categoria, dict)
+            for tipo in categoria
+        )
+    except (TypeError, ValueError, AttributeError):
+        return frozenset()
+
+
+def tipos_entidade_livres(entity_types_json: str) -> frozenset[str]:
+    """Lista os tipos de entidade configurados que as regras não extraem.
+
+    Entidades de texto livre (nomes, datas, produtos) só são identificadas
+    pelo LLM; enquanto houver alguma configurada, a análise de uma mensagem
+    não pode ser reaproveitada de outra.
+
+    Args:
+        entity_types_json (str): JSON no formato de ``VALID_ENTITY_TYPES``.
+
+    Returns:
+        frozenset[str]: Os tipos configurados fora de
+        ``TIPOS_ENTIDADE_REGRAS``.
+    """
+    return tipos_configurados(entity_types_json) - TIPOS_ENTIDADE_REGRAS
+
+
+def _classificar_numero(valor: str, texto: str) -> Optional[str]:
+    """Decide o tipo de uma sequência numérica pelo formato e contexto."""
+    digitos = re.sub(r"\D", "", valor)
+    if len(digitos) == 14:
+        return "cnpj_cliente" if validar_cnpj(digitos) else None
+    if len(digitos) == 11:
+        telefone = _MENCIONA_TELEFONE.search(texto) and not (
+            _MENCIONA_CPF.search(texto)
+        )
+        return "cpf_cliente" if validar_cpf(digitos) and not telefone else None
+    if len(digitos) == 8:
+        formatado = "-" in valor
+        return (
+            "cep_cliente" if formatado or _MENCIONA_CEP.search(texto) else None
+        )
+    return None
+
+
+def _reconhecer_intencoes(
+    palavras: list[str], tipos_intent_validos: frozenset[str]
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """Reconhece frases de intenção trivial na sequência de palavras.
+
+    Returns:
+        tuple[list[dict[str, Any]], list[str]]: As intenções reconhecidas e
+            as palavras que não fazem parte de nenhuma frase conhecida.
+    """
+    frases = _indice_frases(tipos_intent_validos)
+    intencoes: list[dict[str, Any]] = []
+    nao_reconhecidas: list[str] = []
+    i = 0
+    while i < len(palavras):
+        for tamanho in range(
+            min(_MAX_PALAVRAS_FRASE, len(palavras) - i), 0, -1
+        ):
+            frase = " ".join(palavras[i : i + tamanho])
+            tipo = frases.get(frase)
+            if tipo is not None:
+                if not any(tipo in item for item in intencoes):
+                    intencoes.append({tipo: frase})
+                i += tamanho
+                break
+        else:
+            nao_reconhecidas.append(palavras[i])
+            i += 1
+    return intencoes, nao_reconhecidas
+
+
+@lru_cache(maxsize=8)
+def _indice_frases(tipos_intent_validos: frozenset[str]) -> dict[str, str]:
+    """Mapeia frase -> tipo para os tipos de intenção configurados."""
+    return {
+        frase: tipo
+        for tipo, frases in _FRASES_INTENCAO.items()
+        if tipo in tipos_intent_validos
+        for frase in frases
+    }
+
+
+def _sem_acentos(texto: str) -> str:
+    """Remove acentos para comparação com as frases conhecidas."""
+    decomposto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
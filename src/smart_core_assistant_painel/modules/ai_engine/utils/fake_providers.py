@@ -0,0 +1,384 @@
+"""Provedores simulados de LLM e embeddings, determinísticos e sem rede.
+
+Permitem medir e testar a carga do pipeline sem chamar provedores pagos:
+
+- ``FakeChat`` (``LLM_CLASS=FakeChat``): responde ecoando a última
+  mensagem e, com ``with_structured_output``, devolve uma instância
+  determinística do modelo Pydantic pedido (inclusive o modelo dinâmico da
+  análise prévia).
+- ``HashEmbeddings`` (``EMBEDDINGS_CLASS=HashEmbeddings``): gera vetores de
+  1024 dimensões por hashing das palavras do texto, normalizados. Textos
+  com palavras em comum resultam em vetores próximos, o que mantém a busca
+  por similaridade significativa.
+
+A mesma entrada produz sempre a mesma saída. Apenas a latência artificial
+varia, segundo ``FAKE_LLM_LATENCY_MS``, ``FAKE_EMBEDDINGS_LATENCY_MS``,
+``FAKE_LATENCY_JITTER`` e ``FAKE_LATENCY_DISTRIBUTION``.
+"""
+
+import asyncio
+import hashlib
+import math
+import random
+import re
+import time
+import typing
+from collections.abc import AsyncIterator, Iterator, Sequence
+from enum import Enum
+from typing import Any, Optional
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import (
+    ChatGeneration,
+    ChatGenerationChunk,
+    ChatResult,
+)
+from langchain_core.runnables import Runnable, RunnableLambda
+from pydantic import BaseModel, ConfigDict
+
+from smart_core_assistant_painel.modules.services import SERVICEHUB
+
+_PALAVRAS = re.compile(r"\w+", re.UNICODE)
+_RNG = random.Random()
+
+
+def amostrar_latencia(
+    media_ms: float,
+    jitter: float,
+    distribuicao: str,
+    rng: Optional[random.Random] = None,
+) -> float:
+    """Sorteia uma latência artificial.
+
+    Args:
+        media_ms (float): Latência média em milissegundos (0 desativa).
+        jitter (float): Desvio padrão como fração da média.
+        distribuicao (str): 'fixa', 'uniforme', 'normal' ou 'lognormal'.
+        rng (Optional[random.Random]): Gerador de números aleatórios.
+
+    Returns:
+        float: A latência em segundos (nunca negativa).
+
+    Raises:
+        ValueError: Se a distribuição não for reconhecida.
+    """
+    if media_ms <= 0:
+        return 0.0
+    rng = rng or _RNG
+    desvio = media_ms * max(jitter, 0.0)
+    if distribuicao == "fixa" or desvio == 0:
+        valor = media_ms
+    elif distribuicao == "uniforme":
+        # Mesmo desvio padrão da normal equivalente
+        amplitude = desvio * math.sqrt(3)
+        valor = rng.uniform(media_ms - amplitude, media_ms + amplitude)
+    elif distribuicao == "normal":
+        valor = rng.gauss(media_ms, desvio)
+    elif distribuicao == "lognormal":
+        sigma = math.sqrt(math.log1p((desvio / media_ms) ** 2))
+        valor = rng.lognormvariate(math.log(media_ms) - sigma**2 / 2, sigma)
+    else:
+        raise ValueError(
+            f"Distribuição de latência '{distribuicao}' não reconhecida. "
+            "Use 'fixa', 'uniforme', 'normal' ou 'lognormal'."
+        )
+    return max(valor, 0.0) / 1000
+
+
+def _latencia(media_ms: Optional[float], padrao_ms: float) -> float:
+    """Sorteia a latência com a configuração do ServiceHub."""
+    return amostrar_latencia(
+        padrao_ms if media_ms is None else media_ms,
+        SERVICEHUB.FAKE_LATENCY_JITTER,
+        SERVICEHUB.FAKE_LATENCY_DISTRIBUTION,
+    )
+
+
+def _semente(texto: str) -> int:
+    """Inteiro derivado de forma estável do texto."""
+    return int.from_bytes(
+        hashlib.blake2b(texto.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def _texto(conteudo: Any) -> str:
+    """Extrai o texto do conteúdo de uma mensagem."""
+    if isinstance(conteudo, str):
+        return conteudo
+    return " ".join(
+        parte.get("text", "") if isinstance(parte, dict) else str(parte)
+        for parte in conteudo
+    )
+
+
+def instancia_deterministica(
+    esquema: type[BaseModel], texto: str
+) -> BaseModel:
+    """Preenche o modelo Pydantic com valores derivados do texto.
+
+    Listas recebem um ou dois itens, textos recebem trechos do próprio
+    texto de entrada e os demais tipos, valores derivados do seu hash.
+
+    Args:
+        esquema (type[BaseModel]): Modelo a ser preenchido.
+        texto (str): Texto de entrada que determina os valores.
+
+    Returns:
+        BaseModel: Uma instância válida do modelo.
+    """
+    palavras = _PALAVRAS.findall(texto) or ["texto"]
+    return esquema.model_validate(
+        _valor_modelo(esquema, palavras, _semente(texto))
+    )
+
+
+def _valor_modelo(
+    esquema: type[BaseModel], palavras: list[str], semente: int
+) -> dict[str, Any]:
+    return {
+        nome: _valor(campo.annotation, palavras, semente + i)
+        for i, (nome, campo) in enumerate(esquema.model_fields.items())
+    }
+
+
+def _valor(anotacao: Any, palavras: list[str], semente: int) -> Any:
+    """Gera o valor de um campo a partir da sua anotação de tipo."""
+    origem = typing.get_origin(anotacao)
+    argumentos = [a for a in typing.get_args(anotacao) if a is not type(None)]
+    if origem in (list, set, tuple, Sequence):
+        item = argumentos[0] if argumentos else str
+        return [
+            _valor(item, palavras, semente * 31 + i)
+            for i in range(1 + semente % 2)
+        ]
+    if origem is typing.Literal:
+        return argumentos[semente % len(argumentos)]
+    if origem is dict:
+        return {}
+    if argumentos:  # Optional/Union: usa o primeiro tipo
+        return _valor(argumentos[0], palavras, semente)
+    if isinstance(anotacao, type):
+        if issubclass(anotacao, BaseModel):
+            return _valor_modelo(anotacao, palavras, semente)
+        if issubclass(anotacao, Enum):
+            membros = list(anotacao)
+            return membros[semente % len(membros)].value
+        if issubclass(anotacao, bool):
+            return semente % 2 == 0
+        if issubclass(anotacao, int):
+            return semente % 100
+        if issubclass(anotacao, float):
+            return (semente % 1000) / 1000
+    # str e demais tipos: trecho do texto de entrada
+    inicio = semente % len(palavras)
+    return " ".join(palavras[inicio : inicio + 1 + semente % 4])
+
+
+class FakeChat(BaseChatModel):
+    """Modelo de chat simulado, determinístico e sem rede.
+
+    Aceita os mesmos parâmetros de construção dos demais provedores
+    (``model``, ``temperature``...), ignorando os que não usa.
+
+    Attributes:
+        model (str): Nome informado na configuração.
+        latencia_ms (Optional[float]): Latência média (ms). Se omitida, usa
+            ``FAKE_LLM_LATENCY_MS``.
+    """
+
+    model: str = "fake-chat"
+    temperature: float = 0.0
+    latencia_ms: Optional[float] = None
+
+    model_config = ConfigDict(extra="ignore")
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"model_name": self.model}
+
+    def with_structured_output(  # type: ignore[override]
+        self,
+        schema: Any,
+        *,
+        include_raw: bool = False,
+        **kwargs: Any,
+    ) -> Runnable[Any, Any]:
+        """Retorna uma instância determinística de ``schema``.
+
+        Args:
+            schema (Any): Modelo Pydantic da resposta.
+            include_raw (bool): Se True, retorna também a mensagem bruta.
+            **kwargs (Any): Ignorados.
+
+        Returns:
+            Runnable[Any, Any]: A chain ``llm | conversão``.
+        """
+
+        def converter(mensagem: BaseMessage) -> Any:
+            parsed = schema.model_validate_json(_texto(mensagem.content))
+            if include_raw:
+                return {
+                    "raw": mensagem,
+                    "parsed": parsed,
+                    "parsing_error": None,
+                }
+            return parsed
+
+        return self.bind(esquema=schema) | RunnableLambda(converter)
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self._sortear_latencia())
+        return self._resultado(messages, kwargs.get("esquema"))
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self._sortear_latencia())
+        return self._resultado(messages, kwargs.get("esquema"))
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        # A latência simulada antecede o primeiro token
+        time.sleep(self._sortear_latencia())
+        for trecho in self._trechos(messages, kwargs.get("esquema")):
+            if run_manager:
+                run_manager.on_llm_new_token(trecho.text, chunk=trecho)
+            yield trecho
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self._sortear_latencia())
+        for trecho in self._trechos(messages, kwargs.get("esquema")):
+            if run_manager:
+                await run_manager.on_llm_new_token(trecho.text, chunk=trecho)
+            yield trecho
+
+    def _sortear_latencia(self) -> float:
+        return _latencia(self.latencia_ms, SERVICEHUB.FAKE_LLM_LATENCY_MS)
+
+    @staticmethod
+    def _conteudo(
+        messages: list[BaseMessage], esquema: Optional[type[BaseModel]]
+    ) -> str:
+        """Gera a resposta: eco da última mensagem ou JSON do esquema."""
+        texto = _texto(messages[-1].content) if messages else ""
+        if esquema is None:
+            return texto
+        return instancia_deterministica(esquema, texto).model_dump_json()
+
+    def _resultado(
+        self,
+        messages: list[BaseMessage],
+        esquema: Optional[type[BaseModel]],
+    ) -> ChatResult:
+        conteudo = self._conteudo(messages, esquema)
+        mensagem = AIMessage(
+            content=conteudo,
+            usage_metadata=self._uso(messages, conteudo),
+            response_metadata={"model_name": self.model},
+        )
+        return ChatResult(generations=[ChatGeneration(message=mensagem)])
+
+    def _trechos(
+        self,
+        messages: list[BaseMessage],
+        esquema: Optional[type[BaseModel]],
+    ) -> Iterator[ChatGenerationChunk]:
+        conteudo = self._conteudo(messages, esquema)
+        for trecho in re.findall(r"\S+\s*|\s+", conteudo):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=trecho))
+
+    @staticmethod
+    def _uso(messages: list[BaseMessage], conteudo: str) -> Any:
+        """Contagem aproximada de tokens (uma por palavra)."""
+        entrada = sum(
+            len(_PALAVRAS.findall(_texto(m.content))) for m in messages
+        )
+        saida = len(_PALAVRAS.findall(conteudo))
+        return {
+            "input_tokens": entrada,
+            "output_tokens": saida,
+            "total_tokens": entrada + saida,
+        }
+
+
+class HashEmbeddings(Embeddings, BaseModel):
+    """Embeddings simulados por hashing das palavras do texto.
+
+    Cada palavra (em minúsculas) soma +1 ou -1 a uma dimensão escolhida
+    pelo seu hash. O vetor resultante é normalizado.
+
+    Attributes:
+        model (str): Nome informado na configuração.
+        dimensoes (int): Tamanho dos vetores (1024, como nas tabelas).
+        latencia_ms (Optional[float]): Latência média (ms) por requisição.
+            Se omitida, usa ``FAKE_EMBEDDINGS_LATENCY_MS``.
+    """
+
+    model: str = "hash-embeddings"
+    dimensoes: int = 1024
+    latencia_ms: Optional[float] = None
+
+    model_config = ConfigDict(extra="ignore")
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        # Uma requisição por lote, como nos provedores reais
+        time.sleep(self._sortear_latencia())
+        return [self._vetor(texto) for texto in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        time.sleep(self._sortear_latencia())
+        return self._vetor(text)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        await asyncio.sleep(self._sortear_latencia())
+        return [self._vetor(texto) for texto in texts]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        await asyncio.sleep(self._sortear_latencia())
+        return self._vetor(text)
+
+    def _sortear_latencia(self) -> float:
+        return _latencia(
+            self.latencia_ms, SERVICEHUB.FAKE_EMBEDDINGS_LATENCY_MS
+        )
+
+    def _vetor(self, texto: str) -> list[float]:
+        """Gera o vetor normalizado do texto."""
+        vetor = [0.0] * self.dimensoes
+        for palavra in _PALAVRAS.findall(texto.lower()) or [texto]:
+            semente = _semente(palavra)
+            sinal = 1.0 if semente & 1 else -1.0
+            vetor[(semente >> 1) % self.dimensoes] += sinal
+        norma = math.sqrt(sum(valor * valor for valor in vetor))
+        return [valor / norma for valor in vetor]
@@ -0,0 +1,79 @@
+"""Filtro incremental das tags de pensamento (``<think>``) do LLM.
+
+Nas respostas completas as tags são removidas com uma expressão regular.
+No streaming, uma tag pode chegar dividida entre vários trechos, então o
+filtro guarda apenas o sufixo que ainda pode ser o início de uma tag e
+libera o restante do texto imediatamente.
+"""
+
+_ABERTURA = "<think>"
+_FECHAMENTO = "</think>"
+
+
+class FiltroPensamento:
+    """Remove trechos ``<think>...</think>`` de um fluxo de texto.
+
+    Exemplo:
+        >>> filtro = FiltroPensamento()
+        >>> filtro.processar("Olá <thi") + filtro.processar("nk>x</think>!")
+        'Olá !'
+    """
+
+    def __init__(self) -> None:
+        self._pendente = ""
+        self._pensando = False
+        self._inicio = True
+
+    def processar(self, trecho: str) -> str:
+        """Processa um trecho do fluxo.
+
+        Args:
+            trecho (str): O próximo trecho recebido do LLM.
+
+        Returns:
+            str: O texto que já pode ser exibido (pode ser vazio).
+        """
+        texto = self._pendente + trecho
+        self._pendente = ""
+        saida: list[str] = []
+        while texto:
+            tag = _FECHAMENTO if self._pensando else _ABERTURA
+            posicao = texto.find(tag)
+            if posicao >= 0:
+                if not self._pensando:
+                    saida.append(texto[:posicao])
+                texto = texto[posicao + len(tag) :]
+                self._pensando = not self._pensando
+                continue
+            reter = _prefixo_parcial(texto, tag)
+            if not self._pensando:
+                saida.append(texto[: len(texto) - reter])
+            self._pendente = texto[len(texto) - reter :]
+            break
+        return self._sem_espacos_iniciais("".join(saida))
+
+    def finalizar(self) -> str:
+        """Libera o texto retido ao final do fluxo.
+
+        Returns:
+            str: O restante do texto, se não fizer parte de um pensamento.
+        """
+        pendente, self._pendente = self._pendente, ""
+        if self._pensando:
+            return ""
+        return self._sem_espacos_iniciais(pendente)
+
+    def _sem_espacos_iniciais(self, texto: str) -> str:
+        """Descarta espaços no início da resposta, como o ``strip`` final."""
+        if self._inicio:
+            texto = texto.lstrip()
+            self._inicio = not texto
+        return texto
+
+
+def _prefixo_parcial(texto: str, tag: str) -> int:
+    """Retorna o tamanho do maior sufixo de ``texto`` que inicia ``tag``."""
+    for tamanho in range(min(len(tag) - 1, len(texto)), 0, -1):
+        if tag.startswith(texto[-tamanho:]):
+            return tamanho
+    return 0
@@ -0,0 +1,273 @@
+"""Execução concorrente de estágios organizados em um grafo de dependências.
+
+Cada estágio declara de quais outros depende e recebe os resultados deles
+como argumentos nomeados. Estágios independentes executam em paralelo em
+threads e cada estágio inicia assim que suas dependências terminam, de modo
+que a latência total se aproxima do caminho mais lento do grafo em vez da
+soma dos estágios. A duração de cada estágio é registrada no log.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, NamedTuple, Optional
+
+from loguru import logger
+
+
+class Estagio(NamedTuple):
+    """Estágio do grafo.
+
+    Attributes:
+        nome (str): Nome único do estágio.
+        funcao (Callable[..., Any]): Função executada. Recebe o resultado de
+            cada dependência como argumento nomeado pelo nome do estágio.
+        dependencias (tuple[str, ...]): Estágios que precisam terminar antes.
+    """
+
+    nome: str
+    funcao: Callable[..., Any]
+    dependencias: tuple[str, ...] = ()
+
+
+class ResultadoGrafo(NamedTuple):
+    """Resultado da execução do grafo.
+
+    Attributes:
+        resultados (dict[str, Any]): Resultado de cada estágio concluído.
+        erros (dict[str, BaseException]): Exceção de cada estágio que falhou.
+        ignorados (list[str]): Estágios não executados porque uma
+            dependência falhou.
+        duracoes (dict[str, float]): Duração em segundos de cada estágio.
+        total (float): Duração total da execução em segundos.
+    """
+
+    resultados: dict[str, Any]
+    erros: dict[str, BaseException]
+    ignorados: list[str]
+    duracoes: dict[str, float]
+    total: float
+
+
+class GrafoEstagios:
+    """Executa estágios respeitando as dependências declaradas.
+
+    Além das dependências declaradas, um estágio pode aguardar o resultado
+    de outro somente quando precisar dele, com ``aguardar``. Isso permite
+    iniciar trabalho que só eventualmente usa o resultado de outro estágio.
+    """
+
+    def __init__(
+        self,
+        estagios: list[Estagio],
+        finalizar_thread: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Inicializa o grafo validando nomes e dependências.
+
+        Args:
+            estagios (list[Estagio]): Os estágios, em qualquer ordem.
+            finalizar_thread (Optional[Callable[[], None]]): Executado na
+                thread de cada estágio ao terminar (por exemplo, para fechar
+                conexões de banco de dados abertas pela thread).
+
+        Raises:
+            ValueError: Se houver nomes repetidos, dependências
+                desconhecidas ou ciclos.
+        """
+        self._estagios = {estagio.nome: estagio for estagio in estagios}
+        if len(self._estagios) != len(estagios):
+            raise ValueError("Estágios com nomes repetidos")
+        for estagio in estagios:
+            desconhecidas = set(estagio.dependencias) - self._estagios.keys()
+            if desconhecidas:
+                raise ValueError(
+                    f"Estágio '{estagio.nome}' depende de estágios "
+                    f"inexistentes: {sorted(desconhecidas)}"
+                )
+        self._verificar_ciclos()
+        self._finalizar_thread = finalizar_thread
+        self._futures: dict[str, Future[Any]] = {}
+        self._agendamento_concluido = False
+        self._condicao = threading.Condition()
+
+    def aguardar(self, nome: str, timeout: Optional[float] = None) -> Any:
+        """Aguarda e retorna o resultado de um estágio.
+
+        Deve ser chamado por outro estágio durante a execução do grafo.
+
+        Args:
+            nome (str): Nome do estágio.
+            timeout (Optional[float]): Tempo máximo de espera em segundos.
+
+        Returns:
+            Any: O resultado do estágio.
+
+        Raises:
+            Exception: A exceção levantada pelo estágio aguardado.
+        """
+        if nome not in self._estagios:
+            raise KeyError(nome)
+        inicio = time.perf_counter()
+        with self._condicao:
+            if not self._condicao.wait_for(
+                lambda: nome in self._futures or self._agendamento_concluido,
+                timeout,
+            ):
+                raise TimeoutError(f"Estágio '{nome}' não foi iniciado")
+            future = self._futures.get(nome)
+        if future is None:
+            raise RuntimeError(f"Estágio '{nome}' não foi executado")
+        restante = (
+            None
+            if timeout is None
+            else max(0.0, timeout - (time.perf_counter() - inicio))
+        )
+        try:
+            resultado, _ = future.result(timeout=restante)
+        except _FalhaEstagio as falha:
+            raise falha.erro from None
+        return resultado
+
+    def executar(self, descricao: str = "grafo") -> ResultadoGrafo:
+        """Executa todos os estágios e aguarda a conclusão.
+
+        Falhas não interrompem estágios independentes; os que dependem de
+        um estágio com falha não são executados.
+
+        Args:
+            descricao (str): Identificação usada no log das durações.
+
+        Returns:
+            ResultadoGrafo: Resultados, erros e durações dos estágios.
+        """
+        resultados: dict[str, Any] = {}
+        erros: dict[str, BaseException] = {}
+        ignorados: list[str] = []
+        duracoes: dict[str, float] = {}
+        pendentes = dict(self._estagios)
+        em_execucao: dict[Future[Any], str] = {}
+        with self._condicao:
+            self._futures = {}
+            self._agendamento_concluido = False
+        inicio = time.perf_counter()
+
+        with ThreadPoolExecutor(
+            max_workers=len(self._estagios) or 1,
+            thread_name_prefix=f"estagio-{descricao}",
+        ) as executor:
+            while pendentes or em_execucao:
+                for nome, estagio in list(pendentes.items()):
+                    dependencias = estagio.dependencias
+                    if any(d in erros or d in ignorados for d in dependencias):
+                        del pendentes[nome]
+                        ignorados.append(nome)
+                        continue
+                    if all(d in resultados for d in dependencias):
+                        del pendentes[nome]
+                        argumentos = {d: resultados[d] for d in dependencias}
+                        future = executor.submit(
+                            self._executar_estagio, estagio, argumentos
+                        )
+                        em_execucao[future] = nome
+                        self._agendar(nome, future)
+                if not pendentes:
+                    self._agendar(None, None)
+                if not em_execucao:
+                    continue
+                concluidos, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+                for future in concluidos:
+                    nome = em_execucao.pop(future)
+                    try:
+                        resultado, duracao = future.result()
+                        resultados[nome] = resultado
+                    except _FalhaEstagio as falha:
+                        erros[nome] = falha.erro
+                        duracao = falha.duracao
+                        logger.error(
+                            f"Estágio '{nome}' de {descricao} falhou: "
+                            f"{falha.erro}"
+                        )
+                    duracoes[nome] = duracao
+            self._agendar(None, None)
+
+        total = time.perf_counter() - inicio
+        etapas = ", ".join(
+            f"{nome}={duracao * 1000:.0f}ms"
+            for nome, duracao in duracoes.items()
+        )
+        logger.info(
+            f"{descricao}: total={total * 1000:.0f}ms "
+            f"(soma dos estágios={sum(duracoes.values()) * 1000:.0f}ms; "
+            f"{etapas})"
+        )
+        if ignorados:
+            logger.warning(
+                f"{descricao}: estágios não executados por falha em "
+                f"dependência: {ignorados}"
+            )
+        return ResultadoGrafo(resultados, erros, ignorados, duracoes, total)
+
+    def _agendar(
+        self, nome: Optional[str], future: Optional[Future[Any]]
+    ) -> None:
+        """Registra um estágio submetido ou o fim do agendamento."""
+        with self._condicao:
+            if nome is not None and future is not None:
+                self._futures[nome] = future
+            else:
+                self._agendamento_concluido = True
+            self._condicao.notify_all()
+
+    def _executar_estagio(
+        self, estagio: Estagio, argumentos: dict[str, Any]
+    ) -> tuple[Any, float]:
+        """Executa um estágio medindo sua duração."""
+        inicio = time.perf_counter()
+        try:
+            resultado = estagio.funcao(**argumentos)
+        except Exception as e:
+            raise _FalhaEstagio(e, time.perf_counter() - inicio) from e
+        finally:
+            if self._finalizar_thread is not None:
+                try:
+                    self._finalizar_thread()
+                except Exception as e:
+                    logger.warning(
+                        f"Erro ao finalizar thread do estágio "
+                        f"'{estagio.nome}': {e}"
+                    )
+        return resultado, time.perf_counter() - inicio
+
+    def _verificar_ciclos(self) -> None:
+        """Levanta ValueError se as dependências formarem um ciclo."""
+        visitados: set[str] = set()
+        caminho: set[str] = set()
+
+        def visitar(nome: str) -> None:
+            if nome in caminho:
+                raise ValueError(f"Ciclo de dependências em '{nome}'")
+            if nome in visitados:
+                return
+            caminho.add(nome)
+            for dependencia in self._estagios[nome].dependencias:
+                visitar(dependencia)
+            caminho.discard(nome)
+            visitados.add(nome)
+
+        for nome in self._estagios:
+            visitar(nome)
+
+
+class _FalhaEstagio(Exception):
+    """Exceção de um estágio acompanhada da duração até a falha."""
+
+    def __init__(self, erro: Exception, duracao: float) -> None:
+        super().__init__(str(erro))
+        self.erro = erro
+        self.duracao = duracao
@@ -0,0 +1,134 @@
+"""Registro de clientes LLM reutilizáveis por configuração de provedor.
+
+Instanciar ``ChatOllama``/``ChatOpenAI``/``ChatGroq`` cria um novo cliente
+HTTP a cada chamada, pagando novamente o handshake TLS e o aquecimento da
+conexão. Este módulo mantém, por processo, uma única instância por
+combinação ``(llm_class, model, extra_params)``, preservando o pool de
+conexões keep-alive do cliente HTTP entre chamadas.
+
+O registro é seguro para uso concorrente pelos workers do Django-Q e é
+invalidado automaticamente quando ``ServiceHub.reload_config`` detecta
+mudança na configuração do LLM.
+"""
+
+import threading
+from typing import Any, Dict, Hashable, Optional, Type
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from loguru import logger
+
+from smart_core_assistant_painel.modules.services import SERVICEHUB
+
+LlmClientKey = tuple[
+    Type[BaseChatModel], str, tuple[tuple[str, Hashable], ...]
+]
+
+
+def _congelar(valor: Any) -> Hashable:
+    """Converte um valor de configuração em uma representação hashable.
+
+    Args:
+        valor (Any): Valor de ``extra_params``.
+
+    Returns:
+        Hashable: O próprio valor, tuplas para coleções ou ``repr`` para
+            objetos não hashable.
+    """
+    if isinstance(valor, dict):
+        return tuple(sorted((str(k), _congelar(v)) for k, v in valor.items()))
+    if isinstance(valor, (list, tuple, set, frozenset)):
+        return tuple(_congelar(v) for v in valor)
+    try:
+        hash(valor)
+    except TypeError:
+        return repr(valor)
+    return valor
+
+
+class LlmClientRegistry:
+    """Registro thread-safe de instâncias de LLM por configuração.
+
+    Attributes:
+        hits (int): Número de reutilizações de clientes já criados.
+        misses (int): Número de clientes criados.
+    """
+
+    def __init__(self) -> None:
+        """Inicializa o registro vazio."""
+        self._clients: Dict[LlmClientKey, BaseChatModel] = {}
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @staticmethod
+    def make_key(
+        llm_class: Type[BaseChatModel],
+        model: str,
+        extra_params: Optional[Dict[str, Any]] = None,
+    ) -> LlmClientKey:
+        """Gera a chave do registro para uma configuração de LLM.
+
+        Args:
+            llm_class (Type[BaseChatModel]): A classe do modelo de linguagem.
+            model (str): O nome do modelo.
+            extra_params (Optional[Dict[str, Any]]): Parâmetros extras.
+
+        Returns:
+            LlmClientKey: Tupla imutável que identifica a configuração.
+        """
+        params = tuple(
+            sorted(
+                (str(k), _congelar(v)) for k, v in (extra_params or {}).items()
+            )
+        )
+        return (llm_class, model, params)
+
+    def get(
+        self,
+        llm_class: Type[BaseChatModel],
+        model: str,
+        extra_params: Optional[Dict[str, Any]] = None,
+    ) -> BaseChatModel:
+        """Retorna o cliente da configuração, criando-o se necessário.
+
+        Args:
+            llm_class (Type[BaseChatModel]): A classe do modelo de linguagem.
+            model (str): O nome do modelo.
+            extra_params (Optional[Dict[str, Any]]): Parâmetros extras.
+
+        Returns:
+            BaseChatModel: Instância compartilhada do modelo de linguagem.
+        """
+        key = self.make_key(llm_class, model, extra_params)
+        client = self._clients.get(key)
+        if client is not None:
+            self.hits += 1
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = llm_class(**{"model": model, **(extra_params or {})})
+                self._clients[key] = client
+                self.misses += 1
+                nome = getattr(llm_class, "__name__", llm_class)
+                logger.debug(f"Cliente LLM criado: {nome} ({model})")
+            else:
+                self.hits += 1
+            return client
+
+    def clear(self) -> None:
+        """Descarta todos os clientes registrados."""
+        with self._lock:
+            total = len(self._clients)
+            self._clients.clear()
+        if total:
+            logger.info(f"Registro de clientes LLM invalidado ({total})")
+
+    def __len__(self) -> int:
+        """Retorna o número de clientes registrados."""
+        return len(self._clients)
+
+
+LLM_CLIENT_REGISTRY = LlmClientRegistry()
+SERVICEHUB.add_llm_config_listener(LLM_CLIENT_REGISTRY.clear)
@@ -0,0 +1,574 @@
+"""Roteamento das chamadas ao LLM entre provedores, com circuit breaker.
+
+A lista ordenada de provedores vem de ``SERVICEHUB.LLM_PROVIDERS`` (por
+exemplo Groq → OpenAI → Ollama local). Para cada provedor são mantidas, em
+uma janela deslizante, a latência (p95) e a taxa de erro das chamadas.
+Quando a taxa de erro ou o p95 ultrapassam os limites configurados, o
+circuito do provedor é aberto por ``LLM_ROUTER_OPEN_SECONDS`` e as chamadas
+seguem para o próximo provedor saudável. Após esse período, uma chamada de
+teste decide se o circuito fecha novamente.
+
+Opcionalmente, a chamada pode ser replicada (hedging): se o provedor
+principal não responder em ``LLM_ROUTER_HEDGE_DELAY`` segundos, o próximo
+provedor é acionado em paralelo e vale a primeira resposta bem-sucedida.
+
+Os métodos ``aexecutar`` e ``aexecutar_com_hedge`` são as variantes para
+chamadas assíncronas, com as mesmas métricas e o mesmo circuito.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
+from typing import Any, NamedTuple, Optional, TypeVar
+
+from loguru import logger
+from py_return_success_or_error import (
+    ErrorReturn,
+    ReturnSuccessOrError,
+    SuccessReturn,
+)
+
+from smart_core_assistant_painel.modules.services import SERVICEHUB
+
+from .telemetria import percentil
+
+T = TypeVar("T")
+
+# Quantidade de chamadas consideradas nas métricas de cada provedor
+_JANELA = 50
+# Mínimo de chamadas na janela antes de avaliar a abertura do circuito
+_MINIMO_AMOSTRAS = 5
+
+
+class ProvedorLlm(NamedTuple):
+    """Provedor de LLM configurado para o roteamento.
+
+    Attributes:
+        classe (str): Nome da classe do LLM (ex.: 'ChatGroq').
+        modelo (str): Nome do modelo.
+    """
+
+    classe: str
+    modelo: str
+
+    @property
+    def nome(self) -> str:
+        """Identificação do provedor nos logs e métricas."""
+        return f"{self.classe}:{self.modelo}"
+
+
+@dataclass
+class _EstadoProvedor:
+    """Métricas e estado do circuito de um provedor."""
+
+    latencias: deque[float] = field(
+        default_factory=lambda: deque(maxlen=_JANELA)
+    )
+    sucessos: deque[bool] = field(
+        default_factory=lambda: deque(maxlen=_JANELA)
+    )
+    aberto_ate: float = 0.0
+    teste_ate: float = 0.0
+    chamadas: int = 0
+    falhas: int = 0
+    desvios: int = 0
+
+
+class LlmRouter:
+    """Escolhe o provedor de cada chamada ao LLM e registra as métricas."""
+
+    def __init__(self) -> None:
+        self._estados: dict[str, _EstadoProvedor] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def ordem(self, provedores: list[ProvedorLlm]) -> list[ProvedorLlm]:
+        """Ordena os provedores para a próxima chamada.
+
+        Provedores com circuito fechado vêm primeiro, na ordem configurada;
+        os de circuito aberto só são usados se nenhum outro estiver
+        disponível. Um provedor cujo período de abertura expirou recebe uma
+        única chamada de teste.
+
+        Args:
+            provedores (list[ProvedorLlm]): Provedores na ordem configurada.
+
+        Returns:
+            list[ProvedorLlm]: Provedores na ordem em que serão tentados.
+        """
+        agora = time.monotonic()
+        disponiveis: list[ProvedorLlm] = []
+        abertos: list[ProvedorLlm] = []
+        with self._lock:
+            for provedor in provedores:
+                estado = self._estado(provedor)
+                if estado.aberto_ate <= 0:
+                    disponiveis.append(provedor)
+                elif estado.aberto_ate <= agora and estado.teste_ate <= agora:
+                    estado.teste_ate = (
+                        agora + SERVICEHUB.LLM_ROUTER_OPEN_SECONDS
+                    )
+                    logger.info(
+                        f"Roteador LLM: testando '{provedor.nome}' após "
+                        f"abertura do circuito"
+                    )
+                    disponiveis.append(provedor)
+                else:
+                    abertos.append(provedor)
+        return disponiveis + abertos
+
+    def executar(
+        self,
+        provedores: list[ProvedorLlm],
+        chamada: Callable[[ProvedorLlm], ReturnSuccessOrError[T]],
+        descricao: str = "chamada",
+    ) -> ReturnSuccessOrError[T]:
+        """Executa a chamada no primeiro provedor saudável, com fallback.
+
+        Args:
+            provedores (list[ProvedorLlm]): Provedores na ordem configurada.
+            chamada (Callable[[ProvedorLlm], ReturnSuccessOrError[T]]):
+                Executa o caso de uso com o provedor informado.
+            descricao (str): Identificação da chamada nos logs.
+
+        Returns:
+            ReturnSuccessOrError[T]: O primeiro sucesso ou o último erro.
+        """
+        return self._executar_em_ordem(
+            self.ordem(provedores), chamada, descricao
+        )
+
+    def _executar_em_ordem(
+        self,
+        ordem: list[ProvedorLlm],
+        chamada: Callable[[ProvedorLlm], ReturnSuccessOrError[T]],
+        descricao: str,
+    ) -> ReturnSuccessOrError[T]:
+        """Tenta os provedores na ordem informada até o primeiro sucesso.
+
+        Exceções levantadas pela chamada também acionam o fallback; se o
+        último provedor levantar exceção, ela é propagada.
+        """
+        if not ordem:
+            raise ValueError("Nenhum provedor de LLM configurado")
+        for posicao, provedor in enumerate(ordem):
+            if posicao > 0:
+                logger.warning(
+                    f"Roteador LLM: {descricao} redirecionada para "
+                    f"'{provedor.nome}'"
+                )
+                self._registrar_desvio(provedor)
+            try:
+                resultado = self._medir(provedor, chamada)
+            except Exception as e:
+                if posicao == len(ordem) - 1:
+                    raise
+                logger.error(
+                    f"Roteador LLM: erro em {descricao} com "
+                    f"'{provedor.nome}': {e}"
+                )
+                continue
+            if isinstance(resultado, SuccessReturn):
+                return resultado
+        return resultado
+
+    def executar_stream(
+        self,
+        provedores: list[ProvedorLlm],
+        chamada: Callable[[ProvedorLlm], Iterator[T]],
+        descricao: str = "chamada",
+    ) -> Iterator[T]:
+        """Transmite a resposta do primeiro provedor saudável, com fallback.
+
+        O próximo provedor só é tentado se o stream falhar antes do
+        primeiro trecho; depois dele, a falha é propagada, pois os trechos
+        já entregues não podem ser desfeitos. A latência registrada vai até
+        o fim do stream.
+
+        Args:
+            provedores (list[ProvedorLlm]): Provedores na ordem configurada.
+            chamada (Callable[[ProvedorLlm], Iterator[T]]): Inicia o stream
+                com o provedor informado.
+            descricao (str): Identificação da chamada nos logs.
+
+        Yields:
+            T: Os trechos da resposta.
+        """
+        ordem = self.ordem(provedores)
+        if not ordem:
+            raise ValueError("Nenhum provedor de LLM configurado")
+        for posicao, provedor in enumerate(ordem):
+            if posicao > 0:
+                logger.warning(
+                    f"Roteador LLM: {descricao} redirecionada para "
+                    f"'{provedor.nome}'"
+                )
+                self._registrar_desvio(provedor)
+            inicio = time.perf_counter()
+            try:
+                trechos = iter(chamada(provedor))
+                primeiro = next(trechos)
+            except StopIteration:
+                self._registrar(provedor, time.perf_counter() - inicio, True)
+                return
+            except Exception as e:
+                self._registrar(provedor, time.perf_counter() - inicio, False)
+                if posicao == len(ordem) - 1:
+                    raise
+                logger.error(
+                    f"Roteador LLM: erro em {descricao} com "
+                    f"'{provedor.nome}': {e}"
+                )
+                continue
+
+            try:
+                yield primeiro
+                yield from trechos
+            except Exception:
+                self._registrar(provedor, time.perf_counter() - inicio, False)
+                raise
+            self._registrar(provedor, time.perf_counter() - inicio, True)
+            return
+
+    def executar_com_hedge(
+        self,
+        provedores: list[ProvedorLlm],
+        chamada: Callable[[ProvedorLlm], ReturnSuccessOrError[T]],
+        descricao: str = "chamada",
+    ) -> ReturnSuccessOrError[T]:
+        """Executa a chamada replicando-a no próximo provedor se demorar.
+
+        Se ``SERVICEHUB.LLM_ROUTER_HEDGE_DELAY`` for 0 ou houver um único
+        provedor, equivale a ``executar``. A chamada mais lenta não é
+        interrompida, mas seu resultado é descartado (e registrado nas
+        métricas).
+
+        Args:
+            provedores (list[ProvedorLlm]): Provedores na ordem configurada.
+            chamada (Callable[[ProvedorLlm], ReturnSuccessOrError[T]]):
+                Executa o caso de uso com o provedor informado.
+            descricao (str): Identificação da chamada nos logs.
+
+        Returns:
+            ReturnSuccessOrError[T]: A primeira resposta bem-sucedida ou,
+                se ambas falharem, o fallback para os demais provedores.
+        """
+        atraso = SERVICEHUB.LLM_ROUTER_HEDGE_DELAY
+        ordem = self.ordem(provedores)
+        if atraso <= 0 or len(ordem) < 2:
+            return self._executar_em_ordem(ordem, chamada, descricao)
+
+        principal, reserva = ordem[0], ordem[1]
+        futures: dict[Future[ReturnSuccessOrError[T]], ProvedorLlm] = {
+            self._submeter(principal, chamada): principal
+        }
+        concluidos, _ = wait(futures, timeout=atraso)
+        if not concluidos:
+            logger.info(
+                f"Roteador LLM: {descricao} em '{principal.nome}' excedeu "
+                f"{atraso}s; replicando em '{reserva.nome}'"
+            )
+            self._registrar_desvio(reserva)
+            futures[self._submeter(reserva, chamada)] = reserva
+
+        resultado: Optional[ReturnSuccessOrError[T]] = None
+        excecao: Optional[Exception] = None
+        pendentes = set(futures)
+        while pendentes:
+            concluidos, pendentes = wait(
+                pendentes, return_when=FIRST_COMPLETED
+            )
+            for future in concluidos:
+                try:
+                    resultado = future.result()
+                except Exception as e:
+                    excecao = e
+                    continue
+                if isinstance(resultado, SuccessReturn):
+                    return resultado
+
+        restantes = [p for p in ordem if p not in futures.values()]
+        if restantes:
+            return self._executar_em_ordem(restantes, chamada, descricao)
+        if resultado is None and excecao is not None:
+            raise excecao
+        return resultado
+
+    async def aexecutar(
+        self,
+        provedores: list[ProvedorLlm],
+        chamada: Callable[[ProvedorLlm], Awaitable[ReturnSuccessOrError[T]]],
+        descricao: str = "chamada",
+    ) -> ReturnSuccessOrError[T]:
+        """Variante assíncrona de ``executar``.
+
+        Args:
+            provedores (list[ProvedorLlm]): Provedores na ordem configurada.
+            chamada (Callable[[ProvedorLlm], Awaitable[...]]): Executa o
+                caso de uso com o provedor informado.
+            descricao (str): Identificação da chamada nos logs.
+
+        Returns:
+            ReturnSuccessOrError[T]: O primeiro sucesso ou o último erro.
+        """
+        return await self._aexecutar_em_ordem(
+            self.ordem(provedores), chamada, descricao
+        )
+
+    async def _aexecutar_em_ordem(
+        self,
+        ordem: list[ProvedorLlm],
+        chamada: Callable[[ProvedorLlm], Awaitable[ReturnSuccessOrError[T]]],
+        descricao: str,
+    ) -> ReturnSuccessOrError[T]:
+        """Variante assíncrona de ``_executar_em_ordem``."""
+        if not ordem:
+            raise ValueError("Nenhum provedor de LLM configurado")
+        for posicao, provedor in enumerate(ordem):
+            if posicao > 0:
+                logger.warning(
+                    f"Roteador LLM: {descricao} redirecionada para "
+                    f"'{provedor.nome}'"
+                )
+                self._registrar_desvio(provedor)
+            try:
+                resultado = await self._amedir(provedor, chamada)
+            except Exception as e:
+                if posicao == len(ordem) - 1:
+                    raise
+                logger.error(
+                    f"Roteador LLM: erro em {descricao} com "
+                    f"'{provedor.nome}': {e}"
+                )
+                continue
+            if isinstance(resultado, SuccessReturn):
+                return resultado
+        return resultado
+
+    async def aexecutar_com_hedge(
+        self,
+        provedores: list[ProvedorLlm],
+        chamada: Callable[[ProvedorLlm], Awaitable[ReturnSuccessOrError[T]]],
+        descricao: str = "chamada",
+    ) -> ReturnSuccessOrError[T]:
+        """Variante assíncrona de ``executar_com_hedge``.
+
+        Diferente da variante síncrona, a chamada mais lenta é cancelada
+        assim que a outra responde com sucesso e não entra nas métricas.
+
+        Args:
+            provedores (list[ProvedorLlm]): Provedores na ordem configurada.
+            chamada (Callable[[ProvedorLlm], Awaitable[...]]): Executa o
+                caso de uso com o provedor informado.
+            descricao (str): Identificação da chamada nos logs.
+
+        Returns:
+            ReturnSuccessOrError[T]: A primeira resposta bem-sucedida ou,
+                se ambas falharem, o fallback para os demais provedores.
+        """
+        atraso = SERVICEHUB.LLM_ROUTER_HEDGE_DELAY
+        ordem = self.ordem(provedores)
+        if atraso <= 0 or len(ordem) < 2:
+            return await self._aexecutar_em_ordem(ordem, chamada, descricao)
+
+        principal, reserva = ordem[0], ordem[1]
+        tarefas: dict[
+            asyncio.Task[ReturnSuccessOrError[T]], ProvedorLlm
+        ] = {asyncio.create_task(self._amedir(principal, chamada)): principal}
+        pendentes = set(tarefas)
+        resultado: Optional[ReturnSuccessOrError[T]] = None
+        excecao: Optional[Exception] = None
+        try:
+            concluidas, _ = await asyncio.wait(pendentes, timeout=atraso)
+            if not concluidas:
+                logger.info(
+                    f"Roteador LLM: {descricao} em '{principal.nome}' "
+                    f"excedeu {atraso}s; replicando em '{reserva.nome}'"
+                )
+                self._registrar_desvio(reserva)
+                tarefa = asyncio.create_task(self._amedir(reserva, chamada))
+                tarefas[tarefa] = reserva
+                pendentes.add(tarefa)
+
+            while pendentes:
+                concluidas, pendentes = await asyncio.wait(
+                    pendentes, return_when=asyncio.FIRST_COMPLETED
+                )
+                for tarefa in concluidas:
+                    try:
+                        resultado = tarefa.result()
+                    except Exception as e:
+                        excecao = e
+                        continue
+                    if isinstance(resultado, SuccessReturn):
+                        return resultado
+        finally:
+            for tarefa in pendentes:
+                tarefa.cancel()
+
+        restantes = [p for p in ordem if p not in tarefas.values()]
+        if restantes:
+            return await self._aexecutar_em_ordem(
+                restantes, chamada, descricao
+            )
+        if resultado is None and excecao is not None:
+            raise excecao
+        return resultado
+
+    def metricas(self) -> dict[str, dict[str, Any]]:
+        """Retorna as métricas de cada provedor.
+
+        Returns:
+            dict[str, dict[str, Any]]: Por provedor, p95 (s), taxa de erro
+                na janela, totais de chamadas, falhas e desvios recebidos e
+                se o circuito está aberto.
+        """
+        agora = time.monotonic()
+        with self._lock:
+            return {
+                nome: {
+                    "p95": percentil(list(estado.latencias), 0.95),
+                    "taxa_erro": _taxa_erro(estado),
+                    "chamadas": estado.chamadas,
+                    "falhas": estado.falhas,
+                    "desvios": estado.desvios,
+                    "circuito_aberto": estado.aberto_ate > agora,
+                }
+                for nome, estado in self._estados.items()
+            }
+
+    def clear(self) -> None:
+        """Descarta as métricas e fecha todos os circuitos."""
+        with self._lock:
+            self._estados.clear()
+
+    def _medir(
+        self,
+        provedor: ProvedorLlm,
+        chamada: Callable[[ProvedorLlm], ReturnSuccessOrError[T]],
+    ) -> ReturnSuccessOrError[T]:
+        """Executa a chamada no provedor e registra latência e resultado."""
+        inicio = time.perf_counter()
+        try:
+            resultado = chamada(provedor)
+        except Exception:
+            self._registrar(provedor, time.perf_counter() - inicio, False)
+            raise
+        sucesso = not isinstance(resultado, ErrorReturn)
+        self._registrar(provedor, time.perf_counter() - inicio, sucesso)
+        return resultado
+
+    async def _amedir(
+        self,
+        provedor: ProvedorLlm,
+        chamada: Callable[[ProvedorLlm], Awaitable[ReturnSuccessOrError[T]]],
+    ) -> ReturnSuccessOrError[T]:
+        """Variante assíncrona de ``_medir``; cancelamentos não contam."""
+        inicio = time.perf_counter()
+        try:
+            resultado = await chamada(provedor)
+        except Exception:
+            self._registrar(provedor, time.perf_counter() - inicio, False)
+            raise
+        sucesso = not isinstance(resultado, ErrorReturn)
+        self._registrar(provedor, time.perf_counter() - inicio, sucesso)
+        return resultado
+
+    def _registrar(
+        self, provedor: ProvedorLlm, duracao: float, sucesso: bool
+    ) -> None:
+        """Atualiza as métricas e o estado do circuito do provedor."""
+        with self._lock:
+            estado = self._estado(provedor)
+            estado.chamadas += 1
+            estado.falhas += 0 if sucesso else 1
+            estado.latencias.append(duracao)
+            estado.sucessos.append(sucesso)
+
+            # Chamada a um provedor com circuito aberto serve de teste
+            if estado.aberto_ate > 0:
+                estado.teste_ate = 0.0
+                if sucesso:
+                    estado.aberto_ate = 0.0
+                    estado.sucessos.clear()
+                    estado.latencias.clear()
+                    logger.info(
+                        f"Roteador LLM: circuito de '{provedor.nome}' fechado"
+                    )
+                else:
+                    self._abrir(provedor, estado, "falha na chamada de teste")
+                return
+
+            if len(estado.sucessos) < _MINIMO_AMOSTRAS:
+                return
+            taxa_erro = _taxa_erro(estado)
+            p95 = percentil(list(estado.latencias), 0.95)
+            limite_p95 = SERVICEHUB.LLM_ROUTER_P95_THRESHOLD
+            if taxa_erro >= SERVICEHUB.LLM_ROUTER_ERROR_THRESHOLD:
+                self._abrir(provedor, estado, f"taxa de erro {taxa_erro:.0%}")
+            elif limite_p95 > 0 and p95 > limite_p95:
+                self._abrir(provedor, estado, f"p95 de {p95:.2f}s")
+
+    def _abrir(
+        self, provedor: ProvedorLlm, estado: _EstadoProvedor, motivo: str
+    ) -> None:
+        """Abre o circuito do provedor (chamado com o lock adquirido)."""
+        duracao = SERVICEHUB.LLM_ROUTER_OPEN_SECONDS
+        estado.aberto_ate = time.monotonic() + duracao
+        logger.warning(
+            f"Roteador LLM: circuito de '{provedor.nome}' aberto por "
+            f"{duracao}s ({motivo})"
+        )
+
+    def _registrar_desvio(self, provedor: ProvedorLlm) -> None:
+        """Conta uma chamada desviada para o provedor."""
+        with self._lock:
+            self._estado(provedor).desvios += 1
+
+    def _estado(self, provedor: ProvedorLlm) -> _EstadoProvedor:
+        """Retorna o estado do provedor (chamado com o lock adquirido)."""
+        estado = self._estados.get(provedor.nome)
+        if estado is None:
+            estado = self._estados[provedor.nome] = _EstadoProvedor()
+        return estado
+
+    def _submeter(
+        self,
+        provedor: ProvedorLlm,
+        chamada: Callable[[ProvedorLlm], ReturnSuccessOrError[T]],
+    ) -> Future[ReturnSuccessOrError[T]]:
+        """Executa a chamada no pool, preservando o contexto do chamador."""
+        contexto = contextvars.copy_context()
+        return self._obter_executor().submit(
+            contexto.run, self._medir, provedor, chamada
+        )
+
+    def _obter_executor(self) -> ThreadPoolExecutor:
+        """Cria sob demanda o pool de threads das requisições replicadas."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=8, thread_name_prefix="llm-hedge"
+                )
+            return self._executor
+
+
+def _taxa_erro(estado: _EstadoProvedor) -> float:
+    """Fração de chamadas com erro na janela do provedor."""
+    if not estado.sucessos:
+        return 0.0
+    return estado.sucessos.count(False) / len(estado.sucessos)
+
+
+LLM_ROUTER = LlmRouter()
+SERVICEHUB.add_llm_config_listener(LLM_ROUTER.clear)
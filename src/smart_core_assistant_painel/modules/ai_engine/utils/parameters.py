@@ -5,8 +5,9 @@ necessários para as várias funcionalidades do motor de IA, como processamento
 de mensagens, carregamento de documentos e interação com modelos de linguagem.
 """
 
+from collections.abc import Mapping
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Type
+from typing import Any, Dict, Hashable, Optional, Type
 
 from langchain_core.language_models.chat_models import BaseChatModel
 from py_return_success_or_error import ParametersReturnResult
@@ -17,6 +18,9 @@ from smart_core_assistant_painel.modules.ai_engine.utils.erros import (
     EmbeddingError,
     LlmError,
 )
+from smart_core_assistant_painel.modules.ai_engine.utils.llm_client_registry import (
+    LLM_CLIENT_REGISTRY,
+)
 
 
 @dataclass
@@ -138,26 +142,32 @@ class LlmParameters(ParametersReturnResult):
 
     @property
     def create_llm(self) -> BaseChatModel:
-        """Cria uma instância do LLM com os parâmetros configurados.
+        """Retorna uma instância do LLM com os parâmetros configurados.
+
+        A instância é obtida do registro de clientes do processo, sendo
+        reutilizada (com suas conexões keep-alive) por todas as chamadas
+        que compartilham a mesma classe, modelo e parâmetros extras.
 
         Returns:
             BaseChatModel: Uma instância do modelo de linguagem.
         """
-        params = self.__get_params()
-        return self.__llm_class(**params)
+        return LLM_CLIENT_REGISTRY.get(
+            self.__llm_class, self.__model, self.__extra_params
+        )
+
+    @property
+    def config_key(self) -> Hashable:
+        """Retorna a chave imutável da configuração do LLM.
 
-    def __get_params(self) -> Dict[str, Any]:
-        """Retorna os parâmetros como um dicionário.
+        Identifica a combinação de classe, modelo e parâmetros extras,
+        permitindo indexar caches que dependem da configuração do modelo.
 
         Returns:
-            Dict[str, Any]: Um dicionário contendo os parâmetros do modelo.
+            Hashable: Chave da configuração do LLM.
         """
-        params = {"model": self.__model}
-
-        if self.__extra_params:
-            params.update(self.__extra_params)
-
-        return params
+        return LLM_CLIENT_REGISTRY.make_key(
+            self.__llm_class, self.__model, self.__extra_params
+        )
 
     def __str__(self) -> str:
         """Retorna uma representação em string do objeto."""
@@ -169,7 +179,7 @@ class AnalisePreviaMensagemParameters(ParametersReturnResult):
     """Parâmetros para a análise prévia de uma mensagem.
 
     Attributes:
-        historico_atendimento (dict[str, Any]): O histórico de atendimento
+        historico_atendimento (Mapping[str, Any]): O histórico de atendimento
             associado à mensagem.
         valid_intent_types (str): Os tipos de intenção válidos.
         valid_entity_types (str): Os tipos de entidade válidos.
@@ -177,7 +187,7 @@ class AnalisePreviaMensagemParameters(ParametersReturnResult):
         error (LlmError): O erro a ser levantado em caso de falha.
     """
 
-    historico_atendimento: dict[str, Any]
+    historico_atendimento: Mapping[str, Any]
     valid_intent_types: str
     valid_entity_types: str
     llm_parameters: LlmParameters
@@ -0,0 +1,397 @@
+"""Cache de respostas exatas do LLM por feature.
+
+Mensagens idênticas (saudações, confirmações) com histórico vazio ou
+equivalente produzem a mesma análise. Este módulo guarda a resposta
+estruturada indexada por um hash da mensagem normalizada, da impressão
+digital do histórico recente, da versão do prompt e do modelo, evitando
+uma nova chamada ao LLM.
+
+O armazenamento é feito no Redis (``SERVICEHUB.REDIS_URL``) com TTL e
+limite de entradas por feature. Sem Redis configurado, é usado um cache em
+memória do processo com as mesmas regras. Falhas do backend nunca
+interrompem o fluxo: são tratadas como ausência de cache.
+
+O cache é habilitado por feature via ``SERVICEHUB.LLM_CACHE_FEATURES``.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Optional, Protocol
+
+from loguru import logger
+
+from smart_core_assistant_painel.modules.services import SERVICEHUB
+
+_ESPACOS = re.compile(r"\s+")
+_PONTUACAO_BORDAS = re.compile(r"^[\W_]+|[\W_]+$")
+
+# Intervalo (em consultas) para registrar a taxa de acerto no log
+_INTERVALO_LOG_METRICAS: int = 100
+
+
+def normalizar_mensagem(texto: str) -> str:
+    """Normaliza uma mensagem para comparação exata.
+
+    Aplica NFKC, ``casefold``, colapsa espaços e remove pontuação e emojis
+    das bordas, de forma que "Oi!" e " oi " gerem a mesma chave.
+
+    Args:
+        texto (str): O texto original da mensagem.
+
+    Returns:
+        str: O texto normalizado.
+    """
+    normalizado = unicodedata.normalize("NFKC", texto or "").casefold()
+    normalizado = _ESPACOS.sub(" ", normalizado).strip()
+    return _PONTUACAO_BORDAS.sub("", normalizado)
+
+
+def fingerprint_historico(
+    historico_atendimento: Mapping[str, Any], janela: int
+) -> str:
+    """Gera a impressão digital do histórico recente do atendimento.
+
+    Considera apenas as ``janela`` últimas mensagens normalizadas, de modo
+    que atendimentos com histórico vazio ou com o mesmo final compartilhem
+    a chave.
+
+    Args:
+        historico_atendimento (Mapping[str, Any]): Histórico do atendimento.
+        janela (int): Quantidade de mensagens recentes consideradas.
+
+    Returns:
+        str: Hash SHA-256 (hex) do histórico truncado.
+    """
+    mensagens = list(historico_atendimento.get("conteudo_mensagens") or [])
+    recentes = mensagens[-janela:] if janela > 0 else []
+    conteudo = "\x1f".join(normalizar_mensagem(str(m)) for m in recentes)
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+
+class _CacheBackend(Protocol):
+    """Contrato mínimo dos backends de armazenamento do cache."""
+
+    def get(self, key: str) -> Optional[str]: ...
+
+    def set(
+        self, key: str, value: str, ttl: int, max_entries: int
+    ) -> None: ...
+
+    def size(self) -> int: ...
+
+    def incr_metric(self, name: str) -> None: ...
+
+    def metrics(self) -> dict[str, int]: ...
+
+    def clear(self) -> None: ...
+
+
+class _MemoryBackend:
+    """Backend em memória do processo (LRU com expiração)."""
+
+    def __init__(self) -> None:
+        self._dados: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._metricas: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entrada = self._dados.get(key)
+            if entrada is None:
+                return None
+            expira_em, valor = entrada
+            if expira_em <= time.monotonic():
+                del self._dados[key]
+                return None
+            self._dados.move_to_end(key)
+            return valor
+
+    def set(self, key: str, value: str, ttl: int, max_entries: int) -> None:
+        with self._lock:
+            self._dados[key] = (time.monotonic() + ttl, value)
+            self._dados.move_to_end(key)
+            while len(self._dados) > max(1, max_entries):
+                self._dados.popitem(last=False)
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._dados)
+
+    def incr_metric(self, name: str) -> None:
+        with self._lock:
+            self._metricas[name] = self._metricas.get(name, 0) + 1
+
+    def metrics(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._metricas)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._dados.clear()
+            self._metricas.clear()
+
+
+class _RedisBackend:
+    """Backend Redis com TTL por chave e índice ordenado para o limite.
+
+    Cada feature usa o prefixo ``llm_cache:<feature>``. Um sorted set
+    registra o momento de escrita de cada chave para remover as mais
+    antigas quando o limite de entradas é excedido.
+    """
+
+    def __init__(self, client: Any, namespace: str) -> None:
+        self._client = client
+        self._prefixo = f"llm_cache:{namespace}"
+        self._indice = f"{self._prefixo}:indice"
+        self._metricas = f"{self._prefixo}:metricas"
+
+    def _chave(self, key: str) -> str:
+        return f"{self._prefixo}:v:{key}"
+
+    def get(self, key: str) -> Optional[str]:
+        valor = self._client.get(self._chave(key))
+        if valor is None:
+            return None
+        return valor.decode("utf-8") if isinstance(valor, bytes) else valor
+
+    def set(self, key: str, value: str, ttl: int, max_entries: int) -> None:
+        agora = time.time()
+        pipe = self._client.pipeline()
+        pipe.set(self._chave(key), value, ex=ttl)
+        pipe.zadd(self._indice, {key: agora})
+        pipe.zremrangebyscore(self._indice, "-inf", agora - ttl)
+        pipe.zcard(self._indice)
+        total = int(pipe.execute()[-1])
+
+        excedente = total - max(1, max_entries)
+        if excedente > 0:
+            removidas = self._client.zpopmin(self._indice, excedente)
+            if removidas:
+                self._client.delete(
+                    *(self._chave(self._texto(k)) for k, _ in removidas)
+                )
+
+    def size(self) -> int:
+        return int(self._client.zcard(self._indice))
+
+    def incr_metric(self, name: str) -> None:
+        self._client.hincrby(self._metricas, name, 1)
+
+    def metrics(self) -> dict[str, int]:
+        brutas = self._client.hgetall(self._metricas) or {}
+        return {self._texto(k): int(v) for k, v in brutas.items()}
+
+    def clear(self) -> None:
+        chaves = [
+            self._texto(k) for k in self._client.zrange(self._indice, 0, -1)
+        ]
+        if chaves:
+            self._client.delete(*(self._chave(k) for k in chaves))
+        self._client.delete(self._indice, self._metricas)
+
+    @staticmethod
+    def _texto(valor: Any) -> str:
+        return (
+            valor.decode("utf-8") if isinstance(valor, bytes) else str(valor)
+        )
+
+
+class LlmResponseCache:
+    """Cache de respostas do LLM para uma feature.
+
+    Attributes:
+        feature (str): Nome da feature (ex.: 'analise_previa_mensagem').
+    """
+
+    def __init__(
+        self, feature: str, backend: Optional[_CacheBackend] = None
+    ) -> None:
+        """Inicializa o cache da feature.
+
+        Args:
+            feature (str): Nome da feature.
+            backend (Optional[_CacheBackend]): Backend explícito. Se omitido,
+                é resolvido a partir de ``SERVICEHUB.REDIS_URL``.
+        """
+        self.feature = feature
+        self._backend = backend
+        self._lock = threading.Lock()
+        self._consultas = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Indica se o cache está habilitado para a feature."""
+        return self.feature in SERVICEHUB.LLM_CACHE_FEATURES
+
+    @staticmethod
+    def make_key(*partes: Any) -> str:
+        """Gera a chave do cache a partir das partes informadas.
+
+        Args:
+            *partes (Any): Componentes da chave (mensagem, histórico,
+                versão do prompt, modelo...).
+
+        Returns:
+            str: Hash SHA-256 (hex) das partes serializadas.
+        """
+        serializado = json.dumps(
+            partes, ensure_ascii=False, sort_keys=True, default=str
+        )
+        return hashlib.sha256(serializado.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Busca uma resposta no cache e registra acerto ou falha.
+
+        Args:
+            key (str): Chave gerada por ``make_key``.
+
+        Returns:
+            Optional[Any]: A resposta desserializada ou None se ausente.
+        """
+        try:
+            backend = self._get_backend()
+            valor = backend.get(key)
+            backend.incr_metric("hits" if valor is not None else "misses")
+        except Exception as e:
+            logger.warning(f"Cache LLM '{self.feature}' indisponível: {e}")
+            return None
+
+        self._registrar_consulta()
+        if valor is None:
+            return None
+        logger.debug(f"Cache LLM '{self.feature}': acerto")
+        return json.loads(valor)
+
+    def set(self, key: str, value: Any) -> None:
+        """Armazena uma resposta no cache.
+
+        Args:
+            key (str): Chave gerada por ``make_key``.
+            value (Any): Resposta serializável em JSON.
+        """
+        try:
+            self._get_backend().set(
+                key,
+                json.dumps(value, ensure_ascii=False),
+                ttl=SERVICEHUB.LLM_CACHE_TTL,
+                max_entries=SERVICEHUB.LLM_CACHE_MAX_ENTRIES,
+            )
+        except Exception as e:
+            logger.warning(
+                f"Falha ao gravar no cache LLM '{self.feature}': {e}"
+            )
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """Variante assíncrona de ``get``.
+
+        O backend Redis é consultado em uma thread, para não bloquear o
+        event loop; o backend em memória é consultado diretamente.
+        """
+        if self._em_memoria():
+            return self.get(key)
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any) -> None:
+        """Variante assíncrona de ``set``."""
+        if self._em_memoria():
+            self.set(key, value)
+        else:
+            await asyncio.to_thread(self.set, key, value)
+
+    def stats(self) -> dict[str, Any]:
+        """Retorna as métricas de uso do cache.
+
+        Returns:
+            dict[str, Any]: ``hits``, ``misses``, ``hit_rate`` e ``size``.
+        """
+        try:
+            backend = self._get_backend()
+            metricas = backend.metrics()
+            tamanho = backend.size()
+        except Exception as e:
+            logger.warning(f"Cache LLM '{self.feature}' indisponível: {e}")
+            metricas, tamanho = {}, 0
+
+        hits = metricas.get("hits", 0)
+        misses = metricas.get("misses", 0)
+        total = hits + misses
+        return {
+            "feature": self.feature,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+            "size": tamanho,
+        }
+
+    def clear(self) -> None:
+        """Remove todas as respostas e métricas da feature."""
+        try:
+            self._get_backend().clear()
+        except Exception as e:
+            logger.warning(f"Falha ao limpar cache LLM '{self.feature}': {e}")
+
+    def _registrar_consulta(self) -> None:
+        """Registra periodicamente a taxa de acerto no log."""
+        with self._lock:
+            self._consultas += 1
+            registrar = self._consultas % _INTERVALO_LOG_METRICAS == 0
+        if registrar:
+            stats = self.stats()
+            logger.info(
+                f"Cache LLM '{self.feature}': hit_rate="
+                f"{stats['hit_rate']:.2%} hits={stats['hits']} "
+                f"misses={stats['misses']} size={stats['size']}"
+            )
+
+    def _em_memoria(self) -> bool:
+        """Indica se o backend é o cache em memória do processo."""
+        try:
+            return isinstance(self._get_backend(), _MemoryBackend)
+        except Exception:
+            return False
+
+    def _get_backend(self) -> _CacheBackend:
+        """Resolve o backend na primeira utilização."""
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = self._criar_backend()
+        return self._backend
+
+    def _criar_backend(self) -> _CacheBackend:
+        """Cria o backend Redis ou, sem Redis configurado, o em memória."""
+        redis_url = SERVICEHUB.REDIS_URL
+        if not redis_url:
+            logger.info(
+                f"Cache LLM '{self.feature}': REDIS_URL não definida, "
+                "usando cache em memória"
+            )
+            return _MemoryBackend()
+
+        import redis
+
+        client = redis.Redis.from_url(
+            redis_url, socket_timeout=0.5, socket_connect_timeout=0.5
+        )
+        return _RedisBackend(client, self.feature)
+
+
+@lru_cache(maxsize=None)
+def get_response_cache(feature: str) -> LlmResponseCache:
+    """Retorna a instância compartilhada do cache da feature.
+
+    Args:
+        feature (str): Nome da feature.
+
+    Returns:
+        LlmResponseCache: O cache da feature.
+    """
+    return LlmResponseCache(feature)
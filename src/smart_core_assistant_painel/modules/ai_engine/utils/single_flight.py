@@ -0,0 +1,453 @@
+"""Coalescência de chamadas idênticas em andamento (single-flight).
+
+Quando o mesmo texto chega de vários contatos ao mesmo tempo (por exemplo,
+um "SIM" em resposta a uma mensagem em massa), cada worker faria a mesma
+chamada de embeddings ou de análise no mesmo instante. Com o single-flight,
+a primeira chamada para uma chave executa a requisição e as chamadas
+idênticas seguintes aguardam o resultado dela.
+
+Dentro do processo a coordenação é feita com eventos de ``threading`` e,
+para quem aguarda em um event loop (``aexecutar``), com futures do asyncio;
+chamadas síncronas e assíncronas idênticas compartilham a mesma execução.
+Com ``SINGLE_FLIGHT_REDIS_TTL`` maior que 0 e ``REDIS_URL`` definida, uma
+trava no Redis estende a coalescência entre processos: o processo que a
+obtém executa a chamada e publica o resultado por alguns segundos; os
+demais consultam o resultado publicado. Falhas do Redis nunca
+interrompem o fluxo: a chamada é simplesmente executada.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from typing import Any, Optional, TypeVar, cast
+
+from loguru import logger
+
+from smart_core_assistant_painel.modules.services import SERVICEHUB
+
+T = TypeVar("T")
+
+# Intervalo entre consultas ao resultado publicado por outro processo
+_INTERVALO_ESPERA: float = 0.02
+
+
+def _identidade(valor: Any) -> Any:
+    return valor
+
+
+class _Voo:
+    """Chamada em andamento e seu resultado.
+
+    ``concluido`` fica False se o líder for cancelado: quem aguardava
+    executa a chamada por conta própria.
+    """
+
+    __slots__ = ("evento", "resultado", "erro", "concluido", "aguardando")
+
+    def __init__(self) -> None:
+        self.evento = threading.Event()
+        self.resultado: Any = None
+        self.erro: Optional[Exception] = None
+        self.concluido = False
+        self.aguardando: list[
+            tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]
+        ] = []
+
+
+def _avisar(futuro: "asyncio.Future[None]") -> None:
+    if not futuro.done():
+        futuro.set_result(None)
+
+
+class SingleFlight:
+    """Executa uma única vez as chamadas idênticas simultâneas.
+
+    Attributes:
+        namespace (str): Prefixo das chaves (ex.: 'generate_embeddings').
+    """
+
+    def __init__(self, namespace: str, client: Optional[Any] = None) -> None:
+        """Inicializa o coordenador.
+
+        Args:
+            namespace (str): Prefixo das chaves.
+            client (Optional[Any]): Cliente Redis explícito. Se omitido, é
+                criado a partir de ``SERVICEHUB.REDIS_URL`` quando a
+                coalescência entre processos estiver habilitada.
+        """
+        self.namespace = namespace
+        self._client = client
+        self._voos: dict[str, _Voo] = {}
+        self._lock = threading.Lock()
+        self._metricas = {"execucoes": 0, "coalescidas": 0, "redis": 0}
+
+    def executar(
+        self,
+        chave: str,
+        funcao: Callable[[], T],
+        serializar: Callable[[T], Any] = _identidade,
+        desserializar: Callable[[Any], T] = _identidade,
+    ) -> T:
+        """Executa ``funcao`` ou aguarda a execução idêntica em andamento.
+
+        Exceções da execução são propagadas para todos que a aguardavam.
+
+        Args:
+            chave (str): Identifica chamadas idênticas (hash da requisição).
+            funcao (Callable[[], T]): Executa a chamada.
+            serializar (Callable[[T], Any]): Converte o resultado em um
+                valor serializável em JSON (apenas entre processos).
+            desserializar (Callable[[Any], T]): Operação inversa.
+
+        Returns:
+            T: O resultado da chamada.
+        """
+        timeout = SERVICEHUB.SINGLE_FLIGHT_TIMEOUT
+        if timeout <= 0:
+            return funcao()
+
+        with self._lock:
+            voo = self._voos.get(chave)
+            lider = voo is None
+            if voo is None:
+                voo = self._voos[chave] = _Voo()
+                self._metricas["execucoes"] += 1
+            else:
+                self._metricas["coalescidas"] += 1
+
+        if not lider:
+            if not voo.evento.wait(timeout):
+                self._avisar_espera_excedida(timeout)
+                return funcao()
+            if voo.erro is not None:
+                raise voo.erro
+            if voo.concluido:
+                return cast(T, voo.resultado)
+            return funcao()
+
+        try:
+            voo.resultado = self._executar_entre_processos(
+                chave, funcao, serializar, desserializar, timeout
+            )
+            voo.concluido = True
+            return cast(T, voo.resultado)
+        except Exception as e:
+            voo.erro = e
+            raise
+        finally:
+            self._pousar(chave, voo)
+
+    async def aexecutar(
+        self,
+        chave: str,
+        funcao: Callable[[], Awaitable[T]],
+        serializar: Callable[[T], Any] = _identidade,
+        desserializar: Callable[[Any], T] = _identidade,
+    ) -> T:
+        """Variante assíncrona de ``executar``.
+
+        Aguarda sem bloquear o event loop e coalesce também com as chamadas
+        síncronas idênticas em andamento no processo. As operações no Redis
+        são executadas em uma thread.
+
+        Args:
+            chave (str): Identifica chamadas idênticas (hash da requisição).
+            funcao (Callable[[], Awaitable[T]]): Executa a chamada.
+            serializar (Callable[[T], Any]): Converte o resultado em um
+                valor serializável em JSON (apenas entre processos).
+            desserializar (Callable[[Any], T]): Operação inversa.
+
+        Returns:
+            T: O resultado da chamada.
+        """
+        timeout = SERVICEHUB.SINGLE_FLIGHT_TIMEOUT
+        if timeout <= 0:
+            return await funcao()
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            voo = self._voos.get(chave)
+            lider = voo is None
+            if voo is None:
+                voo = self._voos[chave] = _Voo()
+                self._metricas["execucoes"] += 1
+            else:
+                self._metricas["coalescidas"] += 1
+                aviso: asyncio.Future[None] = loop.create_future()
+                voo.aguardando.append((loop, aviso))
+
+        if not lider:
+            try:
+                await asyncio.wait_for(aviso, timeout)
+            except TimeoutError:
+                self._avisar_espera_excedida(timeout)
+                return await funcao()
+            if voo.erro is not None:
+                raise voo.erro
+            if voo.concluido:
+                return cast(T, voo.resultado)
+            return await funcao()
+
+        try:
+            voo.resultado = await self._aexecutar_entre_processos(
+                chave, funcao, serializar, desserializar, timeout
+            )
+            voo.concluido = True
+            return cast(T, voo.resultado)
+        except Exception as e:
+            voo.erro = e
+            raise
+        finally:
+            self._pousar(chave, voo)
+
+    def stats(self) -> dict[str, Any]:
+        """Retorna as métricas de coalescência.
+
+        Returns:
+            dict[str, Any]: ``execucoes`` (chamadas de fato executadas neste
+                processo), ``coalescidas`` (aguardaram outra no processo),
+                ``redis`` (reaproveitaram o resultado de outro processo) e
+                ``em_andamento``.
+        """
+        with self._lock:
+            return {
+                "namespace": self.namespace,
+                **self._metricas,
+                "em_andamento": len(self._voos),
+            }
+
+    def _executar_entre_processos(
+        self,
+        chave: str,
+        funcao: Callable[[], T],
+        serializar: Callable[[T], Any],
+        desserializar: Callable[[Any], T],
+        timeout: float,
+    ) -> T:
+        """Coordena a execução com os demais processos pelo Redis."""
+        ttl = SERVICEHUB.SINGLE_FLIGHT_REDIS_TTL
+        client = self._obter_client() if ttl > 0 else None
+        if client is None:
+            return funcao()
+
+        trava, publicado = self._chaves_redis(chave)
+        try:
+            valor, adquirida = self._reservar(
+                client, trava, publicado, timeout
+            )
+        except Exception as e:
+            logger.warning(f"Single-flight '{self.namespace}': Redis: {e}")
+            return funcao()
+
+        if valor is not None:
+            return self._reaproveitar(valor, desserializar)
+
+        if adquirida:
+            try:
+                resultado = funcao()
+            except Exception:
+                self._liberar(client, trava)
+                raise
+            self._publicar(
+                client, trava, publicado, resultado, serializar, ttl
+            )
+            return resultado
+
+        # Outro processo está executando: aguarda o resultado publicado
+        limite = time.monotonic() + timeout
+        while time.monotonic() < limite:
+            try:
+                valor, liberada = self._consultar(client, trava, publicado)
+            except Exception as e:
+                logger.warning(
+                    f"Single-flight '{self.namespace}': Redis: {e}"
+                )
+                break
+            if valor is not None:
+                return self._reaproveitar(valor, desserializar)
+            if liberada:
+                break
+            time.sleep(_INTERVALO_ESPERA)
+        return funcao()
+
+    async def _aexecutar_entre_processos(
+        self,
+        chave: str,
+        funcao: Callable[[], Awaitable[T]],
+        serializar: Callable[[T], Any],
+        desserializar: Callable[[Any], T],
+        timeout: float,
+    ) -> T:
+        """Variante assíncrona de ``_executar_entre_processos``."""
+        ttl = SERVICEHUB.SINGLE_FLIGHT_REDIS_TTL
+        client = self._obter_client() if ttl > 0 else None
+        if client is None:
+            return await funcao()
+
+        trava, publicado = self._chaves_redis(chave)
+        try:
+            valor, adquirida = await asyncio.to_thread(
+                self._reservar, client, trava, publicado, timeout
+            )
+        except Exception as e:
+            logger.warning(f"Single-flight '{self.namespace}': Redis: {e}")
+            return await funcao()
+
+        if valor is not None:
+            return self._reaproveitar(valor, desserializar)
+
+        if adquirida:
+            try:
+                resultado = await funcao()
+            except BaseException:
+                await asyncio.to_thread(self._liberar, client, trava)
+                raise
+            await asyncio.to_thread(
+                self._publicar,
+                client,
+                trava,
+                publicado,
+                resultado,
+                serializar,
+                ttl,
+            )
+            return resultado
+
+        limite = time.monotonic() + timeout
+        while time.monotonic() < limite:
+            try:
+                valor, liberada = await asyncio.to_thread(
+                    self._consultar, client, trava, publicado
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Single-flight '{self.namespace}': Redis: {e}"
+                )
+                break
+            if valor is not None:
+                return self._reaproveitar(valor, desserializar)
+            if liberada:
+                break
+            await asyncio.sleep(_INTERVALO_ESPERA)
+        return await funcao()
+
+    def _chaves_redis(self, chave: str) -> tuple[str, str]:
+        """Retorna as chaves da trava e do resultado publicado."""
+        return (
+            f"single_flight:{self.namespace}:trava:{chave}",
+            f"single_flight:{self.namespace}:resultado:{chave}",
+        )
+
+    @staticmethod
+    def _reservar(
+        client: Any, trava: str, publicado: str, timeout: float
+    ) -> tuple[Optional[Any], bool]:
+        """Busca o resultado publicado ou tenta obter a trava."""
+        valor = client.get(publicado)
+        if valor is not None:
+            return valor, False
+        return None, bool(
+            client.set(trava, "1", nx=True, px=int(timeout * 1000))
+        )
+
+    @staticmethod
+    def _consultar(
+        client: Any, trava: str, publicado: str
+    ) -> tuple[Optional[Any], bool]:
+        """Busca o resultado publicado e indica se a trava foi liberada."""
+        valor = client.get(publicado)
+        if valor is None and not client.exists(trava):
+            # Trava liberada: confere uma última vez o resultado
+            return client.get(publicado), True
+        return valor, False
+
+    def _publicar(
+        self,
+        client: Any,
+        trava: str,
+        publicado: str,
+        resultado: T,
+        serializar: Callable[[T], Any],
+        ttl: float,
+    ) -> None:
+        """Publica o resultado para os demais processos e libera a trava."""
+        try:
+            pipe = client.pipeline()
+            pipe.set(
+                publicado,
+                json.dumps(serializar(resultado)),
+                px=int(ttl * 1000),
+            )
+            pipe.delete(trava)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(
+                f"Single-flight '{self.namespace}': falha ao publicar "
+                f"resultado: {e}"
+            )
+
+    def _pousar(self, chave: str, voo: _Voo) -> None:
+        """Encerra o voo e acorda quem o aguardava (threads e loops)."""
+        with self._lock:
+            self._voos.pop(chave, None)
+            aguardando, voo.aguardando = voo.aguardando, []
+        voo.evento.set()
+        for loop, aviso in aguardando:
+            try:
+                loop.call_soon_threadsafe(_avisar, aviso)
+            except RuntimeError:
+                # Event loop já encerrado
+                pass
+
+    def _avisar_espera_excedida(self, timeout: float) -> None:
+        logger.warning(
+            f"Single-flight '{self.namespace}': espera excedeu "
+            f"{timeout}s; executando a chamada"
+        )
+
+    def _reaproveitar(
+        self, valor: Any, desserializar: Callable[[Any], T]
+    ) -> T:
+        """Desserializa o resultado publicado por outro processo."""
+        with self._lock:
+            self._metricas["redis"] += 1
+        if isinstance(valor, bytes):
+            valor = valor.decode("utf-8")
+        return desserializar(json.loads(valor))
+
+    def _liberar(self, client: Any, trava: str) -> None:
+        """Remove a trava após uma falha, liberando os demais processos."""
+        try:
+            client.delete(trava)
+        except Exception as e:
+            logger.warning(f"Single-flight '{self.namespace}': Redis: {e}")
+
+    def _obter_client(self) -> Optional[Any]:
+        """Cria o cliente Redis na primeira utilização."""
+        if self._client is None and SERVICEHUB.REDIS_URL:
+            with self._lock:
+                if self._client is None:
+                    import redis
+
+                    self._client = redis.Redis.from_url(
+                        SERVICEHUB.REDIS_URL,
+                        socket_timeout=0.5,
+                        socket_connect_timeout=0.5,
+                    )
+        return self._client
+
+
+@lru_cache(maxsize=None)
+def get_single_flight(namespace: str) -> SingleFlight:
+    """Retorna o coordenador compartilhado do namespace.
+
+    Args:
+        namespace (str): Prefixo das chaves.
+
+    Returns:
+        SingleFlight: O coordenador do namespace.
+    """
+    return SingleFlight(namespace)
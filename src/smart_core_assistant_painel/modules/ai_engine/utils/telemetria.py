@@ -0,0 +1,504 @@
+"""Telemetria das chamadas ao LLM e aos embeddings.
+
+Cada chamada registra a funcionalidade, o modelo, os tokens do prompt e da
+resposta, o tempo até o primeiro token (quando há streaming), a latência
+total e o resultado. Os registros são acumulados em memória e gravados em
+lote por uma thread em segundo plano, no destino configurado pela aplicação
+(tabela de métricas) ou, na falta dele, em ``LLM_TELEMETRY_FILE`` (JSONL).
+
+As chamadas ao LLM são medidas por um callback do LangChain ativado com
+``TELEMETRIA.funcionalidade(nome)``: enquanto o bloco estiver ativo, toda
+chain executada no contexto (inclusive em ``batch`` e ``stream``) é medida.
+"""
+
+import atexit
+import json
+import math
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Any, NamedTuple, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.tracers.context import register_configure_hook
+from loguru import logger
+
+from smart_core_assistant_painel.modules.services import SERVICEHUB
+
+TIPO_LLM = "llm"
+TIPO_EMBEDDING = "embedding"
+
+
+class RegistroTelemetria(NamedTuple):
+    """Medição de uma chamada ao LLM ou aos embeddings.
+
+    Attributes:
+        funcionalidade (str): Funcionalidade que fez a chamada.
+        tipo (str): ``TIPO_LLM`` ou ``TIPO_EMBEDDING``.
+        modelo (str): Nome do modelo.
+        data (datetime): Início da chamada (UTC).
+        latencia (float): Duração total em segundos.
+        sucesso (bool): Se a chamada terminou sem erro.
+        tokens_prompt (Optional[int]): Tokens de entrada, se informados.
+        tokens_resposta (Optional[int]): Tokens de saída, se informados.
+        tempo_primeiro_token (Optional[float]): Segundos até o primeiro
+            token, apenas em chamadas com streaming.
+        erro (str): Descrição do erro, se houver.
+    """
+
+    funcionalidade: str
+    tipo: str
+    modelo: str
+    data: datetime
+    latencia: float
+    sucesso: bool
+    tokens_prompt: Optional[int] = None
+    tokens_resposta: Optional[int] = None
+    tempo_primeiro_token: Optional[float] = None
+    erro: str = ""
+
+
+class ResumoTelemetria(NamedTuple):
+    """Agregado das chamadas de uma funcionalidade em um dia.
+
+    Attributes:
+        dia (date): Dia das chamadas (UTC).
+        funcionalidade (str): Funcionalidade.
+        chamadas (int): Total de chamadas.
+        falhas (int): Chamadas com erro.
+        latencia_p50 (float): Mediana da latência em segundos.
+        latencia_p95 (float): p95 da latência em segundos.
+        primeiro_token_p50 (Optional[float]): Mediana do tempo até o
+            primeiro token, se houve chamadas com streaming.
+        tokens_prompt (int): Soma dos tokens de entrada.
+        tokens_resposta (int): Soma dos tokens de saída.
+    """
+
+    dia: date
+    funcionalidade: str
+    chamadas: int
+    falhas: int
+    latencia_p50: float
+    latencia_p95: float
+    primeiro_token_p50: Optional[float]
+    tokens_prompt: int
+    tokens_resposta: int
+
+
+Destino = Callable[[list[RegistroTelemetria]], None]
+
+# Callback da funcionalidade em execução no contexto atual
+_CALLBACK_ATUAL: ContextVar[Optional["TelemetriaCallback"]] = ContextVar(
+    "telemetria_llm_callback", default=None
+)
+register_configure_hook(_CALLBACK_ATUAL, inheritable=True)
+
+
+@dataclass
+class _Execucao:
+    """Chamada ao modelo em andamento."""
+
+    data: datetime
+    inicio: float
+    modelo: str
+    primeiro_token: Optional[float] = None
+
+
+class TelemetriaCallback(BaseCallbackHandler):
+    """Callback do LangChain que mede as chamadas ao modelo.
+
+    Mede apenas as execuções do modelo (não as das chains que o envolvem),
+    identificadas pelo ``run_id``, o que permite uso concorrente em
+    ``batch``.
+    """
+
+    run_inline = True
+
+    def __init__(
+        self,
+        funcionalidade: str,
+        registrar: Callable[[RegistroTelemetria], None],
+    ) -> None:
+        """Inicializa o callback.
+
+        Args:
+            funcionalidade (str): Funcionalidade atribuída às chamadas.
+            registrar (Callable[[RegistroTelemetria], None]): Recebe o
+                registro de cada chamada concluída.
+        """
+        self.funcionalidade = funcionalidade
+        self._registrar = registrar
+        self._execucoes: dict[UUID, _Execucao] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list[list[Any]],
+        *,
+        run_id: UUID,
+        metadata: Optional[dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Registra o início de uma chamada a um modelo de chat."""
+        self._iniciar(run_id, serialized, metadata)
+
+    def on_llm_start(
+        self,
+        serialized: dict[str, Any],
+        prompts: list[str],
+        *,
+        run_id: UUID,
+        metadata: Optional[dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Registra o início de uma chamada a um modelo de texto."""
+        self._iniciar(run_id, serialized, metadata)
+
+    def on_llm_new_token(
+        self, token: str, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        """Registra o tempo até o primeiro token do streaming."""
+        with self._lock:
+            execucao = self._execucoes.get(run_id)
+            if execucao is not None and execucao.primeiro_token is None:
+                execucao.primeiro_token = time.perf_counter() - execucao.inicio
+
+    def on_llm_end(
+        self, response: LLMResult, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        """Registra o fim bem-sucedido da chamada e os tokens usados."""
+        tokens_prompt, tokens_resposta = _contar_tokens(response)
+        self._finalizar(
+            run_id,
+            sucesso=True,
+            tokens_prompt=tokens_prompt,
+            tokens_resposta=tokens_resposta,
+        )
+
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        """Registra a falha da chamada."""
+        self._finalizar(run_id, sucesso=False, erro=str(error)[:255])
+
+    def _iniciar(
+        self,
+        run_id: UUID,
+        serialized: Optional[dict[str, Any]],
+        metadata: Optional[dict[str, Any]],
+    ) -> None:
+        """Guarda o início da execução do modelo."""
+        with self._lock:
+            self._execucoes[run_id] = _Execucao(
+                data=datetime.now(timezone.utc),
+                inicio=time.perf_counter(),
+                modelo=_nome_modelo(serialized, metadata),
+            )
+
+    def _finalizar(self, run_id: UUID, sucesso: bool, **campos: Any) -> None:
+        """Monta o registro da execução concluída."""
+        with self._lock:
+            execucao = self._execucoes.pop(run_id, None)
+        if execucao is None:
+            return
+        self._registrar(
+            RegistroTelemetria(
+                funcionalidade=self.funcionalidade,
+                tipo=TIPO_LLM,
+                modelo=execucao.modelo,
+                data=execucao.data,
+                latencia=time.perf_counter() - execucao.inicio,
+                sucesso=sucesso,
+                tempo_primeiro_token=execucao.primeiro_token,
+                **campos,
+            )
+        )
+
+
+class TelemetriaLlm:
+    """Coleta os registros de telemetria e os grava em lote.
+
+    Com ``LLM_TELEMETRY_BATCH_SIZE`` igual a 0, nada é medido.
+    """
+
+    def __init__(self) -> None:
+        self._buffer: list[RegistroTelemetria] = []
+        self._lock = threading.Lock()
+        self._destino: Optional[Destino] = None
+        self._sinal = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def habilitada(self) -> bool:
+        """Indica se a telemetria está habilitada."""
+        return SERVICEHUB.LLM_TELEMETRY_BATCH_SIZE > 0
+
+    @contextmanager
+    def funcionalidade(self, nome: str) -> Iterator[None]:
+        """Mede as chamadas ao LLM feitas dentro do bloco.
+
+        Args:
+            nome (str): Funcionalidade atribuída às chamadas.
+        """
+        if not self.habilitada():
+            yield
+            return
+        token = _CALLBACK_ATUAL.set(TelemetriaCallback(nome, self.registrar))
+        try:
+            yield
+        finally:
+            try:
+                _CALLBACK_ATUAL.reset(token)
+            except ValueError:
+                # Geradores (streaming) podem ser retomados em outro contexto
+                _CALLBACK_ATUAL.set(None)
+
+    def registrar_chamada(
+        self,
+        funcionalidade: str,
+        tipo: str,
+        modelo: str,
+        inicio: float,
+        sucesso: bool,
+        erro: str = "",
+    ) -> None:
+        """Registra uma chamada medida fora do LangChain (ex.: embeddings).
+
+        Args:
+            funcionalidade (str): Funcionalidade que fez a chamada.
+            tipo (str): ``TIPO_LLM`` ou ``TIPO_EMBEDDING``.
+            modelo (str): Nome do modelo.
+            inicio (float): Valor de ``time.perf_counter()`` no início.
+            sucesso (bool): Se a chamada terminou sem erro.
+            erro (str): Descrição do erro, se houver.
+        """
+        if not self.habilitada():
+            return
+        latencia = time.perf_counter() - inicio
+        self.registrar(
+            RegistroTelemetria(
+                funcionalidade=funcionalidade,
+                tipo=tipo,
+                modelo=modelo,
+                data=datetime.fromtimestamp(
+                    time.time() - latencia, timezone.utc
+                ),
+                latencia=latencia,
+                sucesso=sucesso,
+                erro=erro[:255],
+            )
+        )
+
+    def registrar(self, registro: RegistroTelemetria) -> None:
+        """Acumula um registro, acionando a gravação quando o lote enche.
+
+        Args:
+            registro (RegistroTelemetria): O registro da chamada.
+        """
+        tamanho_lote = SERVICEHUB.LLM_TELEMETRY_BATCH_SIZE
+        if tamanho_lote <= 0:
+            return
+        with self._lock:
+            self._buffer.append(registro)
+            cheio = len(self._buffer) >= tamanho_lote
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._gravar_periodicamente,
+                    name="telemetria-llm",
+                    daemon=True,
+                )
+                self._thread.start()
+        if cheio:
+            self._sinal.set()
+
+    def configurar_destino(self, destino: Optional[Destino]) -> None:
+        """Define onde os lotes são gravados.
+
+        Args:
+            destino (Optional[Destino]): Recebe cada lote de registros. Com
+                None, usa ``LLM_TELEMETRY_FILE``, se configurado.
+        """
+        self._destino = destino
+
+    def descarregar(self) -> int:
+        """Grava imediatamente os registros acumulados.
+
+        Falhas na gravação são registradas no log e o lote é descartado,
+        para que a telemetria nunca acumule memória nem afete as chamadas.
+
+        Returns:
+            int: Quantidade de registros gravados.
+        """
+        with self._lock:
+            lote, self._buffer = self._buffer, []
+        if not lote:
+            return 0
+        destino = self._destino
+        if destino is None and SERVICEHUB.LLM_TELEMETRY_FILE:
+            destino = destino_arquivo(SERVICEHUB.LLM_TELEMETRY_FILE)
+        if destino is None:
+            return 0
+        try:
+            destino(lote)
+        except Exception as e:
+            logger.warning(
+                f"Falha ao gravar {len(lote)} registros de telemetria: {e}"
+            )
+            return 0
+        return len(lote)
+
+    def pendentes(self) -> int:
+        """Retorna a quantidade de registros ainda não gravados."""
+        with self._lock:
+            return len(self._buffer)
+
+    def _gravar_periodicamente(self) -> None:
+        """Grava o buffer a cada intervalo ou quando o lote enche."""
+        while True:
+            self._sinal.wait(SERVICEHUB.LLM_TELEMETRY_FLUSH_SECONDS)
+            self._sinal.clear()
+            self.descarregar()
+
+
+def destino_arquivo(caminho: str) -> Destino:
+    """Cria um destino que acrescenta os registros a um arquivo JSONL.
+
+    Args:
+        caminho (str): Caminho do arquivo.
+
+    Returns:
+        Destino: Função que grava um lote no arquivo.
+    """
+
+    def gravar(lote: list[RegistroTelemetria]) -> None:
+        with open(caminho, "a", encoding="utf-8") as arquivo:
+            for registro in lote:
+                dados = registro._asdict()
+                dados["data"] = registro.data.isoformat()
+                arquivo.write(json.dumps(dados, ensure_ascii=False) + "\n")
+
+    return gravar
+
+
+def ler_arquivo(caminho: str) -> Iterator[RegistroTelemetria]:
+    """Lê os registros gravados por ``destino_arquivo``.
+
+    Args:
+        caminho (str): Caminho do arquivo JSONL.
+
+    Yields:
+        RegistroTelemetria: Cada registro do arquivo.
+    """
+    with open(caminho, encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            if linha.strip():
+                dados = json.loads(linha)
+                dados["data"] = datetime.fromisoformat(dados["data"])
+                yield RegistroTelemetria(**dados)
+
+
+def resumir(
+    registros: Iterable[RegistroTelemetria],
+) -> list[ResumoTelemetria]:
+    """Agrega os registros por dia e funcionalidade.
+
+    Args:
+        registros (Iterable[RegistroTelemetria]): Os registros.
+
+    Returns:
+        list[ResumoTelemetria]: Um resumo por dia e funcionalidade,
+            ordenados por dia e funcionalidade.
+    """
+    grupos: dict[tuple[date, str], list[RegistroTelemetria]] = defaultdict(
+        list
+    )
+    for registro in registros:
+        dia = registro.data.astimezone(timezone.utc).date()
+        grupos[(dia, registro.funcionalidade)].append(registro)
+
+    resumos: list[ResumoTelemetria] = []
+    for (dia, funcionalidade), grupo in sorted(grupos.items()):
+        latencias = [r.latencia for r in grupo]
+        primeiros_tokens = [
+            r.tempo_primeiro_token
+            for r in grupo
+            if r.tempo_primeiro_token is not None
+        ]
+        resumos.append(
+            ResumoTelemetria(
+                dia=dia,
+                funcionalidade=funcionalidade,
+                chamadas=len(grupo),
+                falhas=sum(1 for r in grupo if not r.sucesso),
+                latencia_p50=percentil(latencias, 0.5),
+                latencia_p95=percentil(latencias, 0.95),
+                primeiro_token_p50=(
+                    percentil(primeiros_tokens, 0.5)
+                    if primeiros_tokens
+                    else None
+                ),
+                tokens_prompt=sum(r.tokens_prompt or 0 for r in grupo),
+                tokens_resposta=sum(r.tokens_resposta or 0 for r in grupo),
+            )
+        )
+    return resumos
+
+
+def percentil(valores: list[float], fracao: float) -> float:
+    """Retorna o percentil pelo método do posto mais próximo.
+
+    Args:
+        valores (list[float]): Os valores (em qualquer ordem).
+        fracao (float): O percentil desejado entre 0 e 1 (ex.: 0.95).
+
+    Returns:
+        float: O percentil, ou 0.0 se não houver valores.
+    """
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    posicao = max(0, math.ceil(fracao * len(ordenados)) - 1)
+    return ordenados[posicao]
+
+
+def _contar_tokens(
+    response: LLMResult,
+) -> tuple[Optional[int], Optional[int]]:
+    """Extrai os tokens de entrada e saída informados pelo provedor."""
+    tokens_prompt: Optional[int] = None
+    tokens_resposta: Optional[int] = None
+    for geracoes in response.generations:
+        for geracao in geracoes:
+            mensagem = getattr(geracao, "message", None)
+            uso = getattr(mensagem, "usage_metadata", None)
+            if uso:
+                tokens_prompt = (tokens_prompt or 0) + uso["input_tokens"]
+                tokens_resposta = (tokens_resposta or 0) + uso["output_tokens"]
+    if tokens_prompt is None and response.llm_output:
+        uso = response.llm_output.get("token_usage") or {}
+        tokens_prompt = uso.get("prompt_tokens")
+        tokens_resposta = uso.get("completion_tokens")
+    return tokens_prompt, tokens_resposta
+
+
+def _nome_modelo(
+    serialized: Optional[dict[str, Any]],
+    metadata: Optional[dict[str, Any]],
+) -> str:
+    """Obtém o nome do modelo dos metadados do LangChain."""
+    modelo = (metadata or {}).get("ls_model_name")
+    if not modelo and serialized:
+        argumentos = serialized.get("kwargs") or {}
+        modelo = argumentos.get("model") or argumentos.get("model_name")
+    return str(modelo or "")
+
+
+TELEMETRIA = TelemetriaLlm()
+atexit.register(TELEMETRIA.descarregar)
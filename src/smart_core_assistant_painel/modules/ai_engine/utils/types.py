@@ -6,7 +6,7 @@ para casos de uso e fontes de dados, bem como tuplas nomeadas para estruturas
 de dados específicas.
 """
 
-from typing import Any, NamedTuple, TypeAlias
+from typing import Any, NamedTuple, Protocol, TypeAlias, TypeVar
 
 from langchain.docstore.document import Document
 from py_return_success_or_error import (
@@ -32,12 +32,25 @@ from smart_core_assistant_painel.modules.ai_engine.utils.parameters import (
     SearchSimilarEmbeddingsParameters,
 )
 
+_R = TypeVar("_R", covariant=True)
+_P = TypeVar("_P", contravariant=True)
+
+
+class DatasourceAsync(Protocol[_R, _P]):
+    """Datasource que também oferece a variante assíncrona da chamada."""
+
+    async def executar_async(self, parameters: _P) -> _R:
+        """Executa a chamada sem bloquear o event loop."""
+        ...
+
+
 ACUsecase: TypeAlias = UsecaseBaseCallData[
     str,
     str,
     LlmParameters,
 ]
 ACData: TypeAlias = Datasource[str, LlmParameters]
+ACAsyncData: TypeAlias = DatasourceAsync[str, LlmParameters]
 
 
 class APMTuple(NamedTuple):
@@ -62,6 +75,9 @@ APMUsecase: TypeAlias = UsecaseBaseCallData[
 APMData: TypeAlias = Datasource[
     AnalisePreviaMensagem, AnalisePreviaMensagemParameters
 ]
+APMAsyncData: TypeAlias = DatasourceAsync[
+    AnalisePreviaMensagem, AnalisePreviaMensagemParameters
+]
 
 LDFUsecase: TypeAlias = UsecaseBaseCallData[
     list[Document],
@@ -87,6 +103,9 @@ GEUsecase: TypeAlias = UsecaseBaseCallData[
     GenerateEmbeddingsParameters,
 ]
 GEData: TypeAlias = Datasource[list[float], GenerateEmbeddingsParameters]
+GEAsyncData: TypeAlias = DatasourceAsync[
+    list[float], GenerateEmbeddingsParameters
+]
 
 # Aliases para Search Similar Embeddings
 SSEUsecase: TypeAlias = UsecaseBase[
@@ -10,7 +10,7 @@ Classes:
 
 import os
 from pathlib import Path
-from typing import Optional, Type
+from typing import Callable, Optional, Type
 
 from langchain_core.language_models.chat_models import BaseChatModel
 
@@ -68,6 +68,7 @@ class ServiceHub:
             self._chunk_size: Optional[int] = None
             self._embeddings_model: Optional[str] = None
             self._embeddings_class: Optional[str] = None
+            self._embeddings_target: Optional[tuple[str, str]] = None
             # Whatsapp
             self._whatsapp_api_base_url: Optional[str] = None
             self._whatsapp_api_send_text_url: Optional[str] = None
@@ -77,6 +78,66 @@ class ServiceHub:
             self._valid_entity_types: Optional[str] = None
             self._valid_intent_types: Optional[str] = None
             self._time_cache: Optional[int] = None
+            # Cache de respostas do LLM
+            self._redis_url: Optional[str] = None
+            self._llm_cache_features: Optional[frozenset[str]] = None
+            self._llm_cache_ttl: Optional[int] = None
+            self._llm_cache_max_entries: Optional[int] = None
+            self._llm_cache_history_window: Optional[int] = None
+            self._semantic_cache_max_distance: Optional[float] = None
+            self._semantic_cache_max_chars: Optional[int] = None
+            self._semantic_cache_sample_rate: Optional[float] = None
+            self._rule_fast_path_min_confidence: Optional[float] = None
+            self._async_provider_concurrency: Optional[dict[str, int]] = None
+            self._async_default_concurrency: Optional[int] = None
+            self._async_call_timeout: Optional[float] = None
+            self._async_worker_concurrency: Optional[int] = None
+            self._llm_batch_max_concurrency: Optional[int] = None
+            # Roteamento entre provedores de LLM
+            self._llm_providers: Optional[list[tuple[str, str]]] = None
+            self._llm_router_error_threshold: Optional[float] = None
+            self._llm_router_p95_threshold: Optional[float] = None
+            self._llm_router_open_seconds: Optional[float] = None
+            self._llm_router_hedge_delay: Optional[float] = None
+            # Telemetria das chamadas ao LLM e aos embeddings
+            self._llm_telemetry_batch_size: Optional[int] = None
+            self._llm_telemetry_flush_seconds: Optional[float] = None
+            self._llm_telemetry_file: Optional[str] = None
+            # Coalescência de chamadas idênticas em andamento
+            self._single_flight_timeout: Optional[float] = None
+            self._single_flight_redis_ttl: Optional[float] = None
+            # Provedores simulados (FakeChat e HashEmbeddings)
+            self._fake_llm_latency_ms: Optional[float] = None
+            self._fake_embeddings_latency_ms: Optional[float] = None
+            self._fake_latency_jitter: Optional[float] = None
+            self._fake_latency_distribution: Optional[str] = None
+            # Embeddings em lote
+            self._embeddings_batch_size: Optional[int] = None
+            # Cache persistente de embeddings
+            self._embeddings_cache_features: Optional[frozenset[str]] = None
+            # Cache dos embeddings de consulta
+            self._embeddings_query_cache_max_entries: Optional[int] = None
+            self._embeddings_query_cache_ttl: Optional[float] = None
+            self._embeddings_query_cache_redis_ttl: Optional[float] = None
+            # Serviço local de embeddings
+            self._embeddings_local_socket: Optional[str] = None
+            self._embeddings_local_backend: Optional[str] = None
+            self._embeddings_local_max_batch: Optional[int] = None
+            self._embeddings_local_max_wait_ms: Optional[float] = None
+            # Busca vetorial com índice quantizado
+            self._vector_search_quantization: Optional[str] = None
+            self._vector_search_rerank_candidates: Optional[int] = None
+            # Pré-classificação de intenções por centroides
+            self._intent_classifier_min_similarity: Optional[float] = None
+            self._intent_classifier_min_margin: Optional[float] = None
+            self._intent_classifier_max_chars: Optional[int] = None
+            self._intent_classifier_examples: Optional[int] = None
+            # Observadores de mudança na configuração do LLM
+            self._llm_config_listeners: list[Callable[[], None]] = []
+            self._llm_config_signature: tuple[Optional[str], ...] = ()
+            # Observadores de mudança na configuração de embeddings
+            self._embeddings_config_listeners: list[Callable[[], None]] = []
+            self._embeddings_config_signature: tuple[Optional[str], ...] = ()
 
             self._load_config()
             self._initialized = True
@@ -90,6 +151,10 @@ class ServiceHub:
         self._llm_temperature = int(os.environ.get("LLM_TEMPERATURE", "0"))
         self._model = os.environ.get("MODEL", "llama3.1")
         self._whatsapp_api_base_url = os.environ.get("WHATSAPP_API_BASE_URL")
+        self._llm_config_signature = self._get_llm_config_signature()
+        self._embeddings_config_signature = (
+            self._get_embeddings_config_signature()
+        )
 
     def reload_config(self) -> None:
         """Recarrega as configurações a partir de variáveis de ambiente.
@@ -108,6 +173,66 @@ class ServiceHub:
 
         # Limpa o cache da classe LLM para forçar recarregamento
         self._llm_class = None
+        self._embeddings_class = None
+
+        # Força a releitura das configurações do cache de respostas
+        self._redis_url = None
+        self._llm_cache_features = None
+        self._llm_cache_ttl = None
+        self._llm_cache_max_entries = None
+        self._llm_cache_history_window = None
+        self._semantic_cache_max_distance = None
+        self._semantic_cache_max_chars = None
+        self._semantic_cache_sample_rate = None
+        self._rule_fast_path_min_confidence = None
+        self._async_provider_concurrency = None
+        self._async_default_concurrency = None
+        self._async_call_timeout = None
+        self._async_worker_concurrency = None
+        self._llm_batch_max_concurrency = None
+        self._llm_providers = None
+        self._llm_router_error_threshold = None
+        self._llm_router_p95_threshold = None
+        self._llm_router_open_seconds = None
+        self._llm_router_hedge_delay = None
+        self._llm_telemetry_batch_size = None
+        self._llm_telemetry_flush_seconds = None
+        self._llm_telemetry_file = None
+        self._single_flight_timeout = None
+        self._single_flight_redis_ttl = None
+        self._fake_llm_latency_ms = None
+        self._fake_embeddings_latency_ms = None
+        self._fake_latency_jitter = None
+        self._fake_latency_distribution = None
+        self._embeddings_batch_size = None
+        self._embeddings_cache_features = None
+        self._embeddings_query_cache_max_entries = None
+        self._embeddings_query_cache_ttl = None
+        self._embeddings_query_cache_redis_ttl = None
+        self._embeddings_local_socket = None
+        self._embeddings_local_backend = None
+        self._embeddings_local_max_batch = None
+        self._embeddings_local_max_wait_ms = None
+        self._vector_search_quantization = None
+        self._vector_search_rerank_candidates = None
+        self._intent_classifier_min_similarity = None
+        self._intent_classifier_min_margin = None
+        self._intent_classifier_max_chars = None
+        self._intent_classifier_examples = None
+
+        # Notifica os observadores se a configuração do LLM mudou
+        nova_assinatura = self._get_llm_config_signature()
+        if nova_assinatura != self._llm_config_signature:
+            self._llm_config_signature = nova_assinatura
+            for listener in list(self._llm_config_listeners):
+                listener()
+
+        # Notifica os observadores se a configuração de embeddings mudou
+        nova_assinatura = self._get_embeddings_config_signature()
+        if nova_assinatura != self._embeddings_config_signature:
+            self._embeddings_config_signature = nova_assinatura
+            for listener in list(self._embeddings_config_listeners):
+                listener()
 
         whatsapp_service_type = os.environ.get("WHATSAPP_SERVICE_TYPE")
         if (
@@ -119,6 +244,88 @@ class ServiceHub:
                 "Use set_whatsapp_service() para definir a instância manualmente."
             )
 
+    def add_llm_config_listener(self, listener: Callable[[], None]) -> None:
+        """Registra uma função chamada quando a configuração do LLM muda.
+
+        A função é executada por ``reload_config`` sempre que a classe, o
+        modelo ou a temperatura do LLM forem alterados, permitindo
+        invalidar caches dependentes (ex.: clientes LLM reutilizados).
+
+        Args:
+            listener (Callable[[], None]): Função sem argumentos a ser
+                chamada na mudança de configuração.
+        """
+        if listener not in self._llm_config_listeners:
+            self._llm_config_listeners.append(listener)
+
+    def add_embeddings_config_listener(
+        self, listener: Callable[[], None]
+    ) -> None:
+        """Registra uma função chamada na mudança dos embeddings.
+
+        A função é executada por ``reload_config`` sempre que a classe, o
+        modelo ou a chave da API de embeddings forem alterados (ex.: para
+        descartar clientes de embeddings reutilizados).
+
+        Args:
+            listener (Callable[[], None]): Função sem argumentos a ser
+                chamada na mudança de configuração.
+        """
+        if listener not in self._embeddings_config_listeners:
+            self._embeddings_config_listeners.append(listener)
+
+    def set_embeddings_target(
+        self, embeddings_class: Optional[str], model: str = ""
+    ) -> None:
+        """Fixa a classe e o modelo de embeddings acima do ambiente.
+
+        Usado quando o modelo dos embeddings dos documentos é definido pelo
+        banco (ex.: após ``reprocessar_embeddings --trocar``): a consulta
+        passa a usar o mesmo modelo dos documentos, independentemente de
+        ``EMBEDDINGS_CLASS``/``EMBEDDINGS_MODEL``. Os observadores de
+        ``add_embeddings_config_listener`` são notificados na mudança.
+
+        Args:
+            embeddings_class (Optional[str]): Classe de embeddings, ou None
+                para voltar a usar as variáveis de ambiente.
+            model (str): Modelo de embeddings.
+        """
+        destino = (
+            None if embeddings_class is None else (embeddings_class, model)
+        )
+        if destino == self._embeddings_target:
+            return
+        self._embeddings_target = destino
+        nova_assinatura = self._get_embeddings_config_signature()
+        if nova_assinatura != self._embeddings_config_signature:
+            self._embeddings_config_signature = nova_assinatura
+            for listener in list(self._embeddings_config_listeners):
+                listener()
+
+    def _get_embeddings_config_signature(
+        self,
+    ) -> tuple[Optional[str], ...]:
+        """Retorna a assinatura atual da configuração de embeddings."""
+        if self._embeddings_target is not None:
+            return (
+                *self._embeddings_target,
+                os.environ.get("HUGGINGFACE_API_KEY", ""),
+            )
+        return (
+            os.environ.get("EMBEDDINGS_CLASS", "OpenAIEmbeddings"),
+            self._embeddings_model,
+            os.environ.get("HUGGINGFACE_API_KEY", ""),
+        )
+
+    def _get_llm_config_signature(self) -> tuple[Optional[str], ...]:
+        """Retorna a assinatura atual da configuração do LLM."""
+        return (
+            os.environ.get("LLM_CLASS", "ChatOllama"),
+            self._model,
+            str(self._llm_temperature),
+            os.environ.get("LLM_PROVIDERS", ""),
+        )
+
     def set_whatsapp_service(self, whatsapp_service: WhatsAppService) -> None:
         """Define a implementação de WhatsAppService a ser utilizada.
 
@@ -265,6 +472,8 @@ class ServiceHub:
     @property
     def EMBEDDINGS_MODEL(self) -> str:
         """Retorna o nome do modelo de embeddings."""
+        if self._embeddings_target is not None:
+            return self._embeddings_target[1]
         if self._embeddings_model is None:
             self._embeddings_model = os.environ.get("EMBEDDINGS_MODEL")
         return (
@@ -276,6 +485,8 @@ class ServiceHub:
     @property
     def EMBEDDINGS_CLASS(self) -> str:
         """Retorna o nome da classe de embeddings."""
+        if self._embeddings_target is not None:
+            return self._embeddings_target[0]
         if self._embeddings_class is None:
             self._embeddings_class = os.environ.get("EMBEDDINGS_CLASS")
         return (
@@ -378,13 +589,524 @@ class ServiceHub:
             self._time_cache = int(os.environ.get("TIME_CACHE", "20"))
         return self._time_cache if self._time_cache is not None else 20
 
-    def _get_llm_class(self) -> Type[BaseChatModel]:
-        """Retorna a classe do LLM com base na variável de ambiente.
+    # Cache de respostas do LLM
+    @property
+    def REDIS_URL(self) -> str:
+        """Retorna a URL do Redis usado pelos caches do motor de IA.
+
+        Usa 'REDIS_URL' se definida; caso contrário, monta a URL a partir de
+        'REDIS_HOST', 'REDIS_PORT' e 'REDIS_PASSWORD' (banco 2). Retorna
+        string vazia se nenhum host estiver configurado.
+        """
+        if self._redis_url is None:
+            self._redis_url = os.environ.get("REDIS_URL", "")
+            host = os.environ.get("REDIS_HOST")
+            if not self._redis_url and host:
+                port = os.environ.get("REDIS_PORT", "6379")
+                password = os.environ.get("REDIS_PASSWORD")
+                auth = f":{password}@" if password else ""
+                self._redis_url = f"redis://{auth}{host}:{port}/2"
+        return self._redis_url
+
+    @property
+    def LLM_CACHE_FEATURES(self) -> frozenset[str]:
+        """Retorna as features com cache de respostas habilitado.
+
+        Lida de 'LLM_CACHE_FEATURES' como lista separada por vírgulas
+        (ex.: 'analise_previa_mensagem'). Vazia desabilita o cache.
+        """
+        if self._llm_cache_features is None:
+            self._llm_cache_features = frozenset(
+                feature.strip()
+                for feature in os.environ.get(
+                    "LLM_CACHE_FEATURES", ""
+                ).split(",")
+                if feature.strip()
+            )
+        return self._llm_cache_features
+
+    @property
+    def LLM_CACHE_TTL(self) -> int:
+        """Retorna o tempo de vida, em segundos, das respostas em cache."""
+        if self._llm_cache_ttl is None:
+            self._llm_cache_ttl = int(
+                os.environ.get("LLM_CACHE_TTL", "86400")
+            )
+        return self._llm_cache_ttl
+
+    @property
+    def LLM_CACHE_MAX_ENTRIES(self) -> int:
+        """Retorna o número máximo de respostas em cache por feature."""
+        if self._llm_cache_max_entries is None:
+            self._llm_cache_max_entries = int(
+                os.environ.get("LLM_CACHE_MAX_ENTRIES", "10000")
+            )
+        return self._llm_cache_max_entries
+
+    @property
+    def LLM_CACHE_HISTORY_WINDOW(self) -> int:
+        """Retorna quantas mensagens recentes compõem a chave do cache."""
+        if self._llm_cache_history_window is None:
+            self._llm_cache_history_window = int(
+                os.environ.get("LLM_CACHE_HISTORY_WINDOW", "3")
+            )
+        return self._llm_cache_history_window
+
+    @property
+    def SEMANTIC_CACHE_MAX_DISTANCE(self) -> float:
+        """Retorna a distância de cosseno máxima para reutilizar análises."""
+        if self._semantic_cache_max_distance is None:
+            self._semantic_cache_max_distance = float(
+                os.environ.get("SEMANTIC_CACHE_MAX_DISTANCE", "0.08")
+            )
+        return self._semantic_cache_max_distance
+
+    @property
+    def SEMANTIC_CACHE_MAX_CHARS(self) -> int:
+        """Retorna o tamanho máximo de mensagem para o cache semântico."""
+        if self._semantic_cache_max_chars is None:
+            self._semantic_cache_max_chars = int(
+                os.environ.get("SEMANTIC_CACHE_MAX_CHARS", "80")
+            )
+        return self._semantic_cache_max_chars
+
+    @property
+    def SEMANTIC_CACHE_SAMPLE_RATE(self) -> float:
+        """Retorna a fração de acertos semânticos verificados pelo LLM."""
+        if self._semantic_cache_sample_rate is None:
+            self._semantic_cache_sample_rate = float(
+                os.environ.get("SEMANTIC_CACHE_SAMPLE_RATE", "0.05")
+            )
+        return self._semantic_cache_sample_rate
+
+    @property
+    def RULE_FAST_PATH_MIN_CONFIDENCE(self) -> float:
+        """Retorna a confiança mínima da extração por regras.
+
+        Acima desse valor a análise prévia dispensa o LLM. Valores maiores
+        que 1 desabilitam o atalho.
+        """
+        if self._rule_fast_path_min_confidence is None:
+            self._rule_fast_path_min_confidence = float(
+                os.environ.get("RULE_FAST_PATH_MIN_CONFIDENCE", "1.0")
+            )
+        return self._rule_fast_path_min_confidence
+
+    @property
+    def ASYNC_PROVIDER_CONCURRENCY(self) -> dict[str, int]:
+        """Retorna o limite de chamadas assíncronas simultâneas por provedor.
+
+        Lido de 'ASYNC_PROVIDER_CONCURRENCY' no formato
+        'ChatGroq=8,OllamaEmbeddings=2'. Entradas inválidas são ignoradas.
+        """
+        if self._async_provider_concurrency is None:
+            limites: dict[str, int] = {}
+            for item in os.environ.get(
+                "ASYNC_PROVIDER_CONCURRENCY", ""
+            ).split(","):
+                provider, _, valor = item.partition("=")
+                if provider.strip() and valor.strip().isdigit():
+                    limites[provider.strip()] = int(valor)
+            self._async_provider_concurrency = limites
+        return self._async_provider_concurrency
+
+    @property
+    def ASYNC_DEFAULT_CONCURRENCY(self) -> int:
+        """Retorna o limite padrão de chamadas simultâneas por provedor."""
+        if self._async_default_concurrency is None:
+            self._async_default_concurrency = int(
+                os.environ.get("ASYNC_DEFAULT_CONCURRENCY", "4")
+            )
+        return self._async_default_concurrency
+
+    @property
+    def ASYNC_CALL_TIMEOUT(self) -> float:
+        """Retorna o tempo limite, em segundos, de cada chamada assíncrona."""
+        if self._async_call_timeout is None:
+            self._async_call_timeout = float(
+                os.environ.get("ASYNC_CALL_TIMEOUT", "60")
+            )
+        return self._async_call_timeout
+
+    @property
+    def ASYNC_WORKER_CONCURRENCY(self) -> int:
+        """Retorna quantas conversas o worker assíncrono atende ao mesmo tempo.
+
+        Com valor maior que 0, as respostas do WhatsApp são processadas no
+        event loop do worker assíncrono em vez de uma thread por estágio.
+        0 (padrão) mantém o processamento síncrono.
+        """
+        if self._async_worker_concurrency is None:
+            self._async_worker_concurrency = int(
+                os.environ.get("ASYNC_WORKER_CONCURRENCY", "0")
+            )
+        return self._async_worker_concurrency
+
+    @property
+    def LLM_BATCH_MAX_CONCURRENCY(self) -> int:
+        """Retorna o máximo de chamadas simultâneas no processamento em lote."""
+        if self._llm_batch_max_concurrency is None:
+            self._llm_batch_max_concurrency = max(
+                1, int(os.environ.get("LLM_BATCH_MAX_CONCURRENCY", "4"))
+            )
+        return self._llm_batch_max_concurrency
+
+    @property
+    def LLM_PROVIDERS(self) -> list[tuple[str, str]]:
+        """Retorna a lista ordenada de provedores de LLM para o roteamento.
+
+        Lida de 'LLM_PROVIDERS' no formato
+        'ChatGroq:llama-3.1-8b-instant,ChatOpenAI:gpt-4o-mini,ChatOllama'.
+        Sem modelo, usa 'MODEL'. Vazia desativa o fallback entre provedores.
+        """
+        if self._llm_providers is None:
+            provedores: list[tuple[str, str]] = []
+            for item in os.environ.get("LLM_PROVIDERS", "").split(","):
+                classe, _, modelo = item.partition(":")
+                if classe.strip():
+                    provedores.append(
+                        (classe.strip(), modelo.strip() or self.MODEL)
+                    )
+            self._llm_providers = provedores
+        return self._llm_providers
+
+    @property
+    def LLM_ROUTER_ERROR_THRESHOLD(self) -> float:
+        """Retorna a taxa de erro que abre o circuito de um provedor."""
+        if self._llm_router_error_threshold is None:
+            self._llm_router_error_threshold = float(
+                os.environ.get("LLM_ROUTER_ERROR_THRESHOLD", "0.5")
+            )
+        return self._llm_router_error_threshold
+
+    @property
+    def LLM_ROUTER_P95_THRESHOLD(self) -> float:
+        """Retorna o p95 de latência (s) que abre o circuito (0 desativa)."""
+        if self._llm_router_p95_threshold is None:
+            self._llm_router_p95_threshold = float(
+                os.environ.get("LLM_ROUTER_P95_THRESHOLD", "0")
+            )
+        return self._llm_router_p95_threshold
+
+    @property
+    def LLM_ROUTER_OPEN_SECONDS(self) -> float:
+        """Retorna por quantos segundos um circuito aberto evita o provedor."""
+        if self._llm_router_open_seconds is None:
+            self._llm_router_open_seconds = float(
+                os.environ.get("LLM_ROUTER_OPEN_SECONDS", "30")
+            )
+        return self._llm_router_open_seconds
+
+    @property
+    def LLM_ROUTER_HEDGE_DELAY(self) -> float:
+        """Retorna a espera (s) antes da requisição paralela (0 desativa)."""
+        if self._llm_router_hedge_delay is None:
+            self._llm_router_hedge_delay = float(
+                os.environ.get("LLM_ROUTER_HEDGE_DELAY", "0")
+            )
+        return self._llm_router_hedge_delay
+
+    @property
+    def LLM_TELEMETRY_BATCH_SIZE(self) -> int:
+        """Retorna o tamanho do lote de gravação da telemetria (0 desativa).
+
+        Registros de latência e tokens das chamadas ao LLM e aos embeddings
+        são acumulados em memória e gravados em lote.
+        """
+        if self._llm_telemetry_batch_size is None:
+            self._llm_telemetry_batch_size = int(
+                os.environ.get("LLM_TELEMETRY_BATCH_SIZE", "50")
+            )
+        return self._llm_telemetry_batch_size
+
+    @property
+    def LLM_TELEMETRY_FLUSH_SECONDS(self) -> float:
+        """Retorna o intervalo máximo (s) entre gravações da telemetria."""
+        if self._llm_telemetry_flush_seconds is None:
+            self._llm_telemetry_flush_seconds = float(
+                os.environ.get("LLM_TELEMETRY_FLUSH_SECONDS", "10")
+            )
+        return self._llm_telemetry_flush_seconds
+
+    @property
+    def LLM_TELEMETRY_FILE(self) -> str:
+        """Retorna o arquivo JSONL da telemetria (vazio usa o banco).
+
+        Usado quando a aplicação não registra outro destino, por exemplo
+        em scripts executados fora do Django.
+        """
+        if self._llm_telemetry_file is None:
+            self._llm_telemetry_file = os.environ.get(
+                "LLM_TELEMETRY_FILE", ""
+            )
+        return self._llm_telemetry_file
+
+    @property
+    def SINGLE_FLIGHT_TIMEOUT(self) -> float:
+        """Retorna a espera máxima (s) por uma chamada idêntica (0 desativa).
+
+        Chamadas idênticas simultâneas ao LLM e aos embeddings aguardam o
+        resultado da primeira em vez de repetir a requisição.
+        """
+        if self._single_flight_timeout is None:
+            self._single_flight_timeout = float(
+                os.environ.get("SINGLE_FLIGHT_TIMEOUT", "30")
+            )
+        return self._single_flight_timeout
+
+    @property
+    def SINGLE_FLIGHT_REDIS_TTL(self) -> float:
+        """Retorna por quantos segundos o resultado fica publicado no Redis.
+
+        Com valor maior que 0 e ``REDIS_URL`` definida, a coalescência vale
+        também entre processos. 0 a restringe a cada processo.
+        """
+        if self._single_flight_redis_ttl is None:
+            self._single_flight_redis_ttl = float(
+                os.environ.get("SINGLE_FLIGHT_REDIS_TTL", "0")
+            )
+        return self._single_flight_redis_ttl
+
+    @property
+    def FAKE_LLM_LATENCY_MS(self) -> float:
+        """Retorna a latência média (ms) simulada pelo ``FakeChat``."""
+        if self._fake_llm_latency_ms is None:
+            self._fake_llm_latency_ms = float(
+                os.environ.get("FAKE_LLM_LATENCY_MS", "0")
+            )
+        return self._fake_llm_latency_ms
+
+    @property
+    def FAKE_EMBEDDINGS_LATENCY_MS(self) -> float:
+        """Retorna a latência média (ms) simulada pelo ``HashEmbeddings``."""
+        if self._fake_embeddings_latency_ms is None:
+            self._fake_embeddings_latency_ms = float(
+                os.environ.get("FAKE_EMBEDDINGS_LATENCY_MS", "0")
+            )
+        return self._fake_embeddings_latency_ms
+
+    @property
+    def FAKE_LATENCY_JITTER(self) -> float:
+        """Retorna a variação da latência simulada (fração da média).
+
+        Ex.: 0.2 com média de 500 ms produz desvio de 100 ms.
+        """
+        if self._fake_latency_jitter is None:
+            self._fake_latency_jitter = float(
+                os.environ.get("FAKE_LATENCY_JITTER", "0")
+            )
+        return self._fake_latency_jitter
+
+    @property
+    def FAKE_LATENCY_DISTRIBUTION(self) -> str:
+        """Retorna a distribuição da latência simulada.
+
+        'fixa', 'uniforme', 'normal' ou 'lognormal' (cauda longa, como a
+        dos provedores reais).
+        """
+        if self._fake_latency_distribution is None:
+            self._fake_latency_distribution = os.environ.get(
+                "FAKE_LATENCY_DISTRIBUTION", "lognormal"
+            )
+        return self._fake_latency_distribution
+
+    @property
+    def EMBEDDINGS_BATCH_SIZE(self) -> int:
+        """Retorna quantos textos são enviados por requisição de embeddings.
+
+        Usado pela geração em lote (``embed_documents``).
+        """
+        if self._embeddings_batch_size is None:
+            self._embeddings_batch_size = max(
+                1, int(os.environ.get("EMBEDDINGS_BATCH_SIZE", "64"))
+            )
+        return self._embeddings_batch_size
+
+    @property
+    def EMBEDDINGS_CACHE_FEATURES(self) -> frozenset[str]:
+        """Retorna as funcionalidades que consultam o cache de embeddings.
+
+        Lida de 'EMBEDDINGS_CACHE_FEATURES' como lista separada por
+        vírgulas ('generate_embeddings', 'generate_embeddings_lote'). Vazia
+        desabilita o cache.
+        """
+        if self._embeddings_cache_features is None:
+            self._embeddings_cache_features = frozenset(
+                feature.strip()
+                for feature in os.environ.get(
+                    "EMBEDDINGS_CACHE_FEATURES",
+                    "generate_embeddings,generate_embeddings_lote",
+                ).split(",")
+                if feature.strip()
+            )
+        return self._embeddings_cache_features
+
+    @property
+    def EMBEDDINGS_QUERY_CACHE_MAX_ENTRIES(self) -> int:
+        """Retorna o máximo de embeddings de consulta em memória.
+
+        0 desabilita o cache dos embeddings de consulta.
+        """
+        if self._embeddings_query_cache_max_entries is None:
+            self._embeddings_query_cache_max_entries = max(
+                0,
+                int(
+                    os.environ.get(
+                        "EMBEDDINGS_QUERY_CACHE_MAX_ENTRIES", "4096"
+                    )
+                ),
+            )
+        return self._embeddings_query_cache_max_entries
+
+    @property
+    def EMBEDDINGS_QUERY_CACHE_TTL(self) -> float:
+        """Retorna o tempo de vida (s) dos embeddings de consulta."""
+        if self._embeddings_query_cache_ttl is None:
+            self._embeddings_query_cache_ttl = float(
+                os.environ.get("EMBEDDINGS_QUERY_CACHE_TTL", "3600")
+            )
+        return self._embeddings_query_cache_ttl
+
+    @property
+    def EMBEDDINGS_QUERY_CACHE_REDIS_TTL(self) -> float:
+        """Retorna o tempo de vida (s) dos embeddings de consulta no Redis.
+
+        Com valor maior que 0 e ``REDIS_URL`` definida, o cache é
+        compartilhado entre os processos. 0 o restringe a cada processo.
+        """
+        if self._embeddings_query_cache_redis_ttl is None:
+            self._embeddings_query_cache_redis_ttl = float(
+                os.environ.get("EMBEDDINGS_QUERY_CACHE_REDIS_TTL", "0")
+            )
+        return self._embeddings_query_cache_redis_ttl
+
+    @property
+    def EMBEDDINGS_LOCAL_SOCKET(self) -> str:
+        """Retorna o socket Unix do serviço local de embeddings."""
+        if self._embeddings_local_socket is None:
+            self._embeddings_local_socket = os.environ.get(
+                "EMBEDDINGS_LOCAL_SOCKET", "/tmp/smart_core_embeddings.sock"
+            )
+        return self._embeddings_local_socket
+
+    @property
+    def EMBEDDINGS_LOCAL_BACKEND(self) -> str:
+        """Retorna a classe de embeddings carregada pelo serviço local.
+
+        Usada com ``EMBEDDINGS_MODEL`` (ex.: 'HuggingFaceEmbeddings' com um
+        modelo sentence-transformers).
+        """
+        if self._embeddings_local_backend is None:
+            self._embeddings_local_backend = os.environ.get(
+                "EMBEDDINGS_LOCAL_BACKEND", "HuggingFaceEmbeddings"
+            )
+        return self._embeddings_local_backend
+
+    @property
+    def EMBEDDINGS_LOCAL_MAX_BATCH(self) -> int:
+        """Retorna o máximo de textos por lote do serviço local."""
+        if self._embeddings_local_max_batch is None:
+            self._embeddings_local_max_batch = max(
+                1, int(os.environ.get("EMBEDDINGS_LOCAL_MAX_BATCH", "32"))
+            )
+        return self._embeddings_local_max_batch
+
+    @property
+    def EMBEDDINGS_LOCAL_MAX_WAIT_MS(self) -> float:
+        """Retorna a espera máxima (ms) para completar um lote.
+
+        Contada a partir do primeiro pedido do lote.
+        """
+        if self._embeddings_local_max_wait_ms is None:
+            self._embeddings_local_max_wait_ms = float(
+                os.environ.get("EMBEDDINGS_LOCAL_MAX_WAIT_MS", "5")
+            )
+        return self._embeddings_local_max_wait_ms
+
+    @property
+    def VECTOR_SEARCH_QUANTIZATION(self) -> str:
+        """Retorna o índice usado na primeira etapa da busca de documentos.
+
+        'halfvec' (meia precisão), 'binary' (um bit por dimensão) ou
+        'prefix' (primeiras 256 dimensões, para modelos Matryoshka) buscam
+        os candidatos no índice HNSW compacto e os reordenam pela distância
+        exata em float32. Vazio mantém a busca exata.
+        """
+        if self._vector_search_quantization is None:
+            self._vector_search_quantization = (
+                os.environ.get("VECTOR_SEARCH_QUANTIZATION", "")
+                .strip()
+                .lower()
+            )
+        return self._vector_search_quantization
+
+    @property
+    def VECTOR_SEARCH_RERANK_CANDIDATES(self) -> int:
+        """Retorna quantos candidatos do índice quantizado são reordenados."""
+        if self._vector_search_rerank_candidates is None:
+            self._vector_search_rerank_candidates = max(
+                1,
+                int(os.environ.get("VECTOR_SEARCH_RERANK_CANDIDATES", "40")),
+            )
+        return self._vector_search_rerank_candidates
+
+    @property
+    def INTENT_CLASSIFIER_MIN_SIMILARITY(self) -> float:
+        """Retorna a similaridade mínima da pré-classificação de intenções.
+
+        Acima desse valor de cosseno com o centroide da intenção, a análise
+        prévia dispensa o LLM. 0 desabilita a pré-classificação.
+        """
+        if self._intent_classifier_min_similarity is None:
+            self._intent_classifier_min_similarity = float(
+                os.environ.get("INTENT_CLASSIFIER_MIN_SIMILARITY", "0")
+            )
+        return self._intent_classifier_min_similarity
+
+    @property
+    def INTENT_CLASSIFIER_MIN_MARGIN(self) -> float:
+        """Retorna a vantagem mínima sobre a segunda intenção mais próxima."""
+        if self._intent_classifier_min_margin is None:
+            self._intent_classifier_min_margin = float(
+                os.environ.get("INTENT_CLASSIFIER_MIN_MARGIN", "0.05")
+            )
+        return self._intent_classifier_min_margin
+
+    @property
+    def INTENT_CLASSIFIER_MAX_CHARS(self) -> int:
+        """Retorna o tamanho máximo das mensagens pré-classificadas.
+
+        Mensagens longas costumam trazer entidades que só o LLM extrai.
+        """
+        if self._intent_classifier_max_chars is None:
+            self._intent_classifier_max_chars = int(
+                os.environ.get("INTENT_CLASSIFIER_MAX_CHARS", "200")
+            )
+        return self._intent_classifier_max_chars
+
+    @property
+    def INTENT_CLASSIFIER_EXAMPLES(self) -> int:
+        """Retorna quantos exemplos do histórico compõem cada centroide.
+
+        Os exemplos vêm de ``Mensagem.intent_detectado``. 0 usa apenas as
+        descrições de ``VALID_INTENT_TYPES``.
+        """
+        if self._intent_classifier_examples is None:
+            self._intent_classifier_examples = int(
+                os.environ.get("INTENT_CLASSIFIER_EXAMPLES", "20")
+            )
+        return self._intent_classifier_examples
+
+    def get_llm_class(self, llm_type: str) -> Type[BaseChatModel]:
+        """Retorna a classe do LLM correspondente ao nome informado.
+
+        Args:
+            llm_type (str): 'ChatGroq', 'ChatOpenAI', 'ChatOllama' ou
+                'FakeChat' (simulado, sem rede).
 
         Raises:
             ValueError: Se a classe LLM especificada não for reconhecida.
         """
-        llm_type = os.environ.get("LLM_CLASS", "ChatOllama")
         if llm_type == "ChatGroq":
             from langchain_groq import ChatGroq
 
@@ -397,13 +1119,27 @@ class ServiceHub:
             from langchain_ollama import ChatOllama
 
             return ChatOllama
+        elif llm_type == "FakeChat":
+            from smart_core_assistant_painel.modules.ai_engine.utils.fake_providers import (
+                FakeChat,
+            )
+
+            return FakeChat
         else:
             raise ValueError(
                 f"Classe LLM '{llm_type}' não reconhecida. "
                 "Defina a variável de ambiente 'LLM_CLASS' como 'ChatGroq', "
-                "'ChatOpenAI' ou 'ChatOllama'."
+                "'ChatOpenAI', 'ChatOllama' ou 'FakeChat'."
             )
 
+    def _get_llm_class(self) -> Type[BaseChatModel]:
+        """Retorna a classe do LLM com base na variável de ambiente.
+
+        Raises:
+            ValueError: Se a classe LLM especificada não for reconhecida.
+        """
+        return self.get_llm_class(os.environ.get("LLM_CLASS", "ChatOllama"))
+
     # def _get_embeddings_class(self) -> Type[Embeddings]:
     #     """Retorna a classe de embeddings com base na variável de ambiente.
 
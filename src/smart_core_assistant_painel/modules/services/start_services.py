@@ -52,6 +52,61 @@ def _log_environment_variables() -> None:
         "valid_entity_types": "VALID_ENTITY_TYPES",
         "valid_intent_types": "VALID_INTENT_TYPES",
         "time_cache": "TIME_CACHE",
+        # Cache de respostas do LLM
+        "llm_cache_features": "LLM_CACHE_FEATURES",
+        "llm_cache_ttl": "LLM_CACHE_TTL",
+        "llm_cache_max_entries": "LLM_CACHE_MAX_ENTRIES",
+        "llm_cache_history_window": "LLM_CACHE_HISTORY_WINDOW",
+        "semantic_cache_max_distance": "SEMANTIC_CACHE_MAX_DISTANCE",
+        "semantic_cache_max_chars": "SEMANTIC_CACHE_MAX_CHARS",
+        "semantic_cache_sample_rate": "SEMANTIC_CACHE_SAMPLE_RATE",
+        # Extração por regras
+        "rule_fast_path_min_confidence": "RULE_FAST_PATH_MIN_CONFIDENCE",
+        # Runtime assíncrono
+        "async_provider_concurrency": "ASYNC_PROVIDER_CONCURRENCY",
+        "async_default_concurrency": "ASYNC_DEFAULT_CONCURRENCY",
+        "async_call_timeout": "ASYNC_CALL_TIMEOUT",
+        "async_worker_concurrency": "ASYNC_WORKER_CONCURRENCY",
+        "llm_batch_max_concurrency": "LLM_BATCH_MAX_CONCURRENCY",
+        # Roteamento entre provedores de LLM
+        "llm_providers": "LLM_PROVIDERS",
+        "llm_router_error_threshold": "LLM_ROUTER_ERROR_THRESHOLD",
+        "llm_router_p95_threshold": "LLM_ROUTER_P95_THRESHOLD",
+        "llm_router_open_seconds": "LLM_ROUTER_OPEN_SECONDS",
+        "llm_router_hedge_delay": "LLM_ROUTER_HEDGE_DELAY",
+        # Telemetria das chamadas ao LLM e aos embeddings
+        "llm_telemetry_batch_size": "LLM_TELEMETRY_BATCH_SIZE",
+        "llm_telemetry_flush_seconds": "LLM_TELEMETRY_FLUSH_SECONDS",
+        "llm_telemetry_file": "LLM_TELEMETRY_FILE",
+        # Coalescência de chamadas idênticas em andamento
+        "single_flight_timeout": "SINGLE_FLIGHT_TIMEOUT",
+        "single_flight_redis_ttl": "SINGLE_FLIGHT_REDIS_TTL",
+        # Provedores simulados (FakeChat e HashEmbeddings)
+        "fake_llm_latency_ms": "FAKE_LLM_LATENCY_MS",
+        "fake_embeddings_latency_ms": "FAKE_EMBEDDINGS_LATENCY_MS",
+        "fake_latency_jitter": "FAKE_LATENCY_JITTER",
+        "fake_latency_distribution": "FAKE_LATENCY_DISTRIBUTION",
+        # Embeddings em lote
+        "embeddings_batch_size": "EMBEDDINGS_BATCH_SIZE",
+        # Cache persistente de embeddings
+        "embeddings_cache_features": "EMBEDDINGS_CACHE_FEATURES",
+        # Cache dos embeddings de consulta
+        "embeddings_query_cache_max_entries": "EMBEDDINGS_QUERY_CACHE_MAX_ENTRIES",
+        "embeddings_query_cache_ttl": "EMBEDDINGS_QUERY_CACHE_TTL",
+        "embeddings_query_cache_redis_ttl": "EMBEDDINGS_QUERY_CACHE_REDIS_TTL",
+        # Serviço local de embeddings
+        "embeddings_local_socket": "EMBEDDINGS_LOCAL_SOCKET",
+        "embeddings_local_backend": "EMBEDDINGS_LOCAL_BACKEND",
+        "embeddings_local_max_batch": "EMBEDDINGS_LOCAL_MAX_BATCH",
+        "embeddings_local_max_wait_ms": "EMBEDDINGS_LOCAL_MAX_WAIT_MS",
+        # Busca vetorial com índice quantizado
+        "vector_search_quantization": "VECTOR_SEARCH_QUANTIZATION",
+        "vector_search_rerank_candidates": "VECTOR_SEARCH_RERANK_CANDIDATES",
+        # Pré-classificação de intenções por centroides
+        "intent_classifier_min_similarity": "INTENT_CLASSIFIER_MIN_SIMILARITY",
+        "intent_classifier_min_margin": "INTENT_CLASSIFIER_MIN_MARGIN",
+        "intent_classifier_max_chars": "INTENT_CLASSIFIER_MAX_CHARS",
+        "intent_classifier_examples": "INTENT_CLASSIFIER_EXAMPLES",
     }
 
     logger.info("=== VARIÁVEIS DE AMBIENTE CARREGADAS ===")
@@ -18,6 +18,10 @@ os.environ.setdefault(
     "smart_core_assistant_painel.app.ui.core.settings_test"
 )
 
+# Telemetry of LLM calls is exercised by its own tests with a patched
+# ServiceHub; elsewhere it would try to flush to the test database at exit
+os.environ.setdefault("LLM_TELEMETRY_BATCH_SIZE", "0")
+
 # Initialize Django
 django.setup()
 
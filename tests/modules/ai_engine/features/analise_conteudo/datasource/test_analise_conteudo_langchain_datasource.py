@@ -1,9 +1,14 @@
 """Testes para AnaliseConteudoLangchainDatasource."""
 
+import asyncio
 import pytest
 import re
+import threading
+import time
 from unittest.mock import Mock, patch
 
+from langchain_core.runnables import RunnableLambda
+
 from smart_core_assistant_painel.modules.ai_engine.features.analise_conteudo.datasource.analise_conteudo_langchain_datasource import (
     AnaliseConteudoLangchainDatasource,
 )
@@ -11,6 +16,9 @@ from smart_core_assistant_painel.modules.ai_engine.utils.parameters import (
     LlmParameters,
 )
 from smart_core_assistant_painel.modules.ai_engine.utils.erros import LlmError
+from smart_core_assistant_painel.modules.ai_engine.utils.fake_providers import (
+    FakeChat,
+)
 
 
 class TestAnaliseConteudoLangchainDatasource:
@@ -294,4 +302,114 @@ final"""
         """Testa se a documentação está presente."""
         assert hasattr(datasource, '__call__')
         assert datasource.__call__.__doc__ is not None
-        assert "Executa a chamada para o LLM" in datasource.__call__.__doc__
\ No newline at end of file
+        assert "Executa a chamada para o LLM" in datasource.__call__.__doc__
+
+    @patch('smart_core_assistant_painel.modules.ai_engine.features.analise_conteudo.datasource.analise_conteudo_langchain_datasource.ChatPromptTemplate')
+    def test_lote_isola_falhas_e_limita_concorrencia(self, mock_chat_prompt, datasource, llm_parameters):
+        """Testa o processamento em lote com batch_as_completed."""
+        # Arrange
+        simultaneas = 0
+        maximo = 0
+        lock = threading.Lock()
+
+        def responder(entrada):
+            nonlocal simultaneas, maximo
+            with lock:
+                simultaneas += 1
+                maximo = max(maximo, simultaneas)
+            time.sleep(0.02)
+            with lock:
+                simultaneas -= 1
+            if entrada["context"] == "falha":
+                raise RuntimeError("erro na página")
+            return Mock(content=f"<think>x</think>{entrada['context']} ok")
+
+        mock_messages = Mock()
+        mock_messages.__or__ = Mock(return_value=RunnableLambda(responder))
+        mock_chat_prompt.from_messages.return_value = mock_messages
+
+        # Act
+        resultados = dict(
+            datasource.lote(llm_parameters, ["p1", "falha", "p3", "p4"], 2)
+        )
+
+        # Assert
+        assert resultados[0] == "p1 ok"
+        assert isinstance(resultados[1], RuntimeError)
+        assert resultados[2] == "p3 ok"
+        assert resultados[3] == "p4 ok"
+        assert maximo <= 2
+
+    def test_lote_vazio(self, datasource, llm_parameters):
+        """Testa que o lote vazio não cria a chain."""
+        assert list(datasource.lote(llm_parameters, [], 2)) == []
+
+    @patch('smart_core_assistant_painel.modules.ai_engine.features.analise_conteudo.datasource.analise_conteudo_langchain_datasource.ChatPromptTemplate')
+    def test_stream_filtra_pensamento_incrementalmente(self, mock_chat_prompt, datasource, llm_parameters):
+        """Testa o streaming com a tag <think> dividida entre trechos."""
+        # Arrange
+        trechos = ["<thi", "nk>rascunho</th", "ink>\n", "Olá", ", mundo"]
+        mock_chain = Mock()
+        mock_chain.stream.return_value = iter(
+            Mock(content=trecho) for trecho in trechos
+        )
+
+        mock_messages = Mock()
+        mock_messages.__or__ = Mock(return_value=mock_chain)
+        mock_chat_prompt.from_messages.return_value = mock_messages
+
+        # Act
+        result = list(datasource.stream(llm_parameters))
+
+        # Assert
+        assert result == ["Olá", ", mundo"]
+        mock_chain.stream.assert_called_once_with(
+            {"prompt_human": "Human prompt for analysis", "context": "Text to be analyzed"}
+        )
+
+
+class TestAnaliseConteudoLangchainDatasourceAsync:
+    """Testes da variante assíncrona do datasource."""
+
+    def test_executar_async_usa_ainvoke_do_llm(self):
+        parametros = LlmParameters(
+            llm_class=FakeChat,
+            model="fake",
+            extra_params={"latencia_ms": 0},
+            prompt_system="Sistema",
+            prompt_human="Melhore",
+            context="<think>rascunho</think>texto",
+            error=LlmError,
+        )
+
+        with patch.object(
+            FakeChat, "_generate", side_effect=AssertionError("síncrono")
+        ):
+            resultado = asyncio.run(
+                AnaliseConteudoLangchainDatasource().executar_async(parametros)
+            )
+
+        assert resultado == "Melhore: texto"
+
+    @patch('smart_core_assistant_painel.modules.ai_engine.features.analise_conteudo.datasource.analise_conteudo_langchain_datasource.ChatPromptTemplate')
+    def test_llm_sem_async_proprio_e_chamado_em_thread(self, mock_chat_prompt):
+        parametros = LlmParameters(
+            llm_class=Mock,
+            model="test-model",
+            extra_params={},
+            prompt_system="Sistema",
+            prompt_human="Melhore",
+            context="texto",
+            error=LlmError,
+        )
+        prompt = mock_chat_prompt.from_messages.return_value
+        mock_chain = prompt.__or__.return_value
+        mock_chain.invoke.return_value.content = "resposta"
+
+        resultado = asyncio.run(
+            AnaliseConteudoLangchainDatasource().executar_async(parametros)
+        )
+
+        assert resultado == "resposta"
+        mock_chain.invoke.assert_called_once()
+        mock_chain.ainvoke.assert_not_called()
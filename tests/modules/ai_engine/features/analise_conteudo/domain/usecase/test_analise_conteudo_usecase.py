@@ -1,5 +1,6 @@
+import asyncio
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from py_return_success_or_error import (
     ErrorReturn,
     SuccessReturn,
@@ -136,4 +137,29 @@ class TestAnaliseConteudoUseCase:
             # Assert
             assert isinstance(result, SuccessReturn)
             assert result.result == large_content
-            assert len(result.result) > 1000
\ No newline at end of file
+            assert len(result.result) > 1000
+
+    def test_executar_async_sucesso(
+        self, usecase, mock_datasource, sample_parameters
+    ):
+        """Testa a variante assíncrona com o datasource assíncrono."""
+        mock_datasource.executar_async = AsyncMock(return_value="análise")
+
+        result = asyncio.run(usecase.executar_async(sample_parameters))
+
+        assert isinstance(result, SuccessReturn)
+        assert result.result == "análise"
+        mock_datasource.assert_not_called()
+
+    def test_executar_async_erro_do_datasource(
+        self, usecase, mock_datasource, sample_parameters
+    ):
+        """Testa que exceções do datasource viram o erro dos parâmetros."""
+        mock_datasource.executar_async = AsyncMock(
+            side_effect=RuntimeError("falhou")
+        )
+
+        result = asyncio.run(usecase.executar_async(sample_parameters))
+
+        assert isinstance(result, ErrorReturn)
+        assert result.result is sample_parameters.error
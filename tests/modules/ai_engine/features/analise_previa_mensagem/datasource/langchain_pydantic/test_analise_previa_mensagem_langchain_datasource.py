@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from typing import Any
 from unittest.mock import Mock, patch
@@ -13,6 +14,9 @@ from smart_core_assistant_painel.modules.ai_engine.features.analise_previa_mensa
 from smart_core_assistant_painel.modules.ai_engine.features.analise_previa_mensagem.domain.interface.analise_previa_mensagem import (
     AnalisePreviaMensagem,
 )
+from smart_core_assistant_painel.modules.ai_engine.utils.fake_providers import (
+    FakeChat,
+)
 
 
 class TestAnalisePreviaMensagemLangchainDatasource:
@@ -894,3 +898,99 @@ class TestAnalisePreviaMensagemLangchainDatasource:
             assert result.intent == [{"saudacao": "ola"}, {"pergunta": "como_esta"}]
             assert result.entities == [{"pessoa": "João"}, {"local": "São Paulo"}]
             mock_chain.invoke.assert_called_once()
+
+
+class TestAnalisePreviaMensagemChainCache:
+    """Testes para a memoização da chain de structured output."""
+
+    MODULE = 'smart_core_assistant_painel.modules.ai_engine.features.analise_previa_mensagem.datasource.langchain_pydantic.analise_previa_mensagem_langchain_datasource'
+
+    @pytest.fixture(autouse=True)
+    def limpar_cache(self):
+        """Garante cache de chains vazio em cada teste."""
+        AnalisePreviaMensagemLangchainDatasource._chain_cache.clear()
+        yield
+        AnalisePreviaMensagemLangchainDatasource._chain_cache.clear()
+
+    def _criar_parametros(
+        self, llm: Any, prompt_system: str = "Sistema"
+    ) -> AnalisePreviaMensagemParameters:
+        mock_llm_params = Mock()
+        mock_llm_params.create_llm = llm
+        mock_llm_params.prompt_system = prompt_system
+        mock_llm_params.prompt_human = "Analise"
+        mock_llm_params.context = "Olá"
+        mock_llm_params.config_key = ("Mock", "test-model", ())
+        return AnalisePreviaMensagemParameters(
+            historico_atendimento={},
+            valid_intent_types='{"intent_types": {}}',
+            valid_entity_types='{"entity_types": {}}',
+            llm_parameters=mock_llm_params,
+            error=LlmError("Erro de teste LLM"),
+        )
+
+    def test_reutiliza_chain_para_mesma_configuracao(self) -> None:
+        datasource = AnalisePreviaMensagemLangchainDatasource()
+        llm = Mock()
+
+        with patch(f"{self.MODULE}.ChatPromptTemplate") as mock_template:
+            datasource(self._criar_parametros(llm))
+            datasource(self._criar_parametros(llm))
+
+        mock_template.from_messages.assert_called_once()
+        llm.with_structured_output.assert_called_once()
+
+    def test_recria_chain_quando_prompt_muda(self) -> None:
+        datasource = AnalisePreviaMensagemLangchainDatasource()
+        llm = Mock()
+
+        with patch(f"{self.MODULE}.ChatPromptTemplate") as mock_template:
+            datasource(self._criar_parametros(llm, "Prompt A"))
+            datasource(self._criar_parametros(llm, "Prompt B"))
+
+        assert mock_template.from_messages.call_count == 2
+
+    def test_recria_chain_quando_llm_muda(self) -> None:
+        datasource = AnalisePreviaMensagemLangchainDatasource()
+
+        with patch(f"{self.MODULE}.ChatPromptTemplate") as mock_template:
+            datasource(self._criar_parametros(Mock()))
+            datasource(self._criar_parametros(Mock()))
+
+        assert mock_template.from_messages.call_count == 2
+
+
+class TestAnalisePreviaMensagemAsync(TestAnalisePreviaMensagemChainCache):
+    """Testes da variante assíncrona da análise prévia."""
+
+    def test_executar_async_usa_ainvoke_do_llm(self) -> None:
+        datasource = AnalisePreviaMensagemLangchainDatasource()
+        parametros = self._criar_parametros(FakeChat(latencia_ms=0))
+        parametros.valid_intent_types = (
+            '{"intent_types": {"comunicacao": {"saudacao": "Cumprimentos"}}}'
+        )
+
+        with patch.object(
+            FakeChat, "_generate", side_effect=AssertionError("síncrono")
+        ):
+            resultado = asyncio.run(datasource.executar_async(parametros))
+
+        assert resultado.intent == datasource(parametros).intent
+
+    def test_llm_sem_async_proprio_e_chamado_em_thread(self) -> None:
+        datasource = AnalisePreviaMensagemLangchainDatasource()
+        resposta = Mock()
+        resposta.intent = []
+        resposta.entities = []
+
+        with patch(f"{self.MODULE}.ChatPromptTemplate") as mock_template:
+            prompt = mock_template.from_messages.return_value
+            mock_chain = prompt.__or__.return_value
+            mock_chain.invoke.return_value = resposta
+            resultado = asyncio.run(
+                datasource.executar_async(self._criar_parametros(Mock()))
+            )
+
+        assert resultado.intent == []
+        mock_chain.invoke.assert_called_once()
+        mock_chain.ainvoke.assert_not_called()
@@ -257,4 +257,17 @@ class TestCreateDynamicPydanticModel:
         # Testa instanciação
         instance = model_class()
         assert instance.intent == []
-        assert instance.entities == []
\ No newline at end of file
+        assert instance.entities == []
+
+    def test_create_dynamic_pydantic_model_memoizado(self) -> None:
+        """Testa a reutilização do modelo para a mesma configuração."""
+        intent_json = json.dumps({"intent_types": {"a": {"b": "c"}}})
+        entity_json = json.dumps({"entity_types": {}})
+        outro_intent_json = json.dumps({"intent_types": {"x": {"y": "z"}}})
+
+        primeiro = create_dynamic_pydantic_model(intent_json, entity_json)
+        segundo = create_dynamic_pydantic_model(intent_json, entity_json)
+        outro = create_dynamic_pydantic_model(outro_intent_json, entity_json)
+
+        assert primeiro is segundo
+        assert outro is not primeiro
@@ -1,5 +1,6 @@
+import asyncio
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from py_return_success_or_error import (
     ErrorReturn,
     SuccessReturn,
@@ -228,4 +229,36 @@ class TestAnalisePreviaMensagemUsecase:
             assert len(result.result.intent_types) == 3
             assert len(result.result.entity_types) == 4
             assert result.result.intent_types == mock_analise.intent
-            assert result.result.entity_types == mock_analise.entities
\ No newline at end of file
+            assert result.result.entity_types == mock_analise.entities
+
+    def test_executar_async_converte_resultado(
+        self, mock_datasource, mock_analise_previa_mensagem, sample_parameters
+    ):
+        """Testa a variante assíncrona com o datasource assíncrono."""
+        mock_datasource.executar_async = AsyncMock(
+            return_value=mock_analise_previa_mensagem
+        )
+        usecase = AnalisePreviaMensagemUsecase(mock_datasource)
+
+        result = asyncio.run(usecase.executar_async(sample_parameters))
+
+        assert isinstance(result, SuccessReturn)
+        assert result.result == APMTuple(
+            intent_types=mock_analise_previa_mensagem.intent,
+            entity_types=mock_analise_previa_mensagem.entities,
+        )
+        mock_datasource.assert_not_called()
+
+    def test_executar_async_erro_do_datasource(
+        self, mock_datasource, sample_parameters
+    ):
+        """Testa que exceções do datasource viram o erro dos parâmetros."""
+        mock_datasource.executar_async = AsyncMock(
+            side_effect=RuntimeError("falhou")
+        )
+        usecase = AnalisePreviaMensagemUsecase(mock_datasource)
+
+        result = asyncio.run(usecase.executar_async(sample_parameters))
+
+        assert isinstance(result, ErrorReturn)
+        assert result.result is sample_parameters.error
@@ -1,12 +1,23 @@
+import asyncio
+import threading
+import time
 import unittest
-from unittest.mock import MagicMock, patch
+from collections.abc import Mapping
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 from langchain.docstore.document import Document
 from py_return_success_or_error import ErrorReturn, SuccessReturn
 
 from smart_core_assistant_painel.modules.ai_engine import (
+    EMBEDDINGS_QUERY_CACHE,
+    LLM_ROUTER,
+    APMTuple,
     DocumentError,
     FeaturesCompose,
+    LlmError,
+)
+from smart_core_assistant_painel.modules.ai_engine.utils.erros import (
+    EmbeddingError,
 )
 
 
@@ -168,6 +179,116 @@ class TestFeaturesCompose(unittest.TestCase):
         mock_use_case.assert_called_once()
         mock_use_case_instance.assert_called_once()
 
+    @patch(
+        "smart_core_assistant_painel.modules.ai_engine.features.features_compose.AnalisePreviaMensagemUsecase"
+    )
+    @patch(
+        "smart_core_assistant_painel.modules.ai_engine.features.features_compose.get_response_cache"
+    )
+    @patch(
+        "smart_core_assistant_painel.modules.ai_engine.features.features_compose.SERVICEHUB"
+    )
+    def test_analise_previa_mensagem_cache_hit(
+        self, mock_service_hub, mock_get_cache, mock_use_case
+    ):
+        # Arrange
+        mock_service_hub.LLM_CLASS.__name__ = "ChatOllama"
+        mock_service_hub.LLM_CACHE_HISTORY_WINDOW = 3
+        mock_cache = mock_get_cache.return_value
+        mock_cache.enabled = True
+        mock_cache.get.return_value = {
+            "intent_types": [{"saudacao": "oi"}],
+            "entity_types": [],
+        }
+
+        # Act
+        result = FeaturesCompose.analise_previa_mensagem(
+            historico_atendimento={}, context="Oi!"
+        )
+
+        # Assert
+        self.assertEqual(result.intent_types, [{"saudacao": "oi"}])
+        self.assertEqual(result.entity_types, [])
+        mock_use_case.assert_not_called()
+        mock_cache.set.assert_not_called()
+
+    @patch(
+        "smart_core_assistant_painel.modules.ai_engine.features.features_compose.AnalisePreviaMensagemLangchainDatasource"
+    )
+    @patch(
+        "smart_core_assistant_painel.modules.ai_engine.features.features_compose.AnalisePreviaMensagemUsecase"
+    )
+    @patch(
+        "smart_core_assistant_painel.modules.ai_engine.features.features_compose.get_response_cache"
+    )
+    @patch(
+        "smart_core_assistant_painel.modules.ai_engine.features.features_compose.SERVICEHUB"
+    )
+    def test_analise_previa_mensagem_cache_miss_grava_resultado(
+        self, mock_service_hub, mock_get_cache, mock_use_case, mock_datasource
+    ):
+        # Arrange
+        from smart_core_assistant_painel.modules.ai_engine import APMTuple
+
+        mock_service_hub.LLM_CLASS.__name__ = "ChatOllama"
+        mock_service_hub.LLM_CACHE_HISTORY_WINDOW = 3
+        mock_cache = mock_get_cache.return_value
+        mock_cache.enabled = True
+        mock_cache.get.return_value = None
+        expected = APMTuple(intent_types=[{"saudacao": "oi"}], entity_types=[])
+        mock_use_case.return_value.return_value = SuccessReturn(expected)
+
+        # Act
+        result = FeaturesCompose.analise_previa_mensagem(
+            historico_atendimento={}, context="oi"
+        )
+
+        # Assert
+        self.assertEqual(result, expected)
+        chave = mock_cache.get.call_args.args[0]
+        mock_cache.set.assert_called_once_with(chave, expected._asdict())
+
+    @patch(
+        "smart_core_assistant_painel.modules.ai_engine.features.features_compose.get_single_flight"
+    )
+    @patch(
+        "smart_core_assistant_painel.modules.ai_engine.features.features_compose.AnalisePreviaMensagemLangchainDatasource"
+    )
+    @patch(
+        "smart_core_assistant_painel.modules.ai_engine.features.features_compose.AnalisePreviaMensagemUsecase"
+    )
+    @patch(
+        "smart_core_assistant_painel.modules.ai_engine.features.features_compose.get_response_cache"
+    )
+    @patch(
+        "smart_core_assistant_painel.modules.ai_engine.features.features_compose.SERVICEHUB"
+    )
+    def test_analise_previa_mensagem_sem_cache_chama_o_llm(
+        self,
+        mock_service_hub,
+        mock_get_cache,
+        mock_use_case,
+        mock_datasource,
+        mock_single_flight,
+    ):
+        # Arrange
+        mock_cache = mock_get_cache.return_value
+        mock_cache.enabled = True
+        mock_cache.get.return_value = {"intent_types": [], "entity_types": []}
+        expected = APMTuple(intent_types=[{"saudacao": "oi"}], entity_types=[])
+        mock_use_case.return_value.return_value = SuccessReturn(expected)
+
+        # Act
+        result = FeaturesCompose.analise_previa_mensagem(
+            historico_atendimento={}, context="oi", usar_cache=False
+        )
+
+        # Assert
+        self.assertEqual(result, expected)
+        mock_cache.get.assert_not_called()
+        mock_cache.set.assert_not_called()
+        mock_single_flight.assert_not_called()
+
     def test_converter_contexto(self):
         # Arrange
         metadata = {"type": "image"}
@@ -489,5 +610,550 @@ class TestFeaturesCompose(unittest.TestCase):
         self.assertIsNone(result)
 
 
+_FC = "smart_core_assistant_painel.modules.ai_engine.features.features_compose"
+
+
+class TestFeaturesComposeLote(unittest.TestCase):
+    """Testes da pré-análise em lote."""
+
+    @patch(f"{_FC}.AnaliseConteudoLangchainDatasource")
+    @patch(f"{_FC}.SERVICEHUB")
+    def test_preserva_ordem_isola_falhas_e_reporta_progresso(
+        self, mock_service_hub, mock_datasource
+    ):
+        mock_service_hub.LLM_BATCH_MAX_CONCURRENCY = 3
+        mock_datasource.return_value.lote.return_value = iter(
+            [(2, "c"), (0, "a"), (1, RuntimeError("falhou"))]
+        )
+        progresso = MagicMock()
+
+        resultado = FeaturesCompose.pre_analise_ia_treinamento_lote(
+            ["p1", "p2", "p3"], progresso=progresso
+        )
+
+        self.assertEqual(resultado[0], "a")
+        self.assertIsInstance(resultado[1], LlmError)
+        self.assertEqual(resultado[2], "c")
+        _, contextos, limite = mock_datasource.return_value.lote.call_args.args
+        self.assertEqual(contextos, ["p1", "p2", "p3"])
+        self.assertEqual(limite, 3)
+        self.assertEqual(
+            progresso.call_args_list,
+            [call(1, 3), call(2, 3), call(3, 3)],
+        )
+
+
+class TestFeaturesComposeRoteamento(unittest.TestCase):
+    """Testes do fallback entre provedores de LLM."""
+
+    @patch(f"{_FC}.LlmParameters")
+    @patch(f"{_FC}.AnaliseConteudoLangchainDatasource")
+    @patch(f"{_FC}.AnaliseConteudoUseCase")
+    @patch(f"{_FC}.SERVICEHUB")
+    def test_melhoria_usa_proximo_provedor_quando_principal_falha(
+        self, mock_service_hub, mock_use_case, mock_datasource, mock_params
+    ):
+        mock_service_hub.LLM_PROVIDERS = [
+            ("ChatGroq", "llama"),
+            ("ChatOllama", "local"),
+        ]
+        mock_use_case.return_value.side_effect = [
+            ErrorReturn(LlmError("indisponível")),
+            SuccessReturn("Texto melhorado"),
+        ]
+
+        resultado = FeaturesCompose.melhoria_ia_treinamento("Texto")
+
+        self.assertEqual(resultado, "Texto melhorado")
+        modelos = [
+            chamada.kwargs["model"] for chamada in mock_params.call_args_list
+        ]
+        self.assertEqual(modelos, ["llama", "local"])
+        mock_service_hub.get_llm_class.assert_any_call("ChatOllama")
+
+    @patch(f"{_FC}.LlmParameters")
+    @patch(f"{_FC}.AnaliseConteudoLangchainDatasource")
+    @patch(f"{_FC}.AnaliseConteudoUseCase")
+    @patch(f"{_FC}.SERVICEHUB")
+    def test_sem_provedores_usa_llm_configurado(
+        self, mock_service_hub, mock_use_case, mock_datasource, mock_params
+    ):
+        mock_service_hub.LLM_PROVIDERS = []
+        mock_service_hub.LLM_CLASS.__name__ = "ChatOllama"
+        mock_service_hub.MODEL = "llama3.1"
+        mock_use_case.return_value.return_value = SuccessReturn("ok")
+
+        FeaturesCompose.pre_analise_ia_treinamento("Texto")
+
+        argumentos = mock_params.call_args.kwargs
+        mock_service_hub.get_llm_class.assert_called_once_with("ChatOllama")
+        self.assertEqual(argumentos["model"], "llama3.1")
+
+    @patch(f"{_FC}.AnalisePreviaMensagemLangchainDatasource")
+    @patch(f"{_FC}.AnalisePreviaMensagemUsecase")
+    @patch(f"{_FC}.get_response_cache")
+    @patch(f"{_FC}.SERVICEHUB")
+    def test_resposta_de_provedor_alternativo_nao_vai_para_o_cache(
+        self, mock_service_hub, mock_get_cache, mock_use_case, mock_datasource
+    ):
+        mock_service_hub.LLM_PROVIDERS = [
+            ("ChatGroq", "llama"),
+            ("ChatOllama", "local"),
+        ]
+        mock_service_hub.LLM_CACHE_HISTORY_WINDOW = 3
+        mock_cache = mock_get_cache.return_value
+        mock_cache.enabled = True
+        mock_cache.get.return_value = None
+        esperado = APMTuple(intent_types=[{"saudacao": "oi"}], entity_types=[])
+        mock_use_case.return_value.side_effect = [
+            ErrorReturn(LlmError("indisponível")),
+            SuccessReturn(esperado),
+            SuccessReturn(esperado),
+        ]
+
+        resultado = FeaturesCompose.analise_previa_mensagem({}, "oi")
+        self.assertEqual(resultado, esperado)
+        mock_cache.set.assert_not_called()
+
+        FeaturesCompose.analise_previa_mensagem({}, "oi")
+        mock_cache.set.assert_called_once()
+
+    @patch(f"{_FC}.SERVICEHUB")
+    def test_versao_analise_previa_usa_o_provedor_principal(
+        self, mock_service_hub
+    ):
+        mock_service_hub.LLM_PROVIDERS = [("ChatGroq", "llama")]
+        versao = FeaturesCompose.versao_analise_previa()
+
+        mock_service_hub.LLM_PROVIDERS = [("ChatGroq", "outro")]
+        self.assertNotEqual(versao, FeaturesCompose.versao_analise_previa())
+
+
+class TestFeaturesComposeTelemetria(unittest.TestCase):
+    """Testes do registro das chamadas na telemetria."""
+
+    @patch(f"{_FC}.TELEMETRIA")
+    @patch(f"{_FC}.GenerateEmbeddingsUseCase")
+    @patch(f"{_FC}.SERVICEHUB")
+    def test_generate_embeddings_registra_chamada(
+        self, mock_service_hub, mock_use_case, mock_telemetria
+    ):
+        mock_service_hub.EMBEDDINGS_MODEL = "bge-m3"
+        mock_use_case.return_value.return_value = SuccessReturn([0.1, 0.2])
+
+        FeaturesCompose.generate_embeddings("texto")
+
+        args, kwargs = mock_telemetria.registrar_chamada.call_args
+        self.assertEqual(args[:3], ("generate_embeddings", "embedding", "bge-m3"))
+        self.assertTrue(kwargs["sucesso"])
+
+    @patch(f"{_FC}.TELEMETRIA")
+    @patch(f"{_FC}.AnaliseConteudoLangchainDatasource")
+    @patch(f"{_FC}.AnaliseConteudoUseCase")
+    @patch(f"{_FC}.SERVICEHUB")
+    def test_melhoria_identifica_funcionalidade(
+        self, mock_service_hub, mock_use_case, mock_datasource, mock_telemetria
+    ):
+        mock_service_hub.LLM_PROVIDERS = []
+        mock_use_case.return_value.return_value = SuccessReturn("ok")
+
+        FeaturesCompose.melhoria_ia_treinamento("Texto")
+
+        mock_telemetria.funcionalidade.assert_called_once_with(
+            "melhoria_ia_treinamento"
+        )
+
+
+class TestFeaturesComposeSingleFlight(unittest.TestCase):
+    """Testes da coalescência de chamadas idênticas simultâneas."""
+
+    @patch(f"{_FC}.GenerateEmbeddingsUseCase")
+    @patch(f"{_FC}.SERVICEHUB")
+    def test_generate_embeddings_identicos_compartilham_chamada(
+        self, mock_service_hub, mock_use_case
+    ):
+        chamadas = []
+
+        def gerar(parameters):
+            chamadas.append(parameters.text)
+            time.sleep(0.1)
+            return SuccessReturn([0.1, 0.2])
+
+        mock_use_case.return_value.side_effect = gerar
+        resultados = []
+        threads = [
+            threading.Thread(
+                target=lambda: resultados.append(
+                    FeaturesCompose.generate_embeddings("SIM")
+                )
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(chamadas, ["SIM"])
+        self.assertEqual(resultados, [[0.1, 0.2]] * 5)
+
+
+class _Historico(Mapping):
+    """Histórico cuja representação só mostra contagens."""
+
+    def __init__(self, mensagens):
+        self._dados = {"conteudo_mensagens": mensagens}
+
+    def __getitem__(self, chave):
+        return self._dados[chave]
+
+    def __iter__(self):
+        return iter(self._dados)
+
+    def __len__(self):
+        return len(self._dados)
+
+    def __repr__(self):
+        return f"_Historico(mensagens={len(self._dados['conteudo_mensagens'])})"
+
+
+class TestFeaturesComposeSingleFlightAnalisePrevia(unittest.TestCase):
+    """Testes da coalescência da análise prévia de mensagens."""
+
+    @patch(f"{_FC}.AnalisePreviaMensagemLangchainDatasource")
+    @patch(f"{_FC}.AnalisePreviaMensagemUsecase")
+    @patch(f"{_FC}.SERVICEHUB")
+    def test_historicos_diferentes_nao_compartilham_chamada(
+        self, mock_service_hub, mock_use_case, mock_datasource
+    ):
+        mock_service_hub.LLM_PROVIDERS = []
+        mock_service_hub.LLM_CACHE_HISTORY_WINDOW = 5
+        ultimos = []
+
+        def analisar(parameters):
+            ultima = parameters.historico_atendimento["conteudo_mensagens"][-1]
+            ultimos.append(ultima)
+            time.sleep(0.1)
+            return SuccessReturn(
+                APMTuple(intent_types=[{"t": ultima}], entity_types=[])
+            )
+
+        mock_use_case.return_value.side_effect = analisar
+        resultados = {}
+
+        def executar(mensagem_anterior):
+            historico = _Historico([mensagem_anterior])
+            resultados[mensagem_anterior] = (
+                FeaturesCompose.analise_previa_mensagem(historico, "sim")
+            )
+
+        threads = [
+            threading.Thread(target=executar, args=(mensagem,))
+            for mensagem in ("quero cancelar", "quero agendar")
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertCountEqual(ultimos, ["quero cancelar", "quero agendar"])
+        for mensagem, resultado in resultados.items():
+            self.assertEqual(resultado.intent_types, [{"t": mensagem}])
+
+
+class TestFeaturesComposeCacheConsultas(unittest.TestCase):
+    """Testes do cache dos embeddings de consulta."""
+
+    def setUp(self) -> None:
+        EMBEDDINGS_QUERY_CACHE.limpar()
+        self.addCleanup(EMBEDDINGS_QUERY_CACHE.limpar)
+
+    @patch(f"{_FC}.GenerateEmbeddingsUseCase")
+    @patch(f"{_FC}.SERVICEHUB")
+    def test_texto_repetido_nao_chama_o_provedor(
+        self, mock_service_hub, mock_use_case
+    ):
+        mock_use_case.return_value.return_value = SuccessReturn([0.5, -1.0])
+
+        primeiro = FeaturesCompose.generate_embeddings("Qual o horário?")
+        segundo = FeaturesCompose.generate_embeddings("Qual o  horário?")
+
+        self.assertEqual(primeiro, segundo)
+        mock_use_case.return_value.assert_called_once()
+        estatisticas = EMBEDDINGS_QUERY_CACHE.estatisticas()
+        self.assertEqual(estatisticas.acertos_memoria, 1)
+
+
+class TestFeaturesComposeEmbeddingsLote(unittest.TestCase):
+    """Testes da geração de embeddings em lote."""
+
+    @patch(f"{_FC}.TELEMETRIA")
+    @patch(f"{_FC}.GenerateEmbeddingsLangchainDatasource")
+    @patch(f"{_FC}.SERVICEHUB")
+    def test_divide_em_lotes_e_preserva_ordem(
+        self, mock_service_hub, mock_datasource, mock_telemetria
+    ):
+        mock_service_hub.EMBEDDINGS_BATCH_SIZE = 2
+        mock_datasource.return_value.lote.side_effect = lambda textos: [
+            [float(len(texto))] for texto in textos
+        ]
+
+        vetores = FeaturesCompose.generate_embeddings_lote(
+            ["a", "bb", "ccc", "dddd", "eeeee"]
+        )
+
+        self.assertEqual(vetores, [[1.0], [2.0], [3.0], [4.0], [5.0]])
+        self.assertEqual(mock_datasource.return_value.lote.call_count, 3)
+        self.assertEqual(mock_telemetria.registrar_chamada.call_count, 3)
+
+    @patch(f"{_FC}.TELEMETRIA")
+    @patch(f"{_FC}.GenerateEmbeddingsLangchainDatasource")
+    @patch(f"{_FC}.SERVICEHUB")
+    def test_falha_do_lote_vira_embedding_error(
+        self, mock_service_hub, mock_datasource, mock_telemetria
+    ):
+        mock_datasource.return_value.lote.side_effect = RuntimeError("503")
+
+        with self.assertRaises(EmbeddingError):
+            FeaturesCompose.generate_embeddings_lote(["a"], tamanho_lote=10)
+
+        self.assertFalse(
+            mock_telemetria.registrar_chamada.call_args.kwargs["sucesso"]
+        )
+
+
+class TestFeaturesComposeStream(unittest.TestCase):
+    """Testes da melhoria em streaming."""
+
+    @patch(f"{_FC}.AnaliseConteudoLangchainDatasource")
+    @patch(f"{_FC}.SERVICEHUB")
+    def test_repassa_trechos_e_converte_erros(
+        self, mock_service_hub, mock_datasource
+    ):
+        def trechos():
+            yield "Texto "
+            raise RuntimeError("conexão perdida")
+
+        mock_datasource.return_value.stream.return_value = trechos()
+        stream = FeaturesCompose.melhoria_ia_treinamento_stream("conteúdo")
+
+        self.assertEqual(next(stream), "Texto ")
+        with self.assertRaises(LlmError):
+            next(stream)
+
+    @patch(f"{_FC}.AnaliseConteudoLangchainDatasource")
+    @patch(f"{_FC}.SERVICEHUB")
+    def test_fallback_quando_stream_falha_antes_do_primeiro_trecho(
+        self, mock_service_hub, mock_datasource
+    ):
+        LLM_ROUTER.clear()
+        self.addCleanup(LLM_ROUTER.clear)
+        mock_service_hub.LLM_PROVIDERS = [
+            ("ChatGroq", "llama"),
+            ("ChatOpenAI", "gpt-4o-mini"),
+        ]
+
+        def falha(parameters):
+            raise RuntimeError("conexão recusada")
+            yield
+
+        def sucesso(parameters):
+            yield "Texto "
+            yield "melhorado"
+
+        mock_datasource.return_value.stream.side_effect = [
+            falha(None),
+            sucesso(None),
+        ]
+
+        trechos = list(
+            FeaturesCompose.melhoria_ia_treinamento_stream("conteúdo")
+        )
+
+        self.assertEqual(trechos, ["Texto ", "melhorado"])
+        mock_service_hub.get_llm_class.assert_has_calls(
+            [call("ChatGroq"), call("ChatOpenAI")]
+        )
+        self.assertEqual(
+            LLM_ROUTER.metricas()["ChatGroq:llama"]["falhas"], 1
+        )
+
+
+class TestChaveMelhoria(unittest.TestCase):
+    """Testes da chave e da versão da melhoria armazenada."""
+
+    @patch(f"{_FC}.SERVICEHUB")
+    def test_chave_depende_apenas_do_conteudo(self, mock_service_hub):
+        mock_service_hub.MODEL = "modelo-a"
+        chave = FeaturesCompose.chave_melhoria_ia_treinamento("texto")
+
+        mock_service_hub.MODEL = "modelo-b"
+        mock_service_hub.PROMPT_SYSTEM_MELHORIA_CONTEUDO = "novo sistema"
+        self.assertEqual(
+            chave, FeaturesCompose.chave_melhoria_ia_treinamento("texto")
+        )
+        self.assertNotEqual(
+            chave, FeaturesCompose.chave_melhoria_ia_treinamento("outro")
+        )
+
+    @patch(f"{_FC}.SERVICEHUB")
+    def test_versao_muda_com_prompt_e_modelo(self, mock_service_hub):
+        mock_service_hub.LLM_CLASS.__name__ = "ChatGroq"
+        mock_service_hub.MODEL = "modelo-a"
+        mock_service_hub.LLM_TEMPERATURE = 0
+        mock_service_hub.PROMPT_SYSTEM_MELHORIA_CONTEUDO = "sistema"
+        mock_service_hub.PROMPT_HUMAN_MELHORIA_CONTEUDO = "humano"
+        versao = FeaturesCompose.versao_melhoria_ia_treinamento()
+
+        self.assertEqual(
+            versao, FeaturesCompose.versao_melhoria_ia_treinamento()
+        )
+        mock_service_hub.PROMPT_SYSTEM_MELHORIA_CONTEUDO = "novo sistema"
+        versao_prompt = FeaturesCompose.versao_melhoria_ia_treinamento()
+        self.assertNotEqual(versao, versao_prompt)
+        mock_service_hub.MODEL = "modelo-b"
+        self.assertNotEqual(
+            versao_prompt, FeaturesCompose.versao_melhoria_ia_treinamento()
+        )
+
+
+class TestFeaturesComposeAsync(unittest.IsolatedAsyncioTestCase):
+    """Testes das variantes assíncronas do FeaturesCompose."""
+
+    def setUp(self):
+        patcher = patch(f"{_FC}.SERVICEHUB")
+        self.mock_service_hub = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_service_hub.LLM_PROVIDERS = []
+        self.mock_service_hub.LLM_CLASS.__name__ = "ChatOllama"
+        self.mock_service_hub.EMBEDDINGS_CLASS = "OllamaEmbeddings"
+        self.mock_service_hub.LLM_CACHE_HISTORY_WINDOW = 3
+        LLM_ROUTER.clear()
+        self.addCleanup(LLM_ROUTER.clear)
+        EMBEDDINGS_QUERY_CACHE.limpar()
+        self.addCleanup(EMBEDDINGS_QUERY_CACHE.limpar)
+
+    @patch(f"{_FC}.AnalisePreviaMensagemLangchainDatasource")
+    @patch(f"{_FC}.AnalisePreviaMensagemUsecase")
+    async def test_analise_previa_mensagem_async_usa_variante_assincrona(
+        self, mock_use_case, mock_datasource
+    ):
+        esperado = APMTuple(intent_types=[{"saudacao": "oi"}], entity_types=[])
+        usecase = mock_use_case.return_value
+        usecase.executar_async = AsyncMock(
+            return_value=SuccessReturn(esperado)
+        )
+
+        result = await FeaturesCompose.analise_previa_mensagem_async(
+            historico_atendimento={}, context="oi", usar_cache=False
+        )
+
+        self.assertEqual(result, esperado)
+        usecase.executar_async.assert_awaited_once()
+        usecase.assert_not_called()
+
+    @patch(f"{_FC}.AnalisePreviaMensagemLangchainDatasource")
+    @patch(f"{_FC}.AnalisePreviaMensagemUsecase")
+    @patch(f"{_FC}.get_response_cache")
+    async def test_analises_identicas_compartilham_chamada(
+        self, mock_get_cache, mock_use_case, mock_datasource
+    ):
+        mock_get_cache.return_value.enabled = False
+        esperado = APMTuple(intent_types=[{"saudacao": "oi"}], entity_types=[])
+
+        async def analisar(parametros):
+            await asyncio.sleep(0.05)
+            return SuccessReturn(esperado)
+
+        usecase = mock_use_case.return_value
+        usecase.executar_async = AsyncMock(side_effect=analisar)
+
+        resultados = await asyncio.gather(
+            *(
+                FeaturesCompose.analise_previa_mensagem_async(
+                    {"conteudo_mensagens": ["a"]}, "sim"
+                )
+                for _ in range(4)
+            )
+        )
+
+        self.assertEqual(resultados, [esperado] * 4)
+        usecase.executar_async.assert_awaited_once()
+
+    @patch(f"{_FC}.LlmParameters")
+    @patch(f"{_FC}.AnaliseConteudoLangchainDatasource")
+    @patch(f"{_FC}.AnaliseConteudoUseCase")
+    @patch(f"{_FC}.ASYNC_RUNTIME")
+    async def test_tempo_limite_usa_proximo_provedor(
+        self, mock_runtime, mock_use_case, mock_datasource, mock_params
+    ):
+        self.mock_service_hub.LLM_PROVIDERS = [
+            ("ChatGroq", "llama"),
+            ("ChatOllama", "local"),
+        ]
+        mock_use_case.return_value.executar_async = AsyncMock(
+            return_value=SuccessReturn("Texto melhorado")
+        )
+
+        async def executar(provider, chamada):
+            if provider == "ChatGroq":
+                raise TimeoutError
+            return await chamada()
+
+        mock_runtime.executar.side_effect = executar
+
+        resultado = await FeaturesCompose.melhoria_ia_treinamento_async(
+            "Texto"
+        )
+
+        self.assertEqual(resultado, "Texto melhorado")
+        self.assertEqual(
+            [c.args[0] for c in mock_runtime.executar.call_args_list],
+            ["ChatGroq", "ChatOllama"],
+        )
+        self.assertEqual(LLM_ROUTER.metricas()["ChatGroq:llama"]["falhas"], 1)
+
+    @patch(f"{_FC}.ASYNC_RUNTIME")
+    async def test_tempo_limite_vira_llm_error(self, mock_runtime):
+        mock_runtime.executar = AsyncMock(side_effect=TimeoutError)
+
+        with self.assertRaises(LlmError):
+            await FeaturesCompose.melhoria_ia_treinamento_async("texto")
+
+    @patch(f"{_FC}.GenerateEmbeddingsLangchainDatasource")
+    @patch(f"{_FC}.GenerateEmbeddingsUseCase")
+    @patch(f"{_FC}.ASYNC_RUNTIME")
+    async def test_generate_embeddings_async_usa_limite_do_provedor(
+        self, mock_runtime, mock_use_case, mock_datasource
+    ):
+        async def executar(provider, chamada):
+            return await chamada()
+
+        mock_runtime.executar.side_effect = executar
+        usecase = mock_use_case.return_value
+        usecase.executar_async = AsyncMock(
+            return_value=SuccessReturn([0.5, -1.0])
+        )
+
+        result = await FeaturesCompose.generate_embeddings_async("texto")
+        repetido = await FeaturesCompose.generate_embeddings_async("texto")
+
+        self.assertEqual(result, [0.5, -1.0])
+        self.assertEqual(repetido, result)
+        usecase.executar_async.assert_awaited_once()
+        usecase.assert_not_called()
+        mock_runtime.executar.assert_called_once()
+        self.assertEqual(
+            mock_runtime.executar.call_args.args[0], "OllamaEmbeddings"
+        )
+
+    @patch(f"{_FC}.ASYNC_RUNTIME")
+    async def test_tempo_limite_vira_embedding_error(self, mock_runtime):
+        mock_runtime.executar = AsyncMock(side_effect=TimeoutError)
+
+        with self.assertRaises(EmbeddingError):
+            await FeaturesCompose.generate_embeddings_async("texto")
+
+
 if __name__ == "__main__":
     unittest.main()
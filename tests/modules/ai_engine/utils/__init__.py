@@ -0,0 +1 @@
+# Arquivo de inicialização do pacote utils
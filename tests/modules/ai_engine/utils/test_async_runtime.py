@@ -0,0 +1,217 @@
+"""Testes para o runtime assíncrono do motor de IA."""
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from langchain_core.embeddings import Embeddings
+
+from smart_core_assistant_painel.modules.ai_engine.utils.async_runtime import (
+    AsyncRuntime,
+    WorkerAssincrono,
+    em_thread,
+    possui_async_nativo,
+)
+from smart_core_assistant_painel.modules.ai_engine.utils.embeddings_locais import (
+    LocalEmbeddings,
+)
+from smart_core_assistant_painel.modules.ai_engine.utils.fake_providers import (
+    HashEmbeddings,
+)
+
+_HUB = "smart_core_assistant_painel.modules.ai_engine.utils.async_runtime.SERVICEHUB"
+
+
+class TestAsyncRuntime(unittest.IsolatedAsyncioTestCase):
+    """Testes dos limites por provedor e do tempo limite."""
+
+    def setUp(self) -> None:
+        patcher = patch(_HUB)
+        self.mock_hub = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_hub.ASYNC_PROVIDER_CONCURRENCY = {"lento": 2}
+        self.mock_hub.ASYNC_DEFAULT_CONCURRENCY = 5
+        self.mock_hub.ASYNC_CALL_TIMEOUT = 1.0
+        self.runtime = AsyncRuntime()
+
+    def test_limite_por_provedor(self) -> None:
+        self.assertEqual(self.runtime.limite("lento"), 2)
+        self.assertEqual(self.runtime.limite("outro"), 5)
+
+    async def test_semaforo_limita_concorrencia(self) -> None:
+        simultaneas = 0
+        maximo = 0
+
+        async def chamada() -> int:
+            nonlocal simultaneas, maximo
+            simultaneas += 1
+            maximo = max(maximo, simultaneas)
+            await asyncio.sleep(0.01)
+            simultaneas -= 1
+            return 1
+
+        resultados = await asyncio.gather(
+            *(self.runtime.executar("lento", chamada) for _ in range(6))
+        )
+
+        self.assertEqual(resultados, [1] * 6)
+        self.assertEqual(maximo, 2)
+        self.assertEqual(self.runtime.em_andamento(), {})
+
+    async def test_tempo_limite_cancela_chamada(self) -> None:
+        cancelada = asyncio.Event()
+
+        async def chamada() -> None:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelada.set()
+                raise
+
+        with self.assertRaises(TimeoutError):
+            await self.runtime.executar("lento", chamada, timeout=0.01)
+
+        await asyncio.wait_for(cancelada.wait(), 1)
+        await asyncio.sleep(0)
+        self.assertEqual(self.runtime.em_andamento(), {})
+
+    async def test_vaga_ocupada_ate_a_thread_terminar(self) -> None:
+        self.mock_hub.ASYNC_PROVIDER_CONCURRENCY = {"lento": 1}
+        liberar = threading.Event()
+
+        def bloqueante() -> str:
+            liberar.wait(5)
+            return "lenta"
+
+        with self.assertRaises(TimeoutError):
+            await self.runtime.executar(
+                "lento", lambda: em_thread(bloqueante), timeout=0.05
+            )
+
+        # A requisição continua em curso: a vaga não foi devolvida
+        self.assertEqual(self.runtime.em_andamento(), {"lento": 1})
+        with self.assertRaises(TimeoutError):
+            await self.runtime.executar(
+                "lento", lambda: em_thread(str), timeout=0.05
+            )
+
+        liberar.set()
+        self.assertEqual(
+            await self.runtime.executar(
+                "lento", lambda: em_thread(str, "ok"), timeout=1
+            ),
+            "ok",
+        )
+        self.assertEqual(self.runtime.em_andamento(), {})
+
+    async def test_cancelamento_libera_semaforo(self) -> None:
+        self.mock_hub.ASYNC_PROVIDER_CONCURRENCY = {"lento": 1}
+
+        async def bloqueia() -> None:
+            await asyncio.sleep(10)
+
+        async def rapida() -> str:
+            return "ok"
+
+        tarefa = asyncio.create_task(self.runtime.executar("lento", bloqueia))
+        await asyncio.sleep(0)
+        tarefa.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await tarefa
+
+        self.assertEqual(
+            await self.runtime.executar("lento", rapida, timeout=0.5), "ok"
+        )
+
+
+class TestPossuiAsyncNativo(unittest.TestCase):
+    """Testes da detecção de implementações assíncronas próprias."""
+
+    def test_cliente_com_implementacao_propria(self) -> None:
+        self.assertTrue(
+            possui_async_nativo(
+                HashEmbeddings(), Embeddings, "aembed_query"
+            )
+        )
+
+    def test_cliente_com_implementacao_padrao(self) -> None:
+        self.assertFalse(
+            possui_async_nativo(
+                LocalEmbeddings(), Embeddings, "aembed_query"
+            )
+        )
+
+    def test_objeto_fora_da_hierarquia(self) -> None:
+        self.assertFalse(
+            possui_async_nativo(object(), Embeddings, "aembed_query")
+        )
+
+
+class TestWorkerAssincrono(unittest.TestCase):
+    """Testes do event loop que atende várias conversas no processo."""
+
+    def setUp(self) -> None:
+        patcher = patch(_HUB)
+        self.mock_hub = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_hub.ASYNC_WORKER_CONCURRENCY = 2
+        self.worker = WorkerAssincrono()
+        self.addCleanup(self.worker.encerrar, 1)
+
+    def test_conversas_simultaneas_no_mesmo_loop(self) -> None:
+        simultaneas = 0
+        maximo = 0
+
+        async def conversa(indice: int) -> int:
+            nonlocal simultaneas, maximo
+            simultaneas += 1
+            maximo = max(maximo, simultaneas)
+            await asyncio.sleep(0.02)
+            simultaneas -= 1
+            return indice
+
+        futuros = [
+            self.worker.submeter(lambda i=i: conversa(i)) for i in range(5)
+        ]
+
+        self.assertEqual([f.result(2) for f in futuros], list(range(5)))
+        self.assertEqual(maximo, 2)
+
+    def test_encerrar_aguarda_conversas_em_andamento(self) -> None:
+        concluidas: list[int] = []
+
+        async def conversa() -> None:
+            await asyncio.sleep(0.05)
+            concluidas.append(1)
+
+        self.worker.submeter(conversa)
+        self.assertEqual(self.worker.em_andamento(), 1)
+        self.worker.encerrar(1)
+
+        self.assertEqual(concluidas, [1])
+        self.assertEqual(self.worker.em_andamento(), 0)
+
+    def test_falha_da_conversa_libera_a_vaga(self) -> None:
+        async def falha() -> None:
+            raise RuntimeError("erro")
+
+        async def ok() -> str:
+            return "ok"
+
+        for _ in range(3):
+            with self.assertRaises(RuntimeError):
+                self.worker.submeter(falha).result(1)
+        inicio = time.monotonic()
+        self.assertEqual(self.worker.submeter(ok).result(1), "ok")
+        self.assertLess(time.monotonic() - inicio, 1)
+
+    def test_habilitado_pela_configuracao(self) -> None:
+        self.assertTrue(self.worker.habilitado)
+        self.mock_hub.ASYNC_WORKER_CONCURRENCY = 0
+        self.assertFalse(self.worker.habilitado)
+
+
+if __name__ == "__main__":
+    unittest.main()
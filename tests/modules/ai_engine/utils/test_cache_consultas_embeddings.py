@@ -0,0 +1,195 @@
+"""Testes para o cache dos embeddings de consulta."""
+
+import asyncio
+import unittest
+from typing import Any, Optional
+from unittest.mock import patch
+
+import numpy as np
+
+from smart_core_assistant_painel.modules.ai_engine.utils.cache_consultas_embeddings import (
+    CacheConsultasEmbeddings,
+)
+
+_HUB = (
+    "smart_core_assistant_painel.modules.ai_engine.utils."
+    "cache_consultas_embeddings.SERVICEHUB"
+)
+
+
+class _RedisFalso:
+    """Subconjunto do cliente Redis usado pelo cache."""
+
+    def __init__(self) -> None:
+        self.dados: dict[str, bytes] = {}
+        self.ttls: dict[str, Optional[int]] = {}
+
+    def get(self, chave: str) -> Optional[bytes]:
+        return self.dados.get(chave)
+
+    def set(self, chave: str, valor: bytes, px: Optional[int] = None) -> None:
+        self.dados[chave] = valor
+        self.ttls[chave] = px
+
+
+class _RedisIndisponivel:
+    """Cliente cujas operações sempre falham."""
+
+    def get(self, chave: str) -> Any:
+        raise ConnectionError("recusada")
+
+    def set(self, *args: Any, **kwargs: Any) -> Any:
+        raise ConnectionError("recusada")
+
+
+class _Gerador:
+    """Gera vetores a partir do tamanho do texto e conta as chamadas."""
+
+    def __init__(self) -> None:
+        self.textos: list[str] = []
+
+    def para(self, texto: str) -> Any:
+        def gerar() -> list[float]:
+            self.textos.append(texto)
+            return [float(len(texto)), 0.5, -1.0]
+
+        return gerar
+
+
+class TestCacheConsultasEmbeddings(unittest.TestCase):
+    """Testes do cache em memória e do nível Redis."""
+
+    def setUp(self) -> None:
+        patcher = patch(_HUB)
+        self.mock_hub = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_hub.EMBEDDINGS_CLASS = "HashEmbeddings"
+        self.mock_hub.EMBEDDINGS_MODEL = "hash"
+        self.mock_hub.EMBEDDINGS_QUERY_CACHE_MAX_ENTRIES = 2
+        self.mock_hub.EMBEDDINGS_QUERY_CACHE_TTL = 60.0
+        self.mock_hub.EMBEDDINGS_QUERY_CACHE_REDIS_TTL = 0.0
+        self.mock_hub.REDIS_URL = ""
+        self.gerador = _Gerador()
+
+    def _obter(self, cache: CacheConsultasEmbeddings, texto: str) -> Any:
+        return cache.obter(texto, self.gerador.para(texto))
+
+    def test_texto_normalizado_compartilha_a_entrada(self) -> None:
+        cache = CacheConsultasEmbeddings()
+
+        primeiro = self._obter(cache, "qual o horário?")
+        segundo = self._obter(cache, "  qual o   horário? ")
+
+        self.assertEqual(self.gerador.textos, ["qual o horário?"])
+        np.testing.assert_allclose(segundo, primeiro, rtol=1e-6)
+        estatisticas = cache.estatisticas()
+        self.assertEqual(
+            (estatisticas.acertos_memoria, estatisticas.faltas), (1, 1)
+        )
+        self.assertEqual(estatisticas.taxa_acerto, 0.5)
+        # Três dimensões em float32
+        self.assertEqual(estatisticas.bytes, 12)
+
+    def test_modelo_faz_parte_da_chave(self) -> None:
+        cache = CacheConsultasEmbeddings()
+
+        self._obter(cache, "sim")
+        self.mock_hub.EMBEDDINGS_MODEL = "outro"
+        self._obter(cache, "sim")
+
+        self.assertEqual(self.gerador.textos, ["sim", "sim"])
+
+    def test_descarta_o_menos_usado_acima_do_limite(self) -> None:
+        cache = CacheConsultasEmbeddings()
+
+        self._obter(cache, "a")
+        self._obter(cache, "b")
+        self._obter(cache, "a")
+        self._obter(cache, "c")
+        self._obter(cache, "a")
+        self._obter(cache, "b")
+
+        self.assertEqual(self.gerador.textos, ["a", "b", "c", "b"])
+        estatisticas = cache.estatisticas()
+        self.assertEqual(estatisticas.entradas, 2)
+        self.assertEqual(estatisticas.bytes, 24)
+
+    def test_entrada_expirada_e_gerada_novamente(self) -> None:
+        self.mock_hub.EMBEDDINGS_QUERY_CACHE_TTL = 0.0
+        cache = CacheConsultasEmbeddings()
+
+        self._obter(cache, "oi")
+        self._obter(cache, "oi")
+
+        self.assertEqual(self.gerador.textos, ["oi", "oi"])
+
+    def test_limite_zero_desabilita(self) -> None:
+        self.mock_hub.EMBEDDINGS_QUERY_CACHE_MAX_ENTRIES = 0
+        cache = CacheConsultasEmbeddings()
+
+        self._obter(cache, "oi")
+        self._obter(cache, "oi")
+
+        self.assertEqual(self.gerador.textos, ["oi", "oi"])
+        self.assertEqual(cache.estatisticas().entradas, 0)
+
+    def test_falha_na_geracao_nao_e_armazenada(self) -> None:
+        cache = CacheConsultasEmbeddings()
+
+        def falhar() -> list[float]:
+            raise RuntimeError("503")
+
+        with self.assertRaises(RuntimeError):
+            cache.obter("oi", falhar)
+
+        self.assertEqual(cache.estatisticas().entradas, 0)
+
+    def test_redis_compartilha_entre_processos(self) -> None:
+        self.mock_hub.EMBEDDINGS_QUERY_CACHE_REDIS_TTL = 30.0
+        redis = _RedisFalso()
+        outro_processo = CacheConsultasEmbeddings(client=redis)
+        cache = CacheConsultasEmbeddings(client=redis)
+
+        self._obter(outro_processo, "obrigado")
+        vetor = self._obter(cache, "obrigado")
+        self._obter(cache, "obrigado")
+
+        self.assertEqual(self.gerador.textos, ["obrigado"])
+        self.assertEqual(vetor, [8.0, 0.5, -1.0])
+        self.assertEqual(list(redis.ttls.values()), [30000])
+        estatisticas = cache.estatisticas()
+        self.assertEqual(
+            (estatisticas.acertos_redis, estatisticas.acertos_memoria),
+            (1, 1),
+        )
+
+    def test_falha_do_redis_gera_normalmente(self) -> None:
+        self.mock_hub.EMBEDDINGS_QUERY_CACHE_REDIS_TTL = 30.0
+        cache = CacheConsultasEmbeddings(client=_RedisIndisponivel())
+
+        vetor = self._obter(cache, "oi")
+
+        self.assertEqual(vetor, [2.0, 0.5, -1.0])
+        self.assertEqual(cache.estatisticas().faltas, 1)
+
+    def test_variante_assincrona_compartilha_as_entradas(self) -> None:
+        self.mock_hub.EMBEDDINGS_QUERY_CACHE_REDIS_TTL = 30.0
+        redis = _RedisFalso()
+        cache = CacheConsultasEmbeddings(client=redis)
+
+        async def gerar() -> list[float]:
+            return self.gerador.para("obrigado")()
+
+        primeiro = asyncio.run(cache.aobter("obrigado", gerar))
+        segundo = asyncio.run(cache.aobter("obrigado", gerar))
+        outro_processo = CacheConsultasEmbeddings(client=redis)
+        terceiro = self._obter(outro_processo, "obrigado")
+
+        self.assertEqual(self.gerador.textos, ["obrigado"])
+        self.assertEqual(primeiro, [8.0, 0.5, -1.0])
+        np.testing.assert_allclose(segundo, primeiro, rtol=1e-6)
+        self.assertEqual(terceiro, primeiro)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""Testes para o cache de embeddings endereçado pelo conteúdo."""
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from smart_core_assistant_painel.modules.ai_engine.utils.cache_embeddings import (
+    CacheEmbeddings,
+    codificar_vetor,
+    decodificar_vetor,
+    hash_conteudo,
+)
+
+_MODULO = (
+    "smart_core_assistant_painel.modules.ai_engine.utils.cache_embeddings"
+)
+
+
+class _ArmazenamentoMemoria:
+    """Armazenamento em memória com a interface esperada pelo cache."""
+
+    def __init__(self) -> None:
+        self.dados: dict[tuple[str, str, str], bytes] = {}
+
+    def buscar(
+        self, embeddings_class: str, model: str, hashes: list[str]
+    ) -> dict[str, bytes]:
+        return {
+            chave: self.dados[(embeddings_class, model, chave)]
+            for chave in hashes
+            if (embeddings_class, model, chave) in self.dados
+        }
+
+    def gravar(
+        self, embeddings_class: str, model: str, vetores: dict[str, bytes]
+    ) -> None:
+        for chave, vetor in vetores.items():
+            self.dados.setdefault((embeddings_class, model, chave), vetor)
+
+
+def _gerar(textos: list[str]) -> list[list[float]]:
+    return [[float(len(texto)), 0.5] for texto in textos]
+
+
+class TestFuncoesAuxiliares(unittest.TestCase):
+    """Testes do hash e da codificação dos vetores."""
+
+    def test_hash_ignora_espacos_e_forma_unicode(self) -> None:
+        self.assertEqual(
+            hash_conteudo("  Horário   de\natendimento "),
+            hash_conteudo("Horário de atendimento"),
+        )
+        # "ação" decomposto (NFD) e composto (NFC)
+        self.assertEqual(
+            hash_conteudo("ac\u0327a\u0303o"), hash_conteudo("a\u00e7\u00e3o")
+        )
+        self.assertNotEqual(hash_conteudo("ação"), hash_conteudo("Ação"))
+
+    def test_codificacao_float32(self) -> None:
+        dados = codificar_vetor([0.25, -1.5, 3.0])
+
+        self.assertEqual(len(dados), 12)
+        self.assertEqual(decodificar_vetor(dados), [0.25, -1.5, 3.0])
+
+
+class TestCacheEmbeddings(unittest.TestCase):
+    """Testes para CacheEmbeddings."""
+
+    def setUp(self) -> None:
+        patcher = patch(f"{_MODULO}.SERVICEHUB")
+        self.mock_hub = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_hub.EMBEDDINGS_CLASS = "HashEmbeddings"
+        self.mock_hub.EMBEDDINGS_MODEL = "hash"
+        self.mock_hub.EMBEDDINGS_CACHE_FEATURES = frozenset({"lote"})
+
+        self.armazenamento = _ArmazenamentoMemoria()
+        self.cache = CacheEmbeddings()
+        self.cache.configurar_armazenamento(self.armazenamento)
+        self.gerar = MagicMock(side_effect=_gerar)
+
+    def test_gera_apenas_textos_ausentes(self) -> None:
+        self.cache.obter_lote("lote", ["um", "dois"], self.gerar)
+        vetores = self.cache.obter_lote(
+            "lote", ["dois", "três", "um", "três"], self.gerar
+        )
+
+        self.assertEqual(vetores, _gerar(["dois", "três", "um", "três"]))
+        self.assertEqual(
+            [c.args[0] for c in self.gerar.call_args_list],
+            [["um", "dois"], ["três"]],
+        )
+        estatisticas = self.cache.estatisticas()
+        self.assertEqual((estatisticas.acertos, estatisticas.faltas), (3, 3))
+        self.assertAlmostEqual(estatisticas.taxa_acerto, 0.5)
+
+    def test_chave_inclui_classe_e_modelo(self) -> None:
+        self.cache.obter_lote("lote", ["um"], self.gerar)
+        self.mock_hub.EMBEDDINGS_MODEL = "outro"
+        self.cache.obter_lote("lote", ["um"], self.gerar)
+
+        self.assertEqual(self.gerar.call_count, 2)
+        self.assertEqual(len(self.armazenamento.dados), 2)
+
+    def test_funcionalidade_desabilitada_ou_sem_armazenamento(self) -> None:
+        self.cache.obter_lote("outra", ["um"], self.gerar)
+        self.assertEqual(self.armazenamento.dados, {})
+
+        self.cache.configurar_armazenamento(None)
+        self.cache.obter_lote("lote", ["um"], self.gerar)
+        self.assertEqual(self.gerar.call_count, 2)
+        self.assertEqual(self.cache.estatisticas().faltas, 0)
+
+    def test_falha_do_armazenamento_nao_impede_a_geracao(self) -> None:
+        armazenamento = MagicMock()
+        armazenamento.buscar.side_effect = RuntimeError("banco indisponível")
+        armazenamento.gravar.side_effect = RuntimeError("banco indisponível")
+        self.cache.configurar_armazenamento(armazenamento)
+
+        vetores = self.cache.obter_lote("lote", ["um", "dois"], self.gerar)
+
+        self.assertEqual(vetores, _gerar(["um", "dois"]))
+
+    def test_falha_da_geracao_e_propagada(self) -> None:
+        self.gerar.side_effect = RuntimeError("provedor fora")
+
+        with self.assertRaises(RuntimeError):
+            self.cache.obter_lote("lote", ["um"], self.gerar)
+        self.assertEqual(self.armazenamento.dados, {})
+
+    def test_variante_assincrona_gera_apenas_textos_ausentes(self) -> None:
+        self.cache.obter_lote("lote", ["um"], self.gerar)
+        gerar = AsyncMock(side_effect=_gerar)
+
+        vetores = asyncio.run(
+            self.cache.aobter_lote("lote", ["um", "dois"], gerar)
+        )
+
+        self.assertEqual(vetores, _gerar(["um", "dois"]))
+        gerar.assert_awaited_once_with(["dois"])
+        self.assertEqual(len(self.armazenamento.dados), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""Testes para a pré-classificação de intenções por centroides."""
+
+import json
+import unittest
+
+import numpy as np
+
+from smart_core_assistant_painel.modules.ai_engine.utils.classificador_intencoes import (
+    ClassificadorCentroides,
+    descricoes_intencoes,
+)
+
+_EIXOS = {
+    "saudacao": [1.0, 0.0, 0.0],
+    "orcamento": [0.0, 1.0, 0.0],
+    "reclamacao": [0.0, 0.0, 1.0],
+}
+
+
+def _gerar(textos: list[str]) -> list[list[float]]:
+    """Embeddings de teste: cada texto começa com o nome do seu eixo."""
+    return [_EIXOS[texto.split(":")[0].split()[0]] for texto in textos]
+
+
+class TestDescricoesIntencoes(unittest.TestCase):
+    """Testes da leitura de VALID_INTENT_TYPES."""
+
+    def test_extrai_descricao_de_cada_tipo(self) -> None:
+        configuracao = json.dumps(
+            {
+                "intent_types": {
+                    "comunicacao": {"saudacao": "Cumprimentos"},
+                    "comercial": {"pedido_orcamento": "Pede um orçamento"},
+                }
+            }
+        )
+
+        self.assertEqual(
+            descricoes_intencoes(configuracao),
+            {
+                "saudacao": "saudacao: Cumprimentos",
+                "pedido_orcamento": "pedido orcamento: Pede um orçamento",
+            },
+        )
+
+    def test_json_invalido(self) -> None:
+        self.assertEqual(descricoes_intencoes("não é json"), {})
+        self.assertEqual(descricoes_intencoes(""), {})
+
+
+class TestClassificadorCentroides(unittest.TestCase):
+    """Testes da construção e da pontuação."""
+
+    def setUp(self) -> None:
+        self.chamadas: list[list[str]] = []
+
+        def gerar(textos: list[str]) -> list[list[float]]:
+            self.chamadas.append(textos)
+            return _gerar(textos)
+
+        self.classificador = ClassificadorCentroides.construir(
+            {nome: f"{nome}: descrição" for nome in _EIXOS},
+            gerar,
+            {"orcamento": ["orcamento de site"], "outra": ["saudacao"]},
+        )
+
+    def test_uma_chamada_de_embeddings_e_exemplos_invalidos_ignorados(
+        self,
+    ) -> None:
+        self.assertEqual(len(self.chamadas), 1)
+        self.assertEqual(len(self.chamadas[0]), 4)
+        self.assertEqual(self.classificador.rotulos, tuple(_EIXOS))
+
+    def test_classifica_pelo_centroide_mais_proximo(self) -> None:
+        classificacao = self.classificador.classificar([0.1, 0.9, 0.2])
+
+        self.assertEqual(classificacao.intencao, "orcamento")
+        norma = np.linalg.norm([0.1, 0.9, 0.2])
+        self.assertAlmostEqual(classificacao.similaridade, 0.9 / norma, 5)
+        self.assertAlmostEqual(
+            classificacao.margem, (0.9 - 0.2) / norma, places=5
+        )
+
+    def test_lote_equivale_a_classificacoes_individuais(self) -> None:
+        rng = np.random.default_rng(0)
+        vetores = rng.normal(size=(50, 3))
+
+        lote = self.classificador.classificar_lote(vetores)
+
+        for vetor, classificacao in zip(vetores, lote):
+            individual = self.classificador.classificar(vetor)
+            self.assertEqual(individual.intencao, classificacao.intencao)
+            self.assertAlmostEqual(
+                individual.similaridade, classificacao.similaridade, 5
+            )
+
+    def test_exemplos_deslocam_o_centroide(self) -> None:
+        classificador = ClassificadorCentroides.construir(
+            {"saudacao": "saudacao: oi", "orcamento": "orcamento: preço"},
+            lambda textos: [
+                [1.0, 0.0] if texto.startswith("saudacao") else [0.0, 1.0]
+                for texto in textos
+            ],
+            {"saudacao": ["orcamento mal rotulado"] * 3},
+        )
+
+        # Sem os exemplos, [0.6, 0.8] estaria mais perto do orçamento
+        self.assertEqual(
+            classificador.classificar([0.6, 0.8]).intencao, "saudacao"
+        )
+
+    def test_uma_intencao_tem_margem_maxima(self) -> None:
+        classificador = ClassificadorCentroides(["unica"], [[1.0, 0.0]])
+
+        self.assertEqual(classificador.classificar([1.0, 0.0]).margem, 2.0)
+
+    def test_rotulos_e_centroides_divergentes(self) -> None:
+        with self.assertRaises(ValueError):
+            ClassificadorCentroides(["a", "b"], [[1.0, 0.0]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+"""Testes para o registro de clientes de embeddings."""
+
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from smart_core_assistant_painel.modules.ai_engine.features.generate_embeddings.datasource.generate_embeddings_langchain_datasource import (
+    GenerateEmbeddingsLangchainDatasource,
+)
+from smart_core_assistant_painel.modules.ai_engine.utils.embeddings_client_registry import (
+    EMBEDDINGS_CLIENT_REGISTRY,
+    EmbeddingsClientRegistry,
+)
+from smart_core_assistant_painel.modules.ai_engine.utils.fake_providers import (
+    HashEmbeddings,
+)
+
+_DATASOURCE = (
+    "smart_core_assistant_painel.modules.ai_engine.features."
+    "generate_embeddings.datasource.generate_embeddings_langchain_datasource"
+)
+
+
+class TestEmbeddingsClientRegistry(unittest.TestCase):
+    """Testes para EmbeddingsClientRegistry."""
+
+    def setUp(self) -> None:
+        self.registry = EmbeddingsClientRegistry()
+        self.fabrica = MagicMock(side_effect=lambda *_: MagicMock())
+
+    def test_reutiliza_cliente_para_mesma_configuracao(self) -> None:
+        primeiro = self.registry.get(
+            "OllamaEmbeddings", "bge-m3", self.fabrica
+        )
+        segundo = self.registry.get("OllamaEmbeddings", "bge-m3", self.fabrica)
+
+        self.assertIs(primeiro, segundo)
+        self.fabrica.assert_called_once_with("OllamaEmbeddings", "bge-m3")
+        self.assertEqual((self.registry.misses, self.registry.hits), (1, 1))
+
+    def test_cria_clientes_distintos_por_configuracao(self) -> None:
+        a = self.registry.get("OllamaEmbeddings", "bge-m3", self.fabrica)
+        b = self.registry.get("OllamaEmbeddings", "nomic", self.fabrica)
+        c = self.registry.get("OpenAIEmbeddings", "bge-m3", self.fabrica)
+
+        self.assertEqual(len({id(a), id(b), id(c)}), 3)
+        self.assertEqual(len(self.registry), 3)
+
+    def test_clear_descarta_clientes(self) -> None:
+        primeiro = self.registry.get("HashEmbeddings", "", self.fabrica)
+        self.registry.clear()
+        segundo = self.registry.get("HashEmbeddings", "", self.fabrica)
+
+        self.assertIsNot(primeiro, segundo)
+        self.assertEqual(self.fabrica.call_count, 2)
+
+    def test_criacao_concorrente_carrega_o_modelo_uma_vez(self) -> None:
+        def carregar(*_: str) -> MagicMock:
+            time.sleep(0.05)
+            return MagicMock()
+
+        fabrica = MagicMock(side_effect=carregar)
+        resultados: list[object] = []
+        threads = [
+            threading.Thread(
+                target=lambda: resultados.append(
+                    self.registry.get("HuggingFaceEmbeddings", "m", fabrica)
+                )
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        fabrica.assert_called_once()
+        self.assertEqual(len({id(r) for r in resultados}), 1)
+
+
+class TestDatasourceReutilizaCliente(unittest.TestCase):
+    """Testes da integração com o datasource de embeddings."""
+
+    def setUp(self) -> None:
+        EMBEDDINGS_CLIENT_REGISTRY.clear()
+        self.addCleanup(EMBEDDINGS_CLIENT_REGISTRY.clear)
+        patcher = patch(f"{_DATASOURCE}.SERVICEHUB")
+        self.mock_hub = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch(
+            f"{EmbeddingsClientRegistry.__module__}.SERVICEHUB",
+            self.mock_hub,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_hub.EMBEDDINGS_CLASS = "HashEmbeddings"
+        self.mock_hub.EMBEDDINGS_MODEL = "hash-a"
+
+    def test_mesma_instancia_entre_chamadas(self) -> None:
+        primeira = GenerateEmbeddingsLangchainDatasource()
+        segunda = GenerateEmbeddingsLangchainDatasource()
+
+        cliente = primeira._create_embeddings_instance()
+        self.assertIsInstance(cliente, HashEmbeddings)
+        self.assertIs(segunda._create_embeddings_instance(), cliente)
+
+        self.mock_hub.EMBEDDINGS_MODEL = "hash-b"
+        self.assertIsNot(segunda._create_embeddings_instance(), cliente)
+
+    def test_aquecer_cria_o_cliente_da_configuracao(self) -> None:
+        cliente = EMBEDDINGS_CLIENT_REGISTRY.aquecer()
+
+        self.assertIs(
+            GenerateEmbeddingsLangchainDatasource()._create_embeddings_instance(),
+            cliente,
+        )
+
+    def test_aquecer_registra_falha(self) -> None:
+        with patch.object(
+            EmbeddingsClientRegistry,
+            "criar",
+            side_effect=RuntimeError("modelo ausente"),
+        ):
+            self.assertIsNone(EMBEDDINGS_CLIENT_REGISTRY.aquecer())
+        self.assertEqual(len(EMBEDDINGS_CLIENT_REGISTRY), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+"""Testes para o serviço local de embeddings com agrupamento de pedidos."""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from smart_core_assistant_painel.modules.ai_engine import (
+    EMBEDDINGS_CLIENT_REGISTRY,
+    HashEmbeddings,
+)
+from smart_core_assistant_painel.modules.ai_engine.utils.embeddings_locais import (
+    AgrupadorEmbeddings,
+    GeradorEmbeddings,
+    LocalEmbeddings,
+    ServidorEmbeddingsLocal,
+)
+from smart_core_assistant_painel.modules.ai_engine.utils.erros import (
+    EmbeddingError,
+)
+
+_EMBEDDINGS = HashEmbeddings(latencia_ms=0)
+
+
+class _ModeloLento:
+    """Modelo que registra os lotes recebidos e demora a cada chamada."""
+
+    def __init__(self, demora: float = 0.02) -> None:
+        self.demora = demora
+        self.lotes: list[list[str]] = []
+
+    def __call__(self, textos: list[str]) -> list[list[float]]:
+        self.lotes.append(list(textos))
+        time.sleep(self.demora)
+        return [
+            [float(len(texto)), float(len(self.lotes))] for texto in textos
+        ]
+
+
+class TestAgrupadorEmbeddings(unittest.TestCase):
+    """Testes para AgrupadorEmbeddings."""
+
+    def test_pedidos_simultaneos_no_mesmo_lote(self) -> None:
+        modelo = _ModeloLento()
+        agrupador = AgrupadorEmbeddings(
+            modelo, max_lote=64, espera_maxima_ms=50
+        )
+        self.addCleanup(agrupador.parar)
+        textos = [f"texto {'x' * i}" for i in range(16)]
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            resultados = list(
+                executor.map(lambda texto: agrupador.gerar([texto]), textos)
+            )
+
+        self.assertEqual(
+            [vetor[0][0] for vetor in resultados],
+            [float(len(texto)) for texto in textos],
+        )
+        estatisticas = agrupador.estatisticas()
+        self.assertEqual(estatisticas.pedidos, 16)
+        self.assertLess(estatisticas.lotes, 16)
+        self.assertGreater(estatisticas.textos_por_lote, 1)
+
+    def test_lote_respeita_o_maximo_de_textos(self) -> None:
+        modelo = _ModeloLento(demora=0)
+        liberar = threading.Event()
+
+        def gerar(textos: list[str]) -> list[list[float]]:
+            # Segura o primeiro lote para que os pedidos se acumulem
+            liberar.wait(1)
+            return modelo(textos)
+
+        agrupador = AgrupadorEmbeddings(gerar, max_lote=3, espera_maxima_ms=0)
+        self.addCleanup(agrupador.parar)
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futuros = [
+                executor.submit(agrupador.gerar, textos)
+                for textos in (["a"], ["b", "c"], ["d", "e"], ["f"], ["g"] * 4)
+            ]
+            time.sleep(0.05)
+            liberar.set()
+            for futuro in futuros:
+                futuro.result(timeout=5)
+
+        # Só o pedido maior que o limite forma um lote acima de três textos
+        self.assertTrue(
+            all(len(lote) <= 3 or lote == ["g"] * 4 for lote in modelo.lotes)
+        )
+        self.assertEqual(sum(len(lote) for lote in modelo.lotes), 10)
+        self.assertLess(len(modelo.lotes), 5)
+
+    def test_falha_do_modelo_chega_a_todos_os_pedidos(self) -> None:
+        def falhar(textos: list[str]) -> list[list[float]]:
+            raise RuntimeError("modelo indisponível")
+
+        agrupador = AgrupadorEmbeddings(
+            falhar, max_lote=8, espera_maxima_ms=20
+        )
+        self.addCleanup(agrupador.parar)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futuros = [
+                executor.submit(agrupador.gerar, [str(i)]) for i in range(3)
+            ]
+            for futuro in futuros:
+                with self.assertRaises(RuntimeError):
+                    futuro.result(timeout=5)
+
+    def test_parar_processa_pedidos_pendentes(self) -> None:
+        modelo = _ModeloLento(demora=0)
+        agrupador = AgrupadorEmbeddings(modelo, max_lote=8, espera_maxima_ms=0)
+
+        self.assertEqual(agrupador.gerar([]), [])
+        self.assertEqual(len(agrupador.gerar(["a", "b"])), 2)
+        agrupador.parar()
+        # Um novo pedido reinicia a thread
+        self.assertEqual(len(agrupador.gerar(["c"])), 1)
+        agrupador.parar()
+
+
+class TestServidorEmbeddingsLocal(unittest.TestCase):
+    """Testes do servidor e do cliente ``LocalEmbeddings``."""
+
+    def setUp(self) -> None:
+        diretorio = tempfile.mkdtemp(prefix="emb")
+        self.addCleanup(shutil.rmtree, diretorio, True)
+        self.caminho = os.path.join(diretorio, "servico.sock")
+
+    def _iniciar(self, gerar: GeradorEmbeddings) -> ServidorEmbeddingsLocal:
+        servidor = ServidorEmbeddingsLocal(
+            self.caminho,
+            AgrupadorEmbeddings(gerar, max_lote=32, espera_maxima_ms=5),
+        )
+        thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+        thread.start()
+
+        def encerrar() -> None:
+            servidor.shutdown()
+            servidor.server_close()
+            thread.join()
+
+        self.addCleanup(encerrar)
+        return servidor
+
+    def test_cliente_recebe_vetores_float32(self) -> None:
+        self._iniciar(_EMBEDDINGS.embed_documents)
+        cliente = LocalEmbeddings(socket_path=self.caminho)
+        textos = ["horário de atendimento", "endereço da loja"]
+
+        vetores = cliente.embed_documents(textos)
+
+        np.testing.assert_allclose(
+            vetores, _EMBEDDINGS.embed_documents(textos), rtol=1e-6
+        )
+        np.testing.assert_allclose(
+            cliente.embed_query(textos[0]), vetores[0], rtol=1e-6
+        )
+        self.assertEqual(cliente.embed_documents([]), [])
+
+    def test_erro_do_modelo_e_servico_indisponivel(self) -> None:
+        def falhar(textos: list[str]) -> list[list[float]]:
+            raise RuntimeError("modelo indisponível")
+
+        servidor = self._iniciar(falhar)
+        cliente = LocalEmbeddings(socket_path=self.caminho)
+
+        with self.assertRaisesRegex(EmbeddingError, "modelo indisponível"):
+            cliente.embed_query("texto")
+        with self.assertRaises(OSError):
+            ServidorEmbeddingsLocal(self.caminho, servidor.agrupador)
+        with self.assertRaisesRegex(EmbeddingError, "indisponível em"):
+            LocalEmbeddings(socket_path=self.caminho + "x").embed_query("a")
+
+    def test_classe_registrada_no_registro(self) -> None:
+        cliente = EMBEDDINGS_CLIENT_REGISTRY.criar("LocalEmbeddings", "minilm")
+
+        self.assertIsInstance(cliente, LocalEmbeddings)
+        self.assertEqual(cliente.model, "minilm")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+"""Testes para a extração de entidades e intenções por regras."""
+
+import json
+import unittest
+
+from smart_core_assistant_painel.modules.ai_engine import APMTuple
+from smart_core_assistant_painel.modules.ai_engine.utils.extrator_regras import (
+    ExtracaoRegras,
+    extrair_por_regras,
+    mesclar_entidades,
+    tipos_configurados,
+    validar_cnpj,
+    validar_cpf,
+)
+
+_TIPOS = frozenset({"saudacao", "agradecimento", "confirmacao"})
+
+
+class TestValidadores(unittest.TestCase):
+    """Testes dos dígitos verificadores."""
+
+    def test_validar_cpf(self) -> None:
+        self.assertTrue(validar_cpf("529.982.247-25"))
+        self.assertTrue(validar_cpf("52998224725"))
+        self.assertFalse(validar_cpf("529.982.247-26"))
+        self.assertFalse(validar_cpf("111.111.111-11"))
+        self.assertFalse(validar_cpf("123"))
+
+    def test_validar_cnpj(self) -> None:
+        self.assertTrue(validar_cnpj("11.222.333/0001-81"))
+        self.assertTrue(validar_cnpj("11222333000181"))
+        self.assertFalse(validar_cnpj("11.222.333/0001-82"))
+        self.assertFalse(validar_cnpj("00000000000000"))
+
+
+class TestExtrairPorRegras(unittest.TestCase):
+    """Testes da extração por regras."""
+
+    def test_saudacao_tem_confianca_total(self) -> None:
+        extracao = extrair_por_regras("Olá, bom dia!", _TIPOS)
+
+        self.assertEqual(extracao.intent_types, [{"saudacao": "ola"}])
+        self.assertEqual(extracao.entity_types, [])
+        self.assertEqual(extracao.confianca, 1.0)
+
+    def test_tipo_nao_configurado_nao_e_reconhecido(self) -> None:
+        extracao = extrair_por_regras("Tchau", _TIPOS)
+
+        self.assertEqual(extracao, ExtracaoRegras([], [], 0.0))
+
+    def test_mensagem_somente_com_dados(self) -> None:
+        extracao = extrair_por_regras(
+            "Meu CPF é 529.982.247-25 e o e-mail ana@empresa.com.br", _TIPOS
+        )
+
+        self.assertEqual(
+            extracao.entity_types,
+            [
+                {"email_contato": "ana@empresa.com.br"},
+                {"cpf_cliente": "529.982.247-25"},
+            ],
+        )
+        self.assertEqual(extracao.confianca, 1.0)
+
+    def test_cnpj_cep_e_telefone(self) -> None:
+        extracao = extrair_por_regras(
+            "CNPJ 11.222.333/0001-81, CEP 01310-100, fone (11) 98765-4321",
+            _TIPOS,
+        )
+
+        self.assertEqual(
+            extracao.entity_types,
+            [
+                {"cnpj_cliente": "11.222.333/0001-81"},
+                {"cep_cliente": "01310-100"},
+                {"telefone_cliente": "(11) 98765-4321"},
+            ],
+        )
+        self.assertEqual(extracao.confianca, 1.0)
+
+    def test_cpf_invalido_nao_e_extraido(self) -> None:
+        extracao = extrair_por_regras("cpf 529.982.247-26", _TIPOS)
+
+        self.assertNotIn(
+            "cpf_cliente",
+            {tipo for item in extracao.entity_types for tipo in item},
+        )
+
+    def test_texto_livre_reduz_confianca(self) -> None:
+        extracao = extrair_por_regras(
+            "Oi, preciso de um orçamento para um site", _TIPOS
+        )
+
+        self.assertEqual(extracao.intent_types, [{"saudacao": "oi"}])
+        self.assertLess(extracao.confianca, 0.5)
+
+    def test_frase_de_intencao_nao_conta_palavra_neutra_duas_vezes(
+        self,
+    ) -> None:
+        extracao = extrair_por_regras("ta bom xyz", _TIPOS)
+
+        self.assertLess(extracao.confianca, 1.0)
+
+    def test_mensagem_vazia(self) -> None:
+        self.assertEqual(extrair_por_regras("  ", _TIPOS).confianca, 0.0)
+
+
+class TestMesclarEntidades(unittest.TestCase):
+    """Testes da combinação com o resultado do LLM."""
+
+    def test_acrescenta_apenas_entidades_ausentes(self) -> None:
+        resultado = APMTuple(
+            intent_types=[{"informacao": "orçamento"}],
+            entity_types=[{"email_contato": "ana@empresa.com"}],
+        )
+        extracao = ExtracaoRegras(
+            [],
+            [
+                {"email_contato": "ana@empresa.com"},
+                {"cpf_cliente": "529.982.247-25"},
+            ],
+            0.4,
+        )
+
+        mesclado = mesclar_entidades(resultado, extracao)
+
+        self.assertEqual(mesclado.intent_types, resultado.intent_types)
+        self.assertEqual(
+            mesclado.entity_types,
+            [
+                {"email_contato": "ana@empresa.com"},
+                {"cpf_cliente": "529.982.247-25"},
+            ],
+        )
+
+
+class TestTiposConfigurados(unittest.TestCase):
+    """Testes da leitura dos tipos configurados."""
+
+    def test_le_tipos_de_intencao(self) -> None:
+        config = json.dumps(
+            {
+                "intent_types": {
+                    "comunicacao_basica": {
+                        "saudacao": "Cumprimentos",
+                        "despedida": "Encerramento",
+                    }
+                }
+            }
+        )
+
+        self.assertEqual(
+            tipos_configurados(config), frozenset({"saudacao", "despedida"})
+        )
+
+    def test_json_invalido(self) -> None:
+        self.assertEqual(tipos_configurados("{"), frozenset())
+        self.assertEqual(tipos_configurados(None), frozenset())  # type: ignore[arg-type]
+
+
+if __name__ == "__main__":
+    unittest.main()
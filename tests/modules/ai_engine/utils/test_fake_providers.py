@@ -0,0 +1,166 @@
+"""Testes para os provedores simulados de LLM e embeddings."""
+
+import asyncio
+import math
+import random
+import statistics
+import time
+import unittest
+from unittest.mock import patch
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from smart_core_assistant_painel.modules.ai_engine.features.analise_previa_mensagem.datasource.langchain_pydantic.pydantic_model_factory import (
+    create_dynamic_pydantic_model,
+)
+from smart_core_assistant_painel.modules.ai_engine.utils.fake_providers import (
+    FakeChat,
+    HashEmbeddings,
+    amostrar_latencia,
+)
+
+_HUB = (
+    "smart_core_assistant_painel.modules.ai_engine.utils.fake_providers."
+    "SERVICEHUB"
+)
+
+_INTENTS = '{"intent_types": {"comunicacao": {"saudacao": "Cumprimentos"}}}'
+_ENTIDADES = '{"entity_types": {"contato": {"nome": "Nome do contato"}}}'
+
+
+def _cosseno(a: list[float], b: list[float]) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+class _ComHubSimulado(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = patch(_HUB)
+        self.mock_hub = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_hub.FAKE_LLM_LATENCY_MS = 0.0
+        self.mock_hub.FAKE_EMBEDDINGS_LATENCY_MS = 0.0
+        self.mock_hub.FAKE_LATENCY_JITTER = 0.0
+        self.mock_hub.FAKE_LATENCY_DISTRIBUTION = "fixa"
+
+
+class TestFakeChat(_ComHubSimulado):
+    """Testes do modelo de chat simulado."""
+
+    def test_aceita_parametros_dos_provedores(self) -> None:
+        llm = FakeChat(model="llama3.1", temperature=0, base_url="x")
+
+        self.assertEqual(llm.model, "llama3.1")
+
+    def test_resposta_textual_deterministica(self) -> None:
+        llm = FakeChat()
+
+        primeira = llm.invoke("texto para melhorar")
+        segunda = llm.invoke("texto para melhorar")
+
+        self.assertEqual(primeira.content, "texto para melhorar")
+        self.assertEqual(primeira.content, segunda.content)
+        self.assertEqual(primeira.usage_metadata["input_tokens"], 3)
+
+    def test_saida_estruturada_do_modelo_dinamico(self) -> None:
+        modelo = create_dynamic_pydantic_model(_INTENTS, _ENTIDADES)
+        chain = ChatPromptTemplate.from_messages(
+            [("system", "analise"), ("user", "{context}")]
+        ) | FakeChat().with_structured_output(modelo)
+
+        primeira = chain.invoke({"context": "Olá, meu nome é Ana"})
+        segunda = chain.invoke({"context": "Olá, meu nome é Ana"})
+        outra = chain.invoke({"context": "Preciso de um orçamento urgente"})
+
+        self.assertIsInstance(primeira, modelo)
+        self.assertGreaterEqual(len(primeira.intent), 1)
+        self.assertEqual(primeira, segunda)
+        self.assertNotEqual(primeira, outra)
+
+    def test_stream_em_trechos(self) -> None:
+        trechos = list(FakeChat().stream("um dois três"))
+
+        self.assertEqual(len(trechos), 3)
+        self.assertEqual("".join(t.content for t in trechos), "um dois três")
+
+    def test_latencia_simulada_sincrona_e_assincrona(self) -> None:
+        llm = FakeChat(latencia_ms=50)
+
+        inicio = time.perf_counter()
+        llm.invoke("oi")
+        self.assertGreaterEqual(time.perf_counter() - inicio, 0.045)
+
+        async def em_paralelo() -> None:
+            await asyncio.gather(*(llm.ainvoke("oi") for _ in range(10)))
+
+        inicio = time.perf_counter()
+        asyncio.run(em_paralelo())
+        # As esperas assíncronas não bloqueiam o loop
+        self.assertLess(time.perf_counter() - inicio, 0.4)
+
+
+class TestHashEmbeddings(_ComHubSimulado):
+    """Testes dos embeddings simulados."""
+
+    def test_vetor_normalizado_de_1024_dimensoes(self) -> None:
+        vetor = HashEmbeddings().embed_query("Olá, quero um orçamento")
+
+        self.assertEqual(len(vetor), 1024)
+        self.assertAlmostEqual(math.sqrt(_cosseno(vetor, vetor)), 1.0)
+
+    def test_deterministico_e_sensivel_ao_conteudo(self) -> None:
+        embeddings = HashEmbeddings()
+        base = embeddings.embed_query("quero um orçamento de site")
+
+        self.assertEqual(
+            base, HashEmbeddings().embed_query("quero um orçamento de site")
+        )
+        parecido = embeddings.embed_query("quero um orçamento de app")
+        diferente = embeddings.embed_query("qual o horário de atendimento")
+        self.assertGreater(_cosseno(base, parecido), _cosseno(base, diferente))
+
+    def test_texto_vazio_gera_vetor_valido(self) -> None:
+        vetor = HashEmbeddings().embed_query("")
+
+        self.assertAlmostEqual(_cosseno(vetor, vetor), 1.0)
+
+    def test_documentos_e_variantes_assincronas(self) -> None:
+        embeddings = HashEmbeddings(dimensoes=8)
+
+        documentos = embeddings.embed_documents(["a", "b"])
+        assincronos = asyncio.run(embeddings.aembed_documents(["a", "b"]))
+
+        self.assertEqual(documentos, assincronos)
+        self.assertEqual(
+            asyncio.run(embeddings.aembed_query("a")), documentos[0]
+        )
+
+
+class TestAmostrarLatencia(unittest.TestCase):
+    """Testes das distribuições de latência."""
+
+    def test_media_e_desvio_aproximados(self) -> None:
+        for distribuicao in ("uniforme", "normal", "lognormal"):
+            with self.subTest(distribuicao=distribuicao):
+                rng = random.Random(42)
+                amostras = [
+                    amostrar_latencia(100, 0.2, distribuicao, rng)
+                    for _ in range(5000)
+                ]
+                self.assertAlmostEqual(
+                    statistics.mean(amostras), 0.1, delta=0.003
+                )
+                self.assertAlmostEqual(
+                    statistics.stdev(amostras), 0.02, delta=0.003
+                )
+
+    def test_fixa_e_desativada(self) -> None:
+        self.assertEqual(amostrar_latencia(100, 0.5, "fixa"), 0.1)
+        self.assertEqual(amostrar_latencia(0, 0.5, "normal"), 0.0)
+
+    def test_distribuicao_invalida(self) -> None:
+        with self.assertRaises(ValueError):
+            amostrar_latencia(100, 0.2, "exponencial")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""Testes para o filtro incremental das tags de pensamento."""
+
+import re
+import unittest
+
+from smart_core_assistant_painel.modules.ai_engine.utils.filtro_pensamento import (
+    FiltroPensamento,
+)
+
+
+def _filtrar_em_trechos(texto: str, tamanho: int) -> str:
+    filtro = FiltroPensamento()
+    saida = "".join(
+        filtro.processar(texto[i : i + tamanho])
+        for i in range(0, len(texto), tamanho)
+    )
+    return saida + filtro.finalizar()
+
+
+class TestFiltroPensamento(unittest.TestCase):
+    """Testes do FiltroPensamento."""
+
+    def test_equivale_ao_filtro_da_resposta_completa(self) -> None:
+        texto = (
+            "<think>\nanalisando a < entrada</think>\n\n"
+            "Texto <b>melhorado</b> <thinking> <think>x</think>fim"
+        )
+        esperado = re.sub(
+            r"<think>.*?</think>", "", texto, flags=re.DOTALL
+        ).lstrip()
+
+        for tamanho in range(1, 12):
+            with self.subTest(tamanho=tamanho):
+                self.assertEqual(
+                    _filtrar_em_trechos(texto, tamanho), esperado
+                )
+
+    def test_libera_texto_sem_esperar_o_fim(self) -> None:
+        filtro = FiltroPensamento()
+
+        self.assertEqual(filtro.processar("Olá, mu"), "Olá, mu")
+        self.assertEqual(filtro.processar("ndo <th"), "ndo ")
+        self.assertEqual(filtro.processar("ink>oculto</think>!"), "!")
+
+    def test_pensamento_sem_fechamento_e_descartado(self) -> None:
+        filtro = FiltroPensamento()
+
+        self.assertEqual(filtro.processar("a<think>b</thi"), "a")
+        self.assertEqual(filtro.finalizar(), "")
+
+    def test_sinal_de_menor_no_fim_e_liberado(self) -> None:
+        filtro = FiltroPensamento()
+
+        self.assertEqual(filtro.processar("x <"), "x ")
+        self.assertEqual(filtro.finalizar(), "<")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""Testes para a execução de estágios em grafo de dependências."""
+
+import threading
+import time
+import unittest
+
+from smart_core_assistant_painel.modules.ai_engine.utils.grafo_estagios import (
+    Estagio,
+    GrafoEstagios,
+)
+
+
+class TestGrafoEstagios(unittest.TestCase):
+    """Testes do agendamento, das falhas e das durações."""
+
+    def test_estagios_independentes_executam_em_paralelo(self) -> None:
+        def lento(valor: int) -> int:
+            time.sleep(0.1)
+            return valor
+
+        grafo = GrafoEstagios(
+            [
+                Estagio("a", lambda: lento(1)),
+                Estagio("b", lambda: lento(2)),
+                Estagio("c", lambda: lento(3)),
+                Estagio("soma", lambda a, b: a + b, ("a", "b")),
+            ]
+        )
+
+        resultado = grafo.executar()
+
+        self.assertEqual(resultado.resultados["soma"], 3)
+        self.assertLess(resultado.total, 0.25)
+        self.assertGreaterEqual(sum(resultado.duracoes.values()), 0.3)
+        self.assertEqual(set(resultado.duracoes), {"a", "b", "c", "soma"})
+
+    def test_falha_ignora_dependentes(self) -> None:
+        def falha() -> None:
+            raise RuntimeError("falhou")
+
+        grafo = GrafoEstagios(
+            [
+                Estagio("a", falha),
+                Estagio("b", lambda a: a, ("a",)),
+                Estagio("c", lambda b: b, ("b",)),
+                Estagio("d", lambda: "ok"),
+            ]
+        )
+
+        resultado = grafo.executar()
+
+        self.assertIsInstance(resultado.erros["a"], RuntimeError)
+        self.assertEqual(resultado.ignorados, ["b", "c"])
+        self.assertEqual(resultado.resultados, {"d": "ok"})
+
+    def test_aguardar_resultado_sob_demanda(self) -> None:
+        liberar = threading.Event()
+
+        def embedding() -> list[float]:
+            liberar.wait(1)
+            return [0.1]
+
+        def analise() -> list[float]:
+            liberar.set()
+            return grafo.aguardar("embedding")
+
+        grafo = GrafoEstagios(
+            [Estagio("embedding", embedding), Estagio("analise", analise)]
+        )
+
+        resultado = grafo.executar()
+
+        self.assertEqual(resultado.resultados["analise"], [0.1])
+
+    def test_aguardar_propaga_erro_do_estagio(self) -> None:
+        def falha() -> None:
+            raise ValueError("sem embedding")
+
+        def analise() -> str:
+            try:
+                grafo.aguardar("embedding")
+            except ValueError as e:
+                return str(e)
+            return ""
+
+        grafo = GrafoEstagios(
+            [Estagio("embedding", falha), Estagio("analise", analise)]
+        )
+
+        resultado = grafo.executar()
+
+        self.assertEqual(resultado.resultados["analise"], "sem embedding")
+
+    def test_finalizar_thread_apos_cada_estagio(self) -> None:
+        finalizados: list[str] = []
+
+        grafo = GrafoEstagios(
+            [Estagio("a", lambda: 1), Estagio("b", lambda a: a, ("a",))],
+            finalizar_thread=lambda: finalizados.append(
+                threading.current_thread().name
+            ),
+        )
+        grafo.executar()
+
+        self.assertEqual(len(finalizados), 2)
+
+    def test_valida_dependencias(self) -> None:
+        with self.assertRaises(ValueError):
+            GrafoEstagios([Estagio("a", lambda x: x, ("x",))])
+        with self.assertRaises(ValueError):
+            GrafoEstagios(
+                [
+                    Estagio("a", lambda b: b, ("b",)),
+                    Estagio("b", lambda a: a, ("a",)),
+                ]
+            )
+        with self.assertRaises(ValueError):
+            GrafoEstagios([Estagio("a", lambda: 1), Estagio("a", lambda: 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
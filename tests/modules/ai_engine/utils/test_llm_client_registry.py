@@ -0,0 +1,111 @@
+"""Testes para o registro de clientes LLM."""
+
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from smart_core_assistant_painel.modules.ai_engine.utils.erros import LlmError
+from smart_core_assistant_painel.modules.ai_engine.utils.llm_client_registry import (
+    LLM_CLIENT_REGISTRY,
+    LlmClientRegistry,
+)
+from smart_core_assistant_painel.modules.ai_engine.utils.parameters import (
+    LlmParameters,
+)
+
+
+class TestLlmClientRegistry(unittest.TestCase):
+    """Testes para LlmClientRegistry."""
+
+    def setUp(self) -> None:
+        self.registry = LlmClientRegistry()
+        self.llm_class = MagicMock(side_effect=lambda **_: MagicMock())
+
+    def test_reutiliza_cliente_para_mesma_configuracao(self) -> None:
+        primeiro = self.registry.get(
+            self.llm_class, "llama3.1", {"temperature": 0}
+        )
+        segundo = self.registry.get(
+            self.llm_class, "llama3.1", {"temperature": 0}
+        )
+
+        self.assertIs(primeiro, segundo)
+        self.llm_class.assert_called_once_with(
+            model="llama3.1", temperature=0
+        )
+        self.assertEqual(self.registry.misses, 1)
+        self.assertEqual(self.registry.hits, 1)
+
+    def test_cria_clientes_distintos_por_configuracao(self) -> None:
+        a = self.registry.get(self.llm_class, "llama3.1", {"temperature": 0})
+        b = self.registry.get(self.llm_class, "llama3.1", {"temperature": 1})
+        c = self.registry.get(self.llm_class, "qwen3", {"temperature": 0})
+
+        self.assertEqual(len({id(a), id(b), id(c)}), 3)
+        self.assertEqual(len(self.registry), 3)
+
+    def test_chave_aceita_parametros_nao_hashable(self) -> None:
+        chave_1 = LlmClientRegistry.make_key(
+            self.llm_class, "m", {"stop": ["a"], "headers": {"x": 1}}
+        )
+        chave_2 = LlmClientRegistry.make_key(
+            self.llm_class, "m", {"headers": {"x": 1}, "stop": ["a"]}
+        )
+
+        self.assertEqual(chave_1, chave_2)
+        hash(chave_1)
+
+    def test_clear_descarta_clientes(self) -> None:
+        primeiro = self.registry.get(self.llm_class, "llama3.1")
+        self.registry.clear()
+        segundo = self.registry.get(self.llm_class, "llama3.1")
+
+        self.assertIsNot(primeiro, segundo)
+        self.assertEqual(self.llm_class.call_count, 2)
+
+    def test_criacao_unica_sob_concorrencia(self) -> None:
+        barreira = threading.Barrier(8)
+        resultados = []
+
+        def obter() -> None:
+            barreira.wait()
+            resultados.append(self.registry.get(self.llm_class, "llama3.1"))
+
+        threads = [threading.Thread(target=obter) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.llm_class.call_count, 1)
+        self.assertEqual(len({id(r) for r in resultados}), 1)
+
+
+class TestLlmParametersCreateLlm(unittest.TestCase):
+    """Testes da integração de LlmParameters com o registro."""
+
+    def tearDown(self) -> None:
+        LLM_CLIENT_REGISTRY.clear()
+
+    def test_create_llm_reutiliza_instancia(self) -> None:
+        llm_class = MagicMock(side_effect=lambda **_: MagicMock())
+
+        def criar_parametros() -> LlmParameters:
+            return LlmParameters(
+                llm_class=llm_class,
+                model="llama3.1",
+                error=LlmError,
+                prompt_system="s",
+                prompt_human="h",
+                context="c",
+                extra_params={"temperature": 0},
+            )
+
+        self.assertIs(
+            criar_parametros().create_llm, criar_parametros().create_llm
+        )
+        llm_class.assert_called_once_with(model="llama3.1", temperature=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
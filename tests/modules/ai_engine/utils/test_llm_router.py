@@ -0,0 +1,291 @@
+"""Testes para o roteamento de chamadas ao LLM entre provedores."""
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from py_return_success_or_error import ErrorReturn, SuccessReturn
+
+from smart_core_assistant_painel.modules.ai_engine.utils.erros import LlmError
+from smart_core_assistant_painel.modules.ai_engine.utils.llm_router import (
+    LlmRouter,
+    ProvedorLlm,
+)
+
+_HUB = (
+    "smart_core_assistant_painel.modules.ai_engine.utils.llm_router."
+    "SERVICEHUB"
+)
+
+GROQ = ProvedorLlm("ChatGroq", "llama")
+OPENAI = ProvedorLlm("ChatOpenAI", "gpt-4o-mini")
+OLLAMA = ProvedorLlm("ChatOllama", "llama3.1")
+
+
+def _sucesso(valor: str) -> SuccessReturn[str]:
+    return SuccessReturn(valor)
+
+
+def _erro() -> ErrorReturn[str]:
+    return ErrorReturn(LlmError("falhou"))
+
+
+class TestLlmRouter(unittest.TestCase):
+    """Testes do fallback e do circuit breaker."""
+
+    def setUp(self) -> None:
+        patcher = patch(_HUB)
+        self.mock_hub = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_hub.LLM_ROUTER_ERROR_THRESHOLD = 0.5
+        self.mock_hub.LLM_ROUTER_P95_THRESHOLD = 0.0
+        self.mock_hub.LLM_ROUTER_OPEN_SECONDS = 30.0
+        self.mock_hub.LLM_ROUTER_HEDGE_DELAY = 0.0
+        self.router = LlmRouter()
+
+    def test_fallback_para_proximo_provedor(self) -> None:
+        chamados: list[str] = []
+
+        def chamada(provedor: ProvedorLlm):
+            chamados.append(provedor.classe)
+            if provedor is GROQ:
+                return _erro()
+            return _sucesso(provedor.classe)
+
+        resultado = self.router.executar([GROQ, OPENAI, OLLAMA], chamada)
+
+        self.assertIsInstance(resultado, SuccessReturn)
+        self.assertEqual(resultado.result, "ChatOpenAI")
+        self.assertEqual(chamados, ["ChatGroq", "ChatOpenAI"])
+        metricas = self.router.metricas()
+        self.assertEqual(metricas[GROQ.nome]["falhas"], 1)
+        self.assertEqual(metricas[OPENAI.nome]["desvios"], 1)
+
+    def test_todos_falham_retorna_ultimo_erro(self) -> None:
+        resultado = self.router.executar([GROQ, OPENAI], lambda _: _erro())
+
+        self.assertIsInstance(resultado, ErrorReturn)
+
+    def test_excecao_conta_como_falha(self) -> None:
+        def chamada(provedor: ProvedorLlm):
+            if provedor is GROQ:
+                raise RuntimeError("conexão recusada")
+            return _sucesso("ok")
+
+        resultado = self.router.executar([GROQ, OPENAI], chamada)
+
+        self.assertEqual(resultado.result, "ok")
+        self.assertEqual(self.router.metricas()[GROQ.nome]["falhas"], 1)
+
+    def test_circuito_abre_por_taxa_de_erro_e_fecha_apos_teste(self) -> None:
+        groq_saudavel = False
+
+        def chamada(provedor: ProvedorLlm):
+            if provedor is GROQ and not groq_saudavel:
+                return _erro()
+            return _sucesso(provedor.classe)
+
+        for _ in range(5):
+            self.router.executar([GROQ, OPENAI], chamada)
+
+        self.assertTrue(self.router.metricas()[GROQ.nome]["circuito_aberto"])
+        self.assertEqual(self.router.ordem([GROQ, OPENAI]), [OPENAI, GROQ])
+
+        # Simula o fim do período de abertura
+        self.router._estados[GROQ.nome].aberto_ate = time.monotonic() - 1
+        groq_saudavel = True
+        resultado = self.router.executar([GROQ, OPENAI], chamada)
+
+        self.assertEqual(resultado.result, "ChatGroq")
+        self.assertFalse(self.router.metricas()[GROQ.nome]["circuito_aberto"])
+        self.assertEqual(self.router.ordem([GROQ, OPENAI]), [GROQ, OPENAI])
+
+    def test_circuito_abre_por_p95(self) -> None:
+        self.mock_hub.LLM_ROUTER_P95_THRESHOLD = 0.01
+
+        def chamada(provedor: ProvedorLlm):
+            if provedor is GROQ:
+                time.sleep(0.02)
+            return _sucesso(provedor.classe)
+
+        for _ in range(5):
+            self.router.executar([GROQ, OPENAI], chamada)
+
+        metricas = self.router.metricas()[GROQ.nome]
+        self.assertTrue(metricas["circuito_aberto"])
+        self.assertGreater(metricas["p95"], 0.01)
+        self.assertEqual(metricas["taxa_erro"], 0.0)
+
+    def test_provedor_unico_com_circuito_aberto_ainda_e_usado(self) -> None:
+        for _ in range(5):
+            self.router.executar([GROQ], lambda _: _erro())
+
+        resultado = self.router.executar([GROQ], lambda _: _sucesso("ok"))
+
+        self.assertEqual(resultado.result, "ok")
+
+    def test_clear_fecha_circuitos(self) -> None:
+        for _ in range(5):
+            self.router.executar([GROQ], lambda _: _erro())
+
+        self.router.clear()
+
+        self.assertEqual(self.router.metricas(), {})
+
+    def test_stream_fallback_antes_do_primeiro_trecho(self) -> None:
+        def chamada(provedor: ProvedorLlm):
+            if provedor is GROQ:
+                raise RuntimeError("conexão recusada")
+            yield "a"
+            yield "b"
+
+        trechos = list(
+            self.router.executar_stream([GROQ, OPENAI], chamada)
+        )
+
+        self.assertEqual(trechos, ["a", "b"])
+        metricas = self.router.metricas()
+        self.assertEqual(metricas[GROQ.nome]["falhas"], 1)
+        self.assertEqual(metricas[OPENAI.nome]["desvios"], 1)
+        self.assertEqual(metricas[OPENAI.nome]["falhas"], 0)
+
+    def test_stream_falha_apos_primeiro_trecho_e_propagada(self) -> None:
+        chamados: list[str] = []
+
+        def chamada(provedor: ProvedorLlm):
+            chamados.append(provedor.classe)
+            yield "a"
+            raise RuntimeError("conexão encerrada")
+
+        recebidos: list[str] = []
+        with self.assertRaisesRegex(RuntimeError, "encerrada"):
+            for trecho in self.router.executar_stream(
+                [GROQ, OPENAI], chamada
+            ):
+                recebidos.append(trecho)
+
+        self.assertEqual(recebidos, ["a"])
+        self.assertEqual(chamados, ["ChatGroq"])
+        self.assertEqual(self.router.metricas()[GROQ.nome]["falhas"], 1)
+
+    def test_stream_respeita_circuito_aberto(self) -> None:
+        for _ in range(5):
+            self.router.executar([GROQ], lambda _: _erro())
+
+        trechos = list(
+            self.router.executar_stream(
+                [GROQ, OPENAI], lambda provedor: iter([provedor.classe])
+            )
+        )
+
+        self.assertEqual(trechos, ["ChatOpenAI"])
+
+
+class TestLlmRouterHedge(unittest.TestCase):
+    """Testes da replicação de chamadas lentas."""
+
+    def setUp(self) -> None:
+        patcher = patch(_HUB)
+        self.mock_hub = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_hub.LLM_ROUTER_ERROR_THRESHOLD = 0.5
+        self.mock_hub.LLM_ROUTER_P95_THRESHOLD = 0.0
+        self.mock_hub.LLM_ROUTER_OPEN_SECONDS = 30.0
+        self.mock_hub.LLM_ROUTER_HEDGE_DELAY = 0.05
+        self.router = LlmRouter()
+        self.liberar = threading.Event()
+        self.addCleanup(self.liberar.set)
+
+    def test_reserva_responde_quando_principal_demora(self) -> None:
+        def chamada(provedor: ProvedorLlm):
+            if provedor is GROQ:
+                self.liberar.wait(5)
+            return _sucesso(provedor.classe)
+
+        inicio = time.perf_counter()
+        resultado = self.router.executar_com_hedge([GROQ, OPENAI], chamada)
+
+        self.assertEqual(resultado.result, "ChatOpenAI")
+        self.assertLess(time.perf_counter() - inicio, 1.0)
+        self.assertEqual(self.router.metricas()[OPENAI.nome]["desvios"], 1)
+
+    def test_principal_rapido_nao_replica(self) -> None:
+        chamados: list[str] = []
+
+        def chamada(provedor: ProvedorLlm):
+            chamados.append(provedor.classe)
+            return _sucesso(provedor.classe)
+
+        resultado = self.router.executar_com_hedge([GROQ, OPENAI], chamada)
+
+        self.assertEqual(resultado.result, "ChatGroq")
+        self.assertEqual(chamados, ["ChatGroq"])
+
+    def test_ambos_falham_usa_demais_provedores(self) -> None:
+        def chamada(provedor: ProvedorLlm):
+            if provedor is OLLAMA:
+                return _sucesso("local")
+            return _erro()
+
+        resultado = self.router.executar_com_hedge(
+            [GROQ, OPENAI, OLLAMA], chamada
+        )
+
+        self.assertEqual(resultado.result, "local")
+
+
+class TestLlmRouterAsync(unittest.IsolatedAsyncioTestCase):
+    """Testes das variantes assíncronas do roteador."""
+
+    def setUp(self) -> None:
+        patcher = patch(_HUB)
+        self.mock_hub = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_hub.LLM_ROUTER_ERROR_THRESHOLD = 0.5
+        self.mock_hub.LLM_ROUTER_P95_THRESHOLD = 0.0
+        self.mock_hub.LLM_ROUTER_OPEN_SECONDS = 30.0
+        self.mock_hub.LLM_ROUTER_HEDGE_DELAY = 0.05
+        self.router = LlmRouter()
+
+    async def test_fallback_para_proximo_provedor(self) -> None:
+        chamados: list[str] = []
+
+        async def chamada(provedor: ProvedorLlm):
+            chamados.append(provedor.classe)
+            if provedor is GROQ:
+                raise RuntimeError("conexão recusada")
+            return _sucesso(provedor.classe)
+
+        resultado = await self.router.aexecutar([GROQ, OPENAI], chamada)
+
+        self.assertEqual(resultado.result, "ChatOpenAI")
+        self.assertEqual(chamados, ["ChatGroq", "ChatOpenAI"])
+        self.assertEqual(self.router.metricas()[GROQ.nome]["falhas"], 1)
+
+    async def test_hedge_cancela_chamada_mais_lenta(self) -> None:
+        cancelada = asyncio.Event()
+
+        async def chamada(provedor: ProvedorLlm):
+            if provedor is GROQ:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelada.set()
+                    raise
+            return _sucesso(provedor.classe)
+
+        resultado = await self.router.aexecutar_com_hedge(
+            [GROQ, OPENAI], chamada
+        )
+        await asyncio.wait_for(cancelada.wait(), 1)
+
+        self.assertEqual(resultado.result, "ChatOpenAI")
+        metricas = self.router.metricas()
+        self.assertEqual(metricas[OPENAI.nome]["desvios"], 1)
+        self.assertEqual(metricas[GROQ.nome]["falhas"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+"""Testes para o cache de respostas do LLM."""
+
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+
+from smart_core_assistant_painel.modules.ai_engine.utils.response_cache import (
+    LlmResponseCache,
+    _MemoryBackend,
+    _RedisBackend,
+    fingerprint_historico,
+    normalizar_mensagem,
+)
+
+
+class TestNormalizacao(unittest.TestCase):
+    """Testes para normalização de mensagem e histórico."""
+
+    def test_normalizar_mensagem(self) -> None:
+        self.assertEqual(normalizar_mensagem("  Oi!! "), "oi")
+        self.assertEqual(normalizar_mensagem("BOM   dia"), "bom dia")
+        self.assertEqual(normalizar_mensagem("ok 👍"), "ok")
+        self.assertEqual(normalizar_mensagem(""), "")
+
+    def test_fingerprint_considera_apenas_janela(self) -> None:
+        historico_a = {"conteudo_mensagens": ["x", "a", "b"]}
+        historico_b = {"conteudo_mensagens": ["y", "A!", "b"]}
+
+        self.assertEqual(
+            fingerprint_historico(historico_a, 2),
+            fingerprint_historico(historico_b, 2),
+        )
+        self.assertNotEqual(
+            fingerprint_historico(historico_a, 3),
+            fingerprint_historico(historico_b, 3),
+        )
+
+    def test_fingerprint_historico_vazio(self) -> None:
+        self.assertEqual(
+            fingerprint_historico({}, 3),
+            fingerprint_historico({"conteudo_mensagens": []}, 3),
+        )
+
+
+class TestLlmResponseCacheMemoria(unittest.TestCase):
+    """Testes do cache com backend em memória."""
+
+    def setUp(self) -> None:
+        self.cache = LlmResponseCache("teste", backend=_MemoryBackend())
+        patcher = patch(
+            "smart_core_assistant_painel.modules.ai_engine.utils.response_cache.SERVICEHUB"
+        )
+        self.mock_hub = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_hub.LLM_CACHE_TTL = 60
+        self.mock_hub.LLM_CACHE_MAX_ENTRIES = 2
+        self.mock_hub.LLM_CACHE_FEATURES = frozenset({"teste"})
+
+    def test_enabled_por_feature(self) -> None:
+        self.assertTrue(self.cache.enabled)
+        self.mock_hub.LLM_CACHE_FEATURES = frozenset()
+        self.assertFalse(self.cache.enabled)
+
+    def test_get_set_e_metricas(self) -> None:
+        chave = LlmResponseCache.make_key("oi", "h", "v1", "modelo")
+
+        self.assertIsNone(self.cache.get(chave))
+        self.cache.set(chave, {"intent_types": [{"saudacao": "oi"}]})
+        self.assertEqual(
+            self.cache.get(chave), {"intent_types": [{"saudacao": "oi"}]}
+        )
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_rate"], 0.5)
+        self.assertEqual(stats["size"], 1)
+
+    def test_limite_de_entradas(self) -> None:
+        for i in range(3):
+            self.cache.set(f"k{i}", i)
+
+        self.assertIsNone(self.cache.get("k0"))
+        self.assertEqual(self.cache.get("k2"), 2)
+        self.assertEqual(self.cache.stats()["size"], 2)
+
+    def test_expiracao(self) -> None:
+        self.mock_hub.LLM_CACHE_TTL = 0
+        self.cache.set("k", 1)
+        self.assertIsNone(self.cache.get("k"))
+
+    def test_make_key_varia_com_partes(self) -> None:
+        self.assertNotEqual(
+            LlmResponseCache.make_key("oi", "h", "v1", "m1"),
+            LlmResponseCache.make_key("oi", "h", "v1", "m2"),
+        )
+
+    def test_falha_do_backend_e_tratada_como_ausencia(self) -> None:
+        backend = MagicMock()
+        backend.get.side_effect = ConnectionError("redis fora")
+        backend.set.side_effect = ConnectionError("redis fora")
+        cache = LlmResponseCache("teste", backend=backend)
+
+        self.assertIsNone(cache.get("k"))
+        cache.set("k", 1)
+
+    def test_variantes_assincronas(self) -> None:
+        async def gravar_e_ler() -> object:
+            await self.cache.aset("k", {"a": 1})
+            return await self.cache.aget("k")
+
+        self.assertEqual(asyncio.run(gravar_e_ler()), {"a": 1})
+        self.assertEqual(self.cache.get("k"), {"a": 1})
+
+
+class TestRedisBackend(unittest.TestCase):
+    """Testes do backend Redis com cliente simulado."""
+
+    def test_set_remove_excedente(self) -> None:
+        client = MagicMock()
+        client.pipeline.return_value.execute.return_value = [
+            True,
+            1,
+            0,
+            3,
+        ]
+        client.zpopmin.return_value = [(b"antiga", 1.0)]
+        backend = _RedisBackend(client, "teste")
+
+        backend.set("nova", "{}", ttl=60, max_entries=2)
+
+        pipe = client.pipeline.return_value
+        pipe.set.assert_called_once_with(
+            "llm_cache:teste:v:nova", "{}", ex=60
+        )
+        client.zpopmin.assert_called_once_with("llm_cache:teste:indice", 1)
+        client.delete.assert_called_once_with("llm_cache:teste:v:antiga")
+
+    def test_get_decodifica_bytes(self) -> None:
+        client = MagicMock()
+        client.get.return_value = b'{"a": 1}'
+        backend = _RedisBackend(client, "teste")
+
+        self.assertEqual(backend.get("k"), '{"a": 1}')
+        client.get.assert_called_once_with("llm_cache:teste:v:k")
+
+    def test_metrics(self) -> None:
+        client = MagicMock()
+        client.hgetall.return_value = {b"hits": b"3", b"misses": b"1"}
+        backend = _RedisBackend(client, "teste")
+
+        self.assertEqual(backend.metrics(), {"hits": 3, "misses": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,293 @@
+"""Testes para a coalescência de chamadas idênticas em andamento."""
+
+import asyncio
+import threading
+import time
+import unittest
+from typing import Any, Optional
+from unittest.mock import patch
+
+from smart_core_assistant_painel.modules.ai_engine.utils.single_flight import (
+    SingleFlight,
+)
+
+_HUB = (
+    "smart_core_assistant_painel.modules.ai_engine.utils.single_flight."
+    "SERVICEHUB"
+)
+
+
+class _RedisFalso:
+    """Subconjunto do cliente Redis usado pelo single-flight."""
+
+    def __init__(self) -> None:
+        self.dados: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, chave: str) -> Optional[Any]:
+        return self.dados.get(chave)
+
+    def set(
+        self,
+        chave: str,
+        valor: Any,
+        nx: bool = False,
+        px: Optional[int] = None,
+    ) -> bool:
+        with self._lock:
+            if nx and chave in self.dados:
+                return False
+            self.dados[chave] = (
+                valor.encode("utf-8") if isinstance(valor, str) else valor
+            )
+            return True
+
+    def exists(self, chave: str) -> int:
+        return int(chave in self.dados)
+
+    def delete(self, chave: str) -> int:
+        return int(self.dados.pop(chave, None) is not None)
+
+    def pipeline(self) -> "_RedisFalso":
+        return self
+
+    def execute(self) -> None:
+        pass
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Testes da coalescência dentro do processo."""
+
+    def setUp(self) -> None:
+        patcher = patch(_HUB)
+        self.mock_hub = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_hub.SINGLE_FLIGHT_TIMEOUT = 5.0
+        self.mock_hub.SINGLE_FLIGHT_REDIS_TTL = 0.0
+        self.flight = SingleFlight("teste")
+
+    def _executar_em_paralelo(
+        self, chaves: list[str], funcao: Any
+    ) -> tuple[list[Any], list[Exception]]:
+        resultados: list[Any] = []
+        erros: list[Exception] = []
+
+        def alvo(chave: str) -> None:
+            try:
+                resultados.append(self.flight.executar(chave, funcao))
+            except Exception as e:
+                erros.append(e)
+
+        threads = [
+            threading.Thread(target=alvo, args=(chave,)) for chave in chaves
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return resultados, erros
+
+    def test_chamadas_identicas_compartilham_execucao(self) -> None:
+        chamadas = []
+
+        def funcao() -> list[float]:
+            chamadas.append(1)
+            time.sleep(0.1)
+            return [0.1, 0.2]
+
+        resultados, erros = self._executar_em_paralelo(["sim"] * 8, funcao)
+
+        self.assertEqual(erros, [])
+        self.assertEqual(len(chamadas), 1)
+        self.assertEqual(resultados, [[0.1, 0.2]] * 8)
+        stats = self.flight.stats()
+        self.assertEqual(stats["execucoes"], 1)
+        self.assertEqual(stats["coalescidas"], 7)
+        self.assertEqual(stats["em_andamento"], 0)
+
+    def test_chaves_diferentes_executam_separadamente(self) -> None:
+        chamadas = []
+
+        def funcao() -> str:
+            chamadas.append(1)
+            time.sleep(0.05)
+            return "ok"
+
+        self._executar_em_paralelo(["a", "b", "c"], funcao)
+
+        self.assertEqual(len(chamadas), 3)
+
+    def test_erro_propagado_para_quem_aguardava(self) -> None:
+        def funcao() -> str:
+            time.sleep(0.1)
+            raise RuntimeError("provedor indisponível")
+
+        resultados, erros = self._executar_em_paralelo(["sim"] * 4, funcao)
+
+        self.assertEqual(resultados, [])
+        self.assertEqual(len(erros), 4)
+        self.assertTrue(all(isinstance(e, RuntimeError) for e in erros))
+
+    def test_chamada_seguinte_executa_novamente(self) -> None:
+        chamadas = []
+
+        def funcao() -> int:
+            chamadas.append(1)
+            return len(chamadas)
+
+        self.assertEqual(self.flight.executar("sim", funcao), 1)
+        self.assertEqual(self.flight.executar("sim", funcao), 2)
+
+    def test_desabilitado_com_timeout_zero(self) -> None:
+        self.mock_hub.SINGLE_FLIGHT_TIMEOUT = 0
+        chamadas = []
+
+        def funcao() -> str:
+            chamadas.append(1)
+            time.sleep(0.05)
+            return "ok"
+
+        self._executar_em_paralelo(["sim"] * 3, funcao)
+
+        self.assertEqual(len(chamadas), 3)
+        self.assertEqual(self.flight.stats()["execucoes"], 0)
+
+
+class TestSingleFlightAsync(unittest.IsolatedAsyncioTestCase):
+    """Testes da variante assíncrona da coalescência."""
+
+    def setUp(self) -> None:
+        patcher = patch(_HUB)
+        self.mock_hub = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_hub.SINGLE_FLIGHT_TIMEOUT = 5.0
+        self.mock_hub.SINGLE_FLIGHT_REDIS_TTL = 0.0
+        self.flight = SingleFlight("teste")
+
+    async def test_chamadas_identicas_compartilham_execucao(self) -> None:
+        chamadas = []
+
+        async def funcao() -> str:
+            chamadas.append(1)
+            await asyncio.sleep(0.05)
+            return "ok"
+
+        resultados = await asyncio.gather(
+            *(self.flight.aexecutar("sim", funcao) for _ in range(5))
+        )
+
+        self.assertEqual(resultados, ["ok"] * 5)
+        self.assertEqual(len(chamadas), 1)
+        self.assertEqual(self.flight.stats()["coalescidas"], 4)
+
+    async def test_aguarda_chamada_sincrona_em_andamento(self) -> None:
+        iniciou = threading.Event()
+        liberar = threading.Event()
+
+        def funcao_sincrona() -> str:
+            iniciou.set()
+            liberar.wait(5)
+            return "sincrono"
+
+        async def funcao() -> str:
+            return "assincrono"
+
+        thread = threading.Thread(
+            target=self.flight.executar, args=("sim", funcao_sincrona)
+        )
+        thread.start()
+        self.addCleanup(thread.join)
+        self.assertTrue(iniciou.wait(1))
+
+        espera = asyncio.create_task(self.flight.aexecutar("sim", funcao))
+        await asyncio.sleep(0.05)
+        self.assertFalse(espera.done())
+        liberar.set()
+
+        self.assertEqual(await espera, "sincrono")
+
+    async def test_erro_propagado_para_quem_aguardava(self) -> None:
+        async def funcao() -> str:
+            await asyncio.sleep(0.05)
+            raise RuntimeError("provedor indisponível")
+
+        resultados = await asyncio.gather(
+            *(self.flight.aexecutar("sim", funcao) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        self.assertTrue(
+            all(isinstance(r, RuntimeError) for r in resultados)
+        )
+
+
+class TestSingleFlightRedis(unittest.TestCase):
+    """Testes da coalescência entre processos pelo Redis."""
+
+    def setUp(self) -> None:
+        patcher = patch(_HUB)
+        self.mock_hub = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_hub.SINGLE_FLIGHT_TIMEOUT = 5.0
+        self.mock_hub.SINGLE_FLIGHT_REDIS_TTL = 10.0
+        self.redis = _RedisFalso()
+
+    def test_resultado_publicado_e_reaproveitado(self) -> None:
+        processo_a = SingleFlight("teste", client=self.redis)
+        processo_b = SingleFlight("teste", client=self.redis)
+        chamadas = []
+
+        def funcao() -> tuple[int, int]:
+            chamadas.append(1)
+            return (1, 2)
+
+        self.assertEqual(processo_a.executar("sim", funcao), (1, 2))
+        resultado = processo_b.executar(
+            "sim", funcao, desserializar=lambda valor: tuple(valor)
+        )
+
+        self.assertEqual(resultado, (1, 2))
+        self.assertEqual(len(chamadas), 1)
+        self.assertEqual(processo_b.stats()["redis"], 1)
+        self.assertFalse(
+            any(":trava:" in chave for chave in self.redis.dados)
+        )
+
+    def test_aguarda_processo_que_detem_a_trava(self) -> None:
+        self.redis.set("single_flight:teste:trava:sim", "1")
+        processo = SingleFlight("teste", client=self.redis)
+
+        def publicar() -> None:
+            time.sleep(0.1)
+            self.redis.set("single_flight:teste:resultado:sim", "[3]")
+            self.redis.delete("single_flight:teste:trava:sim")
+
+        threading.Thread(target=publicar).start()
+
+        resultado = processo.executar("sim", lambda: self.fail("executou"))
+
+        self.assertEqual(resultado, [3])
+
+    def test_trava_liberada_sem_resultado_executa(self) -> None:
+        processo = SingleFlight("teste", client=self.redis)
+
+        def falhar() -> str:
+            raise RuntimeError("falhou")
+
+        with self.assertRaises(RuntimeError):
+            processo.executar("sim", falhar)
+
+        self.assertEqual(self.redis.dados, {})
+        self.assertEqual(processo.executar("sim", lambda: "ok"), "ok")
+
+    def test_falha_do_redis_executa_diretamente(self) -> None:
+        processo = SingleFlight("teste", client=self.redis)
+
+        with patch.object(
+            self.redis, "get", side_effect=ConnectionError("redis fora")
+        ):
+            self.assertEqual(processo.executar("sim", lambda: "ok"), "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,283 @@
+"""Testes para a telemetria das chamadas ao LLM e aos embeddings."""
+
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from langchain_core.language_models.fake_chat_models import (
+    GenericFakeChatModel,
+)
+from langchain_core.messages import AIMessage
+from langchain_core.prompts import ChatPromptTemplate
+
+from smart_core_assistant_painel.modules.ai_engine.utils.telemetria import (
+    TIPO_EMBEDDING,
+    TIPO_LLM,
+    RegistroTelemetria,
+    TelemetriaLlm,
+    destino_arquivo,
+    ler_arquivo,
+    percentil,
+    resumir,
+)
+
+_HUB = (
+    "smart_core_assistant_painel.modules.ai_engine.utils.telemetria."
+    "SERVICEHUB"
+)
+
+
+def _registro(
+    funcionalidade: str,
+    latencia: float,
+    data: datetime,
+    sucesso: bool = True,
+    **campos: object,
+) -> RegistroTelemetria:
+    return RegistroTelemetria(
+        funcionalidade=funcionalidade,
+        tipo=TIPO_LLM,
+        modelo="modelo",
+        data=data,
+        latencia=latencia,
+        sucesso=sucesso,
+        **campos,
+    )
+
+
+class TestTelemetriaCallback(unittest.TestCase):
+    """Testes da medição das chains do LangChain."""
+
+    def setUp(self) -> None:
+        patcher = patch(_HUB)
+        self.mock_hub = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_hub.LLM_TELEMETRY_BATCH_SIZE = 100
+        self.mock_hub.LLM_TELEMETRY_FLUSH_SECONDS = 60.0
+        self.telemetria = TelemetriaLlm()
+        self.registros: list[RegistroTelemetria] = []
+        self.telemetria.registrar = self.registros.append  # type: ignore[method-assign]
+
+    @staticmethod
+    def _chain(*mensagens: AIMessage):  # type: ignore[no-untyped-def]
+        llm = GenericFakeChatModel(messages=iter(mensagens))
+        return ChatPromptTemplate.from_messages([("human", "{texto}")]) | llm
+
+    def test_registra_tokens_e_latencia(self) -> None:
+        chain = self._chain(
+            AIMessage(
+                content="resposta",
+                usage_metadata={
+                    "input_tokens": 12,
+                    "output_tokens": 3,
+                    "total_tokens": 15,
+                },
+            )
+        )
+
+        with self.telemetria.funcionalidade("analise_previa_mensagem"):
+            chain.invoke({"texto": "oi"})
+
+        self.assertEqual(len(self.registros), 1)
+        registro = self.registros[0]
+        self.assertEqual(registro.funcionalidade, "analise_previa_mensagem")
+        self.assertEqual(registro.tipo, TIPO_LLM)
+        self.assertEqual(registro.tokens_prompt, 12)
+        self.assertEqual(registro.tokens_resposta, 3)
+        self.assertTrue(registro.sucesso)
+        self.assertGreaterEqual(registro.latencia, 0.0)
+        self.assertIsNone(registro.tempo_primeiro_token)
+
+    def test_streaming_registra_tempo_ate_primeiro_token(self) -> None:
+        chain = self._chain(AIMessage(content="um dois tres"))
+
+        with self.telemetria.funcionalidade("melhoria_ia_treinamento"):
+            list(chain.stream({"texto": "oi"}))
+
+        registro = self.registros[0]
+        self.assertIsNotNone(registro.tempo_primeiro_token)
+        assert registro.tempo_primeiro_token is not None
+        self.assertLessEqual(registro.tempo_primeiro_token, registro.latencia)
+
+    def test_batch_registra_cada_chamada(self) -> None:
+        chain = self._chain(AIMessage(content="a"), AIMessage(content="b"))
+
+        with self.telemetria.funcionalidade("pre_analise_ia_treinamento"):
+            chain.batch(
+                [{"texto": "1"}, {"texto": "2"}],
+                config={"max_concurrency": 2},
+            )
+
+        self.assertEqual(len(self.registros), 2)
+
+    def test_falha_registrada(self) -> None:
+        chain = self._chain()  # sem mensagens: a chamada falha
+
+        with self.telemetria.funcionalidade("melhoria_ia_treinamento"):
+            with self.assertRaises(Exception):
+                chain.invoke({"texto": "oi"})
+
+        self.assertEqual(len(self.registros), 1)
+        self.assertFalse(self.registros[0].sucesso)
+
+    def test_fora_do_bloco_nada_e_registrado(self) -> None:
+        chain = self._chain(AIMessage(content="a"))
+
+        chain.invoke({"texto": "oi"})
+
+        self.assertEqual(self.registros, [])
+
+    def test_desabilitada_nao_registra(self) -> None:
+        self.mock_hub.LLM_TELEMETRY_BATCH_SIZE = 0
+        chain = self._chain(AIMessage(content="a"))
+
+        with self.telemetria.funcionalidade("analise_previa_mensagem"):
+            chain.invoke({"texto": "oi"})
+
+        self.assertEqual(self.registros, [])
+
+
+class TestTelemetriaBuffer(unittest.TestCase):
+    """Testes do acúmulo e da gravação em lote."""
+
+    def setUp(self) -> None:
+        patcher = patch(_HUB)
+        self.mock_hub = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_hub.LLM_TELEMETRY_BATCH_SIZE = 2
+        self.mock_hub.LLM_TELEMETRY_FLUSH_SECONDS = 60.0
+        self.mock_hub.LLM_TELEMETRY_FILE = ""
+        self.telemetria = TelemetriaLlm()
+        self.destino = MagicMock()
+        self.telemetria.configurar_destino(self.destino)
+
+    def test_grava_em_lote_quando_buffer_enche(self) -> None:
+        agora = datetime.now(timezone.utc)
+        self.telemetria.registrar(_registro("a", 0.1, agora))
+        self.assertFalse(self.destino.called)
+
+        self.telemetria.registrar(_registro("a", 0.2, agora))
+
+        limite = time.monotonic() + 2
+        while not self.destino.called and time.monotonic() < limite:
+            time.sleep(0.01)
+        self.destino.assert_called_once()
+        self.assertEqual(len(self.destino.call_args.args[0]), 2)
+        self.assertEqual(self.telemetria.pendentes(), 0)
+
+    def test_falha_do_destino_descarta_lote(self) -> None:
+        self.mock_hub.LLM_TELEMETRY_BATCH_SIZE = 100
+        self.destino.side_effect = RuntimeError("banco indisponível")
+        self.telemetria.registrar(
+            _registro("a", 0.1, datetime.now(timezone.utc))
+        )
+
+        self.assertEqual(self.telemetria.descarregar(), 0)
+        self.assertEqual(self.telemetria.pendentes(), 0)
+
+    def test_registrar_chamada_de_embedding(self) -> None:
+        self.mock_hub.LLM_TELEMETRY_BATCH_SIZE = 100
+        inicio = time.perf_counter()
+
+        self.telemetria.registrar_chamada(
+            "generate_embeddings", TIPO_EMBEDDING, "bge-m3", inicio, True
+        )
+        self.assertEqual(self.telemetria.descarregar(), 1)
+
+        registro = self.destino.call_args.args[0][0]
+        self.assertEqual(registro.tipo, TIPO_EMBEDDING)
+        self.assertEqual(registro.modelo, "bge-m3")
+        self.assertIsNone(registro.tokens_prompt)
+
+    def test_arquivo_padrao_sem_destino(self) -> None:
+        self.mock_hub.LLM_TELEMETRY_BATCH_SIZE = 100
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "telemetria.jsonl")
+            self.mock_hub.LLM_TELEMETRY_FILE = caminho
+            self.telemetria.configurar_destino(None)
+            registro = _registro(
+                "a", 0.5, datetime.now(timezone.utc), tokens_prompt=7
+            )
+            self.telemetria.registrar(registro)
+
+            self.telemetria.descarregar()
+
+            self.assertEqual(list(ler_arquivo(caminho)), [registro])
+
+
+class TestResumir(unittest.TestCase):
+    """Testes da agregação por dia e funcionalidade."""
+
+    def test_percentis_tokens_e_falhas_por_dia(self) -> None:
+        dia = datetime(2025, 1, 10, 12, tzinfo=timezone.utc)
+        registros = [
+            _registro("analise", i / 100, dia, tokens_prompt=10)
+            for i in range(1, 21)
+        ]
+        registros.append(
+            _registro(
+                "analise",
+                1.0,
+                dia,
+                sucesso=False,
+                tempo_primeiro_token=0.2,
+            )
+        )
+        registros.append(_registro("analise", 0.3, dia + timedelta(days=1)))
+        registros.append(_registro("melhoria", 0.4, dia))
+
+        resumos = resumir(registros)
+
+        self.assertEqual(
+            [(r.dia.day, r.funcionalidade) for r in resumos],
+            [(10, "analise"), (10, "melhoria"), (11, "analise")],
+        )
+        analise = resumos[0]
+        self.assertEqual(analise.chamadas, 21)
+        self.assertEqual(analise.falhas, 1)
+        self.assertAlmostEqual(analise.latencia_p50, 0.11)
+        self.assertAlmostEqual(analise.latencia_p95, 0.2)
+        self.assertEqual(analise.primeiro_token_p50, 0.2)
+        self.assertEqual(analise.tokens_prompt, 200)
+        self.assertIsNone(resumos[1].primeiro_token_p50)
+
+    def test_percentil(self) -> None:
+        self.assertEqual(percentil([], 0.95), 0.0)
+        self.assertEqual(percentil([3.0, 1.0, 2.0], 0.5), 2.0)
+        self.assertEqual(percentil([float(i) for i in range(100)], 0.95), 94)
+
+
+class TestDestinoArquivo(unittest.TestCase):
+    """Testes do destino JSONL."""
+
+    def test_grava_e_le_registros(self) -> None:
+        registros = [
+            _registro(
+                "a",
+                0.1,
+                datetime(2025, 1, 1, tzinfo=timezone.utc),
+                tokens_prompt=1,
+                tokens_resposta=2,
+                tempo_primeiro_token=0.05,
+            ),
+            _registro(
+                "b",
+                0.2,
+                datetime(2025, 1, 2, tzinfo=timezone.utc),
+                sucesso=False,
+                erro="falhou",
+            ),
+        ]
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "telemetria.jsonl")
+
+            destino_arquivo(caminho)(registros)
+
+            self.assertEqual(list(ler_arquivo(caminho)), registros)
+
+
+if __name__ == "__main__":
+    unittest.main()
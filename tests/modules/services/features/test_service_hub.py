@@ -87,6 +87,15 @@ class TestServiceHub(unittest.TestCase):
 
         self.assertEqual(hub.LLM_CLASS, ChatOpenAI)
 
+    @patch.dict(os.environ, {"LLM_CLASS": "FakeChat"})
+    def test_get_llm_class_fakechat(self):
+        hub = ServiceHub()
+        from smart_core_assistant_painel.modules.ai_engine.utils.fake_providers import (
+            FakeChat,
+        )
+
+        self.assertEqual(hub.LLM_CLASS, FakeChat)
+
     @patch.dict(os.environ, {"LLM_CLASS": "InvalidLLM"})
     def test_get_llm_class_invalid(self):
         hub = ServiceHub()
@@ -239,6 +248,178 @@ class TestServiceHub(unittest.TestCase):
         # Verifica se as configurações foram recarregadas
         self.assertIsNotNone(hub.TIME_CACHE)
 
+    @patch.dict(
+        os.environ,
+        {"LLM_CACHE_FEATURES": " analise_previa_mensagem, ,outra "},
+    )
+    def test_llm_cache_features_property(self):
+        hub = ServiceHub()
+        self.assertEqual(
+            hub.LLM_CACHE_FEATURES,
+            frozenset({"analise_previa_mensagem", "outra"}),
+        )
+
+    @patch.dict(
+        os.environ,
+        {
+            "SEMANTIC_CACHE_MAX_DISTANCE": "0.1",
+            "SEMANTIC_CACHE_MAX_CHARS": "40",
+            "SEMANTIC_CACHE_SAMPLE_RATE": "0.5",
+        },
+    )
+    def test_semantic_cache_properties(self):
+        hub = ServiceHub()
+        hub.reload_config()
+        self.assertEqual(hub.SEMANTIC_CACHE_MAX_DISTANCE, 0.1)
+        self.assertEqual(hub.SEMANTIC_CACHE_MAX_CHARS, 40)
+        self.assertEqual(hub.SEMANTIC_CACHE_SAMPLE_RATE, 0.5)
+
+    @patch.dict(
+        os.environ,
+        {
+            "ASYNC_PROVIDER_CONCURRENCY": "ChatGroq=8, OllamaEmbeddings=2,x=,y",
+            "ASYNC_CALL_TIMEOUT": "15",
+        },
+    )
+    def test_async_runtime_properties(self):
+        hub = ServiceHub()
+        hub.reload_config()
+        self.assertEqual(
+            hub.ASYNC_PROVIDER_CONCURRENCY,
+            {"ChatGroq": 8, "OllamaEmbeddings": 2},
+        )
+        self.assertEqual(hub.ASYNC_CALL_TIMEOUT, 15.0)
+        self.assertEqual(hub.ASYNC_DEFAULT_CONCURRENCY, 4)
+
+    @patch.dict(os.environ, {"RULE_FAST_PATH_MIN_CONFIDENCE": "0.9"})
+    def test_rule_fast_path_min_confidence_property(self):
+        hub = ServiceHub()
+        hub.reload_config()
+        self.assertEqual(hub.RULE_FAST_PATH_MIN_CONFIDENCE, 0.9)
+
+    @patch.dict(
+        os.environ,
+        {"REDIS_HOST": "redis", "REDIS_PORT": "6380", "REDIS_URL": ""},
+    )
+    def test_redis_url_montada_a_partir_do_host(self):
+        hub = ServiceHub()
+        self.assertEqual(hub.REDIS_URL, "redis://redis:6380/2")
+
+    @patch.dict(
+        os.environ, {"EMBEDDINGS_CACHE_FEATURES": " generate_embeddings_lote,"}
+    )
+    def test_embeddings_cache_features_property(self):
+        hub = ServiceHub()
+        hub.reload_config()
+        self.assertEqual(
+            hub.EMBEDDINGS_CACHE_FEATURES,
+            frozenset({"generate_embeddings_lote"}),
+        )
+
+    @patch.dict(
+        os.environ,
+        {
+            "EMBEDDINGS_LOCAL_SOCKET": "/run/embeddings.sock",
+            "EMBEDDINGS_LOCAL_MAX_BATCH": "0",
+            "EMBEDDINGS_LOCAL_MAX_WAIT_MS": "2.5",
+        },
+    )
+    def test_embeddings_local_properties(self):
+        hub = ServiceHub()
+        hub.reload_config()
+        self.assertEqual(hub.EMBEDDINGS_LOCAL_SOCKET, "/run/embeddings.sock")
+        self.assertEqual(hub.EMBEDDINGS_LOCAL_BACKEND, "HuggingFaceEmbeddings")
+        self.assertEqual(hub.EMBEDDINGS_LOCAL_MAX_BATCH, 1)
+        self.assertEqual(hub.EMBEDDINGS_LOCAL_MAX_WAIT_MS, 2.5)
+
+    @patch.dict(
+        os.environ,
+        {
+            "EMBEDDINGS_QUERY_CACHE_MAX_ENTRIES": "-5",
+            "EMBEDDINGS_QUERY_CACHE_REDIS_TTL": "30",
+        },
+    )
+    def test_embeddings_query_cache_properties(self):
+        hub = ServiceHub()
+        hub.reload_config()
+        self.assertEqual(hub.EMBEDDINGS_QUERY_CACHE_MAX_ENTRIES, 0)
+        self.assertEqual(hub.EMBEDDINGS_QUERY_CACHE_TTL, 3600.0)
+        self.assertEqual(hub.EMBEDDINGS_QUERY_CACHE_REDIS_TTL, 30.0)
+
+    @patch.dict(
+        os.environ,
+        {
+            "VECTOR_SEARCH_QUANTIZATION": " HalfVec ",
+            "VECTOR_SEARCH_RERANK_CANDIDATES": "0",
+        },
+    )
+    def test_vector_search_properties(self):
+        hub = ServiceHub()
+        hub.reload_config()
+        self.assertEqual(hub.VECTOR_SEARCH_QUANTIZATION, "halfvec")
+        self.assertEqual(hub.VECTOR_SEARCH_RERANK_CANDIDATES, 1)
+
+    @patch.dict(os.environ, {"MODEL": "modelo-a"})
+    def test_reload_config_notifica_mudanca_de_modelo(self):
+        hub = ServiceHub()
+        chamadas = []
+        hub.add_llm_config_listener(lambda: chamadas.append(True))
+
+        hub.reload_config()
+        self.assertEqual(chamadas, [])
+
+        os.environ["MODEL"] = "modelo-b"
+        hub.reload_config()
+        self.assertEqual(chamadas, [True])
+
+    def test_add_llm_config_listener_sem_duplicatas(self):
+        hub = ServiceHub()
+
+        def listener():
+            pass
+
+        hub.add_llm_config_listener(listener)
+        hub.add_llm_config_listener(listener)
+        self.assertEqual(hub._llm_config_listeners, [listener])
+
+    @patch.dict(
+        os.environ,
+        {"EMBEDDINGS_CLASS": "OllamaEmbeddings", "EMBEDDINGS_MODEL": "a"},
+    )
+    def test_reload_config_notifica_mudanca_de_embeddings(self):
+        hub = ServiceHub()
+        chamadas = []
+        hub.add_embeddings_config_listener(lambda: chamadas.append(True))
+
+        hub.reload_config()
+        self.assertEqual(chamadas, [])
+
+        os.environ["EMBEDDINGS_CLASS"] = "HashEmbeddings"
+        hub.reload_config()
+        self.assertEqual(chamadas, [True])
+        self.assertEqual(hub.EMBEDDINGS_CLASS, "HashEmbeddings")
+
+    @patch.dict(
+        os.environ,
+        {"EMBEDDINGS_CLASS": "OllamaEmbeddings", "EMBEDDINGS_MODEL": "a"},
+    )
+    def test_set_embeddings_target_prevalece_sobre_ambiente(self):
+        hub = ServiceHub()
+        chamadas = []
+        hub.add_embeddings_config_listener(lambda: chamadas.append(True))
+
+        hub.set_embeddings_target("HashEmbeddings", "b")
+        hub.set_embeddings_target("HashEmbeddings", "b")
+        hub.reload_config()
+        self.assertEqual(chamadas, [True])
+        self.assertEqual(hub.EMBEDDINGS_CLASS, "HashEmbeddings")
+        self.assertEqual(hub.EMBEDDINGS_MODEL, "b")
+
+        hub.set_embeddings_target(None)
+        self.assertEqual(chamadas, [True, True])
+        self.assertEqual(hub.EMBEDDINGS_CLASS, "OllamaEmbeddings")
+        self.assertEqual(hub.EMBEDDINGS_MODEL, "a")
+
     @patch.dict(os.environ, {"LLM_CLASS": "ChatOllama"})
     def test_get_llm_class_chatollama_default(self):
         hub = ServiceHub()
@@ -475,6 +656,27 @@ class TestServiceHub(unittest.TestCase):
         result = hub.TIME_CACHE
         self.assertEqual(result, 20)
 
+    @patch.dict(
+        os.environ,
+        {
+            "MODEL": "padrao",
+            "LLM_PROVIDERS": "ChatGroq:llama-3.1-8b-instant, ChatOllama,",
+        },
+    )
+    def test_llm_providers_com_modelo_padrao(self):
+        hub = ServiceHub()
+        self.assertEqual(
+            hub.LLM_PROVIDERS,
+            [("ChatGroq", "llama-3.1-8b-instant"), ("ChatOllama", "padrao")],
+        )
+
+    def test_llm_providers_sem_env_var(self):
+        if "LLM_PROVIDERS" in os.environ:
+            del os.environ["LLM_PROVIDERS"]
+        hub = ServiceHub()
+        self.assertEqual(hub.LLM_PROVIDERS, [])
+        self.assertEqual(hub.LLM_ROUTER_HEDGE_DELAY, 0.0)
+
 
 if __name__ == "__main__":
     unittest.main()